@@ -10,18 +10,12 @@ import subprocess
 import threading
 import psutil
 import os
-import re
 import sys
 import time
-import importlib.util
 import json
 import hashlib
 from pathlib import Path
-from PIL import Image, ImageTk, ImageDraw
-import win32gui
-import win32ui
 import win32con
-import win32process
 import ctypes
 
 try:
@@ -31,17 +25,16 @@ try:
 except ImportError:
     TRAY_AVAILABLE = False
 
-try:
-    from plugins import TextractorPlugin
-    PLUGINS_AVAILABLE = True
-except ImportError:
-    PLUGINS_AVAILABLE = False
+from hook_ingestion import (PLUGINS_AVAILABLE, SLOW_PLUGIN_MS, HookIngestionEngine, HookRegistry, PluginManifest,
+                            UIUpdateBatcher, plugin_has_settings)
+from hook_capture import CAPTURE_EXTENSION, CaptureTee, CaptureWriter
+from process_scanner import ProcessScanner, get_window_backend
+from icon_cache import IconThumbnailCache, get_icon_extractor
 
 # Constants
 CREATE_NO_WINDOW = 0x08000000
 DEFAULT_DPI = 96.0
 MIN_SYSTEM_PID = 100
-ICON_SIZE = 32
 SCALED_ICON_SIZE = 24
 ICON_CORNER_RADIUS = 3
 MAX_HOOK_TEXTS = 3
@@ -51,6 +44,14 @@ AUTO_HOOK_RETRY_DELAY = 5000
 AUTO_HOOK_MAX_RETRIES = 3
 PROCESS_MONITOR_DELAY = 3000
 GAME_LAUNCH_ATTACH_DELAY = 4000
+UI_TICK_MS = 33
+SLOW_PLUGIN_WARNING_SECONDS = 10  # How long the status bar shows a slow plugin call
+PLUGIN_STATS_REFRESH_MS = 1000
+PROCESS_FILTER_DEBOUNCE_MS = 150  # The process list is filtered once typing pauses this long
+PROCESS_SEARCH_PLACEHOLDER = "🔍 Search processes..."
+# A launched game is looked for in the process list this often, this many times (before it is attached)
+PROCESS_SELECT_INTERVAL_MS = 100
+PROCESS_SELECT_ATTEMPTS = 40
 
 class ModernTextractorGUI:
     def __init__(self, root):
@@ -109,22 +110,34 @@ class ModernTextractorGUI:
         min_height = int(650 * self.scale_factor)
         self.root.minsize(min_width, min_height)
         
+        # Headless ingestion core: parser, hook registry and plugin dispatcher
+        self.ingestion = HookIngestionEngine(registry=HookRegistry(max_texts=MAX_HOOK_TEXTS))
+        
+        # Last slow plugin call (filename, seconds, time), set on the reader thread
+        self.last_slow_plugin = None
+        self.plugin_stats_window = None
+        self.ingestion.dispatcher.on_slow = self.on_slow_plugin
+        
+        # Updates from the reader thread, drained once per UI frame
+        self.ui_batcher = UIUpdateBatcher()
+        
         # State variables
         self.cli_process = None
         self.attached_pid = None
-        self.hooks = {}
         self.selected_hook_id = None
+        self.hook_items = {}  # hook_id -> hook_tree item id
+        self.hook_previews = {}  # hook_id -> preview string currently shown
         self.is_reading = False
-        self.process_icons = {}
+        self.process_icons = {}  # pid -> PhotoImage shown in the row of a listed process
+        self.process_rows = {}  # (pid, create_time) -> (ProcessEntry, process_tree item), in list order
+        self.process_filter_after_id = None
         self.is_fullscreen = False
         
-        # Plugin system
-        self.plugins = {}
-        self.active_plugins = []
-        self.plugin_order = []
+        # Plugin system (plugins, active_plugins and plugin_order live in the dispatcher)
         self.plugins_config_path = None
         self.plugins_folder = None
         self.plugin_settings = {}
+        self.plugin_manifest = None  # Cached metadata of the plugin files
         
         # Game profiles system
         self.game_profiles = {}
@@ -137,6 +150,10 @@ class ModernTextractorGUI:
         # Auto-copy settings
         self.auto_copy_enabled = tk.BooleanVar(value=True)
         
+        # Capture mode: record raw CLI output for offline replay
+        self.capture_enabled = tk.BooleanVar(value=False)
+        self.capture_writer = None
+        
         # Statistics tracking
         self.stats = {'lines': 0, 'words': 0, 'chars': 0, 'start_time': None, 'last_update': time.time()}
         
@@ -201,6 +218,11 @@ class ModernTextractorGUI:
             'textractor_gui.exe' , 'sugoi_hook.exe'
         }
         
+        # Process list: scanned in the background, only new and exited processes are probed
+        self.window_backend = get_window_backend()
+        self.process_scanner = ProcessScanner(self.window_backend, exclude=self.should_exclude_process,
+                                              min_pid=MIN_SYSTEM_PID)
+        
         # Determine CLI paths - handle both development and compiled modes
         is_frozen = getattr(sys, 'frozen', False)
         is_nuitka = getattr(sys, '__compiled__', False) or (
@@ -221,7 +243,16 @@ class ModernTextractorGUI:
         # Configure plugin and profile paths
         self.plugins_folder = self.app_path / "plugins"
         self.plugins_config_path = self.app_path / "plugins_config.json"
+        self.plugins_manifest_path = self.app_path / "plugins_manifest.json"
         self.game_profiles_path = self.app_path / "game_profiles.json"
+        self.captures_folder = self.app_path / "captures"
+        self.icon_cache_folder = self.app_path / "icon_cache"
+        
+        # Process icons: rendered off the UI thread once per executable version, kept on disk as PNG
+        self.icon_cache = IconThumbnailCache(self.icon_cache_folder, get_icon_extractor(),
+                                             size=self.scale(SCALED_ICON_SIZE),
+                                             radius=self.scale(ICON_CORNER_RADIUS),
+                                             scale=self.scale_factor, photo_factory=self.make_icon_photo)
         
         # Engine executable paths
         self.textractor_x86_path = self.base_path / "textractor_builds" / "_x86" / "TextractorCLI.exe"
@@ -259,8 +290,9 @@ class ModernTextractorGUI:
         self.create_status_bar()
         self.setup_ui()
         self.setup_system_tray()
-        self.refresh_processes()
+        self.process_scanner.start()
         self.update_status_bar()
+        self.drain_ui_updates()
         
         # Bind fullscreen detection
         self.root.bind('<F11>', self.toggle_fullscreen)
@@ -271,6 +303,54 @@ class ModernTextractorGUI:
         """Scale a value based on DPI"""
         return int(value * self.scale_factor)
 
+    # ==================== INGESTION STATE ====================
+    # Hook and plugin state is owned by the headless ingestion engine so the
+    # reader thread and the UI always see the same objects.
+
+    @property
+    def hooks(self):
+        return self.ingestion.registry.hooks
+
+    @property
+    def selected_hook_id(self):
+        return self.ingestion.selected_hook_id
+
+    @selected_hook_id.setter
+    def selected_hook_id(self, hook_id):
+        self.ingestion.selected_hook_id = hook_id
+
+    @property
+    def silent_auto_launch(self):
+        return self.ingestion.suppress_unselected
+
+    @silent_auto_launch.setter
+    def silent_auto_launch(self, value):
+        self.ingestion.suppress_unselected = value
+
+    @property
+    def plugins(self):
+        return self.ingestion.dispatcher.plugins
+
+    @plugins.setter
+    def plugins(self, plugins):
+        self.ingestion.dispatcher.plugins = plugins
+
+    @property
+    def active_plugins(self):
+        return self.ingestion.dispatcher.active_plugins
+
+    @active_plugins.setter
+    def active_plugins(self, active_plugins):
+        self.ingestion.dispatcher.active_plugins = active_plugins
+
+    @property
+    def plugin_order(self):
+        return self.ingestion.dispatcher.plugin_order
+
+    @plugin_order.setter
+    def plugin_order(self, plugin_order):
+        self.ingestion.dispatcher.plugin_order = plugin_order
+
     # ==================== PLUGIN SYSTEM METHODS ====================
     
     def init_plugin_system(self):
@@ -284,6 +364,7 @@ class ModernTextractorGUI:
         
         # Load saved plugin configuration
         self.load_plugins_config()
+        self.plugin_manifest = PluginManifest(self.plugins_manifest_path)
         
         # Discover and load available plugins
         self.discover_plugins()
@@ -301,8 +382,13 @@ class ModernTextractorGUI:
             
             current_files.add(plugin_file.name)
             
+            # Loaded from the file as it is now (on reload): keep the plugin and its state
+            if self.ingestion.dispatcher.is_current(plugin_file.name, plugin_file):
+                continue
+            
             try:
-                plugin = self.load_plugin(plugin_file)
+                # Inactive plugins are listed from their metadata; their module runs once activated
+                plugin = self.load_plugin(plugin_file, lazy=plugin_file.name not in self.active_plugins)
                 # Apply saved settings to the plugin
                 if plugin and plugin_file.name in self.plugin_settings:
                     for setting_name, setting_value in self.plugin_settings[plugin_file.name].items():
@@ -318,6 +404,14 @@ class ModernTextractorGUI:
             except Exception:
                 pass
         
+        # Unregister plugins whose file was removed
+        for filename in list(self.plugins):
+            if filename not in current_files:
+                self.ingestion.dispatcher.remove(filename)
+        
+        if self.plugin_manifest:
+            self.plugin_manifest.save()
+        
         # Clean up active_plugins list - remove any that weren't found
         self.active_plugins = [p for p in self.active_plugins if p in self.plugins]
         
@@ -337,6 +431,7 @@ class ModernTextractorGUI:
         self.active_plugins = []
         self.plugin_order = []
         self.plugin_settings = {}
+        self.ingestion.dispatcher.slow_threshold_ms = SLOW_PLUGIN_MS
         
         if self.plugins_config_path and self.plugins_config_path.exists():
             try:
@@ -345,6 +440,7 @@ class ModernTextractorGUI:
                     self.active_plugins = config.get('active_plugins', [])
                     self.plugin_order = config.get('plugin_order', [])
                     self.plugin_settings = config.get('plugin_settings', {})
+                    self.ingestion.dispatcher.slow_threshold_ms = config.get('slow_plugin_ms', SLOW_PLUGIN_MS)
             except Exception:
                 pass
     
@@ -359,7 +455,8 @@ class ModernTextractorGUI:
                 config = {
                     'active_plugins': self.active_plugins,
                     'plugin_order': self.plugin_order,
-                    'plugin_settings': self.plugin_settings
+                    'plugin_settings': self.plugin_settings,
+                    'slow_plugin_ms': self.ingestion.dispatcher.slow_threshold_ms
                 }
                 
                 # Ensure directory exists
@@ -371,37 +468,17 @@ class ModernTextractorGUI:
             except Exception:
                 pass
     
-    def load_plugin(self, plugin_path):
-        """Load a single plugin from a file path"""
+    def load_plugin(self, plugin_path, lazy=False):
+        """Load a single plugin from a file path (lazy: a LazyPlugin if its metadata can be read)"""
         if not PLUGINS_AVAILABLE:
             return None
         
-        plugin_name = plugin_path.stem
-        
         try:
-            # Load the module dynamically
-            spec = importlib.util.spec_from_file_location(plugin_name, plugin_path)
-            module = importlib.util.module_from_spec(spec)
-            sys.modules[plugin_name] = module
-            spec.loader.exec_module(module)
-            
-            # Look for a 'plugin' instance or a class that inherits from TextractorPlugin
-            plugin_instance = None
-            
-            if hasattr(module, 'plugin'):
-                plugin_instance = module.plugin
-            else:
-                # Look for a class that inherits from TextractorPlugin
-                for attr_name in dir(module):
-                    attr = getattr(module, attr_name)
-                    if (isinstance(attr, type) and 
-                        issubclass(attr, TextractorPlugin) and 
-                        attr is not TextractorPlugin):
-                        plugin_instance = attr()
-                        break
+            # Load the module dynamically (or list it from the manifest) and register it
+            plugin_instance = self.ingestion.dispatcher.discover(plugin_path, lazy=lazy,
+                                                                 manifest=self.plugin_manifest)
             
             if plugin_instance:
-                self.plugins[plugin_path.name] = plugin_instance
                 return plugin_instance
                 
         except Exception:
@@ -413,9 +490,13 @@ class ModernTextractorGUI:
     def activate_plugin(self, plugin_filename):
         """Activate a plugin"""
         if plugin_filename in self.plugins and plugin_filename not in self.active_plugins:
+            # Load the plugin's module if it was only listed so far
+            plugin = self.ingestion.dispatcher.resolve(plugin_filename)
+            if plugin is None:
+                return False
             self.active_plugins.append(plugin_filename)
-            plugin = self.plugins[plugin_filename]
             plugin.enabled = True
+            self.ingestion.dispatcher.invalidate()
             plugin.on_enable()
             self.save_plugins_config()
             return True
@@ -425,6 +506,7 @@ class ModernTextractorGUI:
         """Deactivate a plugin"""
         if plugin_filename in self.active_plugins:
             self.active_plugins.remove(plugin_filename)
+            self.ingestion.dispatcher.invalidate()
             if plugin_filename in self.plugins:
                 plugin = self.plugins[plugin_filename]
                 plugin.enabled = False
@@ -438,33 +520,11 @@ class ModernTextractorGUI:
         if not PLUGINS_AVAILABLE:
             return text
         
-        current_text = text
-        
-        # Determine execution order: plugin_order filtered by active state
-        execution_order = [p for p in self.plugin_order if p in self.active_plugins]
-        
-        # Iterate over the execution order
-        for plugin_filename in execution_order:
-            if plugin_filename in self.plugins:
-                plugin = self.plugins[plugin_filename]
-                if plugin.enabled:
-                    try:
-                        result = plugin.process_text(current_text)
-                        if result is None:
-                            return None
-                        current_text = result
-                    except Exception:
-                        pass
-        
-        return current_text
+        return self.ingestion.dispatcher.process(text)
     
     def reset_all_plugins(self):
         """Reset state of all plugins"""
-        for plugin in self.plugins.values():
-            try:
-                plugin.reset()
-            except Exception:
-                pass
+        self.ingestion.dispatcher.reset_all()
     
     def open_plugins_folder(self):
         """Open the plugins folder in file explorer"""
@@ -487,6 +547,7 @@ class ModernTextractorGUI:
             for filename in self.plugins:
                 if filename not in self.plugin_order:
                     self.plugin_order.append(filename)
+                    self.ingestion.dispatcher.invalidate()
             
             # Display plugins in the order defined by plugin_order
             for filename in self.plugin_order:
@@ -495,7 +556,7 @@ class ModernTextractorGUI:
                     status = "✓ Active" if filename in self.active_plugins else "○ Inactive"
                     
                     # Check if plugin has settings to show configure button
-                    has_settings = bool(plugin.get_settings())
+                    has_settings = plugin_has_settings(plugin)
                     actions = "⚙️ Configure" if has_settings else ""
                     
                     # We store the filename in the text attribute (hidden ID) for tracking
@@ -604,8 +665,8 @@ class ModernTextractorGUI:
                     # Deactivate first
                     self.deactivate_plugin(plugin_filename)
                     
-                    # Remove from plugins dict
-                    del self.plugins[plugin_filename]
+                    # Unregister it (the dispatcher also drops its signature and the cached plugin chain)
+                    self.ingestion.dispatcher.remove(plugin_filename)
                     
                     # Remove from plugin_order
                     if plugin_filename in self.plugin_order:
@@ -615,6 +676,8 @@ class ModernTextractorGUI:
                     plugin_path = self.plugins_folder / plugin_filename
                     if plugin_path.exists():
                         plugin_path.unlink()
+                    if self.plugin_manifest:
+                        self.plugin_manifest.save()
                     
                     # Save the updated configuration
                     self.save_plugins_config()
@@ -648,7 +711,7 @@ class ModernTextractorGUI:
             
             # Check if plugin has settings
             plugin = self.plugins[plugin_filename]
-            has_settings = bool(plugin.get_settings())
+            has_settings = plugin_has_settings(plugin)
             
             # Create context menu
             menu = tk.Menu(self.root, tearoff=0, bg=self.colors['surface'], fg=self.colors['fg'])
@@ -689,7 +752,9 @@ class ModernTextractorGUI:
         if not plugin_filename:
             return
         
-        plugin = self.plugins[plugin_filename]
+        plugin = self.ingestion.dispatcher.resolve(plugin_filename)
+        if plugin is None:
+            return
         settings = plugin.get_settings()
         
         if not settings:
@@ -1043,6 +1108,7 @@ class ModernTextractorGUI:
             return
         
         self.current_game_id = game_id
+        self.ingestion.dispatcher.set_game(game_id)
         
         # Check if profile exists
         if game_id in self.game_profiles:
@@ -1259,16 +1325,9 @@ class ModernTextractorGUI:
                                             self.detach_process()
                                             time.sleep(0.5)
                                         
-                                        # Refresh process list to include the new game
+                                        # Refresh process list to include the new game, and select it once listed
                                         self.refresh_processes()
-                                        
-                                        # Find and select the process in the tree
-                                        for tree_item in self.process_tree.get_children():
-                                            tree_values = self.process_tree.item(tree_item)['values']
-                                            if tree_values[0] == pid:
-                                                self.process_tree.selection_set(tree_item)
-                                                self.process_tree.see(tree_item)
-                                                break
+                                        self.select_process_when_listed(pid)
                                         
                                         # Wait a bit to ensure the UI is updated and selection is properly set
                                         def perform_attach():
@@ -1484,16 +1543,9 @@ class ModernTextractorGUI:
                                                 self.detach_process()
                                                 time.sleep(0.5)
                                             
-                                            # Refresh process list to include the new game
+                                            # Refresh process list to include the new game, and select it once listed
                                             self.refresh_processes()
-                                            
-                                            # Find and select the process in the tree
-                                            for tree_item in self.process_tree.get_children():
-                                                tree_values = self.process_tree.item(tree_item)['values']
-                                                if tree_values[0] == pid:
-                                                    self.process_tree.selection_set(tree_item)
-                                                    self.process_tree.see(tree_item)
-                                                    break
+                                            self.select_process_when_listed(pid)
                                             
                                             # Wait a bit to ensure the UI is updated and selection is properly set
                                             # This prevents "No Selection" errors
@@ -1739,6 +1791,8 @@ class ModernTextractorGUI:
         """Set the window icon from logo.webp"""
         try:
             if self.logo_path.exists():
+                # PIL is imported where it is used, to keep it off the startup path
+                from PIL import Image, ImageTk
                 # Load the webp image
                 logo_img = Image.open(self.logo_path)
                 # Convert to PhotoImage for tkinter
@@ -1898,8 +1952,8 @@ class ModernTextractorGUI:
         self.search_var = tk.StringVar()
         search_entry = ttk.Entry(search_frame, textvariable=self.search_var)
         search_entry.grid(row=0, column=0, sticky=(tk.W, tk.E), padx=(0, 10))
-        search_entry.insert(0, "🔍 Search processes...")
-        search_entry.bind('<FocusIn>', lambda e: search_entry.delete(0, tk.END) if search_entry.get() == "🔍 Search processes..." else None)
+        search_entry.insert(0, PROCESS_SEARCH_PLACEHOLDER)
+        search_entry.bind('<FocusIn>', lambda e: search_entry.delete(0, tk.END) if search_entry.get() == PROCESS_SEARCH_PLACEHOLDER else None)
         
         ttk.Button(search_frame, text="🔄 Refresh", command=self.refresh_processes,
                   style="Secondary.TButton").grid(row=0, column=1, padx=(0, 5))
@@ -1938,7 +1992,7 @@ class ModernTextractorGUI:
         scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
         
         # Now set up the search trace after process_tree is created
-        self.search_var.trace('w', lambda *args: self.filter_processes())
+        self.search_var.trace('w', lambda *args: self.schedule_process_filter())
         
         # Enable double-click to attach
         self.process_tree.bind('<Double-Button-1>', lambda e: self.attach_process())
@@ -2051,6 +2105,10 @@ class ModernTextractorGUI:
                   command=self.open_plugins_folder,
                   style="Secondary.TButton").pack(side=tk.LEFT, padx=(0, 5))
         
+        ttk.Button(btn_frame, text="📊 Stats", 
+                  command=self.show_plugin_stats,
+                  style="Secondary.TButton").pack(side=tk.LEFT, padx=(0, 5))
+        
         ttk.Button(btn_frame, text="🔄 Refresh", 
                   command=self.reload_plugins,
                   style="Secondary.TButton").pack(side=tk.LEFT)
@@ -2166,9 +2224,139 @@ class ModernTextractorGUI:
                 
         self.drag_start_item = None
     
+    def on_slow_plugin(self, filename, seconds):
+        """Called by the dispatcher (reader thread) after a plugin call over the slow threshold"""
+        self.last_slow_plugin = (filename, seconds, time.time())
+    
+    def show_plugin_stats(self):
+        """Open the per-plugin statistics window (calls, latency, filter rate, errors)"""
+        if self.plugin_stats_window is not None and self.plugin_stats_window.winfo_exists():
+            self.plugin_stats_window.lift()
+            return
+        
+        dispatcher = self.ingestion.dispatcher
+        window = tk.Toplevel(self.root)
+        window.title("📊 Plugin Statistics")
+        window.geometry("1200x450")
+        window.configure(bg=self.colors['bg'])
+        window.transient(self.root)
+        self.plugin_stats_window = window
+        
+        # Main container
+        container = ttk.Frame(window, style="TFrame")
+        container.pack(fill=tk.BOTH, expand=True, padx=15, pady=15)
+        container.columnconfigure(0, weight=1)
+        container.rowconfigure(1, weight=1)
+        
+        # Title section
+        title_frame = ttk.Frame(container, style="Card.TFrame", padding=15)
+        title_frame.grid(row=0, column=0, sticky=(tk.W, tk.E), pady=(0, 10))
+        
+        ttk.Label(title_frame, text="📊 Plugin Statistics", 
+                 font=('Segoe UI', 14, 'bold'),
+                 foreground=self.colors['primary']).pack()
+        
+        ttk.Label(title_frame, text="Latency percentiles cover each plugin's last 1000 lines",
+                 font=('Segoe UI', 10),
+                 foreground=self.colors['text_dim']).pack(pady=(5, 0))
+        
+        # Statistics list
+        list_card = ttk.Frame(container, style="Card.TFrame", padding=15)
+        list_card.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), pady=(0, 10))
+        list_card.columnconfigure(0, weight=1)
+        list_card.rowconfigure(0, weight=1)
+        
+        columns = ('name', 'calls', 'filtered', 'errors', 'slow', 'mean', 'p50', 'p95', 'p99', 'max',
+                   'chars', 'last_error')
+        headings = ('Plugin', 'Calls', 'Filtered', 'Errors', 'Slow', 'Mean ms', 'p50 ms', 'p95 ms', 'p99 ms',
+                    'Max ms', 'Chars In → Out', 'Last Error')
+        stats_tree = ttk.Treeview(list_card, columns=columns, show='headings', height=10)
+        for column, heading in zip(columns, headings):
+            stats_tree.heading(column, text=heading)
+            stats_tree.column(column, width=70, anchor='center', stretch=False)
+        stats_tree.column('name', width=170, stretch=False)
+        stats_tree.column('chars', width=130, stretch=False)
+        stats_tree.column('last_error', width=220, anchor='w', stretch=True)
+        stats_tree.tag_configure('slow', foreground=self.colors['warning'])
+        stats_tree.tag_configure('error', foreground=self.colors['secondary'])
+        
+        scrollbar = ttk.Scrollbar(list_card, orient=tk.VERTICAL, command=stats_tree.yview)
+        stats_tree.configure(yscrollcommand=scrollbar.set)
+        stats_tree.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        
+        def refresh():
+            if not window.winfo_exists():
+                return
+            stats = dispatcher.get_stats()
+            order = [f for f in self.plugin_order if f in stats] + [f for f in stats if f not in self.plugin_order]
+            stats_tree.delete(*stats_tree.get_children())
+            for filename in order:
+                row = stats[filename]
+                tags = ('error',) if row['errors'] else ('slow',) if row['slow'] else ()
+                stats_tree.insert('', tk.END, text=filename, tags=tags, values=(
+                    row['name'],
+                    row['calls'],
+                    f"{row['filtered']} ({row['filter_rate']:.0%})",
+                    row['errors'],
+                    row['slow'],
+                    f"{row['mean_ms']:.2f}",
+                    f"{row['p50_ms']:.2f}",
+                    f"{row['p95_ms']:.2f}",
+                    f"{row['p99_ms']:.2f}",
+                    f"{row['max_ms']:.1f}",
+                    f"{row['chars_in']} → {row['chars_out']}",
+                    row['last_error'] or ''
+                ))
+            window.after(PLUGIN_STATS_REFRESH_MS, refresh)
+        
+        # Controls: slow threshold, reset and export
+        btn_card = ttk.Frame(container, style="Card.TFrame", padding=15)
+        btn_card.grid(row=2, column=0, sticky=(tk.W, tk.E))
+        
+        ttk.Label(btn_card, text="Slow plugin warning from (ms):").pack(side=tk.LEFT, padx=(0, 5))
+        threshold_var = tk.IntVar(value=int(dispatcher.slow_threshold_ms))
+        
+        def set_threshold(*args):
+            try:
+                value = int(threshold_var.get())
+            except (tk.TclError, ValueError):
+                return
+            if value > 0 and value != dispatcher.slow_threshold_ms:
+                dispatcher.slow_threshold_ms = value
+                self.save_plugins_config()
+        
+        ttk.Spinbox(btn_card, from_=10, to=10000, increment=10, width=7,
+                    textvariable=threshold_var, command=set_threshold).pack(side=tk.LEFT)
+        threshold_var.trace_add('write', set_threshold)
+        
+        def reset_stats():
+            dispatcher.reset_stats()
+            self.last_slow_plugin = None
+        
+        def export_stats():
+            filename = filedialog.asksaveasfilename(
+                parent=window,
+                defaultextension=".json",
+                filetypes=[("JSON files", "*.json"), ("CSV files", "*.csv")],
+                title="Export Plugin Statistics"
+            )
+            if not filename:
+                return
+            try:
+                dispatcher.export_stats(filename)
+            except Exception as e:
+                messagebox.showerror("Error", f"Failed to export statistics:\n{str(e)}", parent=window)
+        
+        ttk.Button(btn_card, text="💾 Export", command=export_stats,
+                  style="Secondary.TButton").pack(side=tk.RIGHT)
+        ttk.Button(btn_card, text="🔄 Reset", command=reset_stats,
+                  style="Secondary.TButton").pack(side=tk.RIGHT, padx=(0, 5))
+        
+        refresh()
+    
     def reload_plugins(self):
-        """Reload all plugins from the plugins folder"""
-        self.plugins.clear()
+        """Reload the plugins folder: new and changed plugins are loaded, unchanged ones kept"""
         self.discover_plugins()
         self.refresh_plugins_list()
         
@@ -2194,6 +2382,9 @@ class ModernTextractorGUI:
         action_frame = ttk.Frame(header_frame)
         action_frame.grid(row=0, column=1, sticky=tk.E)
         
+        ttk.Checkbutton(action_frame, text="⏺ Record Capture",
+                        variable=self.capture_enabled).pack(side=tk.LEFT, padx=(0, 10))
+        
         ttk.Button(action_frame, text="💾 Save to File", 
                   command=self.save_to_file,
                   style="Secondary.TButton").pack(side=tk.LEFT)
@@ -2272,144 +2463,90 @@ class ModernTextractorGUI:
         
         return False
     
-    def has_visible_window(self, pid):
-        """Check if process has a visible window (heuristic for user applications)"""
-        try:
-            def enum_windows_callback(hwnd, windows):
-                if win32gui.IsWindowVisible(hwnd):
-                    _, window_pid = win32process.GetWindowThreadProcessId(hwnd)
-                    if window_pid == pid:
-                        title = win32gui.GetWindowText(hwnd)
-                        # Only count windows with actual titles
-                        if title and len(title) > 0:
-                            windows.append((hwnd, title))
-                return True
-            
-            windows = []
-            win32gui.EnumWindows(enum_windows_callback, windows)
-            return len(windows) > 0
-        except:
-            # If we can't check, assume it might be valid
-            return True
+    def get_process_icon(self, exe_path):
+        """Icon of an executable if it is ready; otherwise it is rendered in the background (apply_icon_updates)"""
+        return self.icon_cache.get_photo(exe_path)
     
-    def get_process_icon(self, pid):
-        """Extract high-quality icon from process executable"""
-        if pid in self.process_icons:
-            return self.process_icons[pid]
-        
-        try:
-            proc = psutil.Process(pid)
-            exe_path = proc.exe()
-            
-            # Try to extract both large and small icons
-            large, small = win32gui.ExtractIconEx(exe_path, 0)
-            
-            # Prefer large icon for better quality, fall back to small if needed
-            icon_handle = large[0] if large else (small[0] if small else None)
-            
-            if icon_handle:
-                # Use larger icon size for better quality (32x32)
-                icon_size = 32
-                
-                hdc = win32ui.CreateDCFromHandle(win32gui.GetDC(0))
-                hbmp = win32ui.CreateBitmap()
-                hbmp.CreateCompatibleBitmap(hdc, icon_size, icon_size)
-                hdc = hdc.CreateCompatibleDC()
-                hdc.SelectObject(hbmp)
-                
-                # Draw icon with transparent background support
-                hdc.DrawIcon((0, 0), icon_handle)
-                
-                bmpstr = hbmp.GetBitmapBits(True)
-                img = Image.frombuffer('RGB', (icon_size, icon_size), bmpstr, 'raw', 'BGRX', 0, 1)
-                
-                # Resize with high-quality resampling to scaled size for better clarity
-                scaled_size = self.scale(24)
-                img = img.resize((scaled_size, scaled_size), Image.Resampling.LANCZOS)
-                
-                # Add subtle rounded corners for modern look
-                mask = Image.new('L', (scaled_size, scaled_size), 0)
-                draw = ImageDraw.Draw(mask)
-                draw.rounded_rectangle([(0, 0), (scaled_size-1, scaled_size-1)], radius=self.scale(3), fill=255)
-                img.putalpha(mask)
-                
-                photo = ImageTk.PhotoImage(img)
-                self.process_icons[pid] = photo
-                
-                # Clean up icon handles
-                if large:
-                    win32gui.DestroyIcon(large[0])
-                if small:
-                    win32gui.DestroyIcon(small[0])
-                
-                return photo
-        except Exception as e:
-            # Silently fail for processes without accessible icons
-            pass
-        
-        return None
+    def make_icon_photo(self, image):
+        """PhotoImage of a process icon thumbnail (UI thread)"""
+        # PIL is imported where it is used, to keep it off the startup path
+        from PIL import ImageTk
+        return ImageTk.PhotoImage(image)
     
     def get_process_architecture(self, pid):
         """Determine if a process is 32-bit or 64-bit"""
-        try:
-            if sys.platform == 'win32':
-                import ctypes
-                kernel32 = ctypes.windll.kernel32
-                handle = kernel32.OpenProcess(0x1000, False, pid)
-                if handle:
-                    is_wow64 = ctypes.c_bool()
-                    if kernel32.IsWow64Process(handle, ctypes.byref(is_wow64)):
-                        kernel32.CloseHandle(handle)
-                        return "x86" if is_wow64.value else "x64"
-                    kernel32.CloseHandle(handle)
-        except:
-            pass
-        return "x86"
+        return self.window_backend.architecture(pid)
     
     def refresh_processes(self):
-        """Refresh the list of running processes with advanced filtering"""
-        self.process_tree.delete(*self.process_tree.get_children())
-        self.all_processes = []
-        self.process_icons.clear()
+        """Rescan the running processes now; the list is updated on a following UI frame"""
+        self.process_scanner.refresh()
+    
+    def select_process_when_listed(self, pid, attempts=PROCESS_SELECT_ATTEMPTS):
+        """Select the row of pid once a scan has listed it (checked every PROCESS_SELECT_INTERVAL_MS)"""
+        search_term = self.get_process_search_term()
+        for entry, row_item in self.process_rows.values():
+            # Rows hidden by the search box cannot be selected
+            if entry.pid == pid and entry.matches(search_term):
+                self.process_tree.selection_set(row_item)
+                self.process_tree.see(row_item)
+                return
+        if attempts > 1:
+            self.root.after(PROCESS_SELECT_INTERVAL_MS, lambda: self.select_process_when_listed(pid, attempts - 1))
+    
+    def apply_process_updates(self):
+        """Apply the process list changes queued by the scanner"""
+        added, removed = self.process_scanner.drain()
         
-        for proc in psutil.process_iter(['pid', 'name', 'exe']):
-            try:
-                pid = proc.info['pid']
-                name = proc.info['name']
-                exe_path = proc.info.get('exe', '')
-                
-                # Skip very low PIDs (system processes)
-                if pid < 100:
-                    continue
-                
-                # Apply advanced filtering
-                if self.should_exclude_process(name, exe_path):
-                    continue
-                
-                # Additional heuristic: check if process has visible windows
-                # This helps filter out background services and daemons
-                if not self.has_visible_window(pid):
-                    continue
-                
-                arch = self.get_process_architecture(pid)
-                icon = self.get_process_icon(pid)
-                self.all_processes.append((pid, arch, name, icon))
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                continue
+        for key in removed:
+            row = self.process_rows.pop(key, None)
+            if row:
+                self.process_tree.delete(row[1])
+                self.process_icons.pop(key[0], None)
         
-        self.filter_processes()
+        if not added:
+            return
+        search_term = self.get_process_search_term()
+        for entry in added:
+            icon = self.get_process_icon(entry.exe)
+            if icon:
+                self.process_icons[entry.pid] = icon
+            row_item = self.process_tree.insert('', tk.END, text='', values=(entry.pid, entry.arch, entry.name),
+                                                image=icon if icon else '')
+            self.process_rows[entry.key] = (entry, row_item)
+            if not entry.matches(search_term):
+                self.process_tree.detach(row_item)
+    
+    def apply_icon_updates(self):
+        """Show the process icons the icon cache finished since the last frame"""
+        for exe_path, photo in self.icon_cache.drain():
+            if photo is None:
+                continue
+            for entry, row_item in self.process_rows.values():
+                if entry.exe == exe_path:
+                    self.process_icons[entry.pid] = photo
+                    self.process_tree.item(row_item, image=photo)
+    
+    def get_process_search_term(self):
+        """Lowercase text of the search box ("" for the placeholder)"""
+        search_term = self.search_var.get().lower()
+        if search_term == PROCESS_SEARCH_PLACEHOLDER.lower():
+            return ""
+        return search_term
+    
+    def schedule_process_filter(self):
+        """Filter the process list once typing pauses"""
+        if self.process_filter_after_id is not None:
+            self.root.after_cancel(self.process_filter_after_id)
+        self.process_filter_after_id = self.root.after(PROCESS_FILTER_DEBOUNCE_MS, self.filter_processes)
     
     def filter_processes(self):
         """Filter processes based on search term"""
-        self.process_tree.delete(*self.process_tree.get_children())
-        search_term = self.search_var.get().lower()
-        if search_term == "🔍 search processes...":
-            search_term = ""
+        self.process_filter_after_id = None
+        search_term = self.get_process_search_term()
         
-        for pid, arch, name, icon in self.all_processes:
-            if search_term in name.lower() or search_term in str(pid):
-                self.process_tree.insert('', tk.END, text='', values=(pid, arch, name), 
-                                        image=icon if icon else '')
+        # Rows are kept: the ones that do not match are only detached from the tree
+        self.process_tree.set_children('', *(row_item for entry, row_item in self.process_rows.values()
+                                              if entry.matches(search_term)))
     
     def attach_process(self):
         """Attach to the selected process"""
@@ -2472,7 +2609,10 @@ class ModernTextractorGUI:
             
             self.is_reading = True
             self.hooks.clear()
-            self.hook_tree.delete(*self.hook_tree.get_children())
+            self.ui_batcher.clear()
+            self.clear_hook_list()
+            
+            self.start_capture(name)
             
             threading.Thread(target=self.read_cli_output, daemon=True).start()
             
@@ -2676,138 +2816,78 @@ For more information, refer to the Textractor documentation.
     
     def read_textractor_output(self):
         """Read and parse Textractor CLI output"""
-        pattern = re.compile(r'^\[(\d+):([^:]+):([^:]+):([^:]+):([^:]+):([^:]+):([^\]]+)\] (.*)$')
-        console_pattern = re.compile(r'^\[Console\] (.+)$')
-        
-        while self.is_reading and self.cli_process:
-            try:
-                line = self.cli_process.stdout.readline()
-                if not line:
-                    break
-                
-                line = line.strip()
-                if not line:
-                    continue
-                
-                console_match = console_pattern.match(line)
-                if console_match:
-                    # Process console output in background thread
-                    text_to_process = f"[Console] {console_match.group(1)}\n"
-                    processed_text = self.process_text_through_plugins(text_to_process)
-                    if processed_text is not None:
-                        self.root.after(0, self.append_output, processed_text, False)
-                    continue
-                
-                match = pattern.match(line)
-                if match:
-                    hook_id = match.group(1)
-                    thread_name = match.group(6)
-                    text = match.group(8)
-                    
-                    if hook_id not in self.hooks:
-                        self.hooks[hook_id] = {
-                            'id': hook_id,
-                            'function': thread_name,
-                            'texts': []
-                        }
-                        self.root.after(0, self.add_hook_to_list, hook_id, thread_name)
-                    
-                    # Store text and update preview - even if text is empty string
-                    # Only store up to 3 texts for memory efficiency
-                    if len(self.hooks[hook_id]['texts']) < 3:
-                        self.hooks[hook_id]['texts'].append(text)
-                    
-                    # Always update the preview with the latest text (even if empty)
-                    # This ensures the preview updates from "Waiting for text..." to actual content
-                    self.root.after(0, self.update_hook_preview, hook_id, text)
-                    
-                    if self.selected_hook_id and hook_id == self.selected_hook_id:
-                        if text:
-                            # Process text through plugins in background thread
-                            processed_text = self.process_text_through_plugins(text + "\n")
-                            if processed_text is not None:
-                                self.root.after(0, self.append_output, processed_text, False)
-                    elif not self.selected_hook_id and not self.silent_auto_launch:
-                        # Only show hook preview if not in silent auto-launch mode
-                        # Process text through plugins in background thread
-                        processed_text = self.process_text_through_plugins(f"[Hook {hook_id}] {text}\n")
-                        if processed_text is not None:
-                            self.root.after(0, self.append_output, processed_text, False)
-                
-            except Exception:
-                break
+        self.ingestion.set_engine("textractor")
+        self.run_ingestion()
     
     def read_luna_output(self):
         """Read and parse Luna Hook CLI output"""
-        # Luna Hook CLI format: [#ID|context_info] text
-        pattern = re.compile(r'^\[#(\d+)\|([^\]]+)\] (.*)$')
-        console_pattern = re.compile(r'^\[Console\] (.+)$')
+        self.ingestion.set_engine("luna")
+        self.run_ingestion()
+    
+    def run_ingestion(self):
+        """Feed the CLI stdout to the ingestion engine until detached or EOF"""
+        ingestion = self.ingestion
+        ingestion.on_new_hook = self.ui_batcher.new_hook
+        ingestion.on_hook_text = self.ui_batcher.hook_text
+        ingestion.on_output = self.ui_batcher.output
+        
+        cli_process = self.cli_process
+        if not cli_process:
+            return
         
-        while self.is_reading and self.cli_process:
-            try:
-                line = self.cli_process.stdout.readline()
-                if not line:
-                    break
-                
-                line = line.strip()
-                if not line:
-                    continue
-                
-                # Check for console messages
-                console_match = console_pattern.match(line)
-                if console_match:
-                    text_to_process = f"[Console] {console_match.group(1)}\n"
-                    processed_text = self.process_text_through_plugins(text_to_process)
-                    if processed_text is not None:
-                        self.root.after(0, self.append_output, processed_text, False)
-                    continue
-                
-                # Check for hook output
-                match = pattern.match(line)
-                if match:
-                    hook_id = match.group(1)
-                    context_info = match.group(2)
-                    text = match.group(3)
-                    
-                    # Extract hook name from context (last part before .exe)
-                    context_parts = context_info.split(':')
-                    if len(context_parts) >= 2:
-                        # Try to find a meaningful name from the context
-                        thread_name = context_parts[-2] if len(context_parts) > 1 else context_parts[0]
-                    else:
-                        thread_name = "Unknown"
-                    
-                    if hook_id not in self.hooks:
-                        self.hooks[hook_id] = {
-                            'id': hook_id,
-                            'function': thread_name,
-                            'texts': []
-                        }
-                        self.root.after(0, self.add_hook_to_list, hook_id, thread_name)
-                    
-                    # Store text and update preview
-                    if len(self.hooks[hook_id]['texts']) < 3:
-                        self.hooks[hook_id]['texts'].append(text)
-                    
-                    self.root.after(0, self.update_hook_preview, hook_id, text)
-                    
-                    if self.selected_hook_id and hook_id == self.selected_hook_id:
-                        if text:
-                            processed_text = self.process_text_through_plugins(text + "\n")
-                            if processed_text is not None:
-                                self.root.after(0, self.append_output, processed_text, False)
-                    elif not self.selected_hook_id and not self.silent_auto_launch:
-                        # Only show hook preview if not in silent auto-launch mode
-                        processed_text = self.process_text_through_plugins(f"[Hook #{hook_id}] {text}\n")
-                        if processed_text is not None:
-                            self.root.after(0, self.append_output, processed_text, False)
-                
-            except Exception:
-                break
+        # The capture writer is only written and closed from this thread
+        capture_writer = self.capture_writer
+        stream = CaptureTee(cli_process.stdout, capture_writer) if capture_writer else cli_process.stdout
+        try:
+            ingestion.run(stream, lambda: self.is_reading and self.cli_process)
+        finally:
+            if capture_writer:
+                capture_writer.close()
+                if self.capture_writer is capture_writer:
+                    self.capture_writer = None
+    
+    def start_capture(self, process_name):
+        """Open a capture file for the CLI output if capture mode is enabled"""
+        self.capture_writer = None
+        if not self.capture_enabled.get():
+            return
+        
+        try:
+            stem = Path(process_name).stem
+            capture_path = self.captures_folder / f"{stem}_{time.strftime('%Y%m%d_%H%M%S')}{CAPTURE_EXTENSION}"
+            self.capture_writer = CaptureWriter(capture_path, engine=self.engine_var.get())
+            self.append_output(f"⏺ Recording capture to {capture_path.name}\n")
+        except Exception:
+            self.capture_writer = None
+    
+    def drain_ui_updates(self):
+        """Apply everything the reader thread queued since the last frame"""
+        try:
+            new_hooks, previews, outputs = self.ui_batcher.drain()
+            
+            for hook_id, function in new_hooks:
+                self.add_hook_to_list(hook_id, function)
+            
+            for hook_id, text in previews.items():
+                self.update_hook_preview(hook_id, text)
+            
+            if outputs:
+                self.append_output_batch(outputs)
+            
+            self.apply_process_updates()
+            self.apply_icon_updates()
+        except Exception:
+            pass
+        
+        self.root.after(UI_TICK_MS, self.drain_ui_updates)
     
     def add_hook_to_list(self, hook_id, function):
         """Add a hook to the hook list"""
-        self.hook_tree.insert('', tk.END, values=(hook_id, function, "Waiting for text..."))
+        if hook_id in self.hook_items:
+            return
+        
+        self.hook_items[hook_id] = self.hook_tree.insert('', tk.END, values=(hook_id, function, "Waiting for text..."))
+        self.hook_previews[hook_id] = "Waiting for text..."
         
         # Check if we should auto-select this hook (with longer delay to let all hooks populate)
         # Some games insert many hooks before the correct one appears
@@ -2831,21 +2911,31 @@ For more information, refer to the Textractor documentation.
             
             # Format the preview
             if preview_text:
-                # Limit preview to 80 characters to prevent window breaking
-                if len(preview_text) > 80:
-                    preview = preview_text[:80] + "..."
+                # Limit preview length to prevent window breaking
+                if len(preview_text) > MAX_PREVIEW_LENGTH:
+                    preview = preview_text[:MAX_PREVIEW_LENGTH] + "..."
                 else:
                     preview = preview_text
             else:
                 preview = "No text yet"
             
-            # Update the tree view - ensure hook_id comparison works correctly
-            for item in self.hook_tree.get_children():
-                item_values = self.hook_tree.item(item)['values']
-                # Convert both to strings for comparison to handle type mismatches
-                if str(item_values[0]) == str(hook_id):
-                    self.hook_tree.item(item, values=(item_values[0], item_values[1], preview))
-                    break
+            # Skip the Tk update entirely if the visible preview is unchanged
+            hook_id = str(hook_id)
+            if self.hook_previews.get(hook_id) == preview:
+                return
+            
+            item = self.hook_items.get(hook_id)
+            if item is None:
+                return
+            
+            self.hook_tree.set(item, 'preview', preview)
+            self.hook_previews[hook_id] = preview
+    
+    def clear_hook_list(self):
+        """Remove all hooks from the hook list and its lookup index"""
+        self.hook_tree.delete(*self.hook_tree.get_children())
+        self.hook_items.clear()
+        self.hook_previews.clear()
     
     def select_hook(self):
         """Select a hook to display its output"""
@@ -2904,6 +2994,24 @@ For more information, refer to the Textractor documentation.
             self.auto_copy_text(processed_text)
     
     
+    def append_output_batch(self, texts):
+        """Append already processed texts to the output area with a single insert"""
+        batch_text = "".join(texts)
+        
+        self.output_text.config(state='normal')
+        self.output_text.insert(tk.END, batch_text)
+        self.output_text.see(tk.END)
+        self.output_text.config(state='disabled')
+        
+        self.update_statistics(batch_text)
+        
+        # Only the last copyable line would survive on the clipboard anyway
+        if self.auto_copy_enabled.get():
+            for text in reversed(texts):
+                if text.strip() and not text.strip().startswith('[Console]'):
+                    self.auto_copy_text(text)
+                    break
+    
     def auto_copy_text(self, text):
         """Automatically copy new text to clipboard"""
         try:
@@ -2991,7 +3099,8 @@ For more information, refer to the Textractor documentation.
         self.attached_pid = None
         self.selected_hook_id = None
         self.hooks.clear()
-        self.hook_tree.delete(*self.hook_tree.get_children())
+        self.ui_batcher.clear()
+        self.clear_hook_list()
         
         # Reset all plugins state
         self.reset_all_plugins()
@@ -3022,7 +3131,14 @@ For more information, refer to the Textractor documentation.
         self.status_chars_label.pack(side=tk.LEFT, padx=(0, 15))
         
         self.status_rate_label = ttk.Label(status_frame, text="Rate: 0 c/s", style="Status.TLabel")
-        self.status_rate_label.pack(side=tk.LEFT)
+        self.status_rate_label.pack(side=tk.LEFT, padx=(0, 15))
+        
+        self.status_queue_label = ttk.Label(status_frame, text="Coalesced: 0 | Dropped: 0", style="Status.TLabel")
+        self.status_queue_label.pack(side=tk.LEFT)
+        
+        self.status_slow_label = ttk.Label(status_frame, text="", style="Status.TLabel",
+                                           foreground=self.colors['warning'])
+        self.status_slow_label.pack(side=tk.LEFT, padx=(15, 0))
     
     def update_status_bar(self):
         """Update status bar with current statistics"""
@@ -3042,6 +3158,19 @@ For more information, refer to the Textractor documentation.
                 rate = self.stats['chars'] / elapsed
                 self.status_rate_label.config(text=f"Rate: {rate:.1f} c/s")
         
+        queue_stats = self.ui_batcher.stats
+        self.status_queue_label.config(
+            text=f"Coalesced: {queue_stats['coalesced']} | Dropped: {queue_stats['dropped']}")
+        
+        # Warn about a plugin blocking the text pipeline (e.g. a translator waiting on the network)
+        slow = self.last_slow_plugin
+        if slow and time.time() - slow[2] < SLOW_PLUGIN_WARNING_SECONDS:
+            plugin = self.plugins.get(slow[0])
+            name = plugin.name if plugin else slow[0]
+            self.status_slow_label.config(text=f"⚠ Slow plugin: {name} ({slow[1] * 1000:.0f} ms)")
+        else:
+            self.status_slow_label.config(text="")
+        
         self.root.after(1000, self.update_status_bar)
     
     def update_statistics(self, text):
@@ -3064,6 +3193,7 @@ For more information, refer to the Textractor documentation.
         
         try:
             def create_tray_icon():
+                from PIL import Image, ImageDraw
                 # Try to use logo.webp first, fallback to generated icon
                 try:
                     if self.logo_path.exists():
@@ -3107,7 +3237,8 @@ For more information, refer to the Textractor documentation.
             
             def refresh_processes_from_tray(icon, item):
                 """Refresh process list from system tray"""
-                self.refresh_processes()
+                # Runs on the tray thread: the list is updated on the next UI frame
+                self.process_scanner.refresh()
             
             def clear_output_from_tray(icon, item):
                 """Clear output from system tray"""
@@ -3188,6 +3319,8 @@ For more information, refer to the Textractor documentation.
         """Completely quit the application"""
         # Save configuration on exit
         self.save_plugins_config()
+        self.process_scanner.stop()
+        self.icon_cache.close()
         
         if self.cli_process:
             self.detach_process()
@@ -3247,6 +3380,8 @@ For more information, refer to the Textractor documentation.
         """Handle window closing"""
         # Save configuration on close
         self.save_plugins_config()
+        self.process_scanner.stop()
+        self.icon_cache.close()
         
         if self.cli_process:
             self.detach_process()
@@ -1,15 +1,21 @@
 from deep_translator import GoogleTranslator                       
 import json
 import plugins
+from translation_cache import get_shared_cache
+from single_flight import get_shared_flights
 
-# Load user settings
-with open("../../../../User-Settings.json", "r", encoding='utf-8') as file:
-    user_settings = json.load(file)
+USER_SETTINGS_PATH = "../../../../User-Settings.json"
 
-translator_settings = user_settings["Translation_API_Server"]["Google"]
+def load_translator_settings(path=USER_SETTINGS_PATH):
+    # Google section of the toolkit's user settings
+    with open(path, "r", encoding='utf-8') as file:
+        user_settings = json.load(file)
+    return user_settings["Translation_API_Server"]["Google"]
 
 class Main_Translator:
-    def __init__(self):
+    def __init__(self, translator_settings=None):
+        if translator_settings is None:
+            translator_settings = load_translator_settings()
         self.translator_ready_or_not = False
         self.can_change_language_or_not = True
         self.supported_languages_list = translator_settings["supported_languages_list"]
@@ -17,6 +23,11 @@ class Main_Translator:
         self.output_language = self.supported_languages_list[ translator_settings["output_language"] ]
         self.translator = ""
         self.stop_translation = False
+        self.cache = get_shared_cache()
+        # Concurrent requests for the same line share one upstream call (None: every request is sent)
+        self.flights = get_shared_flights()
+        # Optional mirror (or local stub) of the Google Translate page
+        self.base_url = translator_settings.get("base_url")
 
     def pause(self):
         self.stop_translation = True
@@ -26,6 +37,8 @@ class Main_Translator:
 
     def activate(self):
         self.translator = GoogleTranslator(source=self.input_language, target=self.output_language)
+        if self.base_url:
+            self.translator._base_url = self.base_url
         self.translator_ready_or_not = True
         return self.translator_ready_or_not
     
@@ -35,20 +48,92 @@ class Main_Translator:
         if (self.stop_translation == True):
             return "Translation is paused at the moment"
         else:
-            translation_text = self.translator.translate(input_text)  
+            translation_text = self.cached_translate(input_text)
             translation_text = plugins.process_output_text(translation_text)
             return translation_text
+
+    async def atranslate(self, input_text):
+        # asyncio version of translate (translation_server): the request does not block the event loop
+        input_text = plugins.process_input_text(input_text)
+
+        if (self.stop_translation == True):
+            return "Translation is paused at the moment"
+        else:
+            translation_text = await self.acached_translate(input_text)
+            translation_text = plugins.process_output_text(translation_text)
+            return translation_text
+
+    async def acached_translate(self, input_text):
+        source, target = self.translator._source, self.translator._target
+        if self.cache is not None:
+            translation_text = self.cache.get("google", source, target, input_text)
+            if translation_text is not None:
+                return translation_text
+
+        if self.flights is None:
+            return await self.aupstream_translate(input_text, source, target)
+        key = self.flights.key("google", source, target, input_text)
+        return await self.flights.ado(key, lambda: self.aupstream_translate(input_text, source, target))
+
+    async def aupstream_translate(self, input_text, source, target):
+        translation_text = await self.translator.atranslate(input_text)
+        if self.cache is not None:
+            self.cache.put("google", source, target, input_text, translation_text)
+        return translation_text
+
+    def cached_translate(self, input_text):
+        source, target = self.translator._source, self.translator._target
+        if self.cache is not None:
+            translation_text = self.cache.get("google", source, target, input_text)
+            if translation_text is not None:
+                return translation_text
+
+        if self.flights is None:
+            return self.upstream_translate(input_text, source, target)
+        key = self.flights.key("google", source, target, input_text)
+        return self.flights.do(key, lambda: self.upstream_translate(input_text, source, target))
+
+    def upstream_translate(self, input_text, source, target):
+        translation_text = self.translator.translate(input_text)
+        if self.cache is not None:
+            self.cache.put("google", source, target, input_text, translation_text)
+        return translation_text
+
+    def cached_translate_batch(self, input_texts):
+        # Only lines that are not cached are sent, each distinct line once,
+        # through the engine's batch API (one request per chunk, or concurrent requests)
+        source, target = self.translator._source, self.translator._target
+        if self.cache is None:
+            translation_list = [None] * len(input_texts)
+        else:
+            translation_list = [self.cache.get("google", source, target, input_text) for input_text in input_texts]
+
+        missing = list(dict.fromkeys(input_text for input_text, translation_text
+                                     in zip(input_texts, translation_list) if translation_text is None))
+        if missing:
+            translated = dict(zip(missing, self.translator.translate_batch(missing)))
+            if self.cache is not None:
+                for input_text, translation_text in translated.items():
+                    self.cache.put("google", source, target, input_text, translation_text)
+            translation_list = [translated[input_text] if translation_text is None else translation_text
+                                for input_text, translation_text in zip(input_texts, translation_list)]
+        return translation_list
     
     def translate_batch(self, list_of_text_input):
         if (self.stop_translation == True):
             return "Translation is paused at the moment"
         else:
-            translation_list = []
-            for text_input in list_of_text_input:
-                translation = self.translate(text_input)
-                translation_list.append(translation)
-            return translation_list
+            if not list_of_text_input:
+                return []
+            input_texts = [plugins.process_input_text(text_input) for text_input in list_of_text_input]
+            translation_list = self.cached_translate_batch(input_texts)
+            return [plugins.process_output_text(translation_text) for translation_text in translation_list]
     
+    def change_game(self, game_id):
+        # Game specific rules of text_rules.json are added for this game
+        plugins.set_game(game_id)
+        return f"game changed to {game_id}" if game_id else "game rules cleared"
+
     def check_if_language_available(self, language):
         if (self.supported_languages_list.get(language) == None):
             return False
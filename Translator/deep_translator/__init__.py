@@ -2,25 +2,34 @@
 
 __copyright__ = "Copyright (C) 2020 Nidhal Baccouri"
 
-from deep_translator.baidu import BaiduTranslator
-from deep_translator.chatgpt import ChatGptTranslator
-from deep_translator.deepl import DeeplTranslator
-from deep_translator.detection import batch_detection, single_detection
-from deep_translator.google import GoogleTranslator
-from deep_translator.libre import LibreTranslator
-from deep_translator.linguee import LingueeTranslator
-from deep_translator.microsoft import MicrosoftTranslator
-from deep_translator.mymemory import MyMemoryTranslator
-from deep_translator.papago import PapagoTranslator
-from deep_translator.pons import PonsTranslator
-from deep_translator.qcri import QcriTranslator
-from deep_translator.tencent import TencentTranslator
-from deep_translator.yandex import YandexTranslator
+import importlib
 
 __author__ = """Nidhal Baccouri"""
 __email__ = "nidhalbacc@gmail.com"
 __version__ = "1.9.1"
 
+# public name -> module defining it. The modules (and requests, bs4 and the
+# other dependencies they import) are loaded on first access, so importing
+# the package, or using one engine, does not load every engine.
+_LAZY = {
+    "BaiduTranslator": "baidu",
+    "ChatGptTranslator": "chatgpt",
+    "CompositeTranslator": "composite",
+    "DeeplTranslator": "deepl",
+    "GoogleTranslator": "google",
+    "LibreTranslator": "libre",
+    "LingueeTranslator": "linguee",
+    "MicrosoftTranslator": "microsoft",
+    "MyMemoryTranslator": "mymemory",
+    "PapagoTranslator": "papago",
+    "PonsTranslator": "pons",
+    "QcriTranslator": "qcri",
+    "TencentTranslator": "tencent",
+    "YandexTranslator": "yandex",
+    "batch_detection": "detection",
+    "single_detection": "detection",
+}
+
 __all__ = [
     "GoogleTranslator",
     "PonsTranslator",
@@ -35,6 +44,21 @@ __all__ = [
     "ChatGptTranslator",
     "TencentTranslator",
     "BaiduTranslator",
+    "CompositeTranslator",
     "single_detection",
     "batch_detection",
 ]
+
+
+def __getattr__(name: str):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{module}"), name)
+    # later lookups find it directly
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
@@ -0,0 +1,458 @@
+"""
+asyncio HTTP client used by the atranslate methods of the translators.
+
+Requests are sent on keep-alive connections pooled per host, with the same
+retry policy and timeouts as the requests session of session_pool, and are
+cancellable: cancelling a request closes its connection instead of waiting
+for the answer. Only what the translators need is supported (GET/POST,
+query params, form/JSON bodies, chunked and gzip responses, redirects, no
+proxies).
+
+Synchronous code (the GUI, plugins) can run coroutines on one shared event
+loop with submit(), which returns a concurrent.futures.Future whose cancel()
+cancels the request.
+"""
+
+__copyright__ = "Copyright (C) 2020 Nidhal Baccouri"
+
+import asyncio
+import json as jsonlib
+import ssl
+import threading
+import weakref
+import zlib
+from concurrent.futures import Future
+from typing import Coroutine, Dict, Optional, Tuple
+from urllib.parse import urlencode, urljoin, urlsplit
+
+import requests
+
+from deep_translator import session_pool
+
+REDIRECT_STATUS_CODES = (301, 302, 303, 307, 308)
+MAX_REDIRECTS = 10
+
+_loop = None
+_loop_lock = threading.Lock()
+_sessions = weakref.WeakKeyDictionary()  # event loop -> AsyncSession
+
+
+class AsyncResponse:
+    """
+    the subset of requests.Response used by the translators
+    """
+
+    def __init__(
+        self,
+        url: str,
+        status_code: int,
+        reason: str,
+        headers: Dict[str, str],
+        content: bytes,
+    ):
+        self.url = url
+        self.status_code = status_code
+        self.reason = reason
+        self.headers = headers
+        self.content = content
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    @property
+    def encoding(self) -> Optional[str]:
+        content_type = self.headers.get("content-type", "")
+        for param in content_type.split(";")[1:]:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "charset":
+                return value.strip().strip("\"'")
+        return None
+
+    @property
+    def text(self) -> str:
+        encoding = self.encoding or "utf-8"
+        try:
+            return self.content.decode(encoding, errors="replace")
+        except LookupError:
+            return self.content.decode("utf-8", errors="replace")
+
+    def json(self, **kwargs):
+        return jsonlib.loads(self.text, **kwargs)
+
+    def close(self):
+        pass
+
+
+class _ClosedConnection(Exception):
+    """
+    the server closed the connection before answering
+    """
+
+
+def _split_timeout(
+    timeout: session_pool.Timeout,
+) -> Tuple[Optional[float], Optional[float]]:
+    if isinstance(timeout, (tuple, list)):
+        return timeout[0], timeout[1]
+    return timeout, timeout
+
+
+def _build_url(url: str, params) -> str:
+    if not params:
+        return url
+    query = urlencode(params, doseq=True)
+    return url + ("&" if urlsplit(url).query else "?") + query
+
+
+def _encode_body(data, json) -> Tuple[Optional[bytes], Optional[str]]:
+    if json is not None:
+        return jsonlib.dumps(json).encode("utf-8"), "application/json"
+    if data is None:
+        return None, None
+    if isinstance(data, bytes):
+        return data, None
+    if isinstance(data, str):
+        return data.encode("utf-8"), None
+    return (
+        urlencode(data, doseq=True).encode("utf-8"),
+        "application/x-www-form-urlencoded",
+    )
+
+
+def _decode_content(content: bytes, encoding: str) -> bytes:
+    encoding = encoding.lower()
+    if encoding == "gzip":
+        return zlib.decompress(content, 16 + zlib.MAX_WBITS)
+    if encoding == "deflate":
+        try:
+            return zlib.decompress(content)
+        except zlib.error:
+            return zlib.decompress(content, -zlib.MAX_WBITS)
+    return content
+
+
+async def _read_response(
+    reader: asyncio.StreamReader, method: str, url: str
+) -> Tuple[AsyncResponse, bool]:
+    """
+    read one response from a connection
+    @return: the response, and whether the connection can be reused
+    """
+    while True:
+        status_line = await reader.readline()
+        if not status_line:
+            raise _ClosedConnection()
+        version, status, reason = (
+            status_line.decode("latin-1").rstrip("\r\n").split(" ", 2) + [""]
+        )[:3]
+        status_code = int(status)
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        # interim responses (100 Continue) are followed by the real one
+        if not 100 <= status_code < 200:
+            break
+
+    connection = headers.get("connection", "").lower()
+    keep_alive = (
+        connection == "keep-alive"
+        if version == "HTTP/1.0"
+        else connection != "close"
+    )
+    if method == "HEAD" or status_code in (204, 304):
+        content = b""
+    elif "chunked" in headers.get("transfer-encoding", "").lower():
+        chunks = []
+        while True:
+            size_line = await reader.readline()
+            size = int(size_line.split(b";")[0].strip() or b"0", 16)
+            if size == 0:
+                # trailers end with an empty line
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+                break
+            chunks.append(await reader.readexactly(size))
+            await reader.readexactly(2)
+        content = b"".join(chunks)
+    elif "content-length" in headers:
+        content = await reader.readexactly(int(headers["content-length"]))
+    else:
+        # the body ends when the server closes the connection
+        content = await reader.read()
+        keep_alive = False
+
+    if headers.get("content-encoding"):
+        content = _decode_content(content, headers["content-encoding"])
+    return AsyncResponse(url, status_code, reason, headers, content), keep_alive
+
+
+class AsyncSession:
+    """
+    asyncio counterpart of the session_pool session: keep-alive connections
+    pooled per host (at most pool_maxsize open per host), retries of failed
+    connections and 5xx responses, redirects. A session belongs to the event
+    loop it is used on.
+    """
+
+    def __init__(
+        self,
+        retries: Optional[int] = None,
+        backoff_factor: Optional[float] = None,
+        pool_maxsize: Optional[int] = None,
+    ):
+        """
+        @param retries: retries of failed connections, reads and 5xx responses
+        @param backoff_factor: base of the exponential sleep between retries
+        @param pool_maxsize: connections kept per host
+        (arguments left as None follow session_pool.configure)
+        """
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.pool_maxsize = pool_maxsize
+        self.headers = {
+            "User-Agent": requests.utils.default_user_agent(),
+            "Accept-Encoding": "gzip, deflate",
+            "Accept": "*/*",
+            "Connection": "keep-alive",
+        }
+        self._idle = {}  # (scheme, host, port) -> idle (reader, writer) pairs
+        self._limits = {}  # (scheme, host, port) -> asyncio.Semaphore
+        self._ssl_context = None
+
+    def _setting(self, name: str):
+        value = getattr(self, name)
+        if value is None:
+            value = session_pool.get_settings()[name]
+        return value
+
+    async def get(self, url: str, **kwargs) -> AsyncResponse:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> AsyncResponse:
+        return await self.request("POST", url, **kwargs)
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        params=None,
+        data=None,
+        json=None,
+        headers: Optional[dict] = None,
+        timeout: session_pool.Timeout = None,
+    ) -> AsyncResponse:
+        """
+        send a request, following redirects
+        @param method: "GET" or "POST"
+        @param url: request url
+        @param params: query parameters (dict or list of pairs)
+        @param data: form body (dict or list of pairs) or raw body
+        @param json: JSON body
+        @param headers: extra headers
+        @param timeout: (connect, read) timeout in seconds, or one number for both
+        @return: AsyncResponse
+        """
+        url = _build_url(url, params)
+        body, content_type = _encode_body(data, json)
+        request_headers = dict(self.headers)
+        if content_type:
+            request_headers["Content-Type"] = content_type
+        if headers:
+            request_headers.update(headers)
+
+        for _ in range(MAX_REDIRECTS + 1):
+            response = await self._send_with_retries(
+                method, url, body, request_headers, timeout
+            )
+            location = response.headers.get("location")
+            if response.status_code not in REDIRECT_STATUS_CODES or not location:
+                return response
+            url = urljoin(url, location)
+            if response.status_code == 303 or (
+                response.status_code in (301, 302) and method == "POST"
+            ):
+                method, body = "GET", None
+                request_headers.pop("Content-Type", None)
+        raise requests.exceptions.TooManyRedirects(
+            f"Exceeded {MAX_REDIRECTS} redirects."
+        )
+
+    async def _send_with_retries(
+        self,
+        method: str,
+        url: str,
+        body: Optional[bytes],
+        headers: dict,
+        timeout: session_pool.Timeout,
+    ) -> AsyncResponse:
+        retries = self._setting("retries")
+        backoff_factor = self._setting("backoff_factor")
+        for attempt in range(retries + 1):
+            try:
+                response = await self._send(method, url, body, headers, timeout)
+            except requests.exceptions.RequestException:
+                if attempt >= retries:
+                    raise
+                await asyncio.sleep(backoff_factor * 2**attempt)
+                continue
+            if (
+                response.status_code not in session_pool.RETRY_STATUS_CODES
+                or attempt >= retries
+            ):
+                return response
+            delay = backoff_factor * 2**attempt
+            retry_after = response.headers.get("retry-after", "")
+            if retry_after.isdigit():
+                delay = max(delay, int(retry_after))
+            await asyncio.sleep(delay)
+        return response
+
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        body: Optional[bytes],
+        headers: dict,
+        timeout: session_pool.Timeout,
+    ) -> AsyncResponse:
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        host = parts.hostname
+        port = parts.port or (443 if scheme == "https" else 80)
+        key = (scheme, host, port)
+
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        host_header = f"[{host}]" if ":" in host else host
+        if parts.port:
+            host_header += f":{parts.port}"
+        lines = [f"{method} {path} HTTP/1.1", f"Host: {host_header}"]
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        if body is not None or method == "POST":
+            lines.append(f"Content-Length: {len(body or b'')}")
+        request = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+        if body:
+            request += body
+
+        connect_timeout, read_timeout = _split_timeout(timeout)
+        limit = self._limits.get(key)
+        if limit is None:
+            limit = self._limits[key] = asyncio.Semaphore(
+                self._setting("pool_maxsize")
+            )
+        async with limit:
+            while True:
+                reader, writer, reused = await self._acquire(key, connect_timeout)
+                try:
+                    writer.write(request)
+                    response, keep_alive = await asyncio.wait_for(
+                        _read_response(reader, method, url), read_timeout
+                    )
+                except asyncio.TimeoutError:
+                    writer.close()
+                    raise requests.exceptions.ReadTimeout(
+                        f"Read timed out. (read timeout={read_timeout})"
+                    )
+                except (OSError, _ClosedConnection, asyncio.IncompleteReadError) as e:
+                    writer.close()
+                    if reused:
+                        # the server closed the idle connection, use a new one
+                        continue
+                    raise requests.exceptions.ConnectionError(e)
+                except BaseException:
+                    # cancelled: the answer is not read, so the connection cannot be reused
+                    writer.close()
+                    raise
+                if keep_alive:
+                    self._idle.setdefault(key, []).append((reader, writer))
+                else:
+                    writer.close()
+                return response
+
+    async def _acquire(self, key: tuple, connect_timeout: Optional[float]):
+        """
+        @return: reader, writer and whether the connection was reused
+        """
+        idle = self._idle.get(key)
+        while idle:
+            reader, writer = idle.pop()
+            if reader.at_eof() or writer.is_closing():
+                writer.close()
+                continue
+            return reader, writer, True
+
+        scheme, host, port = key
+        ssl_context = None
+        if scheme == "https":
+            if self._ssl_context is None:
+                self._ssl_context = ssl.create_default_context()
+            ssl_context = self._ssl_context
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(
+                    host,
+                    port,
+                    ssl=ssl_context,
+                    server_hostname=host if ssl_context else None,
+                ),
+                connect_timeout,
+            )
+        except asyncio.TimeoutError:
+            raise requests.exceptions.ConnectTimeout(
+                f"Connection to {host} timed out. (connect timeout={connect_timeout})"
+            )
+        except OSError as e:
+            raise requests.exceptions.ConnectionError(e)
+        return reader, writer, False
+
+    def close(self):
+        """
+        close the idle connections
+        """
+        idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for _, writer in connections:
+                writer.close()
+
+
+def get_session() -> AsyncSession:
+    """
+    return the session of the running event loop, creating it on first use
+    @return: AsyncSession
+    """
+    loop = asyncio.get_running_loop()
+    session = _sessions.get(loop)
+    if session is None:
+        session = _sessions[loop] = AsyncSession()
+    return session
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """
+    return the shared event loop, started on a daemon thread on first use
+    @return: asyncio event loop
+    """
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=loop.run_forever, name="deep-translator-loop", daemon=True
+            ).start()
+            _loop = loop
+        return _loop
+
+
+def submit(coroutine: Coroutine) -> Future:
+    """
+    run a coroutine on the shared event loop, from any thread
+    @param coroutine: e.g. translator.atranslate(text)
+    @return: concurrent.futures.Future; cancel() cancels the coroutine
+    """
+    return asyncio.run_coroutine_threadsafe(coroutine, get_loop())
@@ -9,8 +9,6 @@ import os
 import random
 from typing import List, Optional
 
-import requests
-
 from deep_translator.base import BaseTranslator
 from deep_translator.constants import (
     BAIDU_APPID_ENV_VAR,
@@ -90,7 +88,7 @@ class BaiduTranslator(BaseTranslator):
 
             # Do the request and check the connection.
             try:
-                response = requests.post(
+                response = self._http_post(
                     self._base_url, params=payload, headers=headers
                 )
             except ConnectionError:
@@ -2,10 +2,16 @@
 
 __copyright__ = "Copyright (C) 2020 Nidhal Baccouri"
 
+import asyncio
+import functools
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional, Union
+from typing import Callable, Iterator, List, Optional, Union
 
+import requests
+
+from deep_translator import async_http, rate_limit, session_pool
 from deep_translator.constants import GOOGLE_LANGUAGES_TO_CODES
 from deep_translator.exceptions import (
     InvalidSourceOrTargetLanguage,
@@ -18,6 +24,15 @@ class BaseTranslator(ABC):
     Abstract class that serve as a base translator for other different translators
     """
 
+    # engines whose API accepts a list of texts override _translate_chunk and
+    # set these limits; translate_batch then sends one request per chunk
+    batch_max_items = 1
+    batch_max_chars = 5000
+    # concurrent requests used by translate_batch
+    batch_workers = 4
+    # concurrent requests used by atranslate_batch
+    batch_async_limit = 16
+
     def __init__(
         self,
         base_url: str = None,
@@ -27,11 +42,17 @@ class BaseTranslator(ABC):
         payload_key: Optional[str] = None,
         element_tag: Optional[str] = None,
         element_query: Optional[dict] = None,
+        session: Optional[requests.Session] = None,
+        timeout: session_pool.Timeout = None,
         **url_params,
     ):
         """
         @param source: source language to translate from
         @param target: target language to translate to
+        @param session: session to send requests with (default: the shared,
+        keep-alive session of session_pool)
+        @param timeout: request timeout in seconds, or (connect, read)
+        (default: session_pool.get_timeout())
         """
         self._base_url = base_url
         self._languages = languages
@@ -46,8 +67,110 @@ class BaseTranslator(ABC):
         self._element_tag = element_tag
         self._element_query = element_query
         self.payload_key = payload_key
+        self._session = session
+        self._timeout = timeout
         super().__init__()
 
+    # engines may send requests before calling BaseTranslator.__init__
+    # (e.g. to fetch their languages), hence the getattr defaults
+
+    @property
+    def session(self) -> requests.Session:
+        return getattr(self, "_session", None) or session_pool.get_session()
+
+    @property
+    def timeout(self) -> session_pool.Timeout:
+        timeout = getattr(self, "_timeout", None)
+        if timeout is None:
+            return session_pool.get_timeout()
+        return timeout
+
+    @timeout.setter
+    def timeout(self, value: session_pool.Timeout):
+        self._timeout = value
+
+    @property
+    def rate_limiter(self) -> rate_limit.RateLimiter:
+        """
+        the request budget and 429 retries shared by every instance of this engine
+        """
+        return rate_limit.get_limiter(self._type())
+
+    def _http_request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        send a request through the pooled session, within the engine's rate
+        limit; 429 answers are retried while rate_limiter allows it
+        @param method: "GET" or "POST"
+        @param url: request url
+        @param kwargs: requests arguments (timeout defaults to self.timeout)
+        @return: requests.Response
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        limiter = self.rate_limiter
+        chars = rate_limit.payload_chars(kwargs)
+        attempt = 0
+        while True:
+            limiter.acquire(chars)
+            response = self.session.request(method, url, **kwargs)
+            if not limiter.should_retry(response, attempt):
+                return response
+            response.close()
+            attempt += 1
+
+    def _http_get(self, url: str, **kwargs) -> requests.Response:
+        """
+        send a GET request through the pooled session
+        @param url: request url
+        @param kwargs: requests arguments (timeout defaults to self.timeout)
+        @return: requests.Response
+        """
+        return self._http_request("GET", url, **kwargs)
+
+    def _http_post(self, url: str, **kwargs) -> requests.Response:
+        """
+        send a POST request through the pooled session
+        @param url: request url
+        @param kwargs: requests arguments (timeout defaults to self.timeout)
+        @return: requests.Response
+        """
+        return self._http_request("POST", url, **kwargs)
+
+    async def _ahttp_request(
+        self, method: str, url: str, **kwargs
+    ) -> Union[async_http.AsyncResponse, requests.Response]:
+        """
+        send a request through the asyncio session of the running event loop,
+        within the engine's rate limit like _http_request.
+        Proxies and custom requests sessions are not supported by the asyncio
+        client, so such requests are sent with requests on a worker thread.
+        @param method: "GET" or "POST"
+        @param url: request url
+        @param kwargs: requests arguments (timeout defaults to self.timeout)
+        @return: a response with status_code, text and json()
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        if kwargs.get("proxies") or getattr(self, "_session", None) is not None:
+            return await asyncio.get_running_loop().run_in_executor(
+                None, functools.partial(self._http_request, method, url, **kwargs)
+            )
+        kwargs.pop("proxies", None)
+        limiter = self.rate_limiter
+        chars = rate_limit.payload_chars(kwargs)
+        attempt = 0
+        while True:
+            await limiter.aacquire(chars)
+            response = await async_http.get_session().request(method, url, **kwargs)
+            if not limiter.should_retry(response, attempt):
+                return response
+            response.close()
+            attempt += 1
+
+    async def _ahttp_get(self, url: str, **kwargs):
+        return await self._ahttp_request("GET", url, **kwargs)
+
+    async def _ahttp_post(self, url: str, **kwargs):
+        return await self._ahttp_request("POST", url, **kwargs)
+
     @property
     def source(self):
         return self._source
@@ -128,6 +251,18 @@ class BaseTranslator(ABC):
         """
         return NotImplemented("You need to implement the translate method!")
 
+    async def atranslate(self, text: str, **kwargs) -> str:
+        """
+        asyncio counterpart of translate. Engines without an asyncio
+        implementation run translate on a worker thread; cancelling then
+        only discards the translation.
+        @param text: text to translate
+        @return: str
+        """
+        return await asyncio.get_running_loop().run_in_executor(
+            None, functools.partial(self.translate, text, **kwargs)
+        )
+
     def _read_docx(self, f: str):
         import docx2txt
 
@@ -176,8 +311,131 @@ class BaseTranslator(ABC):
         """
         if not batch:
             raise Exception("Enter your text list that you want to translate")
-        arr = []
-        for i, text in enumerate(batch):
-            translated = self.translate(text, **kwargs)
-            arr.append(translated)
+
+        if self.batch_max_items <= 1:
+            # one request per text, sent concurrently
+            return self._map_concurrently(
+                lambda text: self.translate(text, **kwargs), batch
+            )
+
+        # one request per chunk; empty texts are returned as they are
+        arr = list(batch)
+        indexes = [
+            i
+            for i, text in enumerate(batch)
+            if isinstance(text, str) and text.strip()
+        ]
+        if not indexes or self._same_source_target():
+            return arr
+        chunks = list(self._chunk_batch([batch[i] for i in indexes]))
+        results = self._map_concurrently(
+            lambda chunk: self._translate_chunk(chunk, **kwargs), chunks
+        )
+        translations = [text for chunk in results for text in chunk]
+        for i, translated in zip(indexes, translations):
+            arr[i] = translated
         return arr
+
+    def _chunk_batch(self, batch: List[str]) -> Iterator[List[str]]:
+        """
+        split a batch into consecutive chunks within the engine's item and
+        character limits (a text longer than the character limit is sent alone)
+        @param batch: list of texts
+        @return: chunks of texts, in order
+        """
+        chunk = []
+        chars = 0
+        for text in batch:
+            if chunk and (
+                len(chunk) >= self.batch_max_items
+                or chars + len(text) > self.batch_max_chars
+            ):
+                yield chunk
+                chunk = []
+                chars = 0
+            chunk.append(text)
+            chars += len(text)
+        if chunk:
+            yield chunk
+
+    def _translate_chunk(self, chunk: List[str], **kwargs) -> List[str]:
+        """
+        translate a chunk of texts with a single request; engines whose API
+        accepts a list override this
+        @param chunk: list of non-empty texts
+        @return: list of translations, in the same order
+        """
+        return [self.translate(text, **kwargs) for text in chunk]
+
+    def _map_concurrently(self, function: Callable, items: list) -> list:
+        """
+        apply function to every item on up to batch_workers threads
+        @return: results in the order of items
+        """
+        workers = min(self.batch_workers, len(items))
+        if workers <= 1:
+            return [function(item) for item in items]
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(function, items))
+
+    async def atranslate_batch(self, batch: List[str], **kwargs) -> List[str]:
+        """
+        asyncio counterpart of translate_batch: up to batch_async_limit
+        requests at a time; cancelling it cancels the requests in flight
+        @param batch: list of texts you want to translate
+        @return: list of translations, in order
+        """
+        if not batch:
+            raise Exception("Enter your text list that you want to translate")
+
+        if self.batch_max_items <= 1:
+            return await self._amap_concurrently(
+                lambda text: self.atranslate(text, **kwargs), batch
+            )
+
+        arr = list(batch)
+        indexes = [
+            i
+            for i, text in enumerate(batch)
+            if isinstance(text, str) and text.strip()
+        ]
+        if not indexes or self._same_source_target():
+            return arr
+        chunks = list(self._chunk_batch([batch[i] for i in indexes]))
+        results = await self._amap_concurrently(
+            lambda chunk: self._atranslate_chunk(chunk, **kwargs), chunks
+        )
+        translations = [text for chunk in results for text in chunk]
+        for i, translated in zip(indexes, translations):
+            arr[i] = translated
+        return arr
+
+    async def _atranslate_chunk(self, chunk: List[str], **kwargs) -> List[str]:
+        """
+        asyncio counterpart of _translate_chunk
+        @param chunk: list of non-empty texts
+        @return: list of translations, in the same order
+        """
+        return await self._amap_concurrently(
+            lambda text: self.atranslate(text, **kwargs), chunk
+        )
+
+    async def _amap_concurrently(self, function: Callable, items: list) -> list:
+        """
+        await function(item) for every item, at most batch_async_limit at a
+        time; if one fails or the caller is cancelled, the others are cancelled
+        @return: results in the order of items
+        """
+        limit = asyncio.Semaphore(self.batch_async_limit)
+
+        async def run(item):
+            async with limit:
+                return await function(item)
+
+        tasks = [asyncio.ensure_future(run(item)) for item in items]
+        try:
+            return await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
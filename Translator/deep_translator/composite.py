@@ -0,0 +1,432 @@
+"""
+composite translator: several engines behind one translate(), to keep lines
+translated when an engine is slow, throttled or down.
+
+- failover: the engines are tried one after the other, in priority order
+- race: the first race_width engines are asked at once, the first answer wins
+  and the other requests are cancelled
+- hedge: the first engine is asked; if it has not answered after hedge_after
+  seconds (or fails), the next one is asked too, and so on
+
+In every mode an engine that fails hands over to the next one, and engines
+that keep failing are skipped by a circuit breaker until reset_timeout has
+passed. Per-engine latency histograms and counters are kept to compare
+configurations (get_stats).
+"""
+
+__copyright__ = "Copyright (C) 2020 Nidhal Baccouri"
+
+import asyncio
+import math
+import threading
+import time
+from collections import deque
+from typing import List, Union
+
+from deep_translator import async_http
+from deep_translator.base import BaseTranslator
+from deep_translator.exceptions import TranslationNotFound
+from deep_translator.validate import is_empty, is_input_valid
+
+FAILOVER = "failover"
+RACE = "race"
+HEDGE = "hedge"
+MODES = (FAILOVER, RACE, HEDGE)
+
+# upper bounds (ms) of the latency histogram buckets, the last one is open
+LATENCY_BUCKETS_MS = (50, 100, 200, 500, 1000, 2000, 5000, 10000)
+# latencies kept for the percentiles
+LATENCY_SAMPLES = 1000
+
+# circuit breaker states
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class LatencyHistogram:
+    """
+    latencies of successful translations: bucket counts over the whole run,
+    percentiles over the last LATENCY_SAMPLES
+    """
+
+    def __init__(self):
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self._samples = deque(maxlen=LATENCY_SAMPLES)
+
+    def record(self, seconds: float):
+        ms = seconds * 1000.0
+        index = 0
+        while (
+            index < len(LATENCY_BUCKETS_MS) and ms > LATENCY_BUCKETS_MS[index]
+        ):
+            index += 1
+        self.buckets[index] += 1
+        self.count += 1
+        self.total += ms
+        self._samples.append(ms)
+
+    def to_dict(self) -> dict:
+        """
+        @return: count, mean_ms, p50_ms, p90_ms, p99_ms, max_ms and
+        buckets {"<=50": n, ..., ">10000": n}
+        """
+        labels = [f"<={bound}" for bound in LATENCY_BUCKETS_MS]
+        labels.append(f">{LATENCY_BUCKETS_MS[-1]}")
+        stats = {
+            "count": self.count,
+            "buckets": dict(zip(labels, self.buckets)),
+        }
+        samples = sorted(self._samples)
+        if samples:
+
+            def percentile(pct):
+                index = int(pct / 100.0 * len(samples))
+                return samples[min(len(samples) - 1, index)]
+
+            stats.update(
+                mean_ms=self.total / self.count,
+                p50_ms=percentile(50),
+                p90_ms=percentile(90),
+                p99_ms=percentile(99),
+                max_ms=samples[-1],
+            )
+        return stats
+
+
+class CircuitBreaker:
+    """
+    opens after failure_threshold failures in a row; once reset_timeout has
+    passed, one request is let through (half open): success closes the
+    breaker, failure opens it again
+    """
+
+    def __init__(
+        self, failure_threshold: int = 3, reset_timeout: float = 30.0
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """
+        @return: whether a request may be sent to the engine now
+        """
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if (
+                self.state == OPEN
+                and time.monotonic() - self._opened_at >= self.reset_timeout
+            ):
+                self.state = HALF_OPEN
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or (
+                self.state == CLOSED
+                and self.failures >= self.failure_threshold
+            ):
+                self.state = OPEN
+                self.opened += 1
+                self._opened_at = time.monotonic()
+
+    def record_cancelled(self):
+        # the probe of a half open breaker lost a race: let the next one probe
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self.state = OPEN
+
+
+class _Engine:
+    """
+    one engine of a CompositeTranslator, with its breaker and counters
+    """
+
+    def __init__(
+        self, name: str, translator: BaseTranslator, breaker: CircuitBreaker
+    ):
+        self.name = name
+        self.translator = translator
+        self.breaker = breaker
+        self.latency = LatencyHistogram()
+        self.stats = {
+            "requests": 0,
+            "answered": 0,
+            "wins": 0,
+            "errors": 0,
+            "cancelled": 0,
+            "skipped": 0,
+        }
+        self.last_error = None
+
+    def to_dict(self) -> dict:
+        stats = dict(self.stats)
+        stats.update(
+            breaker=self.breaker.state,
+            breaker_opened=self.breaker.opened,
+            last_error=self.last_error,
+            latency=self.latency.to_dict(),
+        )
+        return stats
+
+
+class CompositeTranslator(BaseTranslator):
+    """
+    class that wraps several translators (see the module docstring)
+    """
+
+    def __init__(
+        self,
+        engines: List[Union[str, tuple, BaseTranslator]],
+        source: str = "auto",
+        target: str = "en",
+        mode: str = FAILOVER,
+        race_width: int = 2,
+        hedge_after: float = 0.5,
+        failure_threshold: int = 3,
+        reset_timeout: float = 30.0,
+        **kwargs,
+    ):
+        """
+        @param engines: in priority order, each a translator instance, an
+        engine name of deep_translator.engines.__engines__ (e.g. "google"),
+        or (name, {constructor arguments, e.g. api_key, or source/target in
+        the engine's own codes})
+        @param source: source language, passed to the engines created by name
+        @param target: target language, passed to the engines created by name
+        @param mode: FAILOVER, RACE or HEDGE
+        @param race_width: engines asked at once in RACE mode
+        @param hedge_after: seconds before the next engine is asked in HEDGE mode
+        @param failure_threshold: failures in a row that open an engine's breaker
+        @param reset_timeout: seconds an open breaker skips its engine
+        """
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {MODES}, not {mode!r}")
+        if not engines:
+            raise ValueError("at least one engine is needed")
+        self.mode = mode
+        self.race_width = max(1, race_width)
+        self.hedge_after = hedge_after
+        self._engines = []
+        for engine in engines:
+            translator = self._create(engine, source, target)
+            name = translator._type().replace("Translator", "").lower()
+            if any(existing.name == name for existing in self._engines):
+                name = f"{name}_{len(self._engines)}"
+            breaker = CircuitBreaker(failure_threshold, reset_timeout)
+            self._engines.append(_Engine(name, translator, breaker))
+        self._stats_lock = threading.Lock()
+        self.stats = {
+            "translated": 0,
+            "failed": 0,
+            "hedged": 0,
+            "failed_over": 0,
+        }
+
+        primary = self._engines[0].translator
+        super().__init__(
+            languages=primary._languages,
+            source=primary.source,
+            target=primary.target,
+            **kwargs,
+        )
+
+    @staticmethod
+    def _create(engine, source: str, target: str) -> BaseTranslator:
+        if isinstance(engine, BaseTranslator):
+            return engine
+        name, options = (engine, {}) if isinstance(engine, str) else engine
+        # imported here: building __engines__ loads every engine module
+        from deep_translator.engines import __engines__
+
+        translator_class = __engines__.get(name)
+        if translator_class is None or translator_class is CompositeTranslator:
+            raise ValueError(
+                f"unknown engine {name!r}, expected one of "
+                f"{sorted(__engines__)}"
+            )
+        # options may set the engine's own source/target codes
+        arguments = dict(source=source, target=target)
+        arguments.update(options)
+        return translator_class(**arguments)
+
+    @property
+    def engines(self) -> List[BaseTranslator]:
+        return [engine.translator for engine in self._engines]
+
+    def _count(self, name: str):
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    def translate(self, text: str, **kwargs) -> str:
+        """
+        translate with the engines, as set by mode
+        @param text: desired text to translate
+        @return: str: translated text
+        """
+        return async_http.submit(self.atranslate(text, **kwargs)).result()
+
+    async def atranslate(self, text: str, **kwargs) -> str:
+        """
+        asyncio counterpart of translate; cancelling it cancels the requests
+        of every engine asked
+        @param text: desired text to translate
+        @return: str: translated text
+        """
+        if is_input_valid(text) and is_empty(text.strip()):
+            return text
+        candidates = [
+            engine for engine in self._engines if engine.breaker.allow()
+        ]
+        for engine in self._engines:
+            if engine not in candidates:
+                engine.stats["skipped"] += 1
+        if not candidates:
+            # every breaker is open: better to try them than to give up
+            candidates = list(self._engines)
+
+        if self.mode == RACE:
+            delays = [
+                0.0 if i < self.race_width else math.inf
+                for i in range(len(candidates))
+            ]
+        elif self.mode == HEDGE:
+            delays = [i * self.hedge_after for i in range(len(candidates))]
+        else:
+            delays = [0.0] + [math.inf] * (len(candidates) - 1)
+        try:
+            translated = await self._first_success(
+                text, candidates, delays, **kwargs
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self._count("failed")
+            raise
+        self._count("translated")
+        return translated
+
+    async def _first_success(
+        self,
+        text: str,
+        candidates: List[_Engine],
+        delays: List[float],
+        **kwargs,
+    ) -> str:
+        """
+        start candidate i after delays[i] seconds, or as soon as every
+        engine started so far has failed; the first translation wins and the
+        requests still running are cancelled
+        """
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        running = {}  # task -> engine
+        engines = {}
+        errors = []
+        index = 0
+        try:
+            while True:
+                elapsed = loop.time() - start
+                while index < len(candidates) and (
+                    delays[index] <= elapsed or not running
+                ):
+                    if index and not running:
+                        self._count("failed_over")
+                    elif index and self.mode == HEDGE:
+                        self._count("hedged")
+                    engine = candidates[index]
+                    task = asyncio.ensure_future(
+                        self._attempt(engine, text, **kwargs)
+                    )
+                    running[task] = engine
+                    index += 1
+                if not running:
+                    raise errors[-1]
+
+                timeout = None
+                if index < len(candidates) and delays[index] != math.inf:
+                    timeout = max(0.0, delays[index] - (loop.time() - start))
+                done, _ = await asyncio.wait(
+                    running,
+                    timeout=timeout,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                for task in done:
+                    engines[task] = running.pop(task)
+                for task in done:
+                    if task.exception() is None:
+                        engines[task].stats["wins"] += 1
+                        return task.result()
+                errors.extend(task.exception() for task in done)
+        finally:
+            for task in running:
+                task.cancel()
+
+    async def _attempt(self, engine: _Engine, text: str, **kwargs) -> str:
+        engine.stats["requests"] += 1
+        started = time.perf_counter()
+        try:
+            translated = await engine.translator.atranslate(text, **kwargs)
+            if not translated:
+                raise TranslationNotFound(text)
+        except asyncio.CancelledError:
+            engine.stats["cancelled"] += 1
+            engine.breaker.record_cancelled()
+            raise
+        except Exception as e:
+            engine.stats["errors"] += 1
+            engine.last_error = f"{e.__class__.__name__}: {e}"
+            engine.breaker.record_failure()
+            raise
+        engine.latency.record(time.perf_counter() - started)
+        engine.stats["answered"] += 1
+        engine.breaker.record_success()
+        return translated
+
+    def get_stats(self) -> dict:
+        """
+        @return: overall counters (translated, failed, hedged, failed_over)
+        and per engine: requests, answered, wins (answers used), errors,
+        cancelled (lost a race), skipped (breaker open), breaker
+        state and the latency histogram of its successful answers
+        """
+        with self._stats_lock:
+            stats = dict(self.stats)
+        stats["mode"] = self.mode
+        stats["engines"] = {
+            engine.name: engine.to_dict() for engine in self._engines
+        }
+        return stats
+
+    def translate_file(self, path: str, **kwargs) -> str:
+        """
+        translate directly from file
+        @param path: path to the target file
+        @type path: str
+        @param kwargs: additional args
+        @return: str
+        """
+        return self._translate_file(path, **kwargs)
+
+    def translate_batch(self, batch: List[str], **kwargs) -> List[str]:
+        """
+        translate a list of texts
+        @param batch: list of texts you want to translate
+        @return: list of translations
+        """
+        return self._translate_batch(batch, **kwargs)
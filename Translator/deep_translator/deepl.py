@@ -3,8 +3,6 @@ __copyright__ = "Copyright (C) 2020 Nidhal Baccouri"
 import os
 from typing import List, Optional
 
-import requests
-
 from deep_translator.base import BaseTranslator
 from deep_translator.constants import (
     BASE_URLS,
@@ -26,6 +24,10 @@ class DeeplTranslator(BaseTranslator):
     under the hood to translate word(s)
     """
 
+    # the API takes up to 50 "text" parameters per request
+    batch_max_items = 50
+    batch_max_chars = 30000
+
     def __init__(
         self,
         source: str = "de",
@@ -67,32 +69,97 @@ class DeeplTranslator(BaseTranslator):
             if self._same_source_target() or is_empty(text):
                 return text
 
-            # Create the request parameters.
-            translate_endpoint = "translate"
-            params = {
-                "auth_key": self.api_key,
-                "source_lang": self._source,
-                "target_lang": self._target,
-                "text": text,
-            }
             # Do the request and check the connection.
             try:
-                response = requests.get(
-                    self._base_url + translate_endpoint, params=params
+                response = self._http_get(
+                    self._base_url + "translate",
+                    params=self._request_params(text),
                 )
             except ConnectionError:
                 raise ServerException(503)
-            # If the answer is not success, raise server exception.
-            if response.status_code == 403:
-                raise AuthorizationException(self.api_key)
-            if request_failed(status_code=response.status_code):
-                raise ServerException(response.status_code)
-            # Get the response and check is not empty.
-            res = response.json()
-            if not res:
-                raise TranslationNotFound(text)
-            # Process and return the response.
-            return res["translations"][0]["text"]
+            return self._parse_response(text, response)
+
+    async def atranslate(self, text: str, **kwargs) -> str:
+        """
+        asyncio counterpart of translate
+        @param text: text to translate
+        @return: translated text
+        """
+        if is_input_valid(text):
+            if self._same_source_target() or is_empty(text):
+                return text
+
+            try:
+                response = await self._ahttp_get(
+                    self._base_url + "translate",
+                    params=self._request_params(text),
+                )
+            except ConnectionError:
+                raise ServerException(503)
+            return self._parse_response(text, response)
+
+    def _request_params(self, text: str) -> dict:
+        return {
+            "auth_key": self.api_key,
+            "source_lang": self._source,
+            "target_lang": self._target,
+            "text": text,
+        }
+
+    def _parse_response(self, text: str, response) -> str:
+        # If the answer is not success, raise server exception.
+        if response.status_code == 403:
+            raise AuthorizationException(self.api_key)
+        if request_failed(status_code=response.status_code):
+            raise ServerException(response.status_code)
+        # Get the response and check is not empty.
+        res = response.json()
+        if not res:
+            raise TranslationNotFound(text)
+        # Process and return the response.
+        return res["translations"][0]["text"]
+
+    def _translate_chunk(self, chunk: List[str], **kwargs) -> List[str]:
+        """
+        translate several texts with one request
+        @param chunk: list of texts
+        @return: list of translations, in order
+        """
+        # sent as a form body: many texts would not fit in a url
+        try:
+            response = self._http_post(
+                self._base_url + "translate", data=self._chunk_params(chunk)
+            )
+        except ConnectionError:
+            raise ServerException(503)
+        return self._parse_chunk_response(chunk, response)
+
+    async def _atranslate_chunk(self, chunk: List[str], **kwargs) -> List[str]:
+        try:
+            response = await self._ahttp_post(
+                self._base_url + "translate", data=self._chunk_params(chunk)
+            )
+        except ConnectionError:
+            raise ServerException(503)
+        return self._parse_chunk_response(chunk, response)
+
+    def _chunk_params(self, chunk: List[str]) -> list:
+        return [
+            ("auth_key", self.api_key),
+            ("source_lang", self._source),
+            ("target_lang", self._target),
+        ] + [("text", text) for text in chunk]
+
+    def _parse_chunk_response(self, chunk: List[str], response) -> List[str]:
+        if response.status_code == 403:
+            raise AuthorizationException(self.api_key)
+        if request_failed(status_code=response.status_code):
+            raise ServerException(response.status_code)
+        res = response.json()
+        translations = res.get("translations") if res else None
+        if not translations or len(translations) != len(chunk):
+            raise TranslationNotFound(chunk)
+        return [translation["text"] for translation in translations]
 
     def translate_file(self, path: str, **kwargs) -> str:
         return self._translate_file(path, **kwargs)
@@ -6,9 +6,10 @@ __copyright__ = "Copyright (C) 2020 Nidhal Baccouri"
 
 from typing import List, Optional, Union
 
-import requests
 from requests.exceptions import HTTPError
 
+from deep_translator import session_pool
+
 # Module global config
 config = {
     "url": "https://ws.detectlanguage.com/0.2/detect",
@@ -43,8 +44,11 @@ def get_request_body(
         try:
             headers = config["headers"]
             headers["Authorization"] = headers["Authorization"].format(api_key)
-            response = requests.post(
-                config["url"], json={"q": text}, headers=headers
+            response = session_pool.get_session().post(
+                config["url"],
+                json={"q": text},
+                headers=headers,
+                timeout=session_pool.get_timeout(),
             )
 
             body = response.json().get("data")
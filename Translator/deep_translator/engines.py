@@ -1,8 +1,10 @@
 __copyright__ = "Copyright (C) 2020 Nidhal Baccouri"
 
-from deep_translator.base import BaseTranslator
+import deep_translator
 
+# the engines are loaded on demand by the package; this lists all of them
 __engines__ = {
-    translator.__name__.replace("Translator", "").lower(): translator
-    for translator in BaseTranslator.__subclasses__()
+    name.replace("Translator", "").lower(): getattr(deep_translator, name)
+    for name in deep_translator.__all__
+    if name.endswith("Translator") and name != "CompositeTranslator"
 }
@@ -6,9 +6,6 @@ __copyright__ = "Copyright (C) 2020 Nidhal Baccouri"
 
 from typing import List, Optional
 
-import requests
-from bs4 import BeautifulSoup
-
 from deep_translator.base import BaseTranslator
 from deep_translator.constants import BASE_URLS
 from deep_translator.exceptions import (
@@ -16,9 +13,14 @@ from deep_translator.exceptions import (
     TooManyRequests,
     TranslationNotFound,
 )
+from deep_translator.html_extract import UnsupportedMarkup, find_text
 from deep_translator.validate import is_empty, is_input_valid, request_failed
 
 
+# returned by _parse_response when the text has to be requested again, without hl
+_RETRY = object()
+
+
 class GoogleTranslator(BaseTranslator):
     """
     class that wraps functions, which use Google Translate under the hood to translate text(s)
@@ -58,50 +60,112 @@ class GoogleTranslator(BaseTranslator):
             text = text.strip()
             if self._same_source_target() or is_empty(text):
                 return text
-            self._url_params["tl"] = self._target
-            self._url_params["sl"] = self._source
 
-            if self.payload_key:
-                self._url_params[self.payload_key] = text
+            params = self._request_params(text)
+            while True:
+                response = self._http_get(
+                    self._base_url, params=params, proxies=self.proxies
+                )
+                translated = self._parse_response(text, response, params)
+                if translated is not _RETRY:
+                    return translated
+                # the page came back untranslated: ask again without hl
+                params.pop("hl")
 
-            response = requests.get(
-                self._base_url, params=self._url_params, proxies=self.proxies
-            )
-            if response.status_code == 429:
-                raise TooManyRequests()
+    async def atranslate(self, text: str, **kwargs) -> str:
+        """
+        asyncio counterpart of translate
+        @param text: desired text to translate
+        @return: str: translated text
+        """
+        if is_input_valid(text, max_chars=5000):
+            text = text.strip()
+            if self._same_source_target() or is_empty(text):
+                return text
 
-            if request_failed(status_code=response.status_code):
-                raise RequestError()
+            params = self._request_params(text)
+            while True:
+                response = await self._ahttp_get(
+                    self._base_url, params=params, proxies=self.proxies
+                )
+                translated = self._parse_response(text, response, params)
+                if translated is not _RETRY:
+                    return translated
+                # the page came back untranslated: ask again without hl
+                params.pop("hl")
+
+    def _request_params(self, text: str) -> dict:
+        # per-call copy, so one instance can translate on several threads
+        params = dict(self._url_params)
+        params["tl"] = self._target
+        params["sl"] = self._source
+
+        if self.payload_key:
+            params[self.payload_key] = text
+        return params
+
+    def _parse_response(
+        self, text: str, response, params: dict
+    ) -> Optional[str]:
+        """
+        extract the translation from the html page
+        @param params: the request's params (from _request_params)
+        @return: the translation, or _RETRY to request it again without hl
+        """
+        if response.status_code == 429:
+            raise TooManyRequests()
 
-            soup = BeautifulSoup(response.text, "html.parser")
+        if request_failed(status_code=response.status_code):
+            raise RequestError()
 
-            element = soup.find(self._element_tag, self._element_query)
-            response.close()
+        translated = self._find_translation(response.text)
+        response.close()
 
-            if not element:
-                element = soup.find(self._element_tag, self._alt_element_query)
-                if not element:
-                    raise TranslationNotFound(text)
-            if element.get_text(strip=True) == text.strip():
-                to_translate_alpha = "".join(
-                    ch for ch in text.strip() if ch.isalnum()
-                )
-                translated_alpha = "".join(
-                    ch for ch in element.get_text(strip=True) if ch.isalnum()
-                )
-                if (
-                    to_translate_alpha
-                    and translated_alpha
-                    and to_translate_alpha == translated_alpha
-                ):
-                    self._url_params["tl"] = self._target
-                    if "hl" not in self._url_params:
-                        return text.strip()
-                    del self._url_params["hl"]
-                    return self.translate(text)
-
-            else:
+        if translated is None:
+            raise TranslationNotFound(text)
+        if translated == text.strip():
+            to_translate_alpha = "".join(
+                ch for ch in text.strip() if ch.isalnum()
+            )
+            translated_alpha = "".join(ch for ch in translated if ch.isalnum())
+            if (
+                to_translate_alpha
+                and translated_alpha
+                and to_translate_alpha == translated_alpha
+            ):
+                if "hl" not in params:
+                    return text.strip()
+                return _RETRY
+
+        else:
+            return translated
+
+    def _find_translation(self, html: str) -> Optional[str]:
+        """
+        text of the translation element (element_query, else the alternative one)
+        @return: the text, or None if the page has neither
+        """
+        queries = (self._element_query, self._alt_element_query)
+        if all(list(query) == ["class"] for query in queries):
+            # scan the page for the element, much cheaper than parsing it;
+            # pages the scan is unsure of, or finds nothing in, are parsed
+            try:
+                for query in queries:
+                    translated = find_text(html, self._element_tag, query["class"])
+                    if translated is not None:
+                        return translated
+            except UnsupportedMarkup:
+                pass
+
+        # bs4 is only imported for the pages that need it
+        from bs4 import BeautifulSoup
+
+        soup = BeautifulSoup(html, "html.parser")
+        for query in queries:
+            element = soup.find(self._element_tag, query)
+            if element:
                 return element.get_text(strip=True)
+        return None
 
     def translate_file(self, path: str, **kwargs) -> str:
         """
@@ -0,0 +1,99 @@
+"""
+fast extraction of one element's text from an html page, for the scraping
+translators (the page is scanned with regular expressions instead of being
+parsed into a tree). Pages it cannot read with certainty raise
+UnsupportedMarkup, and the caller falls back to BeautifulSoup.
+"""
+
+__copyright__ = "Copyright (C) 2020 Nidhal Baccouri"
+
+import re
+from html import unescape
+from typing import Optional
+
+# one attribute of a start tag: name, optionally = "value" / 'value' / value
+_ATTRIBUTE = r"""[^\s"'<>/=]+(?:\s*=\s*(?:"[^"]*"|'[^']*'|[^\s"'=<>`]+))?"""
+_ATTRIBUTE_VALUE = re.compile(
+    r"""([^\s"'<>/=]+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'=<>`]+)))?"""
+)
+# markup whose content is not html (skipped when looking for the element)
+_RAW = r"<!--.*?-->|<!\[CDATA\[.*?\]\]>|<(script|style|textarea|title)\b[^>]*>.*?</\1\s*>"
+_TAG = re.compile(r"<[^>]*>")
+
+_start_tags = {}
+
+
+class UnsupportedMarkup(Exception):
+    """
+    the element was not found with certainty; parse the page instead
+    """
+
+
+def _start_tag_pattern(tag: str):
+    pattern = _start_tags.get(tag)
+    if pattern is None:
+        pattern = _start_tags[tag] = re.compile(
+            rf"{_RAW}|<{tag}((?:\s+{_ATTRIBUTE})*)\s*/?>|</{tag}\s*>",
+            re.IGNORECASE | re.DOTALL,
+        )
+    return pattern
+
+
+def _has_class(attributes: str, class_name: str) -> bool:
+    if "class" not in attributes.lower():
+        return False
+    classes = ""
+    for match in _ATTRIBUTE_VALUE.finditer(attributes):
+        if match.group(1).lower() == "class":
+            # like the parser, a repeated attribute replaces the earlier one
+            classes = match.group(2) or match.group(3) or match.group(4) or ""
+    return class_name in classes.split()
+
+
+def find_text(html: str, tag: str, class_name: str) -> Optional[str]:
+    """
+    text of the first <tag> element whose class list contains class_name,
+    the same as BeautifulSoup's soup.find(tag, {"class": class_name})
+    .get_text(strip=True): every text node stripped, empty ones left out,
+    the rest joined
+    @param html: the page
+    @param tag: element name, e.g. "div"
+    @param class_name: one of the element's classes
+    @return: the text, or None if no element matches
+    @raise UnsupportedMarkup: the element contains markup other than tags and text
+    """
+    pattern = _start_tag_pattern(tag)
+    matches = pattern.finditer(html)
+    for match in matches:
+        attributes = match.group(2)
+        if attributes is None or not _has_class(attributes, class_name):
+            continue
+        if match.group(0).endswith("/>"):
+            raise UnsupportedMarkup(tag)
+
+        # find the matching end tag, counting nested elements of the same name
+        depth = 1
+        for inner in matches:
+            if inner.group(1) is not None or inner.group(0).startswith("<!"):
+                # comments or raw text inside the element
+                raise UnsupportedMarkup(tag)
+            if inner.group(2) is not None:
+                depth += 1
+            elif inner.group(0).startswith("</"):
+                depth -= 1
+                if depth == 0:
+                    break
+        else:
+            raise UnsupportedMarkup(tag)
+
+        content = html[match.end() : inner.start()]
+        if "<" in content:
+            if "<!" in content:
+                raise UnsupportedMarkup(tag)
+            pieces = _TAG.split(content)
+        else:
+            pieces = (content,)
+        return "".join(
+            stripped for stripped in (unescape(piece).strip() for piece in pieces) if stripped
+        )
+    return None
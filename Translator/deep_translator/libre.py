@@ -4,9 +4,7 @@ LibreTranslate API
 __copyright__ = "Copyright (C) 2020 Nidhal Baccouri"
 
 import os
-from typing import List, Optional
-
-import requests
+from typing import List, Optional, Union
 
 from deep_translator.base import BaseTranslator
 from deep_translator.constants import (
@@ -28,6 +26,10 @@ class LibreTranslator(BaseTranslator):
     class that wraps functions, which use libre translator under the hood to translate text(s)
     """
 
+    # "q" may be a list; public instances limit the characters per request
+    batch_max_items = 25
+    batch_max_chars = 5000
+
     def __init__(
         self,
         source: str = "en",
@@ -74,35 +76,87 @@ class LibreTranslator(BaseTranslator):
             if self._same_source_target() or is_empty(text):
                 return text
 
-            translate_endpoint = "translate"
-            params = {
-                "q": text,
-                "source": self._source,
-                "target": self._target,
-                "format": "text",
-            }
-            # Add API Key if required
-            if self.api_key:
-                params["api_key"] = self.api_key
             # Do the request and check the connection.
             try:
-                response = requests.post(
-                    self._base_url + translate_endpoint, params=params
+                response = self._http_post(
+                    self._base_url + "translate",
+                    params=self._request_params(text),
+                )
+            except ConnectionError:
+                raise ServerException(503)
+            return self._parse_response(text, response)["translatedText"]
+
+    async def atranslate(self, text: str, **kwargs) -> str:
+        """
+        asyncio counterpart of translate
+        @param text: desired text to translate
+        @return: str: translated text
+        """
+        if is_input_valid(text):
+            if self._same_source_target() or is_empty(text):
+                return text
+
+            try:
+                response = await self._ahttp_post(
+                    self._base_url + "translate",
+                    params=self._request_params(text),
                 )
             except ConnectionError:
                 raise ServerException(503)
-            # If the answer is not success, raise server exception.
-
-            if response.status_code == 403:
-                raise AuthorizationException(self.api_key)
-            elif request_failed(status_code=response.status_code):
-                raise ServerException(response.status_code)
-            # Get the response and check is not empty.
-            res = response.json()
-            if not res:
-                raise TranslationNotFound(text)
-            # Process and return the response.
-            return res["translatedText"]
+            return self._parse_response(text, response)["translatedText"]
+
+    def _request_params(self, q: Union[str, List[str]]) -> dict:
+        params = {
+            "q": q,
+            "source": self._source,
+            "target": self._target,
+            "format": "text",
+        }
+        # Add API Key if required
+        if self.api_key:
+            params["api_key"] = self.api_key
+        return params
+
+    def _parse_response(self, q: Union[str, List[str]], response) -> dict:
+        # If the answer is not success, raise server exception.
+        if response.status_code == 403:
+            raise AuthorizationException(self.api_key)
+        elif request_failed(status_code=response.status_code):
+            raise ServerException(response.status_code)
+        # Get the response and check is not empty.
+        res = response.json()
+        if not res:
+            raise TranslationNotFound(q)
+        return res
+
+    def _translate_chunk(self, chunk: List[str], **kwargs) -> List[str]:
+        """
+        translate several texts with one request ("q" is a list)
+        @param chunk: list of texts
+        @return: list of translations, in order
+        """
+        try:
+            response = self._http_post(
+                self._base_url + "translate", json=self._request_params(chunk)
+            )
+        except ConnectionError:
+            raise ServerException(503)
+        return self._parse_chunk_response(chunk, response)
+
+    async def _atranslate_chunk(self, chunk: List[str], **kwargs) -> List[str]:
+        try:
+            response = await self._ahttp_post(
+                self._base_url + "translate", json=self._request_params(chunk)
+            )
+        except ConnectionError:
+            raise ServerException(503)
+        return self._parse_chunk_response(chunk, response)
+
+    def _parse_chunk_response(self, chunk: List[str], response) -> List[str]:
+        translations = self._parse_response(chunk, response).get("translatedText")
+        if not isinstance(translations, list) or len(translations) != len(chunk):
+            raise TranslationNotFound(chunk)
+        return translations
 
     def translate_file(self, path: str, **kwargs) -> str:
         """
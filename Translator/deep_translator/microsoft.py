@@ -24,6 +24,10 @@ class MicrosoftTranslator(BaseTranslator):
     the class that wraps functions, which use the Microsoft translator under the hood to translate word(s)
     """
 
+    # request limits of the v3 API: 1000 array elements, 50000 characters
+    batch_max_items = 1000
+    batch_max_chars = 50000
+
     def __init__(
         self,
         source: str = "auto",
@@ -68,7 +72,7 @@ class MicrosoftTranslator(BaseTranslator):
             "https://api.cognitive.microsofttranslator.com/languages?api-version=3.0&scope"
             "=translation "
         )
-        microsoft_languages_response = requests.get(
+        microsoft_languages_response = self._http_get(
             microsoft_languages_api_url
         )
         translation_dict = microsoft_languages_response.json()["translation"]
@@ -93,7 +97,7 @@ class MicrosoftTranslator(BaseTranslator):
 
             valid_microsoft_json = [{"text": text}]
             try:
-                response = requests.post(
+                response = self._http_post(
                     self._base_url,
                     params=self._url_params,
                     headers=self.headers,
@@ -119,6 +123,63 @@ class MicrosoftTranslator(BaseTranslator):
                 ]
                 return "\n".join(all_translations)
 
+    async def atranslate(self, text: str, **kwargs) -> str:
+        """
+        asyncio counterpart of translate
+        @param text: desired text to translate
+        @return: str: translated text
+        """
+        if is_input_valid(text):
+            translations = await self._atranslate_chunk([text])
+            return translations[0]
+
+    def _translate_chunk(self, chunk: List[str], **kwargs) -> List[str]:
+        """
+        translate several texts with one request (the body is a list)
+        @param chunk: list of texts
+        @return: list of translations, in order
+        """
+        try:
+            response = self._http_post(
+                self._base_url,
+                params=self._chunk_params(),
+                headers=self.headers,
+                json=[{"text": text} for text in chunk],
+                proxies=self.proxies,
+            )
+        except requests.exceptions.RequestException:
+            raise TranslationNotFound(chunk)
+        return self._parse_chunk_response(chunk, response)
+
+    async def _atranslate_chunk(self, chunk: List[str], **kwargs) -> List[str]:
+        try:
+            response = await self._ahttp_post(
+                self._base_url,
+                params=self._chunk_params(),
+                headers=self.headers,
+                json=[{"text": text} for text in chunk],
+                proxies=self.proxies,
+            )
+        except requests.exceptions.RequestException:
+            raise TranslationNotFound(chunk)
+        return self._parse_chunk_response(chunk, response)
+
+    def _chunk_params(self) -> dict:
+        params = dict(self._url_params)
+        params["from"] = self._source
+        params["to"] = self._target
+        return params
+
+    def _parse_chunk_response(self, chunk: List[str], response) -> List[str]:
+        data = response.json()
+        if type(data) is dict:
+            raise MicrosoftAPIerror(data["error"])
+        if len(data) != len(chunk):
+            raise TranslationNotFound(chunk)
+        return [
+            "\n".join(i["text"] for i in item["translations"]) for item in data
+        ]
+
     def translate_file(self, path: str, **kwargs) -> str:
         """
         translate from a file
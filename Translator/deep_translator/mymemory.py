@@ -6,8 +6,6 @@ __copyright__ = "Copyright (C) 2020 Nidhal Baccouri"
 
 from typing import List, Optional, Union
 
-import requests
-
 from deep_translator.base import BaseTranslator
 from deep_translator.constants import BASE_URLS, MY_MEMORY_LANGUAGES_TO_CODES
 from deep_translator.exceptions import (
@@ -59,40 +57,71 @@ class MyMemoryTranslator(BaseTranslator):
             if self._same_source_target() or is_empty(text):
                 return text
 
-            self._url_params["langpair"] = f"{self._source}|{self._target}"
-            if self.payload_key:
-                self._url_params[self.payload_key] = text
-            if self.email:
-                self._url_params["de"] = self.email
-
-            response = requests.get(
-                self._base_url, params=self._url_params, proxies=self.proxies
+            response = self._http_get(
+                self._base_url,
+                params=self._request_params(text),
+                proxies=self.proxies,
             )
+            return self._parse_response(text, response, return_all)
+
+    async def atranslate(
+        self, text: str, return_all: bool = False, **kwargs
+    ) -> Union[str, List[str]]:
+        """
+        asyncio counterpart of translate
+        @param text: desired text to translate
+        @param return_all: set to True to return all synonym/similars of the translated text
+        @return: str or list
+        """
+        if is_input_valid(text, max_chars=500):
+            text = text.strip()
+            if self._same_source_target() or is_empty(text):
+                return text
 
-            if response.status_code == 429:
-                raise TooManyRequests()
-            if request_failed(status_code=response.status_code):
-                raise RequestError()
-
-            data = response.json()
-            if not data:
-                TranslationNotFound(text)
-
-            response.close()
-            translation = data.get("responseData").get("translatedText")
-            all_matches = data.get("matches", [])
-
-            if translation:
-                if not return_all:
-                    return translation
-                else:
-                    # append translation at the start of the matches list
-                    return [translation] + list(all_matches)
-
-            elif not translation:
-                matches = (match["translation"] for match in all_matches)
-                next_match = next(matches)
-                return next_match if not return_all else list(all_matches)
+            response = await self._ahttp_get(
+                self._base_url,
+                params=self._request_params(text),
+                proxies=self.proxies,
+            )
+            return self._parse_response(text, response, return_all)
+
+    def _request_params(self, text: str) -> dict:
+        # per-call copy, so one instance can translate on several threads
+        params = dict(self._url_params)
+        params["langpair"] = f"{self._source}|{self._target}"
+        if self.payload_key:
+            params[self.payload_key] = text
+        if self.email:
+            params["de"] = self.email
+        return params
+
+    def _parse_response(
+        self, text: str, response, return_all: bool
+    ) -> Union[str, List[str]]:
+        if response.status_code == 429:
+            raise TooManyRequests()
+        if request_failed(status_code=response.status_code):
+            raise RequestError()
+
+        data = response.json()
+        if not data:
+            TranslationNotFound(text)
+
+        response.close()
+        translation = data.get("responseData").get("translatedText")
+        all_matches = data.get("matches", [])
+
+        if translation:
+            if not return_all:
+                return translation
+            else:
+                # append translation at the start of the matches list
+                return [translation] + list(all_matches)
+
+        elif not translation:
+            matches = (match["translation"] for match in all_matches)
+            next_match = next(matches)
+            return next_match if not return_all else list(all_matches)
 
     def translate_file(self, path: str, **kwargs) -> str:
         """
@@ -7,8 +7,6 @@ __copyright__ = "Copyright (C) 2020 Nidhal Baccouri"
 import json
 from typing import List, Optional
 
-import requests
-
 from deep_translator.base import BaseTranslator
 from deep_translator.constants import BASE_URLS, PAPAGO_LANGUAGE_TO_CODE
 from deep_translator.exceptions import TranslationNotFound
@@ -64,7 +62,7 @@ class PapagoTranslator(BaseTranslator):
                 "X-Naver-Client-Secret": self.secret_key,
                 "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8",
             }
-            response = requests.post(
+            response = self._http_post(
                 self._base_url, headers=headers, data=payload
             )
             if request_failed(status_code=response.status_code):
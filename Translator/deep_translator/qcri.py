@@ -3,8 +3,6 @@ __copyright__ = "Copyright (C) 2020 Nidhal Baccouri"
 import os
 from typing import List, Optional
 
-import requests
-
 from deep_translator.base import BaseTranslator
 from deep_translator.constants import (
     BASE_URLS,
@@ -64,7 +62,7 @@ class QcriTranslator(BaseTranslator):
         if not params:
             params = self.params
         try:
-            res = requests.get(
+            res = self._http_get(
                 self._base_url.format(endpoint=self.api_endpoints[endpoint]),
                 params=params,
             )
@@ -0,0 +1,388 @@
+"""
+per-engine request scheduling: requests/second and characters/minute budgets
+(token buckets) and retries of HTTP 429 answers.
+
+Every request sent through BaseTranslator._http_get/_http_post or the asyncio
+counterparts first waits for its engine's budget, so a burst of lines is
+queued and sent at the configured pace instead of being answered with 429.
+When a 429 still comes back, the whole engine pauses for the Retry-After
+delay (or a jittered exponential backoff) and the request is sent again; the
+response is returned to the engine (which raises TooManyRequests) only when
+the retries are used up or the server asks to wait longer than max_delay.
+
+Budgets are off by default (0 = no limit); 429 retries are on.
+"""
+
+__copyright__ = "Copyright (C) 2020 Nidhal Baccouri"
+
+import asyncio
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+# retries of a request answered with 429
+DEFAULT_MAX_RETRIES = 3
+# backoff before retry n (from 0): a random delay in
+# [0.5, 1] * backoff_factor * 2 ** n seconds, unless Retry-After says otherwise
+DEFAULT_BACKOFF_FACTOR = 0.5
+# longest pause accepted (Retry-After or backoff); a longer one is not waited for
+DEFAULT_MAX_DELAY = 30.0
+
+_limiters: Dict[str, "RateLimiter"] = {}
+_lock = threading.Lock()
+
+
+class TokenBucket:
+    """
+    tokens refill at `rate` per second up to `capacity`. Callers reserve
+    tokens and are told when they may proceed, so waiters are served in the
+    order they arrived. Not thread safe on its own (RateLimiter locks it).
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self._tokens = self.capacity
+        self._stamp = time.monotonic()
+
+    def reserve(self, amount: float, at: float) -> float:
+        """
+        take amount tokens at time `at` or later
+        @param amount: tokens (more than capacity counts as a full bucket)
+        @param at: earliest time.monotonic() the caller may proceed
+        @return: the time.monotonic() from which the tokens are the caller's
+        """
+        amount = min(amount, self.capacity)
+        at = max(at, self._stamp)
+        self._tokens = min(
+            self.capacity, self._tokens + (at - self._stamp) * self.rate
+        )
+        self._stamp = at
+        if self._tokens >= amount:
+            self._tokens -= amount
+            return at
+        # the next tokens are this caller's; later callers queue behind it
+        ready = at + (amount - self._tokens) / self.rate
+        self._tokens = 0.0
+        self._stamp = ready
+        return ready
+
+    def refund(self, amount: float, now: float):
+        """
+        give back tokens of a reservation that was not used. While callers
+        are queued, the queue is shortened by the refunded time (never to
+        before `now`), so the next caller does not wait for the cancelled one
+        @param amount: tokens reserved
+        @param now: time.monotonic() of the refund
+        """
+        amount = min(amount, self.capacity)
+        if self._stamp > now:
+            back = min(self._stamp - now, amount / self.rate)
+            self._stamp -= back
+            amount -= back * self.rate
+        self._tokens = min(self.capacity, self._tokens + amount)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    @param value: Retry-After header, in seconds or an HTTP date
+    @return: seconds to wait, or None if absent or invalid
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return None
+
+
+def payload_chars(kwargs: dict) -> int:
+    """
+    characters of text in a request's params, data and json, counted against
+    the characters/minute budget (the language codes and keys sent along
+    make it a slight overestimate)
+    @param kwargs: requests arguments
+    @return: int
+    """
+
+    def count(value) -> int:
+        if isinstance(value, str):
+            return len(value)
+        if isinstance(value, dict):
+            return sum(count(item) for item in value.values())
+        if isinstance(value, (list, tuple)):
+            return sum(count(item) for item in value)
+        return 0
+
+    return sum(count(kwargs.get(name)) for name in ("params", "data", "json"))
+
+
+class RateLimiter:
+    """
+    budgets, 429 retries and counters of one engine
+    """
+
+    def __init__(
+        self,
+        requests_per_second: float = 0,
+        chars_per_minute: float = 0,
+        burst: Optional[float] = None,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
+        max_delay: float = DEFAULT_MAX_DELAY,
+    ):
+        """
+        @param requests_per_second: request budget, 0 for no limit
+        @param chars_per_minute: character budget, 0 for no limit
+        @param burst: requests sent at once after an idle period
+        (default: one second's worth)
+        @param max_retries: retries of a request answered with 429
+        @param backoff_factor: base of the jittered exponential backoff
+        @param max_delay: longest Retry-After or backoff waited for
+        """
+        self._lock = threading.Lock()
+        self._hold_until = 0.0
+        self.stats = {
+            "requests": 0,
+            "chars": 0,
+            "throttled": 0,
+            "throttle_wait_s": 0.0,
+            "max_throttle_wait_s": 0.0,
+            "queue_depth": 0,
+            "max_queue_depth": 0,
+            "rate_limited": 0,
+            "retries": 0,
+            "gave_up": 0,
+        }
+        self._requests = None
+        self._chars = None
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_delay = max_delay
+        self.set_budget(requests_per_second, chars_per_minute, burst)
+
+    def set_budget(
+        self,
+        requests_per_second: float = 0,
+        chars_per_minute: float = 0,
+        burst: Optional[float] = None,
+    ):
+        """
+        replace the budgets (requests already waiting keep their turn)
+        """
+        with self._lock:
+            self.requests_per_second = requests_per_second
+            self.chars_per_minute = chars_per_minute
+            self.burst = burst
+            self._requests = (
+                TokenBucket(requests_per_second, burst)
+                if requests_per_second > 0
+                else None
+            )
+            # a minute's worth of characters can be sent at once
+            self._chars = (
+                TokenBucket(chars_per_minute / 60.0, chars_per_minute)
+                if chars_per_minute > 0
+                else None
+            )
+
+    def _reserve(self, chars: int) -> float:
+        """
+        @return: seconds to wait before sending
+        """
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._hold_until)
+            if self._chars is not None and chars:
+                start = self._chars.reserve(chars, start)
+            if self._requests is not None:
+                start = self._requests.reserve(1, start)
+            self.stats["requests"] += 1
+            self.stats["chars"] += chars
+            wait = start - now
+            if wait > 0:
+                self.stats["throttled"] += 1
+                self.stats["queue_depth"] += 1
+                self.stats["max_queue_depth"] = max(
+                    self.stats["max_queue_depth"], self.stats["queue_depth"]
+                )
+            return wait
+
+    def _refund(self, chars: int):
+        with self._lock:
+            now = time.monotonic()
+            if self._chars is not None and chars:
+                self._chars.refund(chars, now)
+            if self._requests is not None:
+                self._requests.refund(1, now)
+            self.stats["requests"] -= 1
+            self.stats["chars"] -= chars
+
+    def _held(self) -> float:
+        """
+        @return: seconds left of a 429 pause that began while the caller waited
+        """
+        with self._lock:
+            return self._hold_until - time.monotonic()
+
+    def _waited(self, waited: float):
+        with self._lock:
+            self.stats["queue_depth"] -= 1
+            self.stats["throttle_wait_s"] += waited
+            self.stats["max_throttle_wait_s"] = max(
+                self.stats["max_throttle_wait_s"], waited
+            )
+
+    def acquire(self, chars: int = 0):
+        """
+        block until a request of `chars` characters may be sent
+        @param chars: characters of text in the request
+        """
+        start = time.monotonic()
+        wait = self._reserve(chars)
+        if wait <= 0:
+            return
+        try:
+            time.sleep(wait)
+            held = self._held()
+            while held > 0:
+                time.sleep(held)
+                held = self._held()
+        finally:
+            self._waited(time.monotonic() - start)
+
+    async def aacquire(self, chars: int = 0):
+        """
+        asyncio counterpart of acquire; a cancelled waiter gives its turn back
+        @param chars: characters of text in the request
+        """
+        start = time.monotonic()
+        wait = self._reserve(chars)
+        if wait <= 0:
+            return
+        try:
+            await asyncio.sleep(wait)
+            held = self._held()
+            while held > 0:
+                await asyncio.sleep(held)
+                held = self._held()
+        except asyncio.CancelledError:
+            self._refund(chars)
+            raise
+        finally:
+            self._waited(time.monotonic() - start)
+
+    def backoff(self, attempt: int) -> float:
+        """
+        @param attempt: retry number, from 0
+        @return: jittered exponential delay in seconds
+        """
+        delay = min(self.max_delay, self.backoff_factor * 2**attempt)
+        return random.uniform(delay / 2, delay)
+
+    def should_retry(self, response, attempt: int) -> bool:
+        """
+        check a response; on 429, pause the engine and tell whether to send
+        the request again
+        @param response: requests.Response or async_http.AsyncResponse
+        @param attempt: retries already made for this request
+        @return: True if the caller should close the response and retry
+        """
+        if response.status_code != 429:
+            return False
+        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        with self._lock:
+            self.stats["rate_limited"] += 1
+            if attempt >= self.max_retries or (
+                retry_after is not None and retry_after > self.max_delay
+            ):
+                self.stats["gave_up"] += 1
+                return False
+            if retry_after is None:
+                delay = self.backoff(attempt)
+            else:
+                # a little jitter so the waiting requests do not all return at once
+                delay = retry_after + random.uniform(0, self.backoff_factor)
+            # every request of this engine waits, not only this one
+            self._hold_until = max(self._hold_until, time.monotonic() + delay)
+            self.stats["retries"] += 1
+            return True
+
+    def get_stats(self) -> dict:
+        """
+        @return: counters, including queue_depth (requests waiting now) and
+        throttle_wait_s (total time requests waited for the budget or a 429 pause)
+        """
+        with self._lock:
+            stats = dict(self.stats)
+            stats["paused_s"] = max(0.0, self._hold_until - time.monotonic())
+        return stats
+
+    def reset_stats(self):
+        with self._lock:
+            for name in self.stats:
+                if name != "queue_depth":
+                    self.stats[name] = 0
+
+
+def get_limiter(engine: str) -> RateLimiter:
+    """
+    return the limiter of an engine, creating it with the defaults on first use
+    @param engine: engine name, the translator class name (e.g. "GoogleTranslator")
+    @return: RateLimiter
+    """
+    limiter = _limiters.get(engine)
+    if limiter is None:
+        with _lock:
+            limiter = _limiters.setdefault(engine, RateLimiter())
+    return limiter
+
+
+def configure(
+    engine: str,
+    requests_per_second: Optional[float] = None,
+    chars_per_minute: Optional[float] = None,
+    burst: Optional[float] = None,
+    max_retries: Optional[int] = None,
+    backoff_factor: Optional[float] = None,
+    max_delay: Optional[float] = None,
+):
+    """
+    change an engine's settings; arguments left as None keep their value
+    @param engine: engine name, the translator class name (e.g. "GoogleTranslator")
+    @param requests_per_second: request budget, 0 for no limit
+    @param chars_per_minute: character budget, 0 for no limit
+    @param burst: requests sent at once after an idle period
+    @param max_retries: retries of a request answered with 429
+    @param backoff_factor: base of the jittered exponential backoff
+    @param max_delay: longest Retry-After or backoff waited for
+    """
+    limiter = get_limiter(engine)
+    if any(value is not None for value in (requests_per_second, chars_per_minute, burst)):
+        limiter.set_budget(
+            limiter.requests_per_second
+            if requests_per_second is None
+            else requests_per_second,
+            limiter.chars_per_minute if chars_per_minute is None else chars_per_minute,
+            limiter.burst if burst is None else burst,
+        )
+    if max_retries is not None:
+        limiter.max_retries = max_retries
+    if backoff_factor is not None:
+        limiter.backoff_factor = backoff_factor
+    if max_delay is not None:
+        limiter.max_delay = max_delay
+
+
+def get_stats() -> dict:
+    """
+    @return: {engine: counters} of every engine that sent a request
+    """
+    with _lock:
+        limiters = dict(_limiters)
+    return {engine: limiter.get_stats() for engine, limiter in limiters.items()}
@@ -0,0 +1,165 @@
+"""
+shared HTTP session used by all translators, so connections (TCP + TLS) are
+kept alive and reused across lines instead of being opened for every request
+"""
+
+__copyright__ = "Copyright (C) 2020 Nidhal Baccouri"
+
+import threading
+from typing import Optional, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# (connect, read) timeout in seconds used when a request does not set one
+DEFAULT_TIMEOUT = (5.0, 15.0)
+# retries of failed connections, reads and RETRY_STATUS_CODES responses
+DEFAULT_RETRIES = 2
+# sleep between retries: backoff_factor * 2 ** (retry - 1) seconds
+DEFAULT_BACKOFF_FACTOR = 0.3
+# number of hosts whose connections are kept
+DEFAULT_POOL_CONNECTIONS = 10
+# connections kept per host (at least the number of concurrent requests)
+DEFAULT_POOL_MAXSIZE = 16
+# transient server errors worth retrying; 429 is retried by rate_limit
+RETRY_STATUS_CODES = (500, 502, 503, 504)
+
+Timeout = Union[None, float, Tuple[float, float]]
+
+_config = {
+    "timeout": DEFAULT_TIMEOUT,
+    "retries": DEFAULT_RETRIES,
+    "backoff_factor": DEFAULT_BACKOFF_FACTOR,
+    "pool_connections": DEFAULT_POOL_CONNECTIONS,
+    "pool_maxsize": DEFAULT_POOL_MAXSIZE,
+}
+_session = None
+_lock = threading.Lock()
+
+
+class _Retry(Retry):
+    # urllib3 also retries 429 answers that carry Retry-After; those are left
+    # to rate_limit, which pauses every request of the engine, not just one
+    RETRY_AFTER_STATUS_CODES = frozenset([503])
+
+
+def _retry_policy(retries: int, backoff_factor: float) -> Retry:
+    options = dict(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUS_CODES,
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    # translation requests are idempotent, so POSTs are retried too
+    try:
+        return _Retry(allowed_methods=frozenset(["GET", "POST"]), **options)
+    except TypeError:
+        # urllib3 < 1.26
+        return _Retry(method_whitelist=frozenset(["GET", "POST"]), **options)
+
+
+def build_session(
+    retries: int = DEFAULT_RETRIES,
+    backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
+    pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+    pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+) -> requests.Session:
+    """
+    create a session with a keep-alive connection pool per host and a retry policy
+    @param retries: retries of failed connections, reads and 5xx responses
+    @param backoff_factor: base of the exponential sleep between retries
+    @param pool_connections: number of hosts whose connections are kept
+    @param pool_maxsize: connections kept per host
+    @return: requests.Session
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=_retry_policy(retries, backoff_factor),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session() -> requests.Session:
+    """
+    return the shared session, creating it on first use
+    @return: requests.Session
+    """
+    global _session
+    session = _session
+    if session is None:
+        with _lock:
+            if _session is None:
+                _session = build_session(
+                    retries=_config["retries"],
+                    backoff_factor=_config["backoff_factor"],
+                    pool_connections=_config["pool_connections"],
+                    pool_maxsize=_config["pool_maxsize"],
+                )
+            session = _session
+    return session
+
+
+def get_timeout() -> Timeout:
+    """
+    @return: the default timeout of translation requests
+    """
+    return _config["timeout"]
+
+
+def get_settings() -> dict:
+    """
+    @return: the current session settings (timeout, retries, backoff_factor,
+    pool_connections, pool_maxsize), also used by the asyncio client
+    """
+    with _lock:
+        return dict(_config)
+
+
+def configure(
+    timeout: Timeout = None,
+    retries: Optional[int] = None,
+    backoff_factor: Optional[float] = None,
+    pool_connections: Optional[int] = None,
+    pool_maxsize: Optional[int] = None,
+):
+    """
+    change the shared session settings; arguments left as None keep their value.
+    The session is rebuilt on next use (requests in flight finish on the old one).
+    @param timeout: default (connect, read) timeout, or a single number for both
+    @param retries: retries of failed connections, reads and 5xx responses
+    @param backoff_factor: base of the exponential sleep between retries
+    @param pool_connections: number of hosts whose connections are kept
+    @param pool_maxsize: connections kept per host
+    """
+    global _session
+    with _lock:
+        for name, value in (
+            ("timeout", timeout),
+            ("retries", retries),
+            ("backoff_factor", backoff_factor),
+            ("pool_connections", pool_connections),
+            ("pool_maxsize", pool_maxsize),
+        ):
+            if value is not None:
+                _config[name] = value
+        _session = None
+
+
+def close_session():
+    """
+    close the shared session and its pooled connections
+    """
+    global _session
+    with _lock:
+        session, _session = _session, None
+    if session is not None:
+        session.close()
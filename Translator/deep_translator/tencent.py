@@ -11,8 +11,6 @@ import os
 import time
 from typing import List, Optional
 
-import requests
-
 from deep_translator.base import BaseTranslator
 from deep_translator.constants import (
     BASE_URLS,
@@ -105,7 +103,7 @@ class TencentTranslator(BaseTranslator):
 
             # Do the request and check the connection.
             try:
-                response = requests.get(self._base_url, params=params)
+                response = self._http_get(self._base_url, params=params)
             except ConnectionError:
                 raise ServerException(503)
             # If the answer is not success, raise server exception.
@@ -67,7 +67,7 @@ class YandexTranslator(BaseTranslator):
                 version=self.api_version, endpoint="getLangs"
             )
             print("url: ", url)
-            response = requests.get(
+            response = self._http_get(
                 url, params={"key": self.api_key}, proxies=proxies
             )
         except requests.exceptions.ConnectionError:
@@ -90,7 +90,7 @@ class YandexTranslator(BaseTranslator):
             url = self._base_url.format(
                 version=self.api_version, endpoint="detect"
             )
-            response = requests.post(url, data=params, proxies=proxies)
+            response = self._http_post(url, data=params, proxies=proxies)
 
         except RequestError:
             raise
@@ -124,7 +124,7 @@ class YandexTranslator(BaseTranslator):
                 url = self._base_url.format(
                     version=self.api_version, endpoint="translate"
                 )
-                response = requests.post(url, data=params, proxies=proxies)
+                response = self._http_post(url, data=params, proxies=proxies)
             except ConnectionError:
                 raise ServerException(503)
             else:
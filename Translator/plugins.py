@@ -1,22 +1,22 @@
-import re
+from text_rules import TextRules
+
+# Pre/post-processing rules of text_rules.json (see text_rules.py); edits to
+# the file are picked up without restarting
+text_rules = TextRules()
+
+def set_game(game_id):
+    # Adds the rules of this game (the "games" section of text_rules.json)
+    text_rules.set_game(game_id)
 
 def filter_text(extracted_text):
-    result = extracted_text
-    
-    result = result.replace("\n", "<br>")
-    result = result.replace("{", "")  # remove { sign in all positions of the text
-    result = result.replace("�", "")  # remove the first unknown sign in the text
-    result = re.sub(r"カ$", "", result)  # remove カ symbol at the end of the text
-    result = re.sub(r"987$", "?", result)  # replace number 987 at the end of the text with ?
-    result = re.sub(r"^:", "", result)  # remove colon at the beginning of the text
-    
+    result = text_rules.process_input(extracted_text)
     return result
 
 
 def process_input_text(input_text):
-    result1 = filter_text(input_text)
+    result1 = text_rules.process_input(input_text)
     return result1
 
 def process_output_text(output_text):
-    result1 = filter_text(output_text)
-    return result1
\ No newline at end of file
+    result1 = text_rules.process_output(output_text)
+    return result1
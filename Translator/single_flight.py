@@ -0,0 +1,197 @@
+"""
+Single-Flight Translation Requests
+==================================
+
+Coalesces concurrent requests for the same translation into one upstream
+call. Games often emit the same line from several hooks at once, and the
+Translator server gets the same sentence from several clients within
+milliseconds; without coalescing each copy is its own request to the
+engine. The first request of a key (the leader) calls the engine, the ones
+that arrive while it is in flight wait for its result (or its error).
+
+Keys are (engine, source language, target language, normalized text), the
+translation cache's key without the namespace: the translation of a text
+does not depend on the game. A key is only in flight until its call
+returns; lines seen before are served by the translation cache.
+
+Both blocking callers (plugin threads: do) and asyncio callers (the
+Translator server, the shared event loop of deep_translator: ado) can share
+one instance. An asyncio leader's call runs as its own task: cancelling a
+waiter (e.g. a line skipped by the Latest line only schedule) only cancels
+the upstream call once nobody waits for it any more.
+
+Example:
+--------
+flights = get_shared_flights()
+key = flights.key("google", "ja", "en", text)
+translation = flights.do(key, lambda: translator.translate(text))
+translation = await flights.ado(key, lambda: translator.atranslate(text))
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from functools import partial
+from typing import Awaitable, Callable, Optional
+
+from translation_cache import normalize_text
+
+
+class _Flight:
+    """An upstream call in flight, and the number of callers waiting for it."""
+
+    __slots__ = ('future', 'waiters', 'task', 'loop')
+
+    def __init__(self):
+        self.future = Future()
+        self.waiters = 1
+        self.task = None  # asyncio leader: the task running the call
+        self.loop = None
+
+
+class SingleFlight:
+    """
+    Table of the translations in flight, keyed by key().
+
+    Thread-safe.
+
+    Attributes:
+        stats (dict): 'requests' (calls of do/ado), 'upstream' (calls that
+            reached the engine), 'coalesced' (requests answered by another
+            request's call), 'errors' (upstream calls that failed), over all
+            engines; get_stats(engine) gives those of one engine
+    """
+
+    def __init__(self):
+        self.stats = self._new_stats()
+        self._engine_stats = {}  # engine -> counters like stats
+        self._lock = threading.Lock()
+        self._flights = {}  # key -> _Flight
+
+    @staticmethod
+    def _new_stats() -> dict:
+        return {'requests': 0, 'upstream': 0, 'coalesced': 0, 'errors': 0}
+
+    def _count(self, key, name):
+        self.stats[name] += 1
+        engine_stats = self._engine_stats.get(key[0])
+        if engine_stats is None:
+            engine_stats = self._engine_stats[key[0]] = self._new_stats()
+        engine_stats[name] += 1
+
+    @staticmethod
+    def key(engine: str, source: str, target: str, text: str) -> tuple:
+        return (engine or "", source or "", target or "", normalize_text(text))
+
+    def _join(self, key):
+        """The flight of key and whether the caller leads it (registers the caller)."""
+        with self._lock:
+            self._count(key, 'requests')
+            flight = self._flights.get(key)
+            if flight is not None and not flight.future.done():
+                flight.waiters += 1
+                self._count(key, 'coalesced')
+                return flight, False
+            flight = self._flights[key] = _Flight()
+            self._count(key, 'upstream')
+            return flight, True
+
+    def _land(self, key, flight, result=None, error=None):
+        with self._lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+            if error is not None and not isinstance(error, asyncio.CancelledError):
+                self._count(key, 'errors')
+        if flight.future.done():
+            return
+        if isinstance(error, asyncio.CancelledError):
+            flight.future.cancel()
+        elif error is not None:
+            flight.future.set_exception(error)
+        else:
+            flight.future.set_result(result)
+
+    def do(self, key, call: Callable):
+        """
+        Blocking: return call(), or the result of the call for key already
+        in flight (its exception is raised to every waiter).
+        """
+        flight, leader = self._join(key)
+        if leader:
+            try:
+                result = call()
+            except BaseException as e:
+                self._land(key, flight, error=e)
+                raise
+            self._land(key, flight, result)
+            return result
+        return flight.future.result()
+
+    async def ado(self, key, call: Callable[[], Awaitable]):
+        """
+        asyncio: await call() (a coroutine function), or the result of the
+        call for key already in flight.
+        """
+        flight, leader = self._join(key)
+        if leader:
+            flight.loop = asyncio.get_running_loop()
+            flight.task = asyncio.ensure_future(self._run(key, flight, call))
+            flight.task.add_done_callback(partial(self._task_done, key, flight))
+        try:
+            # Shielded: a waiter's cancellation must not cancel the shared future
+            return await asyncio.shield(asyncio.wrap_future(flight.future))
+        except asyncio.CancelledError:
+            with self._lock:
+                flight.waiters -= 1
+                abandoned = flight.waiters == 0
+            if abandoned and flight.task is not None and not flight.future.done():
+                flight.loop.call_soon_threadsafe(flight.task.cancel)
+            raise
+
+    async def _run(self, key, flight, call):
+        try:
+            result = await call()
+        except BaseException as e:
+            self._land(key, flight, error=e)
+            if not isinstance(e, Exception):
+                raise
+        else:
+            self._land(key, flight, result)
+
+    def _task_done(self, key, flight, task):
+        # A task cancelled before it started never ran _run
+        if not flight.future.done():
+            self._land(key, flight, error=asyncio.CancelledError())
+
+    @property
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._flights)
+
+    def get_stats(self, engine: Optional[str] = None) -> dict:
+        """
+        Counters, of one engine if given, plus the coalescing ratio
+        (coalesced / requests) and the keys in flight.
+        """
+        with self._lock:
+            if engine is None:
+                stats = dict(self.stats)
+                stats['in_flight'] = len(self._flights)
+            else:
+                stats = dict(self._engine_stats.get(engine) or self._new_stats())
+                stats['in_flight'] = sum(1 for key in self._flights if key[0] == engine)
+        stats['coalescing_ratio'] = stats['coalesced'] / stats['requests'] if stats['requests'] else 0.0
+        return stats
+
+
+_shared_flights = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_flights() -> SingleFlight:
+    """The process-wide table, shared by Main_Translator and the translator plugins."""
+    global _shared_flights
+    with _shared_lock:
+        if _shared_flights is None:
+            _shared_flights = SingleFlight()
+        return _shared_flights
@@ -0,0 +1,460 @@
+"""
+Text Rules
+==========
+
+Declarative pre/post-processing rules for the Translator: the text sent to
+the engine (input) and its translation (output) are rewritten by the rules
+of a JSON rules file (text_rules.json next to this module), instead of a
+chain of str.replace/re.sub calls edited by hand.
+
+Rules file:
+-----------
+{
+    "input": [
+        {"find": "\\n", "replace": "<br>"},
+        {"find": "{"},
+        {"pattern": "カ$", "pass": 1},
+        {"pattern": "987$", "replace": "?", "pass": 2}
+    ],
+    "output": [...],
+    "games": {
+        "<game profile id>": {"input": [...], "output": [...]}
+    }
+}
+
+A rule has either "find" (a literal text) or "pattern" (a regular
+expression), and optionally:
+- "replace": the replacement, "" (removal) by default. For patterns it is
+  a re template (\\1, \\g<name>)
+- "ignore_case": patterns only
+- "pass": rules of a later pass see the result of the earlier passes (0 by
+  default)
+- "enabled": false to keep a rule in the file without applying it
+- "comment": ignored
+
+The rules of a game are added to the common rules when that game is
+selected (set_game).
+
+Compilation:
+------------
+The rules of a pass are applied in one scan of the text, whatever their
+number. All the literals, and the literal text the patterns start with, are
+compiled into one trie-shaped regular expression (the regex engine's
+equivalent of Aho-Corasick: the characters that cannot start a rule are
+skipped in C), which finds the positions where a rule may apply. There the
+longest literal is replaced, or else the first pattern (in file order) that
+matches, each pattern being precompiled once. Replacements are not scanned
+again, so within a pass a rule does not see the replacements of another:
+use "pass" where a rule must.
+
+Patterns that do not start with literal text are found by a second
+expression of the same scan, which cannot skip ahead and so costs a little
+at every position; those of them with capturing groups, and the patterns
+with inline global flags ((?i)...), are applied after the scan, in file
+order. Patterns that can match the empty string ($, x*) replace it as
+re.sub does.
+"""
+
+import json
+import re
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+DEFAULT_RULES_PATH = Path(__file__).resolve().parent / "text_rules.json"
+RELOAD_INTERVAL = 2.0  # Seconds between checks of the rules file for changes
+
+# The rules of the previous hand-written filter_text, used when there is no
+# rules file. Its replacements ran one after the other: the patterns see the
+# text without "\n" and "{" (pass 1), and "987$" the text without a final
+# "カ" (pass 2)
+DEFAULT_RULES = [
+    {"find": "\n", "replace": "<br>"},
+    {"find": "{", "comment": "remove { sign in all positions of the text"},
+    {"find": "�", "comment": "remove the unknown sign"},
+    {"pattern": "カ$", "pass": 1, "comment": "remove カ symbol at the end of the text"},
+    {"pattern": "987$", "replace": "?", "pass": 2, "comment": "replace number 987 at the end of the text with ?"},
+    {"pattern": "^:", "pass": 1, "comment": "remove colon at the beginning of the text"},
+]
+DEFAULT_RULES_FILE = {"input": DEFAULT_RULES, "output": DEFAULT_RULES, "games": {}}
+
+RULE_KEYS = {"find", "pattern", "replace", "ignore_case", "pass", "enabled", "comment"}
+
+
+class RuleError(ValueError):
+    """An invalid rule or rules file."""
+
+
+def _parse_rule(data, where: str):
+    """(pass, find, pattern, replace, ignore_case) of a rule, or None if disabled."""
+    if not isinstance(data, dict):
+        raise RuleError(f"{where}: a rule must be an object")
+    unknown = set(data) - RULE_KEYS
+    if unknown:
+        raise RuleError(f"{where}: unknown keys {sorted(unknown)}")
+    if not data.get("enabled", True):
+        return None
+    find = data.get("find")
+    pattern = data.get("pattern")
+    if (find is None) == (pattern is None):
+        raise RuleError(f"{where}: a rule needs either \"find\" or \"pattern\"")
+    replace = data.get("replace", "")
+    if not isinstance(replace, str):
+        raise RuleError(f"{where}: \"replace\" must be a string")
+    stage = data.get("pass", 0)
+    if not isinstance(stage, int) or isinstance(stage, bool) or stage < 0:
+        raise RuleError(f"{where}: \"pass\" must be a number >= 0")
+    if find is not None:
+        if not isinstance(find, str) or not find:
+            raise RuleError(f"{where}: \"find\" must be a non-empty string")
+        return stage, find, None, replace, False
+    if not isinstance(pattern, str):
+        raise RuleError(f"{where}: \"pattern\" must be a string")
+    ignore_case = bool(data.get("ignore_case", False))
+    try:
+        re.compile(pattern, re.IGNORECASE if ignore_case else 0)
+    except re.error as e:
+        raise RuleError(f"{where}: invalid pattern {pattern!r}: {e}")
+    return stage, None, pattern, replace, ignore_case
+
+
+def _trie_pattern(literals) -> str:
+    """
+    A regular expression matching any of literals, longest first, factored as
+    a trie. Every alternative at the root starts with a plain character, so
+    re skips ahead to the characters a literal can start with.
+    """
+    trie = {}
+    for literal in literals:
+        node = trie
+        for char in literal:
+            node = node.setdefault(char, {})
+        node[''] = True
+
+    def build(node, root=False) -> str:
+        alternatives = []
+        leaves = []
+        for char in sorted(key for key in node if key):
+            child = node[char]
+            if len(child) == 1 and '' in child and not root:
+                leaves.append(char)
+            else:
+                alternatives.append(re.escape(char) + build(child))
+        if len(leaves) == 1:
+            alternatives.append(re.escape(leaves[0]))
+        elif leaves:
+            alternatives.append('[' + ''.join(re.escape(char) for char in leaves) + ']')
+        if not alternatives:
+            return ''
+        body = alternatives[0] if len(alternatives) == 1 else '(?:' + '|'.join(alternatives) + ')'
+        if '' in node:
+            # A literal ends here: the longer ones are tried first
+            return '(?:' + body + ')?' if len(alternatives) > 1 or len(body) > 1 else body + '?'
+        return body
+
+    return build(trie, root=True)
+
+
+REGEX_SPECIAL = set('\\.^$*+?{}[]|()')
+QUANTIFIERS = set('*+?{')
+# Global flags set inside a pattern: (?i), (?ms)...
+INLINE_FLAGS = re.compile(r'\(\?[aiLmsux]+\)')
+
+
+def _literal_prefix(pattern: str, ignore_case: bool) -> str:
+    """
+    Literal text every match of pattern starts with ("" if unknown): the
+    characters before the first special one (looking into a group the
+    pattern starts with), less one followed by a quantifier. Patterns with
+    an alternation have none.
+    """
+    if '|' in pattern:
+        return ''
+    start = 3 if pattern.startswith('(?:') else 1 if pattern.startswith('(') and pattern[1:2] != '?' else 0
+    prefix = []
+    for index in range(start, len(pattern)):
+        char = pattern[index]
+        if char in REGEX_SPECIAL:
+            if char in QUANTIFIERS and prefix:
+                prefix.pop()
+            elif char == ')' and pattern[index + 1:index + 2] in QUANTIFIERS:
+                # The group may match nothing
+                prefix = []
+            break
+        prefix.append(char)
+    prefix = ''.join(prefix)
+    if ignore_case and any(char.lower() != char or char.upper() != char for char in prefix):
+        return ''
+    return prefix
+
+
+def _non_empty_match(pattern, text: str, pos: int):
+    """The match of pattern at pos that re.sub takes after an empty one there, or None."""
+    matches = pattern.finditer(text, pos)
+    next(matches)
+    match = next(matches, None)
+    return match if match is not None and match.start() == pos else None
+
+
+class _Pass:
+    """
+    The compiled rules of one pass.
+
+    One expression (filter) finds the positions where a rule may match: the
+    literals and the literal prefixes of the patterns as a trie. The
+    patterns without a prefix have their own (free), which re cannot skip
+    through as fast. At each position found, the longest literal is
+    replaced, or else the first pattern (in file order) that matches there.
+    Patterns anchored at the start (^) are only tried at position 0. After
+    an empty match, as with re.sub, the rules get another try at the same
+    position for a non-empty one.
+    """
+
+    __slots__ = ('filter', 'free', 'literal', 'literals', 'by_char', 'unprefixed', 'anchored', 'anchored_prefixes',
+                 'at_start', 'standalone')
+
+    def __init__(self, rules):
+        self.literals = {}  # find -> replacement
+        self.by_char = {}  # first character -> [(index, pattern, replacement, expand)]
+        self.unprefixed = []  # patterns without a literal prefix, tried at every position found
+        self.anchored = []  # patterns starting with ^
+        self.standalone = []  # (pattern, replacement): applied after the scan
+        prefixes = []
+        unprefixed_sources = []
+        anchored_prefixes = []
+
+        for index, (_, find, pattern, replace, ignore_case) in enumerate(rules):
+            if find is not None:
+                self.literals.setdefault(find, replace)
+                continue
+            compiled = re.compile(pattern, re.IGNORECASE if ignore_case else 0)
+            entry = (index, compiled, replace, '\\' in replace)
+            if INLINE_FLAGS.search(pattern):
+                # Inline global flags ((?i)abc) would apply to the whole filter
+                self.standalone.append((compiled, replace))
+                continue
+            if pattern.startswith('^') and '|' not in pattern and not compiled.flags & re.MULTILINE:
+                self.anchored.append(entry)
+                anchored_prefixes.append(_literal_prefix(pattern[1:], ignore_case))
+                continue
+            prefix = _literal_prefix(pattern, ignore_case)
+            if prefix:
+                prefixes.append(prefix)
+                self.by_char.setdefault(prefix[0], []).append(entry)
+            elif compiled.groups:
+                # Its groups cannot be part of the filter
+                self.standalone.append((compiled, replace))
+            else:
+                self.unprefixed.append(entry)
+                unprefixed_sources.append(f"(?i:{pattern})" if ignore_case else f"(?:{pattern})")
+
+        # Patterns without a prefix can match after any character
+        for char, entries in self.by_char.items():
+            entries.extend(self.unprefixed)
+            entries.sort(key=lambda entry: entry[0])
+        # Position 0: the anchored patterns too, tried only if the text starts with their prefix
+        # (None: one of them has no prefix)
+        self.anchored_prefixes = tuple(anchored_prefixes) if all(anchored_prefixes) else None
+        self.at_start = {
+            char: sorted(entries + self.anchored, key=lambda entry: entry[0])
+            for char, entries in list(self.by_char.items()) + [('', self.unprefixed)]
+        }
+
+        starts = set(self.literals) | set(prefixes)
+        self.filter = re.compile(_trie_pattern(starts)).search if starts else None
+        self.free = re.compile('|'.join(unprefixed_sources)).search if unprefixed_sources else None
+        self.literal = re.compile(_trie_pattern(self.literals)).match if self.literals else None
+
+    def _resolve(self, text: str, pos: int, allow_empty: bool = True):
+        """(end, replacement) of the rule that applies at pos, or None."""
+        if self.literal is not None:
+            match = self.literal(text, pos)
+            if match is not None:
+                return match.end(), self.literals[match.group()]
+        char = text[pos:pos + 1]
+        if pos == 0 and self.anchored:
+            entries = self.at_start.get(char) or self.at_start['']
+        else:
+            entries = self.by_char.get(char, self.unprefixed)
+        for _, pattern, replace, expand in entries:
+            match = pattern.match(text, pos)
+            if match is not None and not allow_empty and match.end() == pos:
+                match = _non_empty_match(pattern, text, pos)
+            if match is not None:
+                return match.end(), match.expand(replace) if expand else replace
+        return None
+
+    def apply(self, text: str) -> str:
+        search = self.filter
+        free = self.free
+        anchored = self.anchored and (self.anchored_prefixes is None or text.startswith(self.anchored_prefixes))
+        if search is not None or free is not None or anchored:
+            size = len(text)
+            # Next position found by each expression (size + 1: none)
+            found = search(text) if search is not None else None
+            next_prefixed = found.start() if found is not None else size + 1
+            found = free(text) if free is not None else None
+            next_free = found.start() if found is not None else size + 1
+            pos = 0 if anchored else min(next_prefixed, next_free)
+            parts = []
+            last = 0  # text[last:] is not copied yet
+            allow_empty = True
+            while pos <= size:
+                resolved = self._resolve(text, pos, allow_empty)
+                if resolved is None:
+                    pos += 1
+                else:
+                    end, replacement = resolved
+                    parts.append(text[last:pos])
+                    parts.append(replacement)
+                    last = end
+                    if end == pos:
+                        # An empty match: a non-empty one may still follow here
+                        allow_empty = False
+                        continue
+                    pos = end
+                allow_empty = True
+                if pos > size:
+                    break
+                if next_prefixed < pos:
+                    found = search(text, pos)
+                    next_prefixed = found.start() if found is not None else size + 1
+                if next_free < pos:
+                    found = free(text, pos)
+                    next_free = found.start() if found is not None else size + 1
+                pos = min(next_prefixed, next_free)
+            if parts:
+                parts.append(text[last:])
+                text = ''.join(parts)
+        for pattern, replace in self.standalone:
+            text = pattern.sub(replace, text)
+        return text
+
+
+class RuleSet:
+    """
+    A compiled list of rules.
+
+    Example:
+        rules = RuleSet([{"find": "{"}, {"pattern": "カ$"}])
+        rules.apply(text)
+    """
+
+    def __init__(self, rules=(), where: str = "rules"):
+        parsed = []
+        for index, data in enumerate(rules):
+            rule = _parse_rule(data, f"{where}[{index}]")
+            if rule is not None:
+                parsed.append(rule)
+        self.count = len(parsed)
+        stages = sorted({rule[0] for rule in parsed})
+        self._passes = [_Pass([rule for rule in parsed if rule[0] == stage]) for stage in stages]
+        if len(self._passes) == 1:
+            self.apply = self._passes[0].apply
+
+    def apply(self, text: str) -> str:
+        for stage in self._passes:
+            text = stage.apply(text)
+        return text
+
+    def __len__(self):
+        return self.count
+
+
+class TextRules:
+    """
+    The input and output rules of a rules file, per game, reloaded when
+    the file changes (checked at most every RELOAD_INTERVAL seconds).
+
+    An invalid file is reported on stderr and the rules in use are kept;
+    DEFAULT_RULES_FILE is used while no file exists.
+
+    Attributes:
+        path (Path): the rules file
+        game_id (str): the selected game ("" for none)
+        last_error (str): why the file was last rejected, or None
+    """
+
+    def __init__(self, path=DEFAULT_RULES_PATH, game_id: str = ""):
+        self.path = Path(path)
+        self.game_id = game_id or ""
+        self.last_error = None
+        self._lock = threading.Lock()
+        self._data = DEFAULT_RULES_FILE
+        self._signature = None
+        self._checked = 0.0
+        self._compiled = {}  # (direction, game id) -> RuleSet
+        self._load()
+
+    def _load(self):
+        try:
+            stat = self.path.stat()
+            signature = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            signature = None
+        if signature == self._signature:
+            return
+        self._signature = signature
+        if signature is None:
+            data = DEFAULT_RULES_FILE
+        else:
+            try:
+                data = json.loads(self.path.read_text(encoding='utf-8'))
+                self._validate(data)
+            except (OSError, ValueError, re.error) as e:
+                self.last_error = f"{self.path.name}: {e}"
+                print(f"Text rules not loaded, keeping the previous rules: {self.last_error}", file=sys.stderr)
+                return
+        self.last_error = None
+        self._data = data
+        self._compiled = {}
+
+    @staticmethod
+    def _validate(data):
+        if not isinstance(data, dict):
+            raise RuleError("the rules file must be an object")
+        games = data.get("games", {})
+        if not isinstance(games, dict):
+            raise RuleError("\"games\" must be an object")
+        sections = [("", data)] + [(f"games.{game_id}.", rules) for game_id, rules in games.items()]
+        for prefix, section in sections:
+            for direction in ("input", "output"):
+                rules = section.get(direction, [])
+                if not isinstance(rules, list):
+                    raise RuleError(f"{prefix}{direction} must be a list")
+                # Compiling checks every rule
+                RuleSet(rules, f"{prefix}{direction}")
+
+    def _check(self):
+        now = time.monotonic()
+        if now - self._checked >= RELOAD_INTERVAL:
+            with self._lock:
+                self._checked = now
+                self._load()
+
+    def set_game(self, game_id: Optional[str]):
+        """Select the game whose rules are added to the common ones."""
+        self.game_id = game_id or ""
+
+    def rules(self, direction: str, game_id: Optional[str] = None) -> RuleSet:
+        """The compiled rules of direction ("input" or "output") for a game (the selected one by default)."""
+        self._check()
+        if game_id is None:
+            game_id = self.game_id
+        key = (direction, game_id)
+        compiled = self._compiled.get(key)
+        if compiled is None:
+            rules = list(self._data.get(direction, []))
+            game = self._data.get("games", {}).get(game_id) if game_id else None
+            if game:
+                rules.extend(game.get(direction, []))
+            compiled = self._compiled[key] = RuleSet(rules, direction)
+        return compiled
+
+    def process_input(self, text: str) -> str:
+        return self.rules("input").apply(text)
+
+    def process_output(self, text: str) -> str:
+        return self.rules("output").apply(text)
@@ -0,0 +1,340 @@
+"""
+Translation Cache
+=================
+
+Persistent cache of translations shared by the translator plugins and the
+Translator server. Visual novels repeat the same lines constantly (menus,
+choices, replays, the backlog, re-reading after a load), so most lines only
+ever need to be translated once.
+
+Entries are keyed by (namespace, engine, source language, target language,
+normalized text). The namespace is the game profile id, so two games never
+share a line's translation; "" is the shared namespace used when no game is
+known (e.g. by the Translator server).
+
+Storage is a SQLite database (WAL mode, safe to share between processes)
+with a small in-memory LRU in front of it, so repeated lines are served
+from memory in microseconds. Writes and last-used updates are batched and
+committed every FLUSH_INTERVAL seconds or FLUSH_BATCH changes, and the
+least recently used entries are evicted beyond max_entries. Writes that
+could not be committed (e.g. the database is locked by another process)
+are kept and tried again on a later flush.
+
+The database lives in the user's data folder (DEFAULT_CACHE_PATH), and is
+only opened by the first lookup or write: with caching turned off, no file
+is created.
+
+Example:
+--------
+cache = get_shared_cache()
+translation = cache.get("google", "ja", "en", text)
+if translation is None:
+    translation = translator.translate(text)
+    cache.put("google", "ja", "en", text, translation)
+"""
+
+import atexit
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+APP_NAME = "SugoiHook"
+
+
+def user_data_dir() -> Path:
+    """Per-user folder of the data kept between runs (%LOCALAPPDATA%\\SugoiHook on Windows)."""
+    if sys.platform == 'win32':
+        base = os.environ.get('LOCALAPPDATA') or os.environ.get('APPDATA')
+        base = Path(base) if base else Path.home() / "AppData" / "Local"
+    else:
+        base = Path(os.environ.get('XDG_DATA_HOME') or Path.home() / ".local" / "share")
+    return base / APP_NAME
+
+
+DEFAULT_CACHE_PATH = user_data_dir() / "translation_cache.db"
+
+MAX_ENTRIES = 200000  # Entries kept on disk (least recently used are evicted)
+MEMORY_ENTRIES = 4096  # Entries kept in the in-memory LRU
+FLUSH_INTERVAL = 2.0  # Seconds between commits of batched writes (and retries of a failed commit)
+FLUSH_BATCH = 64  # Commit once this many changes are pending
+MAX_PENDING = 8192  # Writes kept while commits fail (the oldest are dropped beyond)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS translations (
+    namespace TEXT NOT NULL,
+    engine TEXT NOT NULL,
+    source TEXT NOT NULL,
+    target TEXT NOT NULL,
+    text TEXT NOT NULL,
+    translation TEXT NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (namespace, engine, source, target, text)
+);
+CREATE INDEX IF NOT EXISTS translations_last_used ON translations (last_used);
+"""
+
+
+def normalize_text(text: str) -> str:
+    """Cache key form of a text: surrounding whitespace removed, inner runs collapsed."""
+    return ' '.join(text.split())
+
+
+class TranslationCache:
+    """
+    On-disk translation cache with an in-memory LRU.
+
+    Thread-safe: one connection is shared behind a lock, so plugin worker
+    threads can use the same instance. The database is opened by the first
+    get/put; if it cannot be, the cache works from memory only.
+
+    Attributes:
+        namespace (str): default namespace (the current game profile id)
+        stats (dict): 'hits', 'memory_hits', 'misses', 'writes', 'evictions',
+            'flush_errors' (failed commits, retried later), 'dropped_writes'
+            (writes given up on while commits failed)
+        open_error (str): why the database could not be opened, or None
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_entries: int = MAX_ENTRIES,
+                 memory_entries: int = MEMORY_ENTRIES, namespace: str = ""):
+        self.path = Path(path)
+        self.max_entries = max(1, max_entries)
+        self.memory_entries = max(1, memory_entries)
+        self.namespace = namespace or ""
+        self.stats = {'hits': 0, 'memory_hits': 0, 'misses': 0, 'writes': 0, 'evictions': 0,
+                      'flush_errors': 0, 'dropped_writes': 0}
+        self.open_error = None
+
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()  # key -> translation, least recently used first
+        self._pending_puts = {}  # key -> translation, not yet committed (oldest first)
+        self._pending_touches = set()  # keys whose last_used needs updating
+        self._last_flush = time.monotonic()
+        self._retry_at = 0.0  # time.monotonic() before which a failed commit is not retried
+        self._conn = None
+        self._opened = False  # opened (or tried to) once; close() does not reopen it
+        self._count = 0
+
+    def _open_locked(self):
+        """The connection, opened on first use (None if it failed or was closed)."""
+        if self._opened:
+            return self._conn
+        self._opened = True
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+            try:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.executescript(SCHEMA)
+                self._count = conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+            except sqlite3.Error:
+                conn.close()
+                raise
+        except (sqlite3.Error, OSError) as e:
+            self.open_error = f"{self.path}: {e}"
+            return None
+        self._conn = conn
+        return conn
+
+    def _key(self, engine, source, target, text, namespace):
+        if namespace is None:
+            namespace = self.namespace
+        return (namespace or "", engine or "", source or "", target or "", normalize_text(text))
+
+    def get(self, engine: str, source: str, target: str, text: str,
+            namespace: Optional[str] = None) -> Optional[str]:
+        """Return the cached translation of text, or None."""
+        key = self._key(engine, source, target, text, namespace)
+        with self._lock:
+            memory = self._memory
+            translation = memory.get(key)
+            if translation is not None:
+                memory.move_to_end(key)
+                self._pending_touches.add(key)
+                self.stats['hits'] += 1
+                self.stats['memory_hits'] += 1
+                self._maybe_flush()
+                return translation
+
+            conn = self._open_locked()
+            if conn is None:
+                self.stats['misses'] += 1
+                return None
+            row = conn.execute(
+                "SELECT translation FROM translations "
+                "WHERE namespace=? AND engine=? AND source=? AND target=? AND text=?",
+                key,
+            ).fetchone()
+            if row is None:
+                self.stats['misses'] += 1
+                return None
+
+            translation = row[0]
+            self._remember(key, translation)
+            self._pending_touches.add(key)
+            self.stats['hits'] += 1
+            self._maybe_flush()
+            return translation
+
+    def put(self, engine: str, source: str, target: str, text: str, translation: str,
+            namespace: Optional[str] = None):
+        """Store a translation (empty translations are not cached)."""
+        if not translation or not text or not text.strip():
+            return
+        key = self._key(engine, source, target, text, namespace)
+        with self._lock:
+            self._remember(key, translation)
+            self._pending_puts[key] = translation
+            self._pending_touches.discard(key)
+            self.stats['writes'] += 1
+            self._maybe_flush()
+
+    def _remember(self, key, translation):
+        memory = self._memory
+        memory[key] = translation
+        memory.move_to_end(key)
+        while len(memory) > self.memory_entries:
+            memory.popitem(last=False)
+
+    def _maybe_flush(self):
+        pending = len(self._pending_puts) + len(self._pending_touches)
+        if not pending:
+            return
+        now = time.monotonic()
+        if now >= self._retry_at and (pending >= FLUSH_BATCH or now - self._last_flush >= FLUSH_INTERVAL):
+            self._flush_locked()
+
+    def _flush_locked(self):
+        self._last_flush = time.monotonic()
+        puts = self._pending_puts
+        touches = self._pending_touches
+        if not puts and not touches:
+            return
+        conn = self._open_locked()
+        self._pending_puts = {}
+        self._pending_touches = set()
+        if conn is None:
+            # Memory only
+            return
+
+        now = time.time()
+        added = 0
+        evicted = 0
+        try:
+            conn.execute("BEGIN")
+            if puts:
+                before = conn.total_changes
+                conn.executemany(
+                    "INSERT OR IGNORE INTO translations "
+                    "(namespace, engine, source, target, text, translation, last_used) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [key + (translation, now) for key, translation in puts.items()],
+                )
+                added = conn.total_changes - before
+                # Existing entries (e.g. written by another process) get the new translation
+                conn.executemany(
+                    "UPDATE translations SET translation=?, last_used=? "
+                    "WHERE namespace=? AND engine=? AND source=? AND target=? AND text=?",
+                    [(translation, now) + key for key, translation in puts.items()],
+                )
+            if touches:
+                conn.executemany(
+                    "UPDATE translations SET last_used=? "
+                    "WHERE namespace=? AND engine=? AND source=? AND target=? AND text=?",
+                    [(now,) + key for key in touches],
+                )
+            if self._count + added > self.max_entries:
+                evicted = self._count + added - self.max_entries
+                conn.execute(
+                    "DELETE FROM translations WHERE rowid IN "
+                    "(SELECT rowid FROM translations ORDER BY last_used LIMIT ?)",
+                    (evicted,),
+                )
+            conn.execute("COMMIT")
+        except sqlite3.Error:
+            try:
+                conn.execute("ROLLBACK")
+            except sqlite3.Error:
+                pass
+            # Kept for a later flush (the oldest are dropped beyond MAX_PENDING)
+            self.stats['flush_errors'] += 1
+            self._retry_at = self._last_flush + FLUSH_INTERVAL
+            while len(puts) > MAX_PENDING:
+                del puts[next(iter(puts))]
+                self.stats['dropped_writes'] += 1
+            self._pending_puts = puts
+            self._pending_touches = touches
+            return
+        self._count += added - evicted
+        self.stats['evictions'] += evicted
+
+    def flush(self):
+        """Commit batched writes now."""
+        with self._lock:
+            self._flush_locked()
+
+    def clear(self, namespace: Optional[str] = None):
+        """Remove every entry, or only those of one namespace."""
+        with self._lock:
+            self._pending_puts = {}
+            self._pending_touches = set()
+            conn = self._open_locked()
+            if conn is None:
+                self._memory.clear()
+                return
+            if namespace is None:
+                self._memory.clear()
+                conn.execute("DELETE FROM translations")
+            else:
+                for key in [key for key in self._memory if key[0] == namespace]:
+                    del self._memory[key]
+                conn.execute("DELETE FROM translations WHERE namespace=?", (namespace,))
+            self._count = conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._flush_locked()
+            self._opened = True
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def __len__(self):
+        with self._lock:
+            self._open_locked()
+            return self._count
+
+    def get_stats(self) -> dict:
+        """Counters plus the hit rate and entry counts."""
+        with self._lock:
+            stats = dict(self.stats)
+            stats['entries'] = self._count
+            stats['memory_entries'] = len(self._memory)
+            stats['pending_writes'] = len(self._pending_puts)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
+
+
+_shared_cache = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_cache(path=None) -> TranslationCache:
+    """
+    The process-wide cache (its database opened by the first lookup or
+    write, committed at exit). If the database cannot be opened, the cache
+    keeps translations in memory only (open_error says why).
+    """
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = TranslationCache(path or DEFAULT_CACHE_PATH)
+            atexit.register(_shared_cache.close)
+        return _shared_cache
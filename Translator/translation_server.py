@@ -0,0 +1,503 @@
+"""
+Translation Server
+==================
+
+asyncio HTTP server for Main_Translator (Google Translate through
+deep_translator), serving the Sugoi toolkit clients.
+
+Requests are handled concurrently: translations are awaited on the event
+loop (Main_Translator.atranslate), so a client no longer waits for the
+upstream calls of the clients before it. At most max_concurrency upstream
+translations are in flight per worker.
+
+Endpoints:
+----------
+POST /                 {"message": ..., "content": ...}, the toolkit's
+                       control protocol (see change_language.request_server):
+                       "check if server is ready", "translate sentences"
+                       (a string, or a list of strings), "translate batch",
+                       "change input language", "change output language",
+                       "change game" (game specific text rules), "pause",
+                       "resume" and "close server". The answer is the
+                       result, JSON encoded.
+POST /translate_batch  {"content": [texts]}: answered as NDJSON, one
+                       {"index": i, "translation": "..."} line per text (or
+                       {"index": i, "error": "..."}) as soon as it is
+                       translated, in completion order
+GET  /stats            counters of the worker that answers, with its
+                       request coalescing counters (single_flight)
+
+With --workers N, N processes accept connections on the same socket; a
+language change, pause, resume or close received by one worker is applied
+by all of them.
+
+Usage:
+------
+python translation_server.py                      # port of User-Settings.json
+python translation_server.py --port 14366 --workers 4
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import socket
+import threading
+from http import HTTPStatus
+from multiprocessing.connection import wait
+from typing import Optional
+from urllib.parse import urlsplit
+
+DEFAULT_HOST = '0.0.0.0'
+MAX_CONCURRENCY = 16  # Upstream translations in flight per worker
+MAX_BODY_BYTES = 16 * 1024 * 1024
+KEEP_ALIVE_TIMEOUT = 60  # Seconds an idle client connection is kept open
+
+PAUSED_MESSAGE = "Translation is paused at the moment"
+# Messages that change the translator's state, applied by every worker
+BROADCAST_MESSAGES = ("change input language", "change output language", "change game", "pause", "resume")
+
+
+class HTTPError(Exception):
+    """A request the server answers with an error status."""
+
+    def __init__(self, status: int, reason: str):
+        super().__init__(reason)
+        self.status = status
+        self.reason = reason
+
+
+class TranslationServer:
+    """
+    One worker: an asyncio HTTP server around a Main_Translator.
+
+    Attributes:
+        translator: the Main_Translator (activated)
+        max_concurrency (int): upstream translations in flight at once
+        stats (dict): connections, requests, translations, errors,
+            in_flight and max_in_flight
+    """
+
+    def __init__(self, translator, max_concurrency: int = MAX_CONCURRENCY, control=None):
+        """
+        Args:
+            translator: an activated Main_Translator
+            max_concurrency: upstream translations in flight at once
+            control: (receive, send) connections to the parent process in
+                multi-worker mode, to share state changes between workers
+        """
+        self.translator = translator
+        self.max_concurrency = max_concurrency
+        self.control = control
+        self.stats = {
+            'connections': 0,
+            'requests': 0,
+            'translations': 0,
+            'errors': 0,
+            'in_flight': 0,
+            'max_in_flight': 0,
+        }
+        self._server = None
+        self._loop = None
+        self._semaphore = None
+        self._closed = None
+        self._close_requested = False
+
+    @property
+    def port(self) -> int:
+        return self._server.sockets[0].getsockname()[1]
+
+    async def start(self, host: str = DEFAULT_HOST, port: int = 0, sock: Optional[socket.socket] = None):
+        """Start accepting connections (on sock if given, else on host:port)."""
+        self._loop = asyncio.get_running_loop()
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._closed = asyncio.Event()
+        if sock is not None:
+            self._server = await asyncio.start_server(self._handle_connection, sock=sock)
+        else:
+            self._server = await asyncio.start_server(self._handle_connection, host, port)
+        if self.control is not None:
+            threading.Thread(target=self._listen_control, daemon=True).start()
+
+    async def serve(self, host: str = DEFAULT_HOST, port: int = 0, sock: Optional[socket.socket] = None):
+        """Start, and serve until close() (e.g. the "close server" message)."""
+        await self.start(host, port, sock)
+        async with self._server:
+            await self._closed.wait()
+
+    def close(self):
+        if self._closed is not None:
+            self._closed.set()
+
+    # ==================== TRANSLATION ====================
+
+    async def translate(self, text: str) -> str:
+        async with self._semaphore:
+            self.stats['in_flight'] += 1
+            self.stats['max_in_flight'] = max(self.stats['max_in_flight'], self.stats['in_flight'])
+            try:
+                translation = await self.translator.atranslate(text)
+            except Exception:
+                self.stats['errors'] += 1
+                raise
+            finally:
+                self.stats['in_flight'] -= 1
+            self.stats['translations'] += 1
+            return translation
+
+    async def translate_batch(self, texts: list):
+        if self.translator.stop_translation:
+            return PAUSED_MESSAGE
+        # Each distinct text is translated once, all of them concurrently
+        unique = list(dict.fromkeys(texts))
+        translations = dict(zip(unique, await asyncio.gather(*(self.translate(text) for text in unique))))
+        return [translations[text] for text in texts]
+
+    async def handle_message(self, message: str, content):
+        """Answer a message of the toolkit's control protocol."""
+        if message == "check if server is ready":
+            return self.translator.translator_ready_or_not
+        if message in ("translate sentences", "translate batch"):
+            if isinstance(content, list):
+                return await self.translate_batch(content)
+            if not isinstance(content, str):
+                raise HTTPError(400, "content must be a string or a list of strings")
+            return await self.translate(content)
+        if message == "close server":
+            self._close_requested = True
+            self._broadcast(message, content)
+            return "server closed"
+        if message in BROADCAST_MESSAGES:
+            result = self.apply(message, content)
+            self._broadcast(message, content)
+            return result
+        raise HTTPError(400, f"unknown message {message!r}")
+
+    def apply(self, message: str, content):
+        """Apply a state change (language, game, pause/resume) to this worker's translator."""
+        if message == "change input language":
+            return self.translator.change_input_language(content)
+        if message == "change output language":
+            return self.translator.change_output_language(content)
+        if message == "change game":
+            return self.translator.change_game(content)
+        if message == "pause":
+            self.translator.pause()
+            return "translation paused"
+        if message == "resume":
+            self.translator.resume()
+            return "translation resumed"
+        return None
+
+    # ==================== MULTI-WORKER CONTROL ====================
+
+    def _broadcast(self, message: str, content):
+        if self.control is not None:
+            try:
+                self.control[1].send((message, content))
+            except (OSError, EOFError):
+                pass
+
+    def _listen_control(self):
+        """Apply the state changes other workers received (control thread)."""
+        receive = self.control[0]
+        while True:
+            try:
+                message, content = receive.recv()
+            except (OSError, EOFError):
+                break
+            self._loop.call_soon_threadsafe(self._apply_control, message, content)
+
+    def _apply_control(self, message: str, content):
+        if message == "close server":
+            self.close()
+        else:
+            self.apply(message, content)
+
+    # ==================== HTTP ====================
+
+    async def _handle_connection(self, reader, writer):
+        self.stats['connections'] += 1
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(self._read_request(reader), KEEP_ALIVE_TIMEOUT)
+                except HTTPError as e:
+                    await self._send_json(writer, e.status, {'error': e.reason}, keep_alive=False)
+                    break
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError):
+                    break
+                if request is None:
+                    break
+
+                method, path, keep_alive, body = request
+                self.stats['requests'] += 1
+                try:
+                    await self._dispatch(writer, method, path, keep_alive, body)
+                except HTTPError as e:
+                    await self._send_json(writer, e.status, {'error': e.reason}, keep_alive)
+                except ConnectionError:
+                    break
+                except Exception as e:
+                    await self._send_json(writer, 500, {'error': f"{e.__class__.__name__}: {e}"}, keep_alive)
+
+                if self._close_requested:
+                    self.close()
+                    break
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        except asyncio.CancelledError:
+            # Idle keep-alive connections are cancelled when the server closes
+            pass
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader):
+        """
+        Returns:
+            (method, path, keep_alive, body), or None if the client closed
+            the connection
+        """
+        try:
+            line = await reader.readline()
+            if not line:
+                return None
+            try:
+                method, target, version = line.decode('latin-1').split()
+            except ValueError:
+                raise HTTPError(400, "malformed request line")
+
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                headers[name.strip().lower()] = value.strip()
+        except (ValueError, asyncio.LimitOverrunError):
+            raise HTTPError(431, "request line or header too long")
+
+        if 'chunked' in headers.get('transfer-encoding', '').lower():
+            raise HTTPError(411, "a Content-Length is required")
+        try:
+            length = int(headers.get('content-length') or 0)
+        except ValueError:
+            raise HTTPError(400, "invalid Content-Length")
+        if length > MAX_BODY_BYTES:
+            raise HTTPError(413, "request body too large")
+        body = await reader.readexactly(length) if length else b''
+
+        connection = headers.get('connection', '').lower()
+        if version == 'HTTP/1.1':
+            keep_alive = connection != 'close'
+        else:
+            keep_alive = connection == 'keep-alive'
+        return method.upper(), urlsplit(target).path, keep_alive, body
+
+    async def _dispatch(self, writer, method: str, path: str, keep_alive: bool, body: bytes):
+        if path == '/stats':
+            if method != 'GET':
+                raise HTTPError(405, "use GET")
+            stats = dict(self.stats, pid=os.getpid())
+            if self.translator.flights is not None:
+                stats['coalescing'] = self.translator.flights.get_stats('google')
+            await self._send_json(writer, 200, stats, keep_alive)
+            return
+        if path not in ('/', '/translate_batch'):
+            raise HTTPError(404, f"no endpoint {path}")
+        if method != 'POST':
+            raise HTTPError(405, "use POST")
+        try:
+            payload = json.loads(body.decode('utf-8'))
+        except (UnicodeDecodeError, ValueError):
+            raise HTTPError(400, "the body must be JSON")
+        if not isinstance(payload, dict):
+            raise HTTPError(400, "the body must be a JSON object")
+
+        if path == '/':
+            result = await self.handle_message(payload.get('message'), payload.get('content'))
+            await self._send_json(writer, 200, result, keep_alive)
+        else:
+            texts = payload.get('content')
+            if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+                raise HTTPError(400, "content must be a list of strings")
+            await self._stream_batch(writer, texts, keep_alive)
+
+    async def _stream_batch(self, writer, texts: list, keep_alive: bool):
+        """Send one NDJSON line per text as its translation completes (chunked)."""
+        writer.write(self._head(200, 'application/x-ndjson; charset=utf-8', keep_alive,
+                                'Transfer-Encoding: chunked'))
+        indexes = {}
+        for index, text in enumerate(texts):
+            indexes.setdefault(text, []).append(index)
+
+        async def translate(text):
+            if self.translator.stop_translation:
+                return text, None, PAUSED_MESSAGE
+            try:
+                return text, await self.translate(text), None
+            except Exception as e:
+                return text, None, f"{e.__class__.__name__}: {e}"
+
+        tasks = [asyncio.ensure_future(translate(text)) for text in indexes]
+        try:
+            for future in asyncio.as_completed(tasks):
+                text, translation, error = await future
+                lines = []
+                for index in indexes[text]:
+                    if error is None:
+                        item = {'index': index, 'translation': translation}
+                    else:
+                        item = {'index': index, 'error': error}
+                    lines.append(json.dumps(item, ensure_ascii=False))
+                data = ('\n'.join(lines) + '\n').encode('utf-8')
+                writer.write(b'%x\r\n%s\r\n' % (len(data), data))
+                await writer.drain()
+            writer.write(b'0\r\n\r\n')
+            await writer.drain()
+        finally:
+            # The client went away: stop the translations nobody will read
+            for task in tasks:
+                task.cancel()
+
+    @staticmethod
+    def _head(status: int, content_type: str, keep_alive: bool, extra: str) -> bytes:
+        return (f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"{extra}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n").encode('latin-1')
+
+    async def _send_json(self, writer, status: int, result, keep_alive: bool):
+        body = json.dumps(result, ensure_ascii=False).encode('utf-8')
+        writer.write(self._head(status, 'application/json; charset=utf-8', keep_alive,
+                                f'Content-Length: {len(body)}') + body)
+        await writer.drain()
+
+
+def create_translator(translator_settings: dict, use_cache: bool = True, coalesce: bool = True):
+    """An activated Main_Translator."""
+    from Translator import Main_Translator
+
+    translator = Main_Translator(translator_settings)
+    if not use_cache:
+        translator.cache = None
+    if not coalesce:
+        translator.flights = None
+    translator.activate()
+    return translator
+
+
+def _run_worker(sock, control, translator_settings, max_concurrency, use_cache, coalesce):
+    """Entry point of a worker process."""
+    server = TranslationServer(create_translator(translator_settings, use_cache, coalesce), max_concurrency,
+                               control)
+    try:
+        asyncio.run(server.serve(sock=sock))
+    except KeyboardInterrupt:
+        pass
+
+
+def serve(translator_settings: dict, host: str = DEFAULT_HOST, port: int = 0, workers: int = 1,
+          max_concurrency: int = MAX_CONCURRENCY, use_cache: bool = True, coalesce: bool = True):
+    """
+    Run the server until it receives "close server".
+
+    With several workers, the listening socket is shared with worker
+    processes and this process relays the state changes between them.
+    """
+    if workers <= 1:
+        server = TranslationServer(create_translator(translator_settings, use_cache, coalesce), max_concurrency)
+
+        async def run():
+            await server.start(host, port)
+            print(f"Translation server listening on http://{host}:{server.port}", flush=True)
+            async with server._server:
+                await server._closed.wait()
+
+        try:
+            asyncio.run(run())
+        except KeyboardInterrupt:
+            pass
+        return
+
+    sock = socket.create_server((host, port), backlog=1024)
+    processes = []
+    for _ in range(workers):
+        parent_receive, child_send = multiprocessing.Pipe(duplex=False)
+        child_receive, parent_send = multiprocessing.Pipe(duplex=False)
+        process = multiprocessing.Process(
+            target=_run_worker,
+            args=(sock, (child_receive, child_send), translator_settings, max_concurrency, use_cache, coalesce),
+            daemon=True,
+        )
+        process.start()
+        child_receive.close()
+        child_send.close()
+        processes.append((process, parent_receive, parent_send))
+    print(f"Translation server listening on http://{host}:{sock.getsockname()[1]} ({workers} workers)",
+          flush=True)
+
+    try:
+        running = True
+        while running:
+            receivers = {receive: index for index, (_, receive, _) in enumerate(processes)}
+            sentinels = {process.sentinel for process, _, _ in processes}
+            for ready in wait(list(receivers) + list(sentinels)):
+                if ready in sentinels:
+                    # A worker stopped: stop the others
+                    running = False
+                    break
+                try:
+                    message, content = ready.recv()
+                except (OSError, EOFError):
+                    running = False
+                    break
+                for index, (_, _, send) in enumerate(processes):
+                    if index != receivers[ready]:
+                        try:
+                            send.send((message, content))
+                        except (OSError, EOFError):
+                            pass
+                if message == "close server":
+                    running = False
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for process, _, send in processes:
+            try:
+                send.send(("close server", None))
+            except (OSError, EOFError):
+                pass
+        for process, _, _ in processes:
+            process.join(5)
+            if process.is_alive():
+                process.terminate()
+        sock.close()
+
+
+def main(argv=None):
+    from Translator import USER_SETTINGS_PATH, load_translator_settings
+
+    parser = argparse.ArgumentParser(description="Google Translate server for the Sugoi toolkit")
+    parser.add_argument('--settings', default=USER_SETTINGS_PATH, help="path of User-Settings.json")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, help="default: HTTP_port_number of the settings")
+    parser.add_argument('--workers', type=int, default=1, help="worker processes sharing the port")
+    parser.add_argument('--max-concurrency', type=int, default=MAX_CONCURRENCY,
+                        help="upstream translations in flight per worker")
+    parser.add_argument('--no-cache', action='store_true', help="do not use the translation cache")
+    parser.add_argument('--no-coalesce', action='store_true',
+                        help="send every request upstream, even when the same text is already in flight")
+    args = parser.parse_args(argv)
+
+    translator_settings = load_translator_settings(args.settings)
+    port = args.port if args.port is not None else translator_settings["HTTP_port_number"]
+    serve(translator_settings, args.host, port, workers=args.workers,
+          max_concurrency=args.max_concurrency, use_cache=not args.no_cache, coalesce=not args.no_coalesce)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""
+Async Translation Benchmark
+===========================
+
+Compares the blocking and the asyncio translator APIs against the local stub
+servers of bench_batch_translation.py: for each engine, the same lines are
+translated with
+
+- translate in a loop (one line at a time)
+- translate_batch (per-line engines: a pool of batch_workers threads)
+- a thread pool with as many threads as the asyncio concurrency limit
+- atranslate_batch on one event loop (batch_async_limit requests at a time)
+
+and the throughput, request count, threads used and result order are
+reported. A cancellation run submits a batch to the shared event loop,
+cancels it shortly after, and checks that the requests in flight are
+abandoned and that the pool still works afterwards.
+
+Needs requests and beautifulsoup4. No network access is used.
+
+Usage:
+------
+python benchmarks/bench_async_translation.py --lines 200 --latency 0.05 --output async.json
+"""
+
+import argparse
+import http.server
+import json
+import platform
+import sys
+import threading
+import time
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from bench_batch_translation import StubHandler, make_engines, make_proxy_plugin, stub_translation
+from workloads import generate_plugin_inputs
+
+from deep_translator import async_http, session_pool
+
+
+class QuietServer(http.server.ThreadingHTTPServer):
+    """Cancelled requests close their connection before the answer is written."""
+
+    daemon_threads = True
+    request_queue_size = 64
+
+    def handle_error(self, request, client_address):
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+def client_threads() -> int:
+    """Live threads, without the stub server's request handlers."""
+    return sum(1 for thread in threading.enumerate() if 'process_request' not in thread.name)
+
+
+class ThreadCounter:
+    """Samples the number of live client threads while a run is going."""
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.peak = client_threads()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, client_threads())
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def run(name, function, texts):
+    before = StubHandler.requests.get(name, 0)
+    baseline_threads = client_threads()
+    with ThreadCounter() as threads:
+        start = time.perf_counter()
+        translations = function(texts)
+        elapsed = time.perf_counter() - start
+    return {
+        'requests': StubHandler.requests.get(name, 0) - before,
+        'elapsed_s': elapsed,
+        'lines_per_sec': len(texts) / elapsed if elapsed > 0 else 0.0,
+        # the sampler thread itself is not counted
+        'extra_threads': max(0, threads.peak - baseline_threads - 1),
+        'in_order': list(translations) == [stub_translation(text.strip()) for text in texts],
+    }
+
+
+def thread_pool_translate(engine, workers):
+    def translate(texts):
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(engine.translate, texts))
+    return translate
+
+
+def shared_loop(coroutine_function):
+    """Run on the shared event loop of async_http, as the GUI and plugins do."""
+    return lambda texts: async_http.submit(coroutine_function(texts)).result()
+
+
+def bench_cancellation(engine, texts, latency):
+    """Cancel a batch in flight; the abandoned requests must not be waited for."""
+    before = StubHandler.requests.get('google', 0)
+    future = async_http.submit(engine.atranslate_batch(texts))
+    time.sleep(latency / 2)
+    start = time.perf_counter()
+    future.cancel()
+    try:
+        future.result()
+        cancelled = False
+    except CancelledError:
+        cancelled = True
+    cancel_s = time.perf_counter() - start
+    started = StubHandler.requests.get('google', 0) - before
+
+    # The connections of cancelled requests are closed, the next batch opens new ones
+    after = async_http.submit(engine.atranslate_batch(texts[:10])).result()
+    return {
+        'lines': len(texts),
+        'cancelled': cancelled,
+        'cancel_s': cancel_s,
+        'requests_started_before_cancel': started,
+        'next_batch_ok': after == [stub_translation(text) for text in texts[:10]],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the asyncio translator API against stub servers")
+    parser.add_argument('--lines', type=int, default=200, help="lines per batch")
+    parser.add_argument('--latency', type=float, default=0.05, help="stub server delay per request (s)")
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--output', help="write JSON results to this file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    StubHandler.latency = args.latency
+    server = QuietServer(('127.0.0.1', 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    # Connections of the blocking session, as many as the asyncio concurrency limit
+    engines = make_engines(base_url)
+    limit = engines['google'].batch_async_limit
+    session_pool.configure(pool_maxsize=limit)
+
+    texts = list(dict.fromkeys(
+        text.strip() for text in generate_plugin_inputs(args.lines * 4, seed=args.seed, selected=True)
+        if text.strip()
+    ))[:args.lines]
+
+    results = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'lines': len(texts),
+            'latency_s': args.latency,
+            'async_limit': limit,
+            'seed': args.seed,
+        },
+        'engines': {},
+    }
+    plugin = make_proxy_plugin(base_url)
+    try:
+        for name, engine in engines.items():
+            runs = {
+                'sequential': run(name, lambda batch: [engine.translate(text) for text in batch], texts),
+                'translate_batch': run(name, engine.translate_batch, texts),
+                f'threads_{limit}': run(name, thread_pool_translate(engine, limit), texts),
+                'atranslate_batch': run(name, shared_loop(engine.atranslate_batch), texts),
+            }
+            results['engines'][name] = runs
+        results['engines']['translator++'] = {
+            'translate_batch': run('translator++', plugin.translate_batch, texts),
+            'atranslate_batch': run('translator++', shared_loop(plugin.atranslate_batch), texts),
+        }
+        results['cancellation'] = bench_cancellation(engines['google'], texts, args.latency)
+    finally:
+        plugin.on_disable()
+        session_pool.close_session()
+        server.shutdown()
+
+    print(f"\n  {'engine':<14}{'run':<20}{'requests':>10}{'lines/s':>10}{'threads':>9}  in order",
+          file=sys.stderr)
+    for name, runs in results['engines'].items():
+        for run_name, summary in runs.items():
+            print(f"  {name:<14}{run_name:<20}{summary['requests']:>10}{summary['lines_per_sec']:>10.0f}"
+                  f"{summary['extra_threads']:>9}  {summary['in_order']}", file=sys.stderr)
+    print(f"\nCancellation: {results['cancellation']}", file=sys.stderr)
+
+    output = json.dumps(results, indent=2, ensure_ascii=False)
+    if args.output:
+        Path(args.output).write_text(output, encoding='utf-8')
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+"""
+Batch Translation Benchmark
+===========================
+
+Translates the same batch of dialogue lines with each deep_translator engine
+and with the Translator++ plugin, once with the old per-line loop and once
+with translate_batch, against local stub servers that answer like the real
+APIs after a fixed delay. Reports requests sent and wall time, checks that
+every translation comes back in input order, and writes JSON.
+
+- Google (no list API): one request per line, sent concurrently
+- DeepL (repeated "text" form fields), Microsoft (JSON list body),
+  LibreTranslate ("q" list) and Translator++ ("text" list): one request
+  per chunk
+
+Needs requests and beautifulsoup4. No network access is used.
+
+Usage:
+------
+python benchmarks/bench_batch_translation.py --lines 200 --latency 0.05 --output batch.json
+"""
+
+import argparse
+import http.server
+import json
+import platform
+import sys
+import threading
+import time
+import urllib.parse
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from hook_ingestion import load_plugin_module
+from plugins import add_translator_path
+from workloads import generate_plugin_inputs
+
+add_translator_path()
+
+from deep_translator import DeeplTranslator, GoogleTranslator, LibreTranslator, MicrosoftTranslator
+from deep_translator import session_pool
+
+
+def stub_translation(text: str) -> str:
+    return f"EN[{text}]"
+
+
+class StubHandler(http.server.BaseHTTPRequestHandler):
+    """Answers every engine's endpoint, after `latency` seconds per request."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    latency = 0.0
+    requests = {}
+    lock = threading.Lock()
+
+    def _count(self, engine):
+        with self.lock:
+            self.requests[engine] = self.requests.get(engine, 0) + 1
+        time.sleep(self.latency)
+
+    def _reply(self, body, content_type="application/json"):
+        data = body.encode('utf-8') if isinstance(body, str) else json.dumps(body).encode('utf-8')
+        self.send_response(200)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _body(self):
+        return self.rfile.read(int(self.headers.get("Content-Length", 0))).decode('utf-8')
+
+    def do_GET(self):
+        url = urllib.parse.urlparse(self.path)
+        query = urllib.parse.parse_qs(url.query)
+        if url.path.startswith("/google"):
+            self._count('google')
+            text = query.get('q', [''])[0]
+            self._reply(f'<html><div class="result-container">{stub_translation(text)}</div></html>',
+                        content_type="text/html")
+        elif url.path.startswith("/deepl/translate"):
+            self._count('deepl')
+            self._reply({'translations': [{'text': stub_translation(text)} for text in query.get('text', [])]})
+        else:
+            self.send_error(404)
+
+    def do_POST(self):
+        url = urllib.parse.urlparse(self.path)
+        path = url.path
+        body = self._body()
+        if path.startswith("/deepl/translate"):
+            self._count('deepl')
+            texts = urllib.parse.parse_qs(body).get('text', [])
+            self._reply({'translations': [{'text': stub_translation(text)} for text in texts]})
+        elif path.startswith("/microsoft"):
+            self._count('microsoft')
+            self._reply([{'translations': [{'text': stub_translation(item['text']), 'to': 'en'}]}
+                         for item in json.loads(body)])
+        elif path.startswith("/libre/translate"):
+            self._count('libre')
+            # translate sends the text in the query string, _translate_chunk a JSON list
+            q = json.loads(body)['q'] if body else urllib.parse.parse_qs(url.query)['q'][0]
+            if isinstance(q, list):
+                self._reply({'translatedText': [stub_translation(text) for text in q]})
+            else:
+                self._reply({'translatedText': stub_translation(q)})
+        elif path.startswith("/translator++"):
+            self._count('translator++')
+            self._reply({'translations': [{'text': stub_translation(text)} for text in json.loads(body)['text']]})
+        else:
+            self.send_error(404)
+
+    def log_message(self, *args):
+        pass
+
+
+class StubMicrosoftTranslator(MicrosoftTranslator):
+    """Skips the supported languages request made by the constructor."""
+
+    def _get_supported_languages(self):
+        return {"japanese": "ja", "english": "en"}
+
+
+def make_engines(base_url):
+    google = GoogleTranslator(source="ja", target="en")
+    google._base_url = base_url + "/google"
+    deepl = DeeplTranslator(source="ja", target="en", api_key="stub")
+    deepl._base_url = base_url + "/deepl/"
+    microsoft = StubMicrosoftTranslator(source="ja", target="en", api_key="stub")
+    microsoft._base_url = base_url + "/microsoft?api-version=3.0"
+    libre = LibreTranslator(source="ja", target="en", api_key="stub", custom_url=base_url + "/libre/")
+    return {'google': google, 'deepl': deepl, 'microsoft': microsoft, 'libre': libre}
+
+
+def make_proxy_plugin(base_url):
+    plugin = load_plugin_module(ROOT / "plugins" / "translation_proxy.py")
+    plugin.proxy_url = base_url + "/translator++"
+    plugin.source_lang = "ja"
+    plugin.on_enable()
+    return plugin
+
+
+def run(name, function, texts):
+    before = StubHandler.requests.get(name, 0)
+    start = time.perf_counter()
+    translations = function(texts)
+    elapsed = time.perf_counter() - start
+    expected = [stub_translation(text.strip()) for text in texts]
+    return {
+        'requests': StubHandler.requests.get(name, 0) - before,
+        'elapsed_s': elapsed,
+        'lines_per_sec': len(texts) / elapsed if elapsed > 0 else 0.0,
+        'in_order': list(translations) == expected,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark batch translation against stub servers")
+    parser.add_argument('--lines', type=int, default=200, help="lines per batch")
+    parser.add_argument('--latency', type=float, default=0.05, help="stub server delay per request (s)")
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--output', help="write JSON results to this file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    StubHandler.latency = args.latency
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    # Distinct non-empty lines, as the Translator server receives them
+    texts = list(dict.fromkeys(
+        text.strip() for text in generate_plugin_inputs(args.lines * 4, seed=args.seed, selected=True)
+        if text.strip()
+    ))[:args.lines]
+
+    results = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'lines': len(texts),
+            'latency_s': args.latency,
+            'seed': args.seed,
+        },
+        'engines': {},
+    }
+    runs = [
+        (name, lambda batch, engine=engine: [engine.translate(text) for text in batch],
+         lambda batch, engine=engine: engine.translate_batch(batch))
+        for name, engine in make_engines(base_url).items()
+    ]
+    plugin = make_proxy_plugin(base_url)
+    runs.append(('translator++', lambda batch: [plugin._request([text])[0] for text in batch],
+                 plugin.translate_batch))
+
+    try:
+        for name, sequential, batch in runs:
+            old = run(name, sequential, texts)
+            new = run(name, batch, texts)
+            results['engines'][name] = {
+                'sequential': old,
+                'batch': new,
+                'speedup': old['elapsed_s'] / new['elapsed_s'] if new['elapsed_s'] else 0.0,
+            }
+    finally:
+        plugin.on_disable()
+        session_pool.close_session()
+        server.shutdown()
+
+    print(f"\n  {'engine':<14}{'requests':>10}{'->':>4}{'batch':>7}{'seconds':>10}{'->':>4}{'batch':>8}"
+          f"{'speedup':>10}  in order", file=sys.stderr)
+    for name, summary in results['engines'].items():
+        old, new = summary['sequential'], summary['batch']
+        print(f"  {name:<14}{old['requests']:>10}{'':>4}{new['requests']:>7}{old['elapsed_s']:>10.2f}{'':>4}"
+              f"{new['elapsed_s']:>8.2f}{summary['speedup']:>9.1f}x  {old['in_order'] and new['in_order']}",
+              file=sys.stderr)
+
+    output = json.dumps(results, indent=2, ensure_ascii=False)
+    if args.output:
+        Path(args.output).write_text(output, encoding='utf-8')
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+"""
+Request Coalescing Benchmark
+============================
+
+Sends every line from several sources at the same instant, as when a game
+emits one line from several hooks or several clients ask the Translator
+server for the same sentence, against the local stub servers of
+bench_batch_translation.py, with request coalescing (single_flight) off and
+on:
+
+- google_background: the Google Translate plugin's background requests
+  (--hooks worker threads, one per hook)
+- google_sync: the Google Translate plugin translating in process_text
+- translator++: the Translator++ proxy plugin
+- server: Translator/translation_server.py, --hooks clients (--no-coalesce
+  for the run without coalescing)
+
+The copies of a line differ in surrounding spaces, as hooks often do.
+Reports the requests made, the requests the stub received, the coalescing
+ratio (share of requests answered without an upstream request) and the wall
+time, and checks every answer. The translation cache is off.
+
+Needs requests and beautifulsoup4. No network access is used.
+
+Usage:
+------
+python benchmarks/bench_coalescing.py --lines 40 --hooks 3 --latency 0.1 --output coalescing.json
+"""
+
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from bench_async_translation import QuietServer
+from bench_batch_translation import StubHandler, make_proxy_plugin, stub_translation
+from bench_translation_server import Client, free_port, start_server, stop_server
+from hook_ingestion import load_plugin_module
+from workloads import generate_plugin_inputs
+
+
+def hook_copies(text: str, hooks: int):
+    """The line as each hook emits it."""
+    return [(text, f" {text}", f"{text}  ")[hook % 3] for hook in range(hooks)]
+
+
+def google_answer(copy: str) -> str:
+    return stub_translation(copy.strip())
+
+
+def proxy_answer(copy: str) -> str:
+    return f"{copy.rstrip()}\n{stub_translation(copy.strip())}\n\n"
+
+
+def run_bursts(engine: str, translate, texts, hooks: int, expected) -> dict:
+    """
+    Call translate(copy) for every copy of every line, the copies of a line
+    from hooks threads at once; expected(copy) is the right answer.
+    """
+    answers = []
+    errors = []
+    lock = threading.Lock()
+
+    before = StubHandler.requests.get(engine, 0)
+    started = time.perf_counter()
+    for text in texts:
+        barrier = threading.Barrier(hooks)
+
+        def hook(copy, barrier=barrier):
+            barrier.wait()
+            try:
+                answer = translate(copy)
+            except Exception as e:
+                answer = f"{e.__class__.__name__}: {e}"
+            with lock:
+                (answers if answer == expected(copy) else errors).append(answer)
+
+        threads = [threading.Thread(target=hook, args=(copy,)) for copy in hook_copies(text, hooks)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    elapsed = time.perf_counter() - started
+
+    requests = len(texts) * hooks
+    upstream = StubHandler.requests.get(engine, 0) - before
+    return {
+        'requests': requests,
+        'upstream_requests': upstream,
+        'coalescing_ratio': 1.0 - upstream / requests if requests else 0.0,
+        'elapsed_s': elapsed,
+        'correct': len(answers),
+        'wrong': len(errors),
+        'first_wrong': errors[0] if errors else None,
+    }
+
+
+def make_google_plugin(base_url):
+    plugin = load_plugin_module(ROOT / "plugins" / "google_translate.py")
+    plugin.use_cache = False
+    plugin.source_lang = "ja"
+    plugin.enabled = True
+    plugin.on_enable()
+    plugin.translator._base_url = base_url + "/google"
+    return plugin
+
+
+def compare(run, plugin) -> dict:
+    flights = plugin.flights
+    plugin.flights = None
+    off = run()
+    plugin.flights = flights
+    on = run()
+    return {'off': off, 'on': on}
+
+
+def run_server(settings_path: Path, texts, hooks: int, coalesce: bool) -> dict:
+    port = free_port()
+    process = start_server(settings_path, port, [] if coalesce else ['--no-coalesce'])
+    clients = [Client(port) for _ in range(hooks)]
+    pool = list(clients)
+    lock = threading.Lock()
+    try:
+        def translate(copy):
+            with lock:
+                client = pool.pop()
+            try:
+                return client.send("translate sentences", copy)
+            finally:
+                with lock:
+                    pool.append(client)
+
+        result = run_bursts('google', translate, texts, hooks, google_answer)
+        clients[0].connection.request("GET", "/stats")
+        stats = json.loads(clients[0].connection.getresponse().read())
+        result['server_coalescing'] = stats.get('coalescing')
+    finally:
+        for client in clients:
+            client.close()
+        stop_server(process, port)
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the coalescing of identical in-flight translations")
+    parser.add_argument('--lines', type=int, default=40, help="distinct lines")
+    parser.add_argument('--hooks', type=int, default=3, help="copies of each line sent at once")
+    parser.add_argument('--latency', type=float, default=0.1, help="stub server delay per request (s)")
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--output', help="write JSON results to this file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    StubHandler.latency = args.latency
+    stub = QuietServer(('127.0.0.1', 0), StubHandler)
+    threading.Thread(target=stub.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{stub.server_address[1]}"
+
+    # Distinct lines, and none the Translator server's text filter would change
+    texts = list(dict.fromkeys(
+        text for text in (line.strip() for line in generate_plugin_inputs(args.lines * 8, seed=args.seed,
+                                                                          selected=True))
+        if text and not any(sign in text for sign in "{\n�:") and not text.endswith(("カ", "987"))
+    ))[:args.lines]
+
+    results = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'lines': len(texts),
+            'hooks': args.hooks,
+            'latency_s': args.latency,
+            'seed': args.seed,
+        },
+        'scenarios': {},
+    }
+    google = make_google_plugin(base_url)
+    proxy = make_proxy_plugin(base_url)
+    proxy.cache = None
+    try:
+        results['scenarios']['google_background'] = compare(
+            lambda: run_bursts('google', lambda copy: google._translate(copy).result(), texts, args.hooks,
+                               google_answer), google)
+        results['scenarios']['google_sync'] = compare(
+            lambda: run_bursts('google', google._translate_now, texts, args.hooks, google_answer), google)
+        results['scenarios']['translator++'] = compare(
+            lambda: run_bursts('translator++', proxy.process_text, texts, args.hooks, proxy_answer), proxy)
+
+        with tempfile.TemporaryDirectory() as temp:
+            settings_path = Path(temp) / "User-Settings.json"
+            settings_path.write_text(json.dumps({'Translation_API_Server': {'Google': {
+                'HTTP_port_number': 14366,
+                'supported_languages_list': {'Japanese': 'ja', 'English': 'en'},
+                'input_language': 'Japanese',
+                'output_language': 'English',
+                'base_url': base_url + "/google",
+            }}}), encoding='utf-8')
+            results['scenarios']['server'] = {
+                'off': run_server(settings_path, texts, args.hooks, coalesce=False),
+                'on': run_server(settings_path, texts, args.hooks, coalesce=True),
+            }
+    finally:
+        google.on_disable()
+        proxy.on_disable()
+        stub.shutdown()
+    results['plugin_coalescing'] = {
+        'google': google.get_stats().get('coalescing'),
+        'translator++': proxy.get_stats().get('coalescing'),
+    }
+
+    print(f"\n  {'scenario':<20}{'coalesce':<10}{'requests':>9}{'upstream':>10}{'ratio':>8}{'seconds':>9}{'wrong':>7}",
+          file=sys.stderr)
+    for name, runs in results['scenarios'].items():
+        for mode, summary in runs.items():
+            print(f"  {name:<20}{mode:<10}{summary['requests']:>9}{summary['upstream_requests']:>10}"
+                  f"{summary['coalescing_ratio']:>8.2f}{summary['elapsed_s']:>9.2f}{summary['wrong']:>7}",
+                  file=sys.stderr)
+
+    output = json.dumps(results, indent=2, ensure_ascii=False)
+    if args.output:
+        Path(args.output).write_text(output, encoding='utf-8')
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
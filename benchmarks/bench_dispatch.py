@@ -0,0 +1,128 @@
+"""
+Plugin Dispatch Benchmark
+=========================
+
+Measures the cost of PluginDispatcher.process itself, apart from the work
+of the plugins: chains of --sizes pass-through plugins (returning the text
+unchanged), and the offline text plugins of plugins/, run through
+
+- legacy: the previous loop, which rebuilt the execution order for every
+  line (plugin_order filtered by list membership in active_plugins) and
+  looked every plugin up by filename
+- compiled: the chain compiled once, with the per-plugin counters on
+
+Reports the time per line, and per plugin per line.
+
+Usage:
+------
+python benchmarks/bench_dispatch.py --lines 20000 --sizes 5,20,50 --output dispatch.json
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from bench_plugins import DEFAULT_PLUGINS, load_plugins, make_dispatcher
+from hook_ingestion import PluginDispatcher
+from plugins import TextractorPlugin
+from workloads import generate_plugin_inputs
+
+
+class PassThroughPlugin(TextractorPlugin):
+    name = "Pass Through"
+
+    def process_text(self, text):
+        return text
+
+
+def legacy_process(dispatcher: PluginDispatcher, text):
+    """The dispatch loop before the chain was compiled."""
+    current_text = text
+    execution_order = [p for p in dispatcher.plugin_order if p in dispatcher.active_plugins]
+    for plugin_filename in execution_order:
+        if plugin_filename in dispatcher.plugins:
+            plugin = dispatcher.plugins[plugin_filename]
+            if plugin.enabled:
+                try:
+                    result = plugin.process_text(current_text)
+                    if result is None:
+                        return None
+                    current_text = result
+                except Exception:
+                    pass
+    return current_text
+
+
+def time_lines(process, inputs, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in inputs:
+            process(text)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best / len(inputs) * 1e9
+
+
+def compare(make_plugins, inputs, repeat):
+    legacy = make_dispatcher(make_plugins())
+    compiled = make_dispatcher(make_plugins())
+    legacy_ns = time_lines(lambda text: legacy_process(legacy, text), inputs, repeat)
+    compiled_ns = time_lines(compiled.process, inputs, repeat)
+    return {
+        'plugins': len(compiled.plugins),
+        'legacy_ns_per_line': legacy_ns,
+        'compiled_ns_per_line': compiled_ns,
+        'speedup': legacy_ns / compiled_ns if compiled_ns else None,
+        'stats': compiled.get_stats(),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the plugin dispatch loop")
+    parser.add_argument('--lines', type=int, default=20000, help="lines per run")
+    parser.add_argument('--sizes', default="5,20,50", help="comma-separated pass-through chain lengths")
+    parser.add_argument('--repeat', type=int, default=5, help="runs per chain (the fastest is kept)")
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--output', help="write JSON results to this file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    inputs = list(generate_plugin_inputs(args.lines, seed=args.seed))
+    chains = {
+        f"pass_through_{size}": (lambda size=size: {f"pass_{i:03d}.py": PassThroughPlugin() for i in range(size)})
+        for size in map(int, args.sizes.split(','))
+    }
+    chains['text_plugins'] = lambda: load_plugins(DEFAULT_PLUGINS)
+
+    results = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'lines': len(inputs),
+            'repeat': args.repeat,
+            'seed': args.seed,
+        },
+        'chains': {name: compare(make_plugins, inputs, args.repeat) for name, make_plugins in chains.items()},
+    }
+
+    print(f"\n  {'chain':<20}{'plugins':>8}{'legacy ns':>12}{'compiled ns':>13}{'speedup':>9}", file=sys.stderr)
+    for name, summary in results['chains'].items():
+        print(f"  {name:<20}{summary['plugins']:>8}{summary['legacy_ns_per_line']:>12.0f}"
+              f"{summary['compiled_ns_per_line']:>13.0f}{summary['speedup']:>8.1f}x", file=sys.stderr)
+
+    output = json.dumps(results, indent=2, ensure_ascii=False)
+    if args.output:
+        Path(args.output).write_text(output, encoding='utf-8')
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
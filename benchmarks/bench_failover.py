@@ -0,0 +1,178 @@
+"""
+Multi-Engine Translation Benchmark
+==================================
+
+Translates dialogue lines one at a time (as the overlay does) through
+deep_translator's CompositeTranslator, against local stub servers with
+different latency profiles:
+
+- google: usually fast, but a share of requests stall (latency spikes)
+- libre: steady, slower than google's usual answer
+- deepl: steady and slow
+- google_down: an outage, every request times out
+
+and compares the engines alone with the failover, race and hedge modes,
+and an outage with and without the circuit breaker. Reports the per-line
+latency percentiles, lines lost, and every engine's counters and latency
+histogram (CompositeTranslator.get_stats), to pick the fastest setup.
+
+Connection retries are turned off (session_pool), so a timeout costs one
+timeout. Needs requests and beautifulsoup4. No network access is used.
+
+Usage:
+------
+python benchmarks/bench_failover.py --lines 60 --output failover.json
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from bench_async_translation import QuietServer
+from bench_batch_translation import StubHandler, make_engines, stub_translation
+from workloads import generate_plugin_inputs
+
+from deep_translator import CompositeTranslator, session_pool
+from deep_translator.composite import FAILOVER, HEDGE, RACE
+
+# engine -> (usual latency s, share of slow requests, slow latency s)
+PROFILES = {
+    'google': (0.04, 0.15, 1.5),
+    'libre': (0.15, 0.0, 0.0),
+    'deepl': (0.3, 0.0, 0.0),
+    'google_down': (10.0, 0.0, 0.0),
+}
+
+
+def start_server(profile, seed):
+    usual, slow_share, slow = profile
+    rng = random.Random(seed)
+    lock = threading.Lock()
+
+    class Handler(StubHandler):
+        def _count(self, engine):
+            with lock:
+                delay = slow if rng.random() < slow_share else usual
+            time.sleep(delay)
+
+    server = QuietServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(pct / 100.0 * len(values)))] * 1000.0 if values else None
+
+
+def run(translator, texts):
+    latencies = []
+    lost = 0
+    start = time.perf_counter()
+    for text in texts:
+        line_start = time.perf_counter()
+        try:
+            translated = translator.translate(text)
+        except Exception:
+            translated = None
+        latencies.append(time.perf_counter() - line_start)
+        if translated != stub_translation(text):
+            lost += 1
+    summary = {
+        'elapsed_s': time.perf_counter() - start,
+        'lost': lost,
+        'p50_ms': percentile(latencies, 50),
+        'p90_ms': percentile(latencies, 90),
+        'p99_ms': percentile(latencies, 99),
+        'max_ms': max(latencies) * 1000.0,
+    }
+    if isinstance(translator, CompositeTranslator):
+        summary['stats'] = translator.get_stats()
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark failover, racing and hedging across engines")
+    parser.add_argument('--lines', type=int, default=60, help="lines per run")
+    parser.add_argument('--hedge-after', type=float, default=0.2, help="seconds before the hedged request")
+    parser.add_argument('--timeout', type=float, default=0.5, help="request timeout (s)")
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--output', help="write JSON results to this file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    session_pool.configure(timeout=args.timeout, retries=0)
+    servers = {name: start_server(profile, args.seed + index)
+               for index, (name, profile) in enumerate(PROFILES.items())}
+
+    def engine(name):
+        server = servers[name]
+        engines = make_engines(f"http://127.0.0.1:{server.server_address[1]}")
+        return engines[name.split('_')[0]]
+
+    texts = list(dict.fromkeys(
+        text.strip() for text in generate_plugin_inputs(args.lines * 4, seed=args.seed, selected=True)
+        if text.strip()
+    ))[:args.lines]
+
+    def composite(names, mode, **options):
+        return CompositeTranslator([engine(name) for name in names], mode=mode, **options)
+
+    runs = {
+        'google': lambda: engine('google'),
+        'libre': lambda: engine('libre'),
+        'failover_google_libre': lambda: composite(['google', 'libre'], FAILOVER),
+        'race_google_libre': lambda: composite(['google', 'libre'], RACE),
+        'hedge_google_libre': lambda: composite(['google', 'libre'], HEDGE, hedge_after=args.hedge_after),
+        'hedge_google_libre_deepl': lambda: composite(['google', 'libre', 'deepl'], HEDGE,
+                                                      hedge_after=args.hedge_after),
+        'outage_no_breaker': lambda: composite(['google_down', 'libre'], FAILOVER, failure_threshold=10 ** 9),
+        'outage_breaker': lambda: composite(['google_down', 'libre'], FAILOVER, failure_threshold=3,
+                                            reset_timeout=60.0),
+    }
+    results = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'lines': len(texts),
+            'profiles': PROFILES,
+            'hedge_after_s': args.hedge_after,
+            'timeout_s': args.timeout,
+            'seed': args.seed,
+        },
+        'runs': {},
+    }
+    try:
+        for name, make in runs.items():
+            results['runs'][name] = run(make(), texts)
+    finally:
+        session_pool.close_session()
+        for server in servers.values():
+            server.shutdown()
+
+    print(f"\n  {'run':<28}{'lost':>6}{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}{'seconds':>9}  wins",
+          file=sys.stderr)
+    for name, summary in results['runs'].items():
+        wins = ''
+        if 'stats' in summary:
+            wins = ', '.join(f"{engine}={stats['wins']}" for engine, stats in summary['stats']['engines'].items())
+        print(f"  {name:<28}{summary['lost']:>6}{summary['p50_ms']:>9.0f}{summary['p90_ms']:>9.0f}"
+              f"{summary['p99_ms']:>9.0f}{summary['elapsed_s']:>9.2f}  {wins}", file=sys.stderr)
+
+    output = json.dumps(results, indent=2, ensure_ascii=False)
+    if args.output:
+        Path(args.output).write_text(output, encoding='utf-8')
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Google Page Parsing Benchmark
+=============================
+
+Times how GoogleTranslator pulls the translation out of a saved Google
+Translate page (benchmarks/fixtures/google/*.html):
+
+- bs4: BeautifulSoup(page, "html.parser") and soup.find, as translate used to
+- fast: GoogleTranslator._find_translation, which scans the page with
+  deep_translator.html_extract and only parses it when the scan is unsure
+
+Checks that both give the same text for every fixture (None when the page
+has no translation) and reports the time per page and the speedup.
+
+Needs beautifulsoup4 and requests (imported by deep_translator). No network
+access is used.
+
+Usage:
+------
+python benchmarks/bench_google_parsing.py --repeat 200 --output parsing.json
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from plugins import add_translator_path
+
+add_translator_path()
+
+from bs4 import BeautifulSoup
+
+from deep_translator import GoogleTranslator
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures" / "google"
+
+
+def bs4_translation(translator, page):
+    """The text translate used to read: the element, else the alternative one."""
+    soup = BeautifulSoup(page, "html.parser")
+    element = soup.find(translator._element_tag, translator._element_query)
+    if not element:
+        element = soup.find(translator._element_tag, translator._alt_element_query)
+        if not element:
+            return None
+    return element.get_text(strip=True)
+
+
+def time_per_page(function, page, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function(page)
+    return (time.perf_counter() - start) / repeat
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark Google page parsing against saved fixtures")
+    parser.add_argument('--repeat', type=int, default=200, help="parses per fixture and parser")
+    parser.add_argument('--fixtures', default=str(FIXTURES), help="directory of saved pages")
+    parser.add_argument('--output', help="write JSON results to this file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    translator = GoogleTranslator(source="ja", target="en")
+    pages = {path.stem: path.read_text(encoding='utf-8') for path in sorted(Path(args.fixtures).glob("*.html"))}
+
+    results = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'repeat': args.repeat,
+            'fixtures': len(pages),
+        },
+        'fixtures': {},
+    }
+    for name, page in pages.items():
+        expected = bs4_translation(translator, page)
+        translated = translator._find_translation(page)
+        old = time_per_page(lambda html: bs4_translation(translator, html), page, args.repeat)
+        new = time_per_page(translator._find_translation, page, args.repeat)
+        results['fixtures'][name] = {
+            'bytes': len(page.encode('utf-8')),
+            'translation': translated,
+            'identical': translated == expected,
+            'bs4_us': old * 1e6,
+            'fast_us': new * 1e6,
+            'speedup': old / new if new else 0.0,
+        }
+
+    summaries = results['fixtures'].values()
+    total_old = sum(summary['bs4_us'] for summary in summaries)
+    total_new = sum(summary['fast_us'] for summary in summaries)
+    results['all_identical'] = all(summary['identical'] for summary in summaries)
+    results['speedup'] = total_old / total_new if total_new else 0.0
+
+    print(f"\n  {'fixture':<20}{'bytes':>8}{'bs4 us':>10}{'fast us':>10}{'speedup':>10}  identical", file=sys.stderr)
+    for name, summary in results['fixtures'].items():
+        print(f"  {name:<20}{summary['bytes']:>8}{summary['bs4_us']:>10.1f}{summary['fast_us']:>10.1f}"
+              f"{summary['speedup']:>9.1f}x  {summary['identical']}", file=sys.stderr)
+    print(f"\n  overall speedup {results['speedup']:.1f}x, all identical: {results['all_identical']}",
+          file=sys.stderr)
+
+    output = json.dumps(results, indent=2, ensure_ascii=False)
+    if args.output:
+        Path(args.output).write_text(output, encoding='utf-8')
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Process Icon Cache Benchmark
+============================
+
+Measures the UI-thread cost of the process list icons, with a stub icon
+extractor drawing a 32x32 icon per executable (--icons temporary files):
+
+- legacy: every refresh extracted and rendered (LANCZOS resize, rounded
+  mask) every icon on the UI thread
+- cold: IconThumbnailCache (icon_cache.py) with an empty folder: the worker
+  renders and stores every icon
+- warm_disk: a new cache on the same folder (the next start of the app):
+  thumbnails are read back from the PNG files
+- warm_memory: the same cache on the next refresh: photos from the LRU
+
+Reports the UI-thread time per refresh (get_photo and drain calls), the
+time until every icon is delivered, and the cache counters. The photos are
+the PIL images themselves (no display here): creating the Tk photo stays on
+the UI thread and is not part of these times. Neither is the cost of
+ExtractIconEx, which only the Windows extractor has.
+
+Needs Pillow.
+
+Usage:
+------
+python benchmarks/bench_icon_cache.py --icons 150 --refreshes 5 --output icon_cache.json
+"""
+
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from icon_cache import CORNER_RADIUS, ICON_SIZE, THUMBNAIL_SIZE, IconExtractor, IconThumbnailCache, render_thumbnail
+
+
+class StubIconExtractor(IconExtractor):
+    """Draws a different gradient icon per executable."""
+
+    def extract(self, exe_path: str, size: int = ICON_SIZE):
+        from PIL import Image, ImageDraw
+        seed = sum(map(ord, exe_path))
+        image = Image.new('RGB', (size, size))
+        draw = ImageDraw.Draw(image)
+        for y in range(size):
+            draw.line([(0, y), (size - 1, y)], fill=((seed + 8 * y) % 256, (seed * 7) % 256, (255 - 8 * y) % 256))
+        draw.ellipse([(size // 4, size // 4), (3 * size // 4, 3 * size // 4)], fill=(seed % 256, 255, 128))
+        return image
+
+
+def legacy_refresh(extractor, exe_paths, size, radius) -> float:
+    """Seconds of UI-thread work of one refresh before the cache."""
+    started = time.perf_counter()
+    for exe_path in exe_paths:
+        icon = extractor.extract(exe_path, ICON_SIZE)
+        if icon is not None:
+            render_thumbnail(icon, size, radius)
+    return time.perf_counter() - started
+
+
+def cache_refresh(cache: IconThumbnailCache, exe_paths) -> dict:
+    """
+    One refresh: get_photo for every row, then drain every frame until each
+    icon is delivered. Includes the cache counters of the refresh.
+    """
+    before = dict(cache.stats)
+    ui = 0.0
+    started = time.perf_counter()
+    step = time.perf_counter()
+    missing = {exe_path for exe_path in exe_paths if cache.get_photo(exe_path) is None}
+    ui += time.perf_counter() - step
+    while missing:
+        time.sleep(0.001)
+        step = time.perf_counter()
+        delivered = cache.drain()
+        ui += time.perf_counter() - step
+        missing.difference_update(exe_path for exe_path, _ in delivered)
+    summary = {'ui_ms': ui * 1000.0, 'delivered_ms': (time.perf_counter() - started) * 1000.0}
+    summary.update({name: cache.stats[name] - before[name] for name in cache.stats})
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the process icon thumbnail cache")
+    parser.add_argument('--icons', type=int, default=150, help="executables in the process list")
+    parser.add_argument('--refreshes', type=int, default=5, help="refreshes per scenario (the fastest is kept)")
+    parser.add_argument('--scale', type=float, default=1.5, help="DPI scale factor")
+    parser.add_argument('--output', help="write JSON results to this file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    size = int(THUMBNAIL_SIZE * args.scale)
+    radius = int(CORNER_RADIUS * args.scale)
+    scenarios = {}
+    with tempfile.TemporaryDirectory() as temp:
+        exe_paths = []
+        for index in range(args.icons):
+            exe_path = Path(temp) / f"game_{index:03d}.exe"
+            exe_path.write_bytes(b"MZ" + bytes(index))
+            exe_paths.append(str(exe_path))
+        folder = Path(temp) / "icon_cache"
+
+        extractor = StubIconExtractor()
+        legacy_ms = min(legacy_refresh(extractor, exe_paths, size, radius) for _ in range(args.refreshes)) * 1000.0
+        scenarios['legacy'] = {'ui_ms': legacy_ms, 'delivered_ms': legacy_ms, 'extracted': len(exe_paths)}
+
+        def new_cache():
+            return IconThumbnailCache(folder, StubIconExtractor(), size=size, radius=radius, scale=args.scale)
+
+        cache = new_cache()
+        scenarios['cold'] = cache_refresh(cache, exe_paths)
+        scenarios['warm_memory'] = min((cache_refresh(cache, exe_paths) for _ in range(args.refreshes)),
+                                       key=lambda summary: summary['ui_ms'])
+        cache.close()
+
+        cache = new_cache()
+        scenarios['warm_disk'] = cache_refresh(cache, exe_paths)
+        cache.close()
+        disk_bytes = sum(path.stat().st_size for path in folder.glob("*.png"))
+
+    results = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'icons': args.icons,
+            'thumbnail_size': size,
+            'refreshes': args.refreshes,
+        },
+        'scenarios': scenarios,
+        'disk_bytes': disk_bytes,
+    }
+
+    print(f"\n  {'scenario':<14}{'UI ms':>9}{'delivered ms':>14}{'extracted':>11}{'disk hits':>11}{'memory hits':>13}",
+          file=sys.stderr)
+    for name, summary in scenarios.items():
+        print(f"  {name:<14}{summary['ui_ms']:>9.2f}{summary['delivered_ms']:>14.2f}{summary['extracted']:>11}"
+              f"{summary.get('disk_hits', 0):>11}{summary.get('memory_hits', 0):>13}", file=sys.stderr)
+    print(f"\nThumbnails on disk: {disk_bytes / 1024:.1f} KiB for {args.icons} icons", file=sys.stderr)
+
+    output = json.dumps(results, indent=2, ensure_ascii=False)
+    if args.output:
+        Path(args.output).write_text(output, encoding='utf-8')
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Plugin System Cold Start Benchmark
+==================================
+
+Measures how long the plugin system takes to start, each scenario in a fresh
+Python process (so nothing is already imported), and which heavy modules it
+pulls in:
+
+- deep_translator: import the package (engines load on first use)
+- deep_translator_google: import GoogleTranslator only
+- deep_translator_all_engines: load every engine (deep_translator.engines),
+  what importing the package used to do
+- discovery_lazy: list every plugin of plugins/ from its metadata, as the
+  GUI does for inactive plugins (no plugin module runs)
+- discovery_eager: load every plugin module
+- discovery_eager_all_engines: the same plus every engine, roughly what
+  discovery cost when the Google Translate plugin imported deep_translator
+  (and with it every engine) at module import
+- startup_typical: the GUI's startup with two plugins active (Remove Empty
+  Lines and Google Translate, enabled), the others listed lazily
+
+Reports the median and minimum wall time over --repeat runs, the number of
+modules imported and whether requests, bs4, deep_translator and tkinter were.
+
+The deep_translator scenarios need requests and beautifulsoup4.
+
+Usage:
+------
+python benchmarks/bench_import_time.py --repeat 15 --output import_time.json
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+SETUP = f"""
+import sys, time
+sys.path.insert(0, {str(ROOT)!r})
+before = set(sys.modules)
+start = time.perf_counter()
+"""
+
+REPORT = """
+elapsed = time.perf_counter() - start
+loaded = set(sys.modules) - before
+print(repr({
+    'elapsed_ms': elapsed * 1000.0,
+    'modules': len(loaded),
+    'heavy': sorted(name for name in ('requests', 'bs4', 'deep_translator', 'tkinter') if name in loaded),
+}))
+"""
+
+TRANSLATOR_PATH = "from plugins import add_translator_path; add_translator_path()\n"
+FOLDER = f"from pathlib import Path; folder = Path({str(ROOT / 'plugins')!r})\n"
+
+SCENARIOS = {
+    'deep_translator': TRANSLATOR_PATH + "import deep_translator\n",
+    'deep_translator_google': TRANSLATOR_PATH + "from deep_translator import GoogleTranslator\n",
+    'deep_translator_all_engines': TRANSLATOR_PATH + "from deep_translator.engines import __engines__\n",
+    'discovery_lazy': (
+        "from hook_ingestion import PluginDispatcher\n" + FOLDER +
+        "PluginDispatcher().load_folder(folder, activate=False)\n"
+    ),
+    'discovery_eager': (
+        "from hook_ingestion import PluginDispatcher\n" + FOLDER +
+        "PluginDispatcher().load_folder(folder, activate=True)\n"
+    ),
+    'discovery_eager_all_engines': (
+        "from hook_ingestion import PluginDispatcher\n" + FOLDER +
+        "PluginDispatcher().load_folder(folder, activate=True)\n" +
+        TRANSLATOR_PATH + "from deep_translator.engines import __engines__\n"
+    ),
+    'startup_typical': (
+        "from hook_ingestion import PluginDispatcher, discover_plugin\n" + FOLDER +
+        "dispatcher = PluginDispatcher()\n"
+        "active = ['remove_empty.py', 'google_translate.py']\n"
+        "for path in sorted(folder.glob('[!_]*.py')):\n"
+        "    plugin = discover_plugin(path, lazy=path.name not in active)\n"
+        "    dispatcher.add(path.name, plugin)\n"
+        "    if path.name in active:\n"
+        "        plugin.enabled = True\n"
+        "        plugin.on_enable()\n"
+    ),
+}
+
+
+def run_once(code: str) -> dict:
+    result = subprocess.run([sys.executable, "-c", SETUP + code + REPORT], cwd=str(ROOT),
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        return {'error': result.stderr.strip().splitlines()[-1] if result.stderr.strip() else 'failed'}
+    return eval(result.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the cold start of the plugin system")
+    parser.add_argument('--repeat', type=int, default=15, help="fresh processes per scenario")
+    parser.add_argument('--output', help="write JSON results to this file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    results = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'repeat': args.repeat,
+        },
+        'scenarios': {},
+    }
+    for name, code in SCENARIOS.items():
+        runs = [run_once(code) for _ in range(args.repeat)]
+        errors = [run['error'] for run in runs if 'error' in run]
+        if errors:
+            results['scenarios'][name] = {'error': errors[0]}
+            continue
+        times = [run['elapsed_ms'] for run in runs]
+        results['scenarios'][name] = {
+            'median_ms': statistics.median(times),
+            'min_ms': min(times),
+            'modules': runs[-1]['modules'],
+            'heavy': runs[-1]['heavy'],
+        }
+
+    print(f"\n  {'scenario':<30}{'median ms':>10}{'min ms':>9}{'modules':>9}  heavy modules", file=sys.stderr)
+    for name, summary in results['scenarios'].items():
+        if 'error' in summary:
+            print(f"  {name:<30}  error: {summary['error']}", file=sys.stderr)
+            continue
+        print(f"  {name:<30}{summary['median_ms']:>10.1f}{summary['min_ms']:>9.1f}{summary['modules']:>9}  "
+              f"{', '.join(summary['heavy']) or '-'}", file=sys.stderr)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        Path(args.output).write_text(output, encoding='utf-8')
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
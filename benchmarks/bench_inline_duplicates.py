@@ -0,0 +1,184 @@
+"""
+Inline Duplicate Removal Benchmark
+==================================
+
+Compares RemoveDuplicatesPlugin.remove_inline_duplicates with the previous
+implementation, which re-normalized the rest of the line for every pattern
+length up to 200 characters. Runs both on the synthetic VN workload and on
+long scrolling-text lines (with and without repetition), checks that they
+agree wherever the old length cap does not apply, and writes JSON.
+
+Usage:
+------
+python benchmarks/bench_inline_duplicates.py --output inline.json
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from bench_plugins import print_table, summarize
+from hook_ingestion import load_plugin_module
+from workloads import PHRASES, _dialogue, generate_plugin_inputs
+
+# Pattern lengths the previous implementation looked at
+LEGACY_MAX_PATTERN = 200
+
+LONG_LINE_LENGTHS = (100, 400, 1600, 6400)
+
+
+def legacy_remove_inline_duplicates(text: str) -> str:
+    """The implementation before the Z-function rewrite, kept for comparison."""
+    if not text or len(text) < 4:
+        return text
+
+    text_clean = text.strip()
+
+    half_len = len(text_clean) // 2
+    if half_len >= 3:
+        first_half = text_clean[:half_len]
+        second_half = text_clean[half_len:half_len*2]
+
+        first_normalized = ' '.join(first_half.split())
+        second_normalized = ' '.join(second_half.split())
+
+        if first_normalized == second_normalized:
+            return first_half.strip()
+
+    for pattern_len in range(3, min(len(text_clean) // 2 + 1, LEGACY_MAX_PATTERN)):
+        pattern = text_clean[:pattern_len]
+        pattern_normalized = ''.join(pattern.split())
+
+        if len(pattern_normalized) < 3:
+            continue
+
+        rest = text_clean[pattern_len:].lstrip()
+        rest_normalized = ''.join(rest.split())
+
+        if rest_normalized.startswith(pattern_normalized):
+            return pattern.strip()
+
+    return text_clean
+
+
+def scrolling_line(rng: random.Random, length: int) -> str:
+    """A long line of distinct dialogue, as a scrolling text hook emits it."""
+    parts = []
+    size = 0
+    while size < length:
+        part = _dialogue(rng, phrases=rng.randint(1, 3))
+        parts.append(part)
+        size += len(part)
+    return "".join(parts)[:length]
+
+
+def make_workloads(lines: int, long_lines: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    workloads = {
+        'vn_lines': list(generate_plugin_inputs(lines, seed=seed)),
+        'vn_selected': list(generate_plugin_inputs(lines, seed=seed, selected=True)),
+    }
+    for length in LONG_LINE_LENGTHS:
+        unique = [scrolling_line(rng, length) for _ in range(long_lines)]
+        workloads[f'scroll_{length}'] = unique
+        # Half-length line shown twice, as a hook that re-emits the whole buffer
+        workloads[f'scroll_{length}_doubled'] = [text[:length // 2] * 2 for text in unique]
+        # Three copies with a trailing partial copy and whitespace differences
+        workloads[f'scroll_{length}_tripled'] = [
+            (text[:length // 4] + " ") * 3 + text[:length // 8] for text in unique
+        ]
+    # Short phrase repeated, well inside the old 200 character limit
+    workloads['phrase_repeated'] = [rng.choice(PHRASES) * rng.randint(2, 5) for _ in range(long_lines)]
+    return workloads
+
+
+def time_function(function, inputs, repeat: int):
+    """Per-call durations (ns) of the best of `repeat` passes."""
+    clock = time.perf_counter_ns
+    best = None
+    for _ in range(repeat):
+        durations = []
+        for text in inputs:
+            start = clock()
+            function(text)
+            durations.append(clock() - start)
+        if best is None or sum(durations) < sum(best):
+            best = durations
+    return best
+
+
+def compare(new_function, inputs) -> dict:
+    """Count where the two implementations disagree, split by the old cap."""
+    agree = differ_capped = differ = 0
+    for text in inputs:
+        old = legacy_remove_inline_duplicates(text)
+        new = new_function(text)
+        if old == new:
+            agree += 1
+        elif len(new) >= LEGACY_MAX_PATTERN:
+            # A pattern the old loop never reached
+            differ_capped += 1
+        else:
+            differ += 1
+    return {'agree': agree, 'differ_beyond_old_limit': differ_capped, 'differ': differ}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark inline duplicate removal")
+    parser.add_argument('--lines', type=int, default=5000, help="synthetic VN lines per workload")
+    parser.add_argument('--long-lines', type=int, default=100, help="lines per long-line workload")
+    parser.add_argument('--repeat', type=int, default=3, help="passes per measurement (best is kept)")
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--output', help="write JSON results to this file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    plugin = load_plugin_module(ROOT / "plugins" / "remove_duplicates.py")
+    new_function = plugin.remove_inline_duplicates
+
+    results = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed': args.seed,
+            'repeat': args.repeat,
+        },
+        'workloads': {},
+    }
+    legacy_rows = {}
+    new_rows = {}
+    for name, inputs in make_workloads(args.lines, args.long_lines, args.seed).items():
+        legacy = summarize(time_function(legacy_remove_inline_duplicates, inputs, args.repeat))
+        new = summarize(time_function(new_function, inputs, args.repeat))
+        results['workloads'][name] = {
+            'inputs': len(inputs),
+            'legacy': legacy,
+            'new': new,
+            'speedup': legacy['mean_us'] / new['mean_us'] if new['mean_us'] else 0.0,
+            'results': compare(new_function, inputs),
+        }
+        legacy_rows[name] = legacy
+        new_rows[name] = new
+
+    print_table("Legacy (pattern loop)", legacy_rows)
+    print_table("New (Z-function)", new_rows)
+    print("\nSpeedup (mean):", file=sys.stderr)
+    for name, summary in results['workloads'].items():
+        print(f"  {name:<28}{summary['speedup']:>8.1f}x  {summary['results']}", file=sys.stderr)
+
+    output = json.dumps(results, indent=2, ensure_ascii=False)
+    if args.output:
+        Path(args.output).write_text(output, encoding='utf-8')
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Latest-Wins Translation Benchmark
+=================================
+
+Simulates a player clicking through dialogue faster than the translator
+answers, and compares the OrderedWorkerPool policies used by the translator
+plugins:
+
+- TRANSLATE_ALL: every line is translated and shown in order
+- LATEST_ONLY: a new line skips the lines still waiting or in flight
+
+Translations are simulated (no network): either as a cancellable request on
+an event loop, as deep_translator.async_http.submit returns, or as a blocking
+call that cannot be abandoned. Reports the lines delivered, skipped and
+cancelled, the line -> overlay latency and how long the last line waited.
+
+Usage:
+------
+python benchmarks/bench_latest_wins.py --lines 40 --interval 0.15 --latency 0.6 --output latest.json
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from plugins import LATEST_ONLY, TRANSLATE_ALL, OrderedWorkerPool
+
+
+def start_loop():
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    return loop
+
+
+def make_work(kind, loop, latency, jitter, rng):
+    """A fake translator taking latency +- jitter seconds per line."""
+    def duration():
+        return max(0.0, latency + rng.uniform(-jitter, jitter))
+
+    if kind == 'cancellable':
+        return lambda text: asyncio.run_coroutine_threadsafe(
+            asyncio.sleep(duration(), result=f"EN[{text}]"), loop)
+
+    def blocking(text):
+        time.sleep(duration())
+        return f"EN[{text}]"
+    return blocking
+
+
+def run(policy, kind, args, loop):
+    rng = random.Random(args.seed)
+    delivered = []
+    shown_at = {}
+
+    def deliver(text, translated):
+        shown_at[text] = time.monotonic()
+        delivered.append(text)
+
+    pool = OrderedWorkerPool(make_work(kind, loop, args.latency, args.jitter, rng), deliver,
+                             max_in_flight=args.max_in_flight, policy=policy)
+    lines = [f"line {index}" for index in range(args.lines)]
+    start = time.monotonic()
+    for line in lines:
+        pool.submit(line)
+        time.sleep(args.interval)
+    last_line_at = time.monotonic() - args.interval
+
+    # Wait until the last line is shown (or everything has settled)
+    deadline = time.monotonic() + args.latency * (args.lines + 2)
+    while lines[-1] not in shown_at and time.monotonic() < deadline:
+        time.sleep(0.005)
+    pool.close()
+
+    return {
+        'delivered': len(delivered),
+        'in_order': delivered == sorted(delivered, key=lambda text: int(text.split()[1])),
+        'stats': dict(pool.stats),
+        'latency': pool.latency_stats(),
+        'last_line_wait_ms': (shown_at[lines[-1]] - last_line_at) * 1000.0 if lines[-1] in shown_at else None,
+        'elapsed_s': time.monotonic() - start,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark latest-wins translation scheduling")
+    parser.add_argument('--lines', type=int, default=40, help="lines the player clicks through")
+    parser.add_argument('--interval', type=float, default=0.15, help="seconds between lines")
+    parser.add_argument('--latency', type=float, default=0.6, help="seconds per translation")
+    parser.add_argument('--jitter', type=float, default=0.2, help="+- seconds of translation time")
+    parser.add_argument('--max-in-flight', type=int, default=2)
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--output', help="write JSON results to this file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    loop = start_loop()
+    results = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'lines': args.lines,
+            'interval_s': args.interval,
+            'latency_s': args.latency,
+            'jitter_s': args.jitter,
+            'max_in_flight': args.max_in_flight,
+            'seed': args.seed,
+        },
+        'runs': {},
+    }
+    for policy in (TRANSLATE_ALL, LATEST_ONLY):
+        for kind in ('cancellable', 'blocking'):
+            results['runs'][f'{policy}_{kind}'] = run(policy, kind, args, loop)
+
+    print(f"\n  {'run':<22}{'shown':>7}{'skipped':>9}{'cancelled':>11}{'p50 ms':>9}{'p90 ms':>9}"
+          f"{'last line ms':>14}", file=sys.stderr)
+    for name, summary in results['runs'].items():
+        latency = summary['latency']
+        last = summary['last_line_wait_ms']
+        print(f"  {name:<22}{summary['delivered']:>7}{summary['stats']['skipped']:>9}"
+              f"{summary['stats']['cancelled']:>11}{latency.get('p50_ms', 0):>9.0f}{latency.get('p90_ms', 0):>9.0f}"
+              f"{last if last is not None else float('nan'):>14.0f}", file=sys.stderr)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        Path(args.output).write_text(output, encoding='utf-8')
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
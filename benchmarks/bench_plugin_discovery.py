@@ -0,0 +1,167 @@
+"""
+Plugin Discovery Benchmark
+==========================
+
+Measures how long the plugin list takes to build with many plugins installed
+(--plugins copies of the plugins of plugins/, in a temporary folder), each
+run in a fresh Python process as at startup:
+
+- startup_exec_all: every plugin module runs, as discovery did before
+  inactive plugins were listed lazily
+- startup_parse: active plugins run, inactive ones are listed from their
+  metadata, read from the source (no manifest)
+- startup_manifest_cold: the same, building the metadata manifest
+- startup_manifest_warm: the same, with the manifest of a previous start
+
+and how long reloading the folder takes once it is loaded (the Reload
+button):
+
+- reload_exec_all: every plugin module runs again, as reloading did before
+- reload_unchanged: unchanged plugins are kept
+- reload_one_changed: one active plugin was edited and runs again
+
+--active of the plugins are active (run their module), the others inactive.
+Reports the median and minimum wall time over --repeat runs.
+
+Usage:
+------
+python benchmarks/bench_plugin_discovery.py --plugins 60 --active 5 --output discovery.json
+"""
+
+import argparse
+import json
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+SETUP = """
+import sys, time
+from pathlib import Path
+sys.path.insert(0, {root!r})
+from hook_ingestion import LazyPlugin, PluginDispatcher, PluginManifest
+folder = Path({folder!r})
+manifest_path = Path({manifest!r})
+active = set({active!r})
+
+def discover(dispatcher, manifest=None, lazy=True):
+    for path in sorted(folder.glob('[!_]*.py')):
+        dispatcher.discover(path, lazy=lazy and path.name not in active, manifest=manifest)
+    if manifest is not None:
+        manifest.save()
+"""
+
+STARTUP = {
+    'startup_exec_all': "discover(PluginDispatcher(), lazy=False)\n",
+    'startup_parse': "discover(PluginDispatcher())\n",
+    'startup_manifest_cold': (
+        "manifest_path.unlink() if manifest_path.exists() else None\n"
+        "start = time.perf_counter()\n"
+        "discover(PluginDispatcher(), PluginManifest(manifest_path))\n"
+    ),
+    'startup_manifest_warm': "discover(PluginDispatcher(), PluginManifest(manifest_path))\n",
+}
+
+RELOAD = {
+    'reload_exec_all': (
+        "dispatcher = PluginDispatcher()\n"
+        "discover(dispatcher)\n"
+        "start = time.perf_counter()\n"
+        "dispatcher = PluginDispatcher()\n"
+        "discover(dispatcher)\n"
+    ),
+    'reload_unchanged': (
+        "dispatcher = PluginDispatcher()\n"
+        "discover(dispatcher)\n"
+        "start = time.perf_counter()\n"
+        "discover(dispatcher)\n"
+    ),
+    'reload_one_changed': (
+        "dispatcher = PluginDispatcher()\n"
+        "discover(dispatcher)\n"
+        "changed = folder / sorted(active)[0]\n"
+        "changed.write_text(changed.read_text(encoding='utf-8') + '\\n', encoding='utf-8')\n"
+        "start = time.perf_counter()\n"
+        "discover(dispatcher)\n"
+    ),
+}
+
+REPORT = """
+elapsed = time.perf_counter() - start
+print(repr({'elapsed_ms': elapsed * 1000.0}))
+"""
+
+
+def make_folder(folder: Path, count: int):
+    """count plugin files: copies of the plugins of plugins/, renamed."""
+    sources = sorted(path for path in (ROOT / "plugins").glob("*.py") if not path.name.startswith("_"))
+    names = []
+    for index in range(count):
+        source = sources[index % len(sources)]
+        name = f"{source.stem}_{index:03d}.py"
+        shutil.copy2(source, folder / name)
+        names.append(name)
+    return names
+
+
+def run_once(code: str) -> float:
+    result = subprocess.run([sys.executable, "-c", code], cwd=str(ROOT), capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip())
+    return eval(result.stdout.strip().splitlines()[-1])['elapsed_ms']
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark plugin discovery with many plugins installed")
+    parser.add_argument('--plugins', type=int, default=60, help="plugins installed")
+    parser.add_argument('--active', type=int, default=5, help="active plugins among them")
+    parser.add_argument('--repeat', type=int, default=9, help="fresh processes per scenario")
+    parser.add_argument('--output', help="write JSON results to this file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    results = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'plugins': args.plugins,
+            'active': args.active,
+            'repeat': args.repeat,
+        },
+        'scenarios': {},
+    }
+    with tempfile.TemporaryDirectory() as temp:
+        folder = Path(temp) / "plugins"
+        folder.mkdir()
+        names = make_folder(folder, args.plugins)
+        setup = SETUP.format(root=str(ROOT), folder=str(folder), manifest=str(Path(temp) / "plugins_manifest.json"),
+                             active=names[:args.active])
+
+        # Builds the manifest the warm runs read
+        run_once(setup + "start = time.perf_counter()\n" + STARTUP['startup_manifest_cold'] + REPORT)
+        scenarios = {name: "start = time.perf_counter()\n" + code for name, code in STARTUP.items()}
+        scenarios.update(RELOAD)
+        for name, code in scenarios.items():
+            times = [run_once(setup + code + REPORT) for _ in range(args.repeat)]
+            results['scenarios'][name] = {
+                'median_ms': statistics.median(times),
+                'min_ms': min(times),
+            }
+
+    print(f"\n  {'scenario':<26}{'median ms':>10}{'min ms':>9}", file=sys.stderr)
+    for name, summary in results['scenarios'].items():
+        print(f"  {name:<26}{summary['median_ms']:>10.1f}{summary['min_ms']:>9.1f}", file=sys.stderr)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        Path(args.output).write_text(output, encoding='utf-8')
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+"""
+Plugin Pipeline Benchmark
+=========================
+
+Runs synthetic visual novel workloads through the plugins in plugins/ and
+reports per-plugin and whole-chain latency percentiles, throughput and memory
+growth over a long session. Runs headless against the plugin modules
+directly, and writes machine-readable JSON so regressions can be caught.
+
+Usage:
+------
+python benchmarks/bench_plugins.py --lines 20000 --output bench.json
+python benchmarks/bench_plugins.py --plugins remove_duplicates.py,fix_repeated_chars.py
+"""
+
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from hook_ingestion import HookIngestionEngine, PluginDispatcher, load_plugin_module
+from workloads import generate_cli_lines, generate_plugin_inputs
+
+# Text plugins that run offline; translators and the overlay need a network or a display
+DEFAULT_PLUGINS = [
+    "remove_empty.py",
+    "remove_special_chars.py",
+    "fix_repeated_chars.py",
+    "min_length_filter.py",
+    "remove_duplicates.py",
+    "hook_concatenation.py",
+]
+
+PERCENTILES = (50, 90, 99, 99.9)
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(pct / 100.0 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def summarize(durations_ns, total_ns=None):
+    """Latency percentiles (microseconds) and throughput for a list of durations."""
+    durations = sorted(durations_ns)
+    total = total_ns if total_ns is not None else sum(durations)
+    summary = {
+        'calls': len(durations),
+        'mean_us': (sum(durations) / len(durations) / 1000.0) if durations else 0.0,
+        'max_us': durations[-1] / 1000.0 if durations else 0.0,
+        'lines_per_sec': len(durations) / (total / 1e9) if total else 0.0,
+    }
+    for pct in PERCENTILES:
+        summary[f'p{pct:g}_us'] = percentile(durations, pct) / 1000.0
+    return summary
+
+
+def load_plugins(names):
+    """Load fresh plugin instances from plugins/ (module state is not shared between runs)."""
+    plugins = {}
+    for name in names:
+        try:
+            plugin = load_plugin_module(ROOT / "plugins" / name)
+        except Exception as e:
+            print(f"skipping {name}: {e}", file=sys.stderr)
+            continue
+        if plugin is None:
+            continue
+        plugin.enabled = True
+        plugins[name] = plugin
+    return plugins
+
+
+def make_dispatcher(plugins):
+    dispatcher = PluginDispatcher()
+    dispatcher.plugins = dict(plugins)
+    dispatcher.plugin_order = list(plugins)
+    dispatcher.active_plugins = list(plugins)
+    return dispatcher
+
+
+def bench_individual(names, inputs):
+    """Each plugin on its own, fed the whole workload."""
+    results = {}
+    for name, plugin in load_plugins(names).items():
+        process_text = plugin.process_text
+        durations = []
+        filtered = 0
+        clock = time.perf_counter_ns
+        for text in inputs:
+            start = clock()
+            result = process_text(text)
+            durations.append(clock() - start)
+            if result is None:
+                filtered += 1
+        summary = summarize(durations)
+        summary['filtered'] = filtered
+        results[name] = summary
+    return results
+
+
+def bench_chain(names, inputs):
+    """The whole chain, timed per line and per plugin step."""
+    plugins = load_plugins(names)
+
+    # Whole-chain latency through the dispatcher exactly as the GUI runs it
+    dispatcher = make_dispatcher(plugins)
+    process = dispatcher.process
+    clock = time.perf_counter_ns
+    durations = []
+    filtered = 0
+    start_total = clock()
+    for text in inputs:
+        start = clock()
+        if process(text) is None:
+            filtered += 1
+        durations.append(clock() - start)
+    chain = summarize(durations, clock() - start_total)
+    chain['filtered'] = filtered
+
+    # Per-step latency inside the chain (fresh instances, same order)
+    plugins = load_plugins(names)
+    steps = {name: [] for name in plugins}
+    reached = {name: 0 for name in plugins}
+    for text in inputs:
+        current = text
+        for name, plugin in plugins.items():
+            reached[name] += 1
+            start = clock()
+            try:
+                current = plugin.process_text(current)
+            except Exception:
+                pass
+            steps[name].append(clock() - start)
+            if current is None:
+                break
+
+    in_chain = {}
+    for name, step_durations in steps.items():
+        summary = summarize(step_durations)
+        summary['reached'] = reached[name]
+        in_chain[name] = summary
+
+    return chain, in_chain
+
+
+def bench_memory(names, line_count, checkpoints, seed):
+    """Python heap growth of the chain over a long session."""
+    dispatcher = make_dispatcher(load_plugins(names))
+    process = dispatcher.process
+    interval = max(1, line_count // checkpoints)
+    # Built before tracing starts, so only the chain's own growth is measured
+    texts = list(generate_plugin_inputs(line_count, seed=seed + 1))
+
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    samples = []
+    for index, text in enumerate(texts, start=1):
+        process(text)
+        if index % interval == 0:
+            samples.append({'lines': index, 'bytes': tracemalloc.get_traced_memory()[0] - baseline})
+    peak = tracemalloc.get_traced_memory()[1] - baseline
+    tracemalloc.stop()
+
+    growth_per_1k = 0.0
+    if len(samples) >= 2 and samples[-1]['lines'] > samples[0]['lines']:
+        growth_per_1k = ((samples[-1]['bytes'] - samples[0]['bytes']) /
+                         (samples[-1]['lines'] - samples[0]['lines']) * 1000)
+
+    return {
+        'lines': line_count,
+        'samples': samples,
+        'peak_bytes': peak,
+        'growth_bytes_per_1k_lines': growth_per_1k,
+    }
+
+
+def bench_ingestion(names, line_count, seed):
+    """End-to-end: raw CLI lines through parsing, registry and the plugin chain."""
+    results = {}
+    for engine in ("luna", "textractor"):
+        lines = list(generate_cli_lines(line_count, seed=seed, engine=engine))
+        ingestion = HookIngestionEngine(engine=engine, dispatcher=make_dispatcher(load_plugins(names)))
+        start = time.perf_counter()
+        ingestion.feed_lines(lines)
+        elapsed = time.perf_counter() - start
+        results[engine] = {
+            'lines': len(lines),
+            'elapsed_s': elapsed,
+            'lines_per_sec': len(lines) / elapsed if elapsed > 0 else 0.0,
+            'outputs': ingestion.stats['outputs'],
+            'filtered': ingestion.stats['filtered'],
+        }
+    return results
+
+
+def print_table(title, rows):
+    print(f"\n{title}", file=sys.stderr)
+    print(f"  {'name':<28}{'p50 us':>10}{'p99 us':>10}{'max us':>12}{'lines/s':>14}", file=sys.stderr)
+    for name, summary in rows.items():
+        print(f"  {name:<28}{summary['p50_us']:>10.2f}{summary['p99_us']:>10.2f}"
+              f"{summary['max_us']:>12.2f}{summary['lines_per_sec']:>14.0f}", file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the plugin pipeline")
+    parser.add_argument('--lines', type=int, default=20000, help="lines per latency run")
+    parser.add_argument('--session-lines', type=int, default=50000, help="lines for the memory run")
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--plugins', help="comma-separated plugin files (default: offline text plugins)")
+    parser.add_argument('--selected', action='store_true',
+                        help="feed selected-hook output instead of '[Hook #id]' lines")
+    parser.add_argument('--skip-memory', action='store_true')
+    parser.add_argument('--output', help="write JSON results to this file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    names = args.plugins.split(',') if args.plugins else DEFAULT_PLUGINS
+    inputs = list(generate_plugin_inputs(args.lines, seed=args.seed, selected=args.selected))
+
+    individual = bench_individual(names, inputs)
+    chain, in_chain = bench_chain(names, inputs)
+    results = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'lines': len(inputs),
+            'seed': args.seed,
+            'selected': args.selected,
+            'plugins': names,
+        },
+        'plugins': individual,
+        'chain': chain,
+        'chain_steps': in_chain,
+        'ingestion': bench_ingestion(names, args.lines, args.seed),
+    }
+    if not args.skip_memory:
+        results['memory'] = bench_memory(names, args.session_lines, 20, args.seed)
+
+    print_table("Individual plugins", individual)
+    print_table("Plugin steps inside the chain", in_chain)
+    print_table("Whole chain", {'chain': chain})
+    for engine, summary in results['ingestion'].items():
+        print(f"\nIngestion ({engine}): {summary['lines_per_sec']:.0f} lines/s", file=sys.stderr)
+    if 'memory' in results:
+        print(f"Memory growth: {results['memory']['growth_bytes_per_1k_lines']:.0f} bytes / 1k lines",
+              file=sys.stderr)
+
+    output = json.dumps(results, indent=2, ensure_ascii=False)
+    if args.output:
+        Path(args.output).write_text(output, encoding='utf-8')
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
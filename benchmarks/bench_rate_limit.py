@@ -0,0 +1,213 @@
+"""
+Rate Limit Benchmark
+====================
+
+Sends a burst of dialogue lines to a local stub of Google Translate that,
+like the real service, answers HTTP 429 (with Retry-After) once a client
+goes over its request rate, and compares how deep_translator's rate_limit
+scheduler copes:
+
+- no_retries: 429 answers are not retried (TooManyRequests, the line is lost)
+- retry_after: 429 answers pause the engine for Retry-After and are retried
+- budget: requests are queued a little under the server's rate, so no 429
+  is sent back
+- budget_async: the same with atranslate on the shared event loop
+
+Lines are translated one per request, several at a time, as the Google
+Translate plugin does. Reports lines translated and lost, 429 answers,
+retries, the deepest queue and the time spent waiting for the budget.
+
+Needs requests and beautifulsoup4. No network access is used.
+
+Usage:
+------
+python benchmarks/bench_rate_limit.py --lines 120 --server-rate 20 --output rate_limit.json
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import sys
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from bench_async_translation import QuietServer
+from bench_batch_translation import StubHandler, stub_translation
+from plugins import add_translator_path
+from workloads import generate_plugin_inputs
+
+add_translator_path()
+
+from deep_translator import GoogleTranslator, async_http, rate_limit, session_pool
+
+
+class RateLimitedHandler(StubHandler):
+    """Google stub allowing `rate` requests per second (bursts of `rate`), 429 beyond."""
+
+    rate = 20.0
+    retry_after = 1
+    tokens = 0.0
+    stamp = 0.0
+    rejected = 0
+
+    def do_GET(self):
+        url = urllib.parse.urlparse(self.path)
+        if not url.path.startswith("/google"):
+            return super().do_GET()
+        cls = type(self)
+        with self.lock:
+            now = time.monotonic()
+            cls.tokens = min(cls.rate, cls.tokens + (now - cls.stamp) * cls.rate)
+            cls.stamp = now
+            allowed = cls.tokens >= 1
+            if allowed:
+                cls.tokens -= 1
+            else:
+                cls.rejected += 1
+        if not allowed:
+            self.send_response(429)
+            self.send_header("Retry-After", str(self.retry_after))
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        super().do_GET()
+
+    @classmethod
+    def refill(cls):
+        cls.tokens = cls.rate
+        cls.stamp = time.monotonic()
+
+
+def translate_lines(translator, texts, workers):
+    """One request per line on `workers` threads; a failed line is None."""
+    def translate(text):
+        try:
+            return translator.translate(text)
+        except Exception:
+            return None
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(translate, texts))
+
+
+def atranslate_lines(translator, texts, workers):
+    async def translate_all():
+        limit = asyncio.Semaphore(workers)
+
+        async def translate(text):
+            async with limit:
+                try:
+                    return await translator.atranslate(text)
+                except Exception:
+                    return None
+
+        return await asyncio.gather(*(translate(text) for text in texts))
+
+    return async_http.submit(translate_all()).result()
+
+
+def run(name, translate, base_url, texts, workers, server_rate, **settings):
+    engine = f"bench_{name}"
+    # A subclass per run, so every run has its own limiter and counters
+    translator = type(engine, (GoogleTranslator,), {})(source="ja", target="en")
+    translator._base_url = base_url + "/google"
+    rate_limit.configure(engine, **settings)
+    RateLimitedHandler.refill()
+    rejected = RateLimitedHandler.rejected
+    start = time.perf_counter()
+    translations = translate(translator, texts, workers)
+    elapsed = time.perf_counter() - start
+    stats = translator.rate_limiter.get_stats()
+    return {
+        'settings': settings,
+        'translated': sum(1 for text, translated in zip(texts, translations)
+                          if translated == stub_translation(text)),
+        'lost': sum(1 for translated in translations if translated is None),
+        'server_429': RateLimitedHandler.rejected - rejected,
+        'elapsed_s': elapsed,
+        'ideal_s': max(0.0, (len(texts) - server_rate) / server_rate),
+        'rate_limit': stats,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark 429 handling and request budgets against a stub server")
+    parser.add_argument('--lines', type=int, default=120, help="lines in the burst")
+    parser.add_argument('--server-rate', type=float, default=20.0, help="requests per second the stub accepts")
+    parser.add_argument('--retry-after', type=int, default=1, help="Retry-After of the stub's 429 answers (s)")
+    parser.add_argument('--budget', type=float, default=0.9,
+                        help="request budget of the budget runs, as a fraction of the server rate")
+    parser.add_argument('--workers', type=int, default=8, help="requests in flight")
+    parser.add_argument('--latency', type=float, default=0.01, help="stub server delay per request (s)")
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--output', help="write JSON results to this file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    RateLimitedHandler.latency = args.latency
+    RateLimitedHandler.rate = args.server_rate
+    RateLimitedHandler.retry_after = args.retry_after
+    server = QuietServer(('127.0.0.1', 0), RateLimitedHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    session_pool.configure(pool_maxsize=args.workers)
+
+    texts = list(dict.fromkeys(
+        text.strip() for text in generate_plugin_inputs(args.lines * 4, seed=args.seed, selected=True)
+        if text.strip()
+    ))[:args.lines]
+
+    results = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'lines': len(texts),
+            'server_rate': args.server_rate,
+            'retry_after_s': args.retry_after,
+            'budget_rps': args.server_rate * args.budget,
+            'workers': args.workers,
+            'latency_s': args.latency,
+            'seed': args.seed,
+        },
+        'runs': {},
+    }
+    # A little under the server's rate: requests reach it with some jitter
+    budget = dict(requests_per_second=args.server_rate * args.budget, burst=args.server_rate * args.budget)
+    runs = [
+        ('no_retries', translate_lines, dict(max_retries=0)),
+        ('retry_after', translate_lines, dict(max_retries=10)),
+        ('budget', translate_lines, budget),
+        ('budget_async', atranslate_lines, budget),
+    ]
+    try:
+        for name, translate, settings in runs:
+            results['runs'][name] = run(name, translate, base_url, texts, args.workers,
+                                        args.server_rate, **settings)
+    finally:
+        session_pool.close_session()
+        server.shutdown()
+
+    print(f"\n  {'run':<14}{'translated':>11}{'lost':>6}{'429s':>6}{'retries':>9}{'queue':>7}"
+          f"{'waited s':>10}{'seconds':>9}", file=sys.stderr)
+    for name, summary in results['runs'].items():
+        stats = summary['rate_limit']
+        print(f"  {name:<14}{summary['translated']:>11}{summary['lost']:>6}{summary['server_429']:>6}"
+              f"{stats['retries']:>9}{stats['max_queue_depth']:>7}{stats['throttle_wait_s']:>10.1f}"
+              f"{summary['elapsed_s']:>9.2f}", file=sys.stderr)
+
+    output = json.dumps(results, indent=2, ensure_ascii=False)
+    if args.output:
+        Path(args.output).write_text(output, encoding='utf-8')
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
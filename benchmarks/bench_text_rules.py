@@ -0,0 +1,223 @@
+"""
+Text Rules Benchmark
+====================
+
+Measures the per-line cost of the Translator's pre/post-processing rules
+(Translator/text_rules.py) as the number of rules grows: --sizes rule lists
+made of the default rules, three generic patterns, --matching rules on text
+of the workload's dialogue and, for the rest, glossary terms: katakana
+names that do not occur in it (a game's rules list grows with terms most
+lines do not contain). Generated rules are 70% literals and 30%
+patterns: at the end of the line, followed by a number, or with a group in
+the replacement. Each list is run as
+
+- hand_written: one str.replace / re.sub(pattern string) per rule, as rules
+  added to the previous filter_text by hand ran (re's own cache of compiled
+  patterns holds 512)
+- precompiled: one str.replace / compiled pattern .sub per rule, in order
+- rule_set: the rules compiled by RuleSet (one scan per pass with the
+  expression of all the rules' literal prefixes)
+
+Reports the time per line, the share of lines a rule changed and the share
+of lines for which rule_set gives the same text as applying the rules one
+after another (they differ where rules overlap: rule_set never rescans a
+replacement, see text_rules.py). Also checks that the default rules give
+the same text as the previous filter_text on every line.
+
+Usage:
+------
+python benchmarks/bench_text_rules.py --lines 2000 --sizes 6,50,200,500,1000 --matching 20 --output text_rules.json
+"""
+
+import argparse
+import json
+import platform
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "Translator"))
+
+from text_rules import DEFAULT_RULES, RuleSet
+from workloads import generate_plugin_inputs
+
+
+def legacy_filter_text(result):
+    """filter_text before the rules file."""
+    result = result.replace("\n", "<br>")
+    result = result.replace("{", "")
+    result = result.replace("�", "")
+    result = re.sub(r"カ$", "", result)
+    result = re.sub(r"987$", "?", result)
+    result = re.sub(r"^:", "", result)
+    return result
+
+
+# Patterns that do not start with literal text, added to every generated list
+GENERIC_PATTERNS = [
+    {"pattern": "[0-9０-９]{2,}円", "replace": "<yen>"},
+    {"pattern": "[!！]{2,}", "replace": "!"},
+    {"pattern": "(?i:[a-z]+)ww+", "replace": "<lol>"},
+]
+
+KATAKANA = [chr(code) for code in range(ord("ァ"), ord("ヺ") + 1)]
+
+
+def generate_rules(count: int, matching: int, lines, rng: random.Random):
+    """
+    The default rules, GENERIC_PATTERNS, matching rules on text of lines and
+    glossary terms absent from lines, count in all.
+    """
+    rules = list(DEFAULT_RULES) + GENERIC_PATTERNS
+    matching += len(rules)
+    text = "\n".join(lines)
+    finds = set()
+    while len(rules) < count:
+        index = len(rules)
+        if index < matching:
+            line = rng.choice(lines).strip()
+            if len(line) < 3:
+                continue
+            size = rng.randint(2, min(5, len(line)))
+            start = rng.randrange(len(line) - size + 1)
+            find = line[start:start + size]
+        else:
+            find = "".join(rng.choice(KATAKANA) for _ in range(rng.randint(2, 5)))
+            if find in text:
+                continue
+        if find in finds:
+            continue
+        finds.add(find)
+        kind = rng.random()
+        if kind < 0.7:
+            rules.append({"find": find, "replace": f"<r{index}>"})
+        elif kind < 0.8:
+            rules.append({"pattern": f"{re.escape(find)}$", "replace": f"<r{index}>"})
+        elif kind < 0.9:
+            rules.append({"pattern": f"{re.escape(find)}[0-9０-９]+", "replace": f"<r{index}>"})
+        else:
+            rules.append({"pattern": f"({re.escape(find)})[ねよ]", "replace": f"\\1<r{index}>"})
+    return rules[:count]
+
+
+def hand_written(rules):
+    steps = []
+    for rule in rules:
+        if "find" in rule:
+            steps.append((None, rule["find"], rule.get("replace", "")))
+        else:
+            pattern = f"(?i:{rule['pattern']})" if rule.get("ignore_case") else rule["pattern"]
+            steps.append((pattern, None, rule.get("replace", "")))
+
+    def apply(text):
+        for pattern, find, replace in steps:
+            if find is not None:
+                text = text.replace(find, replace)
+            else:
+                text = re.sub(pattern, replace, text)
+        return text
+
+    return apply
+
+
+def precompiled(rules):
+    steps = []
+    for rule in rules:
+        if "find" in rule:
+            steps.append((None, rule["find"], rule.get("replace", "")))
+        else:
+            flags = re.IGNORECASE if rule.get("ignore_case") else 0
+            steps.append((re.compile(rule["pattern"], flags), None, rule.get("replace", "")))
+
+    def apply(text):
+        for pattern, find, replace in steps:
+            if find is not None:
+                text = text.replace(find, replace)
+            else:
+                text = pattern.sub(replace, text)
+        return text
+
+    return apply
+
+
+def time_lines(apply, lines, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in lines:
+            apply(text)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best / len(lines) * 1e9
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Translator's text rules as rules are added")
+    parser.add_argument('--lines', type=int, default=2000, help="lines per run")
+    parser.add_argument('--sizes', default="6,50,200,500,1000", help="comma-separated rule counts")
+    parser.add_argument('--matching', type=int, default=20, help="generated rules on text of the lines")
+    parser.add_argument('--repeat', type=int, default=3, help="runs per rule list (the fastest is kept)")
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--output', help="write JSON results to this file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    lines = list(generate_plugin_inputs(args.lines, seed=args.seed))
+    default_rules = RuleSet(DEFAULT_RULES)
+    results = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'lines': len(lines),
+            'matching_rules': args.matching,
+            'repeat': args.repeat,
+            'seed': args.seed,
+        },
+        'default_rules_match_filter_text': all(default_rules.apply(text) == legacy_filter_text(text)
+                                               for text in lines),
+        'sizes': {},
+    }
+
+    rng = random.Random(args.seed)
+    for size in map(int, args.sizes.split(',')):
+        rules = generate_rules(size, args.matching, lines, rng)
+        started = time.perf_counter()
+        rule_set = RuleSet(rules)
+        compile_ms = (time.perf_counter() - started) * 1000.0
+        sequential = precompiled(rules)
+        outputs = [rule_set.apply(text) for text in lines]
+        timings = {
+            'hand_written': time_lines(hand_written(rules), lines, args.repeat),
+            'precompiled': time_lines(sequential, lines, args.repeat),
+            'rule_set': time_lines(rule_set.apply, lines, args.repeat),
+        }
+        results['sizes'][str(size)] = {
+            'rules': len(rules),
+            'ns_per_line': timings,
+            'speedup_vs_hand_written': timings['hand_written'] / timings['rule_set'],
+            'compile_ms': compile_ms,
+            'lines_changed': sum(output != text for output, text in zip(outputs, lines)) / len(lines),
+            'same_as_sequential': sum(output == sequential(text) for output, text in zip(outputs, lines)) / len(lines),
+        }
+
+    print(f"\n  {'rules':>6}{'hand-written ns':>17}{'precompiled ns':>16}{'rule set ns':>13}{'speedup':>9}"
+          f"{'compile ms':>12}{'changed':>9}{'same':>7}", file=sys.stderr)
+    for summary in results['sizes'].values():
+        timings = summary['ns_per_line']
+        print(f"  {summary['rules']:>6}{timings['hand_written']:>17.0f}{timings['precompiled']:>16.0f}"
+              f"{timings['rule_set']:>13.0f}{summary['speedup_vs_hand_written']:>8.1f}x{summary['compile_ms']:>12.1f}"
+              f"{summary['lines_changed']:>9.2f}{summary['same_as_sequential']:>7.2f}", file=sys.stderr)
+    print(f"\nDefault rules match the previous filter_text: {results['default_rules_match_filter_text']}",
+          file=sys.stderr)
+
+    output = json.dumps(results, indent=2, ensure_ascii=False)
+    if args.output:
+        Path(args.output).write_text(output, encoding='utf-8')
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+"""
+Translation Server Benchmark
+============================
+
+Runs Translator/translation_server.py (in a subprocess, as the toolkit
+does) against the local Google stub of bench_batch_translation.py, and
+sends it --requests "translate sentences" requests (distinct lines) from
+--clients client threads at once, each on its own keep-alive connection:
+
+- serial: --max-concurrency 1, one upstream translation at a time, as the
+  previous server answered (at most 60 requests, it is slow)
+- concurrent: one worker, translations awaited concurrently
+- workers_N: --workers N processes sharing the port
+
+Reports the throughput, p50/p99 request latency and the requests the stub
+received. A batch run then compares, for --batch lines, the time until the
+first translation arrives from /translate_batch (streamed, NDJSON) with the
+time "translate batch" takes to answer with the whole list.
+
+The translation cache is off (--no-cache). Needs requests and
+beautifulsoup4. No network access is used.
+
+Usage:
+------
+python benchmarks/bench_translation_server.py --requests 400 --clients 32 --latency 0.1 --output server.json
+"""
+
+import argparse
+import http.client
+import json
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from bench_async_translation import QuietServer
+from bench_batch_translation import StubHandler, stub_translation
+from workloads import generate_plugin_inputs
+
+SERVER = ROOT / "Translator" / "translation_server.py"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class Client:
+    """A keep-alive connection to the translation server."""
+
+    def __init__(self, port: int):
+        self.connection = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+
+    def post(self, message, content=None, path="/"):
+        body = json.dumps({'message': message, 'content': content})
+        self.connection.request("POST", path, body, {'Content-Type': 'application/json'})
+        return self.connection.getresponse()
+
+    def send(self, message, content=None):
+        response = self.post(message, content)
+        result = json.loads(response.read())
+        if response.status != 200:
+            raise RuntimeError(result)
+        return result
+
+    def close(self):
+        self.connection.close()
+
+
+def start_server(settings_path: Path, port: int, options):
+    process = subprocess.Popen(
+        [sys.executable, str(SERVER), '--settings', str(settings_path), '--host', '127.0.0.1',
+         '--port', str(port), '--no-cache'] + options,
+        cwd=str(SERVER.parent), stdout=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"the translation server exited with code {process.returncode}")
+        try:
+            client = Client(port)
+            ready = client.send("check if server is ready")
+            client.close()
+            if ready:
+                return process
+        except OSError:
+            pass
+        time.sleep(0.05)
+    process.kill()
+    raise RuntimeError("the translation server did not start")
+
+
+def stop_server(process, port: int):
+    try:
+        Client(port).send("close server")
+    except OSError:
+        pass
+    try:
+        process.wait(10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+def run_load(port: int, texts, clients: int) -> dict:
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+    position = iter(range(len(texts)))
+
+    def worker():
+        client = Client(port)
+        try:
+            while True:
+                with lock:
+                    index = next(position, None)
+                if index is None:
+                    break
+                started = time.perf_counter()
+                try:
+                    translation = client.send("translate sentences", texts[index])
+                    if translation != stub_translation(texts[index]):
+                        raise RuntimeError(f"unexpected translation {translation!r}")
+                except Exception as e:
+                    with lock:
+                        errors.append(f"{e.__class__.__name__}: {e}")
+                    client.close()
+                    client = Client(port)
+                    continue
+                with lock:
+                    latencies.append(time.perf_counter() - started)
+        finally:
+            client.close()
+
+    before = StubHandler.requests.get('google', 0)
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'requests': len(texts),
+        'errors': len(errors),
+        'first_error': errors[0] if errors else None,
+        'elapsed_s': elapsed,
+        'requests_per_sec': len(latencies) / elapsed,
+        'p50_ms': latencies[len(latencies) // 2] * 1000.0 if latencies else None,
+        'p99_ms': latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000.0 if latencies else None,
+        'upstream_requests': StubHandler.requests.get('google', 0) - before,
+    }
+
+
+def run_batch(port: int, texts) -> dict:
+    client = Client(port)
+    try:
+        started = time.perf_counter()
+        translations = client.send("translate batch", texts)
+        whole_s = time.perf_counter() - started
+        in_order = translations == [stub_translation(text) for text in texts]
+
+        started = time.perf_counter()
+        response = client.post("translate batch", texts, path="/translate_batch")
+        first_s = None
+        received = {}
+        for line in response:
+            if first_s is None:
+                first_s = time.perf_counter() - started
+            item = json.loads(line)
+            received[item['index']] = item.get('translation')
+        stream_s = time.perf_counter() - started
+    finally:
+        client.close()
+    return {
+        'lines': len(texts),
+        'translate_batch_s': whole_s,
+        'translate_batch_in_order': in_order,
+        'stream_first_line_s': first_s,
+        'stream_total_s': stream_s,
+        'stream_complete': received == {index: stub_translation(text) for index, text in enumerate(texts)},
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the translation server under concurrent clients")
+    parser.add_argument('--requests', type=int, default=400, help="translation requests per scenario")
+    parser.add_argument('--clients', type=int, default=32, help="concurrent client connections")
+    parser.add_argument('--latency', type=float, default=0.1, help="stub server delay per request (s)")
+    parser.add_argument('--workers', type=int, default=4, help="worker processes of the multi-worker run")
+    parser.add_argument('--batch', type=int, default=100, help="lines of the batch run")
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--output', help="write JSON results to this file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    StubHandler.latency = args.latency
+    stub = QuietServer(('127.0.0.1', 0), StubHandler)
+    threading.Thread(target=stub.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{stub.server_address[1]}"
+
+    # Distinct lines, and none the server's text filter would change
+    texts = list(dict.fromkeys(
+        text for text in (line.strip() for line in generate_plugin_inputs(args.requests * 8, seed=args.seed,
+                                                                          selected=True))
+        if text and not any(sign in text for sign in "{\n�:") and not text.endswith(("カ", "987"))
+    ))
+    scenarios = {
+        'serial': (['--max-concurrency', '1'], texts[:min(args.requests, 60)]),
+        'concurrent': ([], texts[:args.requests]),
+        f'workers_{args.workers}': (['--workers', str(args.workers)], texts[:args.requests]),
+    }
+
+    results = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'clients': args.clients,
+            'latency_s': args.latency,
+            'seed': args.seed,
+        },
+        'scenarios': {},
+    }
+    with tempfile.TemporaryDirectory() as temp:
+        settings_path = Path(temp) / "User-Settings.json"
+        settings_path.write_text(json.dumps({'Translation_API_Server': {'Google': {
+            'HTTP_port_number': 14366,
+            'supported_languages_list': {'Japanese': 'ja', 'English': 'en'},
+            'input_language': 'Japanese',
+            'output_language': 'English',
+            'base_url': base_url + "/google",
+        }}}), encoding='utf-8')
+        try:
+            for name, (options, batch) in scenarios.items():
+                port = free_port()
+                process = start_server(settings_path, port, options)
+                try:
+                    results['scenarios'][name] = run_load(port, batch, args.clients)
+                finally:
+                    stop_server(process, port)
+
+            port = free_port()
+            process = start_server(settings_path, port, [])
+            try:
+                results['batch'] = run_batch(port, texts[-args.batch:])
+            finally:
+                stop_server(process, port)
+        finally:
+            stub.shutdown()
+
+    print(f"\n  {'scenario':<14}{'requests':>9}{'errors':>8}{'req/s':>9}{'p50 ms':>9}{'p99 ms':>9}{'upstream':>10}",
+          file=sys.stderr)
+    for name, summary in results['scenarios'].items():
+        print(f"  {name:<14}{summary['requests']:>9}{summary['errors']:>8}{summary['requests_per_sec']:>9.1f}"
+              f"{summary['p50_ms'] or 0:>9.0f}{summary['p99_ms'] or 0:>9.0f}{summary['upstream_requests']:>10}",
+              file=sys.stderr)
+    batch = results['batch']
+    print(f"\nBatch of {batch['lines']}: translate batch {batch['translate_batch_s'] * 1000:.0f} ms, "
+          f"streamed first line {batch['stream_first_line_s'] * 1000:.0f} ms, "
+          f"all {batch['stream_total_s'] * 1000:.0f} ms", file=sys.stderr)
+
+    output = json.dumps(results, indent=2, ensure_ascii=False)
+    if args.output:
+        Path(args.output).write_text(output, encoding='utf-8')
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
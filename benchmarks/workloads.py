@@ -0,0 +1,132 @@
+"""
+Synthetic Visual Novel Workloads
+================================
+
+Deterministic generators of the kind of text a hooked Japanese visual novel
+produces, for benchmarking the plugin chain and the ingestion engine:
+
+- long dialogue lines
+- a speaker name and its line split across two hooks
+- doubled characters from hooks that emit every character twice
+- repeated lines (backlog, replays, re-reading after a load)
+- noise from system hooks (symbols, separators, single characters, numbers)
+
+The same seed always produces the same workload.
+"""
+
+import random
+from collections import deque
+
+NAMES = ["春香", "千早", "雪歩", "やよい", "律子", "あずさ", "伊織", "真", "美希", "響", "貴音", "亜美"]
+
+OPENINGS = [
+    "ねえ、", "あのさ、", "えっと……", "そういえば、", "本当に", "まさか", "ちょっと待って、",
+    "だからね、", "うーん、", "あれ？", "", "",
+]
+
+PHRASES = [
+    "今日はとても良い天気ですね", "昨日の夜、不思議な夢を見たんだ", "放課後、屋上で待っているから",
+    "そんなこと、誰にも言えないよ", "このままじゃ間に合わないかもしれない", "君のことをずっと考えていた",
+    "駅前の喫茶店で新しいケーキが出たらしい", "先生に呼ばれているので先に行きますね",
+    "明日の試験、全然勉強してないんだけど", "あの時の約束、覚えてる？", "もう少しだけ一緒にいてもいいかな",
+    "図書室の奥に古い日記が置いてあった", "雨が降りそうだから傘を持っていこう",
+    "まったく、あなたって人は", "私だって、本当は怖かったんだから",
+]
+
+ENDINGS = ["。", "！", "？", "……", "ね。", "よ。", "な。", "かな？"]
+
+NOISE = [
+    "■■■■■", "――――――", "------", "＊＊＊", "、", "…", "0", "12345", "＿＿＿＿", "▼", "☆☆☆☆☆",
+    "Now Loading...", "SYSTEM", "Save", "Load", "Auto", "Skip",
+]
+
+# Relative frequency of each kind of event
+KIND_WEIGHTS = {
+    'dialogue': 40,
+    'long_dialogue': 10,
+    'split_name': 15,
+    'doubled': 8,
+    'repeat': 12,
+    'noise': 15,
+}
+
+DIALOGUE_HOOK = "1"
+NAME_HOOK = "2"
+DOUBLED_HOOK = "3"
+NOISE_HOOKS = ["7", "8", "9", "12", "15"]
+
+
+def _dialogue(rng: random.Random, phrases: int = 1) -> str:
+    parts = [rng.choice(OPENINGS)]
+    for _ in range(phrases):
+        parts.append(rng.choice(PHRASES) + rng.choice(ENDINGS))
+    return "「" + "".join(parts) + "」"
+
+
+def generate_events(count: int, seed: int = 1234):
+    """
+    Generate hook events.
+
+    Yields:
+        (hook_id, text, kind) tuples
+    """
+    rng = random.Random(seed)
+    kinds = list(KIND_WEIGHTS)
+    weights = [KIND_WEIGHTS[kind] for kind in kinds]
+    # Backlog and replays reach back a fair way, but no further than this
+    history = deque(maxlen=200)
+
+    produced = 0
+    while produced < count:
+        kind = rng.choices(kinds, weights)[0]
+
+        if kind == 'dialogue':
+            text = _dialogue(rng)
+            history.append(text)
+            yield DIALOGUE_HOOK, text, kind
+        elif kind == 'long_dialogue':
+            text = _dialogue(rng, phrases=rng.randint(4, 10))
+            history.append(text)
+            yield DIALOGUE_HOOK, text, kind
+        elif kind == 'split_name':
+            yield NAME_HOOK, rng.choice(NAMES), kind
+            produced += 1
+            if produced >= count:
+                break
+            text = _dialogue(rng)
+            history.append(text)
+            yield DIALOGUE_HOOK, text, kind
+        elif kind == 'doubled':
+            text = "".join(ch * 2 for ch in _dialogue(rng))
+            yield DOUBLED_HOOK, text, kind
+        elif kind == 'repeat' and history:
+            yield DIALOGUE_HOOK, rng.choice(history), kind
+        else:
+            yield rng.choice(NOISE_HOOKS), rng.choice(NOISE), 'noise'
+
+        produced += 1
+
+
+def generate_plugin_inputs(count: int, seed: int = 1234, selected: bool = False):
+    """
+    Generate the strings the GUI hands to process_text_through_plugins.
+
+    Args:
+        selected: format as selected-hook output ("text\\n") instead of the
+                  "[Hook #id] text\\n" lines shown while no hook is selected
+    """
+    for hook_id, text, _ in generate_events(count, seed):
+        if selected:
+            if text:
+                yield text + "\n"
+        else:
+            yield f"[Hook #{hook_id}] {text}\n"
+
+
+def generate_cli_lines(count: int, seed: int = 1234, engine: str = "luna"):
+    """Generate raw CLI stdout lines for the given hook engine."""
+    for hook_id, text, _ in generate_events(count, seed):
+        if engine == "textractor":
+            yield f"[{hook_id}:1a2c:401000:0:0:Func{hook_id}:HS-4@401000] {text}\n"
+        else:
+            yield f"[#{hook_id}|1a2c:401000:0:Func{hook_id}:game.exe] {text}\n"
@@ -0,0 +1,241 @@
+"""
+Hook Output Capture & Replay
+============================
+
+Records the raw stdout lines of TextractorCLI / LunaHostCLI to an append-only
+capture file and replays them through the headless ingestion engine, either
+as fast as possible or at the recorded pace.
+
+Capture format (UTF-8 text, one record per line):
+
+    #SHCAP 1 engine=luna
+    <delta_us>\t<raw line>
+    <delta_us>\t<raw line>
+    ...
+
+Each "#SHCAP" header starts a new session (sessions can be appended to the
+same file). delta_us is the monotonic time in microseconds since the previous
+line of the session, so timestamps stay small and the file stays compact.
+The raw line is everything after the first tab, without its line ending.
+
+Usage:
+------
+python hook_capture.py replay session.shcap --realtime --plugins-folder plugins
+"""
+
+import sys
+import time
+from pathlib import Path
+from typing import Iterator, Optional, Tuple
+
+CAPTURE_MAGIC = "#SHCAP"
+CAPTURE_VERSION = 1
+CAPTURE_EXTENSION = ".shcap"
+
+# Flush the capture file at most this often (seconds) so a crash loses little
+FLUSH_INTERVAL = 1.0
+
+
+class CaptureWriter:
+    """
+    Appends raw CLI lines with monotonic timestamps to a capture file.
+
+    Example:
+        with CaptureWriter("session.shcap", engine="luna") as writer:
+            writer.write(line)
+    """
+
+    def __init__(self, path, engine: str = "luna"):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'a', encoding='utf-8', newline='\n')
+        self._file.write(f"{CAPTURE_MAGIC} {CAPTURE_VERSION} engine={engine}\n")
+        self._last_ns = time.perf_counter_ns()
+        self._last_flush = time.monotonic()
+        self.lines_written = 0
+
+    def write(self, line: str):
+        """Record one raw line (line endings are stripped)."""
+        if self._file is None:
+            return
+
+        now_ns = time.perf_counter_ns()
+        delta_us = (now_ns - self._last_ns) // 1000
+        self._last_ns = now_ns
+
+        line = line.rstrip('\r\n')
+        self._file.write(f"{delta_us}\t{line}\n")
+        self.lines_written += 1
+
+        now = time.monotonic()
+        if now - self._last_flush >= FLUSH_INTERVAL:
+            self._file.flush()
+            self._last_flush = now
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class CaptureTee:
+    """
+    Wraps a stream so every line read from it is also written to a capture.
+
+    Only readline() is provided, which is all HookIngestionEngine.run needs.
+    """
+
+    def __init__(self, stream, writer: CaptureWriter):
+        self.stream = stream
+        self.writer = writer
+
+    def readline(self) -> str:
+        line = self.stream.readline()
+        if line:
+            self.writer.write(line)
+        return line
+
+
+def read_capture(path) -> Iterator[Tuple[str, float, str]]:
+    """
+    Read a capture file.
+
+    Yields:
+        (engine, timestamp, line) where timestamp is the time in seconds since
+        the start of the line's session
+    """
+    engine = "luna"
+    elapsed_us = 0
+
+    with open(path, 'r', encoding='utf-8', newline='\n') as f:
+        for record in f:
+            record = record.rstrip('\n')
+            if record.startswith(CAPTURE_MAGIC):
+                # New session header: "#SHCAP <version> engine=<name>"
+                for field in record.split()[2:]:
+                    key, _, value = field.partition('=')
+                    if key == 'engine' and value:
+                        engine = value
+                elapsed_us = 0
+                continue
+
+            delta, sep, line = record.partition('\t')
+            if not sep:
+                continue
+            try:
+                elapsed_us += int(delta)
+            except ValueError:
+                continue
+
+            yield engine, elapsed_us / 1_000_000, line
+
+
+def replay_capture(path, ingestion, realtime: bool = False, speed: float = 1.0,
+                   max_lines: Optional[int] = None) -> dict:
+    """
+    Feed a capture into an ingestion engine.
+
+    Args:
+        path: capture file
+        ingestion: a HookIngestionEngine (its engine is switched to match the capture)
+        realtime: sleep to reproduce the recorded pace instead of going flat out
+        speed: pace multiplier used with realtime (2.0 = twice as fast)
+        max_lines: stop after this many lines
+
+    Returns:
+        dict with 'lines', 'elapsed' (seconds) and 'lines_per_sec'
+    """
+    lines = 0
+    start = time.perf_counter()
+    session_start = start
+    last_timestamp = None
+
+    for engine, timestamp, line in read_capture(path):
+        if max_lines is not None and lines >= max_lines:
+            break
+
+        ingestion.set_engine(engine)
+
+        if realtime:
+            # A timestamp going backwards means a new session started
+            if last_timestamp is None or timestamp < last_timestamp:
+                session_start = time.perf_counter() - timestamp / speed
+            delay = session_start + timestamp / speed - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            last_timestamp = timestamp
+
+        ingestion.feed_line(line)
+        lines += 1
+
+    elapsed = time.perf_counter() - start
+    return {
+        'lines': lines,
+        'elapsed': elapsed,
+        'lines_per_sec': lines / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def main(argv=None):
+    import argparse
+    import json
+
+    from hook_ingestion import HookIngestionEngine, PluginDispatcher
+
+    parser = argparse.ArgumentParser(description="Replay a hook output capture")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    replay_parser = subparsers.add_parser('replay', help="feed a capture through the ingestion engine")
+    replay_parser.add_argument('capture')
+    replay_parser.add_argument('--realtime', action='store_true', help="replay at the recorded pace")
+    replay_parser.add_argument('--speed', type=float, default=1.0)
+    replay_parser.add_argument('--select', help="only display text of this hook id")
+    replay_parser.add_argument('--plugins-folder', help="load and activate every plugin in this folder")
+    replay_parser.add_argument('--print', action='store_true', help="print the output text")
+    replay_parser.add_argument('--json', action='store_true', help="print results as JSON")
+    replay_parser.add_argument('--plugin-stats', help="write per-plugin statistics to this .json or .csv file")
+
+    record_parser = subparsers.add_parser('record', help="record stdin (e.g. a CLI pipe) to a capture")
+    record_parser.add_argument('capture')
+    record_parser.add_argument('--engine', default='luna')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'record':
+        with CaptureWriter(args.capture, engine=args.engine) as writer:
+            for line in sys.stdin:
+                writer.write(line)
+        return
+
+    dispatcher = PluginDispatcher()
+    if args.plugins_folder:
+        dispatcher.load_folder(Path(args.plugins_folder))
+
+    ingestion = HookIngestionEngine(
+        dispatcher=dispatcher,
+        on_output=(lambda text: sys.stdout.write(text)) if args.print else None,
+    )
+    ingestion.selected_hook_id = args.select
+
+    result = replay_capture(args.capture, ingestion, realtime=args.realtime, speed=args.speed)
+    result.update(ingestion.stats)
+    result['hooks'] = len(ingestion.registry)
+    if args.plugin_stats:
+        dispatcher.export_stats(args.plugin_stats)
+
+    if args.json:
+        print(json.dumps(result))
+    else:
+        print(f"{result['lines']} lines, {result['hooks']} hooks, "
+              f"{result['outputs']} output, {result['filtered']} filtered "
+              f"in {result['elapsed']:.3f}s ({result['lines_per_sec']:.0f} lines/s)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
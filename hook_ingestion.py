@@ -0,0 +1,1196 @@
+"""
+Hook Output Ingestion
+=====================
+
+Headless parsing, hook registry and plugin dispatch for the output of the
+hook engine CLIs (TextractorCLI / LunaHostCLI).
+
+Nothing in this module touches Tk or the Windows APIs, so the whole hot path
+can be fed from any text stream (a CLI pipe, a file, a replayed capture) and
+run, profiled or benchmarked on any platform.
+
+Example:
+--------
+from hook_ingestion import HookIngestionEngine
+
+engine = HookIngestionEngine(engine="luna", on_output=print)
+with open("session.txt", encoding="utf-8") as f:
+    engine.run(f)
+"""
+
+import ast
+import csv
+import hashlib
+import importlib.util
+import json
+import os
+import re
+import sys
+import threading
+import time
+from collections import deque
+from typing import Callable, Iterable, Optional
+
+try:
+    from plugins import TextractorPlugin
+    PLUGINS_AVAILABLE = True
+except ImportError:
+    PLUGINS_AVAILABLE = False
+
+# Latencies kept per plugin for the percentiles of PluginStats
+PLUGIN_LATENCY_SAMPLES = 1000
+# A plugin call longer than this (ms) counts as slow (PluginDispatcher.slow_threshold_ms)
+SLOW_PLUGIN_MS = 200
+
+# Only the first few texts of each hook are kept (used for previews and profiles)
+MAX_HOOK_TEXTS = 3
+
+CONSOLE_PATTERN = re.compile(r'^\[Console\] (.+)$')
+
+# Output lines buffered between two UI frames before the oldest are dropped
+MAX_PENDING_OUTPUT = 500
+
+
+class TextractorLineParser:
+    """
+    Parser for TextractorCLI output lines.
+
+    Format: [hook_id:pid:addr:ctx:ctx2:function:code] text
+    """
+
+    engine = "textractor"
+    pattern = re.compile(r'^\[(\d+):([^:]+):([^:]+):([^:]+):([^:]+):([^:]+):([^\]]+)\] (.*)$')
+
+    def parse(self, line: str):
+        """
+        Parse a hook output line.
+
+        Returns:
+            (hook_id, function, text) or None if the line is not hook output
+        """
+        match = self.pattern.match(line)
+        if not match:
+            return None
+        return match.group(1), match.group(6), match.group(8)
+
+    def format_unselected(self, hook_id: str, text: str) -> str:
+        """Format text of a hook shown while no hook is selected."""
+        return f"[Hook {hook_id}] {text}\n"
+
+
+class LunaLineParser:
+    """
+    Parser for LunaHostCLI output lines.
+
+    Format: [#hook_id|context_info] text
+    """
+
+    engine = "luna"
+    pattern = re.compile(r'^\[#(\d+)\|([^\]]+)\] (.*)$')
+
+    def parse(self, line: str):
+        """
+        Parse a hook output line.
+
+        Returns:
+            (hook_id, function, text) or None if the line is not hook output
+        """
+        match = self.pattern.match(line)
+        if not match:
+            return None
+
+        # Extract hook name from context (last part before .exe)
+        context_parts = match.group(2).split(':')
+        if len(context_parts) >= 2:
+            function = context_parts[-2]
+        else:
+            function = "Unknown"
+
+        return match.group(1), function, match.group(3)
+
+    def format_unselected(self, hook_id: str, text: str) -> str:
+        """Format text of a hook shown while no hook is selected."""
+        return f"[Hook #{hook_id}] {text}\n"
+
+
+PARSERS = {
+    'textractor': TextractorLineParser,
+    'luna': LunaLineParser,
+}
+
+
+def get_parser(engine: str):
+    """Create the line parser for an engine name ('luna' or 'textractor')."""
+    try:
+        return PARSERS[engine]()
+    except KeyError:
+        raise ValueError(f"Unknown hook engine: {engine}")
+
+
+class HookRegistry:
+    """
+    Tracks hooks discovered in the CLI output.
+
+    Each hook is stored as {'id': ..., 'function': ..., 'texts': [...]},
+    keeping only the first MAX_HOOK_TEXTS texts for memory efficiency.
+    """
+
+    def __init__(self, max_texts: int = MAX_HOOK_TEXTS):
+        self.hooks = {}
+        self.max_texts = max_texts
+
+    def record(self, hook_id: str, function: str, text: str) -> bool:
+        """
+        Record a line of text for a hook.
+
+        Returns:
+            True if the hook was not known before
+        """
+        hook = self.hooks.get(hook_id)
+        is_new = hook is None
+        if is_new:
+            hook = {'id': hook_id, 'function': function, 'texts': []}
+            self.hooks[hook_id] = hook
+
+        texts = hook['texts']
+        if len(texts) < self.max_texts:
+            texts.append(text)
+
+        return is_new
+
+    def clear(self):
+        """Forget all hooks (the dict is cleared in place)."""
+        self.hooks.clear()
+
+    def __contains__(self, hook_id):
+        return hook_id in self.hooks
+
+    def __len__(self):
+        return len(self.hooks)
+
+
+def load_plugin_module(plugin_path):
+    """
+    Load a plugin instance from a .py file.
+
+    Looks for a module level 'plugin' instance, or else instantiates the first
+    class that inherits from TextractorPlugin.
+
+    Returns:
+        The plugin instance, or None if the file does not define a plugin
+    """
+    if not PLUGINS_AVAILABLE:
+        return None
+
+    plugin_name = plugin_path.stem
+
+    spec = importlib.util.spec_from_file_location(plugin_name, plugin_path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[plugin_name] = module
+    spec.loader.exec_module(module)
+
+    if hasattr(module, 'plugin'):
+        return module.plugin
+
+    for attr_name in dir(module):
+        attr = getattr(module, attr_name)
+        if (isinstance(attr, type) and
+            issubclass(attr, TextractorPlugin) and
+            attr is not TextractorPlugin):
+            return attr()
+
+    return None
+
+
+# Class attributes shown in the plugin list
+PLUGIN_METADATA = ('name', 'description', 'version', 'author')
+
+
+def read_plugin_metadata(plugin_path, source: Optional[bytes] = None) -> Optional[dict]:
+    """
+    Read a plugin's name, description, version and author without running it.
+
+    The file is parsed, not executed, so its imports (e.g. a translation
+    library) are not loaded. The plugin class is the class of the module
+    level 'plugin' instance, or else the first class deriving from
+    TextractorPlugin (directly or through another class of the file), as
+    load_plugin_module picks it. Its metadata must be literals.
+
+    Args:
+        plugin_path: Path of the plugin file
+        source: the file's content, if already read
+
+    Returns:
+        dict of name, description, version, author and has_settings (the
+        class overrides get_settings), or None if only loading the module
+        can tell
+    """
+    if not PLUGINS_AVAILABLE:
+        return None
+    try:
+        if source is None:
+            source = plugin_path.read_bytes()
+        tree = ast.parse(source)
+    except (OSError, SyntaxError, ValueError):
+        return None
+
+    def base_name(node):
+        if isinstance(node, ast.Name):
+            return node.id
+        if isinstance(node, ast.Attribute):
+            return node.attr
+        return None
+
+    # Plugin classes of the file, with their bases inside the file
+    classes = {}
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef):
+            bases = [base_name(base) for base in node.bases]
+            if 'TextractorPlugin' in bases or any(name in classes for name in bases):
+                classes[node.name] = node
+
+    class_name = None
+    for node in tree.body:
+        targets = node.targets if isinstance(node, ast.Assign) else []
+        if any(isinstance(target, ast.Name) and target.id == 'plugin' for target in targets):
+            value = node.value
+            if not (isinstance(value, ast.Call) and isinstance(value.func, ast.Name)):
+                return None
+            class_name = value.func.id
+    if class_name is None and classes:
+        class_name = sorted(classes)[0]
+    if class_name not in classes:
+        return None
+
+    # The class, then its bases in the file, then TextractorPlugin's defaults
+    lineage = []
+    pending = [classes[class_name]]
+    while pending:
+        node = pending.pop(0)
+        lineage.append(node)
+        pending.extend(classes[name] for name in map(base_name, node.bases) if name in classes)
+
+    metadata = {}
+    has_settings = False
+    for node in lineage:
+        for statement in node.body:
+            if isinstance(statement, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                has_settings = has_settings or statement.name == 'get_settings'
+            if isinstance(statement, ast.Assign):
+                targets, value = statement.targets, statement.value
+            elif isinstance(statement, ast.AnnAssign) and statement.value is not None:
+                targets, value = [statement.target], statement.value
+            else:
+                continue
+            for target in targets:
+                if isinstance(target, ast.Name) and target.id in PLUGIN_METADATA:
+                    if target.id in metadata:
+                        continue
+                    try:
+                        metadata[target.id] = ast.literal_eval(value)
+                    except ValueError:
+                        return None
+    for name in PLUGIN_METADATA:
+        metadata.setdefault(name, getattr(TextractorPlugin, name))
+    metadata['has_settings'] = has_settings
+    return metadata
+
+
+def plugin_signature(plugin_path) -> Optional[tuple]:
+    """(modification time in ns, size) of a plugin file, None if it is missing."""
+    try:
+        stat = plugin_path.stat()
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+class PluginManifest:
+    """
+    Cache of read_plugin_metadata results, kept in a JSON file.
+
+    Entries are keyed by plugin path and are valid while the file's
+    modification time and size are unchanged; a file whose time or size
+    changed but whose content did not (same SHA-1, e.g. copied again) keeps
+    its entry. With it the plugin list is built without reading unchanged
+    plugins. Results of None (the plugin must be loaded to be listed) are
+    cached too.
+
+    Attributes:
+        hits (int): lookups answered from the cache
+        misses (int): lookups that parsed the file
+    """
+
+    # Bump when the metadata read from plugins changes
+    VERSION = 1
+
+    def __init__(self, path=None):
+        """
+        Args:
+            path: Path of the JSON file (None: kept in memory only)
+        """
+        self.path = path
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+        if path is not None:
+            self.load()
+
+    def load(self):
+        """Read the manifest file, if it exists and is of this version."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict) and data.get('version') == self.VERSION:
+            self.entries = data.get('plugins', {})
+
+    def metadata(self, plugin_path) -> Optional[dict]:
+        """read_plugin_metadata(plugin_path), from the cache when the file is unchanged."""
+        key = str(plugin_path)
+        signature = plugin_signature(plugin_path)
+        if signature is None:
+            return None
+        entry = self.entries.get(key)
+        if entry is not None and (entry['mtime_ns'], entry['size']) == signature:
+            self.hits += 1
+            return entry['metadata']
+
+        try:
+            source = plugin_path.read_bytes()
+        except OSError:
+            return None
+        digest = hashlib.sha1(source).hexdigest()
+        if entry is not None and entry['sha1'] == digest:
+            self.hits += 1
+            metadata = entry['metadata']
+        else:
+            self.misses += 1
+            metadata = read_plugin_metadata(plugin_path, source)
+        self.entries[key] = {
+            'mtime_ns': signature[0],
+            'size': signature[1],
+            'sha1': digest,
+            'metadata': metadata,
+        }
+        self._dirty = True
+        return metadata
+
+    def save(self, prune: bool = True):
+        """
+        Write the manifest file if an entry changed.
+
+        Args:
+            prune: drop the entries of plugins removed from the folder
+        """
+        if prune:
+            stale = [key for key in self.entries if not os.path.exists(key)]
+            for key in stale:
+                del self.entries[key]
+            self._dirty = self._dirty or bool(stale)
+        if self.path is None or not self._dirty:
+            return
+        try:
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': self.VERSION, 'plugins': self.entries}, f, indent=2)
+            os.replace(temp_path, self.path)
+            self._dirty = False
+        except OSError:
+            pass
+
+
+class LazyPlugin:
+    """
+    Stands in for a plugin whose module has not been loaded yet.
+
+    Shows the metadata read by read_plugin_metadata, and keeps the settings,
+    game and output callback the host gives it until the plugin is loaded.
+    Anything else loads the module (load) and is forwarded to the plugin.
+    PluginDispatcher.resolve puts the loaded plugin in its place.
+    """
+
+    def __init__(self, plugin_path, metadata: dict):
+        self.plugin = None
+        self.plugin_path = plugin_path
+        self.name = metadata['name']
+        self.description = metadata['description']
+        self.version = metadata['version']
+        self.author = metadata['author']
+        self.has_settings = metadata['has_settings']
+        self.deferred_output = None
+        self._enabled = None
+        self._settings = {}
+        self._game_id = None
+
+    @property
+    def enabled(self) -> bool:
+        if self.plugin is not None:
+            return self.plugin.enabled
+        return True if self._enabled is None else self._enabled
+
+    @enabled.setter
+    def enabled(self, value):
+        if self.plugin is not None:
+            self.plugin.enabled = value
+        else:
+            self._enabled = value
+
+    def load(self):
+        """
+        Load the plugin module, once.
+
+        Returns:
+            The plugin instance, or None if the file does not define a plugin
+        """
+        if self.plugin is None:
+            plugin = load_plugin_module(self.plugin_path)
+            if plugin is None:
+                return None
+            for name, value in self._settings.items():
+                try:
+                    plugin.set_setting(name, value)
+                except Exception:
+                    pass
+            if self._game_id is not None:
+                try:
+                    plugin.on_game_changed(self._game_id)
+                except Exception:
+                    pass
+            if self.deferred_output is not None:
+                plugin.deferred_output = self.deferred_output
+            if self._enabled is not None:
+                plugin.enabled = self._enabled
+            self.plugin = plugin
+        return self.plugin
+
+    def __getattr__(self, name):
+        # Only called for what the stand-in does not have itself
+        if name.startswith('__') or name in ('plugin', 'plugin_path'):
+            raise AttributeError(name)
+        plugin = self.load()
+        if plugin is None:
+            raise AttributeError(name)
+        return getattr(plugin, name)
+
+    def set_setting(self, name: str, value) -> bool:
+        if self.plugin is not None:
+            return self.plugin.set_setting(name, value)
+        self._settings[name] = value
+        return True
+
+    def on_game_changed(self, game_id):
+        if self.plugin is not None:
+            self.plugin.on_game_changed(game_id)
+        else:
+            self._game_id = game_id
+
+    def reset(self):
+        if self.plugin is not None:
+            self.plugin.reset()
+
+    def on_disable(self):
+        if self.plugin is not None:
+            self.plugin.on_disable()
+
+    def __repr__(self):
+        return f"<LazyPlugin: {self.name} v{self.version} ({self.plugin_path.name})>"
+
+
+def discover_plugin(plugin_path, lazy: bool = True, manifest: Optional[PluginManifest] = None):
+    """
+    A plugin for the plugin list: a LazyPlugin when lazy and its metadata
+    can be read without running the file, else the loaded plugin.
+
+    Args:
+        plugin_path: Path of the plugin file
+        lazy: return a LazyPlugin where possible
+        manifest: PluginManifest to take the metadata from
+
+    Returns:
+        The plugin (or stand-in), or None if the file does not define a plugin
+    """
+    if lazy:
+        if manifest is not None:
+            metadata = manifest.metadata(plugin_path)
+        else:
+            metadata = read_plugin_metadata(plugin_path)
+        if metadata is not None:
+            return LazyPlugin(plugin_path, metadata)
+    return load_plugin_module(plugin_path)
+
+
+def plugin_has_settings(plugin) -> bool:
+    """Whether a plugin (or LazyPlugin, without loading it) has settings to configure."""
+    if isinstance(plugin, LazyPlugin) and plugin.plugin is None:
+        return plugin.has_settings
+    return bool(plugin.get_settings())
+
+
+# Columns of PluginStats.to_dict, in the order of the CSV export
+PLUGIN_STATS_FIELDS = (
+    'plugin', 'name', 'calls', 'filtered', 'filter_rate', 'errors', 'slow',
+    'total_ms', 'mean_ms', 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms',
+    'chars_in', 'chars_out', 'last_error',
+)
+
+
+class PluginStats:
+    """
+    Counters of one plugin in the dispatch chain, cheap enough to keep on.
+
+    Attributes:
+        filename (str): plugin filename
+        name (str): plugin name
+        calls (int): lines passed to the plugin
+        filtered (int): lines it filtered out (returned None)
+        errors (int): exceptions it raised (the line went on unchanged)
+        slow (int): calls longer than the dispatcher's slow threshold
+        total_s (float): time spent in the plugin
+        max_s (float): longest call
+        chars_in (int): characters of the lines passed to it
+        chars_out (int): characters of the lines it returned
+        samples (deque): the last PLUGIN_LATENCY_SAMPLES call durations (s)
+        last_error (str): the last exception, or None
+    """
+
+    # Updated for every plugin call: slots keep the attribute updates cheap
+    __slots__ = ('filename', 'name', 'calls', 'filtered', 'errors', 'slow', 'total_s', 'max_s',
+                 'chars_in', 'chars_out', 'samples', 'last_error')
+
+    def __init__(self, filename: str = None, name: str = None):
+        self.filename = filename
+        self.name = name or filename
+        self.reset()
+
+    def reset(self):
+        self.calls = 0
+        self.filtered = 0
+        self.errors = 0
+        self.slow = 0
+        self.total_s = 0.0
+        self.max_s = 0.0
+        self.chars_in = 0
+        self.chars_out = 0
+        self.samples = deque(maxlen=PLUGIN_LATENCY_SAMPLES)
+        self.last_error = None
+
+    def to_dict(self) -> dict:
+        """The counters, with latencies in ms (percentiles over the recent calls)."""
+        samples = sorted(list(self.samples))
+
+        def percentile(pct):
+            if not samples:
+                return 0.0
+            return samples[min(len(samples) - 1, int(pct / 100.0 * len(samples)))] * 1000.0
+
+        return {
+            'plugin': self.filename,
+            'name': self.name,
+            'calls': self.calls,
+            'filtered': self.filtered,
+            'filter_rate': self.filtered / self.calls if self.calls else 0.0,
+            'errors': self.errors,
+            'slow': self.slow,
+            'total_ms': self.total_s * 1000.0,
+            'mean_ms': self.total_s / self.calls * 1000.0 if self.calls else 0.0,
+            'p50_ms': percentile(50),
+            'p95_ms': percentile(95),
+            'p99_ms': percentile(99),
+            'max_ms': self.max_s * 1000.0,
+            'chars_in': self.chars_in,
+            'chars_out': self.chars_out,
+            'last_error': self.last_error,
+        }
+
+
+class PluginDispatcher:
+    """
+    Runs text through the active plugins in their configured order.
+
+    The chain process() runs is compiled once from plugins, active_plugins
+    and plugin_order; assigning any of them rebuilds it, and so do add,
+    remove and resolve. Call invalidate() after changing one of the lists
+    in place or a plugin's enabled flag.
+
+    Every call is measured (see PluginStats); calls longer than
+    slow_threshold_ms are counted as slow and reported to on_slow.
+
+    Attributes:
+        plugins (dict): plugin filename -> plugin instance
+        active_plugins (list): filenames of the active plugins
+        plugin_order (list): filenames in execution order
+        on_deferred (callable): on_deferred(text) for text plugins deliver
+            after processing (see TextractorPlugin.emit_deferred)
+        game_id: profile id of the attached game, or None
+        signatures (dict): plugin filename -> plugin_signature of the file
+            the registered plugin was loaded from
+        stats (dict): plugin filename -> PluginStats
+        slow_threshold_ms (float): duration from which a call is slow
+        on_slow (callable): on_slow(filename, seconds) after a slow call,
+            on the thread that processed the line
+    """
+
+    def __init__(self):
+        self._plugins = {}
+        self._active_plugins = []
+        self._plugin_order = []
+        self._chain = None
+        self.on_deferred = None
+        self.game_id = None
+        self.signatures = {}
+        self.stats = {}
+        self.slow_threshold_ms = SLOW_PLUGIN_MS
+        self.on_slow = None
+
+    @property
+    def plugins(self) -> dict:
+        return self._plugins
+
+    @plugins.setter
+    def plugins(self, plugins):
+        self._plugins = plugins
+        self._chain = None
+
+    @property
+    def active_plugins(self) -> list:
+        return self._active_plugins
+
+    @active_plugins.setter
+    def active_plugins(self, active_plugins):
+        self._active_plugins = active_plugins
+        self._chain = None
+
+    @property
+    def plugin_order(self) -> list:
+        return self._plugin_order
+
+    @plugin_order.setter
+    def plugin_order(self, plugin_order):
+        self._plugin_order = plugin_order
+        self._chain = None
+
+    def invalidate(self):
+        """Rebuild the chain before the next line (activation, order or enabled changed)."""
+        self._chain = None
+
+    def compile(self) -> tuple:
+        """
+        Build the chain process() runs: (process_text, PluginStats) of every
+        enabled, active plugin, in plugin_order.
+        """
+        active = set(self._active_plugins)
+        chain = []
+        for filename in self._plugin_order:
+            plugin = self._plugins.get(filename)
+            if plugin is None or filename not in active:
+                continue
+            try:
+                if not plugin.enabled:
+                    continue
+                # Loads a LazyPlugin's module
+                process_text = plugin.process_text
+            except Exception:
+                continue
+            stats = self.stats.get(filename)
+            if stats is None:
+                stats = self.stats[filename] = PluginStats(filename)
+            stats.name = getattr(plugin, 'name', None) or filename
+            chain.append((process_text, stats))
+        self._chain = tuple(chain)
+        return self._chain
+
+    def add(self, filename: str, plugin, plugin_path=None):
+        """
+        Register a plugin instance and connect its deferred output.
+
+        Args:
+            filename: plugin filename
+            plugin: the plugin (or LazyPlugin)
+            plugin_path: Path of the file it was loaded from, to tell later
+                whether the file changed (is_current)
+        """
+        plugin.deferred_output = self.deliver_deferred
+        self.plugins[filename] = plugin
+        self._chain = None
+        if plugin_path is not None:
+            self.signatures[filename] = plugin_signature(plugin_path)
+        else:
+            self.signatures.pop(filename, None)
+        if self.game_id is not None:
+            try:
+                plugin.on_game_changed(self.game_id)
+            except Exception:
+                pass
+
+    def is_current(self, filename: str, plugin_path) -> bool:
+        """Whether the plugin registered as filename was loaded from plugin_path as it is now."""
+        signature = self.signatures.get(filename)
+        return (filename in self.plugins and signature is not None
+                and signature == plugin_signature(plugin_path))
+
+    def discover(self, plugin_path, lazy: bool = True, manifest: Optional[PluginManifest] = None):
+        """
+        Register the plugin of a file (see discover_plugin), unless the
+        plugin registered under its name was loaded from the file as it is
+        now: reloading a folder keeps unchanged plugins and their state. A
+        plugin replaced because its file changed is disabled first.
+
+        Returns:
+            The registered plugin, or None if the file does not define one
+            (any plugin registered under its name is removed)
+        """
+        filename = plugin_path.name
+        if self.is_current(filename, plugin_path):
+            return self.plugins[filename]
+        plugin = discover_plugin(plugin_path, lazy=lazy, manifest=manifest)
+        if not plugin:
+            self.remove(filename)
+            return None
+        previous = self.plugins.get(filename)
+        if previous is not None:
+            try:
+                previous.on_disable()
+            except Exception:
+                pass
+        self.add(filename, plugin, plugin_path)
+        return plugin
+
+    def remove(self, filename: str):
+        """Disable and unregister a plugin (e.g. its file was deleted)."""
+        plugin = self.plugins.pop(filename, None)
+        self.signatures.pop(filename, None)
+        self._chain = None
+        if plugin is not None:
+            try:
+                plugin.on_disable()
+            except Exception:
+                pass
+
+    def resolve(self, filename: str):
+        """
+        Load a plugin registered as a LazyPlugin and register the plugin
+        itself in its place (e.g. when it is activated or configured).
+
+        Returns:
+            The plugin, or None if it is unknown or could not be loaded
+        """
+        plugin = self.plugins.get(filename)
+        if isinstance(plugin, LazyPlugin):
+            try:
+                loaded = plugin.load()
+            except Exception:
+                loaded = None
+            if loaded is None:
+                return None
+            self.add(filename, loaded, plugin.plugin_path)
+            plugin = loaded
+        return plugin
+
+    def set_game(self, game_id: Optional[str]):
+        """Tell every plugin which game is attached (its game profile id)."""
+        self.game_id = game_id
+        for plugin in self.plugins.values():
+            try:
+                plugin.on_game_changed(game_id)
+            except Exception:
+                pass
+
+    def deliver_deferred(self, source, original: str, text: str):
+        """
+        Pass text a plugin delivered late to the other enabled plugins and
+        then to on_deferred. Called on the plugin's worker thread.
+        """
+        for plugin_filename in self.plugin_order:
+            plugin = self.plugins.get(plugin_filename)
+            if plugin is None or plugin is source or not plugin.enabled:
+                continue
+            if plugin_filename not in self.active_plugins:
+                continue
+            try:
+                plugin.on_deferred_text(source, original, text)
+            except Exception:
+                pass
+
+        if self.on_deferred is not None:
+            self.on_deferred(text)
+
+    def process(self, text: str) -> Optional[str]:
+        """
+        Process text through all active plugins.
+
+        Returns:
+            The processed text, or None if a plugin filtered it out
+        """
+        if not PLUGINS_AVAILABLE:
+            return text
+
+        chain = self._chain
+        if chain is None:
+            chain = self.compile()
+
+        current_text = text
+        clock = time.perf_counter
+        slow_threshold = self.slow_threshold_ms / 1000.0
+        for process_text, stats in chain:
+            stats.chars_in += len(current_text)
+            start = clock()
+            try:
+                result = process_text(current_text)
+            except Exception as e:
+                # A failing plugin passes the line on unchanged
+                result = current_text
+                stats.errors += 1
+                stats.last_error = f"{e.__class__.__name__}: {e}"
+            elapsed = clock() - start
+            stats.calls += 1
+            stats.total_s += elapsed
+            stats.samples.append(elapsed)
+            if elapsed > stats.max_s:
+                stats.max_s = elapsed
+            if elapsed > slow_threshold:
+                stats.slow += 1
+                if self.on_slow is not None:
+                    try:
+                        self.on_slow(stats.filename, elapsed)
+                    except Exception:
+                        pass
+            if result is None:
+                stats.filtered += 1
+                return None
+            stats.chars_out += len(result)
+            current_text = result
+
+        return current_text
+
+    def get_stats(self) -> dict:
+        """Counters of every plugin that processed text: {filename: PluginStats.to_dict()}."""
+        return {filename: stats.to_dict() for filename, stats in list(self.stats.items())}
+
+    def export_stats(self, path):
+        """
+        Write the plugin counters to a file: CSV (one row per plugin, columns
+        PLUGIN_STATS_FIELDS) if its name ends in .csv, else JSON.
+        """
+        stats = self.get_stats()
+        if str(path).lower().endswith('.csv'):
+            with open(path, 'w', encoding='utf-8', newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=PLUGIN_STATS_FIELDS)
+                writer.writeheader()
+                writer.writerows(stats.values())
+        else:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump({'slow_threshold_ms': self.slow_threshold_ms, 'plugins': stats},
+                          f, indent=2, ensure_ascii=False)
+
+    def reset_stats(self):
+        for stats in self.stats.values():
+            stats.reset()
+
+    def load_folder(self, folder, activate: bool = True,
+                    manifest: Optional[PluginManifest] = None) -> int:
+        """
+        Load every plugin in a folder (headless use: benchmarks, replays).
+
+        Plugins already loaded from an unchanged file are kept (see discover).
+
+        Args:
+            folder: Path of the plugins folder
+            activate: append the loaded plugins to the active list; when
+                False, plugins are registered as LazyPlugin where possible
+            manifest: PluginManifest caching the metadata of lazy plugins
+                (saved afterwards)
+
+        Returns:
+            The number of plugins loaded
+        """
+        loaded = 0
+        for plugin_file in sorted(folder.glob("*.py")):
+            if plugin_file.name.startswith("_"):
+                continue
+            try:
+                plugin = self.discover(plugin_file, lazy=not activate, manifest=manifest)
+            except Exception:
+                continue
+            if activate and isinstance(plugin, LazyPlugin):
+                # Kept from an earlier lazy pass: active plugins run their module
+                plugin = self.resolve(plugin_file.name)
+            if not plugin:
+                continue
+
+            if plugin_file.name not in self.plugin_order:
+                self.plugin_order.append(plugin_file.name)
+            if activate and plugin_file.name not in self.active_plugins:
+                self.active_plugins.append(plugin_file.name)
+            loaded += 1
+
+        self._chain = None
+        if manifest is not None:
+            manifest.save()
+        return loaded
+
+    def reset_all(self):
+        """Reset state of all plugins"""
+        for plugin in self.plugins.values():
+            try:
+                plugin.reset()
+            except Exception:
+                pass
+
+
+class UIUpdateBatcher:
+    """
+    Thread-safe outbound queue between the reader thread and the UI.
+
+    The reader thread pushes events as fast as the hook emits them; the UI
+    drains everything once per frame, so UI work per frame stays bounded:
+    - new hooks are delivered in order, never dropped
+    - previews are coalesced per hook (only the latest text matters)
+    - output lines are joined into a single insert, and when more than
+      max_pending lines pile up between two frames the oldest are dropped
+
+    Attributes:
+        stats (dict): 'coalesced' previews, 'dropped' output lines, 'frames' drained
+    """
+
+    def __init__(self, max_pending: int = MAX_PENDING_OUTPUT):
+        self._lock = threading.Lock()
+        self._new_hooks = []
+        self._previews = {}
+        self._outputs = deque(maxlen=max_pending)
+        self.stats = {'coalesced': 0, 'dropped': 0, 'frames': 0}
+
+    def new_hook(self, hook_id, function):
+        with self._lock:
+            self._new_hooks.append((hook_id, function))
+
+    def hook_text(self, hook_id, text):
+        with self._lock:
+            if hook_id in self._previews:
+                self.stats['coalesced'] += 1
+            self._previews[hook_id] = text
+
+    def output(self, text):
+        with self._lock:
+            outputs = self._outputs
+            if len(outputs) == outputs.maxlen:
+                self.stats['dropped'] += 1
+            outputs.append(text)
+
+    def drain(self):
+        """
+        Take everything queued since the last frame.
+
+        Returns:
+            (new_hooks, previews, outputs) - a list of (hook_id, function),
+            a dict of hook_id -> latest text and a list of output texts
+        """
+        with self._lock:
+            new_hooks = self._new_hooks
+            previews = self._previews
+            outputs = list(self._outputs)
+            self._new_hooks = []
+            self._previews = {}
+            self._outputs.clear()
+            if new_hooks or previews or outputs:
+                self.stats['frames'] += 1
+        return new_hooks, previews, outputs
+
+    def clear(self):
+        """Discard everything queued (e.g. after detaching)."""
+        with self._lock:
+            self._new_hooks = []
+            self._previews = {}
+            self._outputs.clear()
+
+
+def _noop(*args):
+    pass
+
+
+class HookIngestionEngine:
+    """
+    Turns raw CLI output lines into hook events and display text.
+
+    Callbacks (all optional, called on the thread feeding the lines):
+        on_new_hook(hook_id, function): a hook was seen for the first time
+        on_hook_text(hook_id, text): a hook emitted text (for previews)
+        on_output(text): processed text that should be displayed; also called
+            from plugin worker threads for text delivered after processing
+
+    Attributes:
+        selected_hook_id: hook whose text is displayed, or None to display all hooks
+        suppress_unselected: don't display any hook text while no hook is selected
+        stats (dict): line counters for throughput measurements
+    """
+
+    def __init__(
+        self,
+        engine: str = "luna",
+        registry: Optional[HookRegistry] = None,
+        dispatcher: Optional[PluginDispatcher] = None,
+        on_new_hook: Optional[Callable] = None,
+        on_hook_text: Optional[Callable] = None,
+        on_output: Optional[Callable] = None,
+    ):
+        self.parser = get_parser(engine)
+        self.registry = registry if registry is not None else HookRegistry()
+        self.dispatcher = dispatcher if dispatcher is not None else PluginDispatcher()
+        self.on_new_hook = on_new_hook or _noop
+        self.on_hook_text = on_hook_text or _noop
+        self.on_output = on_output or _noop
+        self.selected_hook_id = None
+        self.suppress_unselected = False
+        self.dispatcher.on_deferred = self._emit_deferred
+        self.reset_stats()
+
+    @property
+    def engine(self) -> str:
+        return self.parser.engine
+
+    def set_engine(self, engine: str):
+        """Switch the line format being parsed ('luna' or 'textractor')."""
+        if engine != self.parser.engine:
+            self.parser = get_parser(engine)
+
+    def reset_stats(self):
+        """Reset the line counters."""
+        self.stats = {
+            'lines': 0,
+            'hook_lines': 0,
+            'console_lines': 0,
+            'outputs': 0,
+            'filtered': 0,
+            'deferred': 0,
+        }
+
+    def _emit(self, text: str):
+        processed_text = self.dispatcher.process(text)
+        if processed_text is None:
+            self.stats['filtered'] += 1
+            return
+        self.stats['outputs'] += 1
+        self.on_output(processed_text)
+
+    def _emit_deferred(self, text: str):
+        # Text a plugin delivered later from its own thread (e.g. a translation)
+        self.stats['deferred'] += 1
+        self.on_output(text)
+
+    def feed_line(self, line: str):
+        """Parse and dispatch a single line of CLI output."""
+        line = line.strip()
+        if not line:
+            return
+
+        stats = self.stats
+        stats['lines'] += 1
+
+        console_match = CONSOLE_PATTERN.match(line)
+        if console_match:
+            stats['console_lines'] += 1
+            self._emit(f"[Console] {console_match.group(1)}\n")
+            return
+
+        parsed = self.parser.parse(line)
+        if parsed is None:
+            return
+
+        hook_id, function, text = parsed
+        stats['hook_lines'] += 1
+
+        if self.registry.record(hook_id, function, text):
+            self.on_new_hook(hook_id, function)
+
+        # Always update the preview with the latest text (even if empty)
+        self.on_hook_text(hook_id, text)
+
+        selected_hook_id = self.selected_hook_id
+        if selected_hook_id and hook_id == selected_hook_id:
+            if text:
+                self._emit(text + "\n")
+        elif not selected_hook_id and not self.suppress_unselected:
+            self._emit(self.parser.format_unselected(hook_id, text))
+
+    def feed_lines(self, lines: Iterable[str]) -> int:
+        """Feed an iterable of lines. Returns the number of lines fed."""
+        count = 0
+        for line in lines:
+            self.feed_line(line)
+            count += 1
+        return count
+
+    def run(self, stream, keep_running: Optional[Callable[[], bool]] = None) -> int:
+        """
+        Read lines from a stream until EOF (or until keep_running() is false).
+
+        Args:
+            stream: any object with readline() (pipe, file) or an iterable of lines
+            keep_running: optional callable checked before each line
+
+        Returns:
+            The number of lines read
+        """
+        readline = getattr(stream, 'readline', None)
+        if readline is None:
+            lines = iter(stream)
+            readline = lambda: next(lines, '')
+
+        count = 0
+        while keep_running is None or keep_running():
+            try:
+                line = readline()
+                if not line:
+                    break
+                count += 1
+                self.feed_line(line)
+            except Exception:
+                break
+
+        return count
+
+
+def main(argv=None):
+    """Run a text stream through the ingestion engine and report throughput."""
+    import argparse
+    from pathlib import Path
+
+    parser = argparse.ArgumentParser(description="Headless hook output ingestion")
+    parser.add_argument('input', nargs='?', help="file to read (default: stdin)")
+    parser.add_argument('--engine', choices=sorted(PARSERS), default='luna')
+    parser.add_argument('--encoding', default='utf-8')
+    parser.add_argument('--select', help="only display text of this hook id")
+    parser.add_argument('--plugins-folder', help="load and activate every plugin in this folder")
+    parser.add_argument('--quiet', action='store_true', help="don't print the output text")
+    args = parser.parse_args(argv)
+
+    dispatcher = PluginDispatcher()
+    if args.plugins_folder:
+        dispatcher.load_folder(Path(args.plugins_folder))
+
+    engine = HookIngestionEngine(
+        engine=args.engine,
+        dispatcher=dispatcher,
+        on_output=None if args.quiet else lambda text: sys.stdout.write(text),
+    )
+    engine.selected_hook_id = args.select
+
+    start = time.perf_counter()
+    if args.input:
+        with open(args.input, 'r', encoding=args.encoding, errors='ignore') as f:
+            engine.run(f)
+    else:
+        engine.run(sys.stdin)
+    elapsed = time.perf_counter() - start
+
+    stats = engine.stats
+    rate = stats['lines'] / elapsed if elapsed > 0 else 0.0
+    print(f"{stats['lines']} lines, {len(engine.registry)} hooks, "
+          f"{stats['outputs']} output, {stats['filtered']} filtered "
+          f"in {elapsed:.3f}s ({rate:.0f} lines/s)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
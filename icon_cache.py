@@ -0,0 +1,347 @@
+"""
+Process Icon Thumbnails
+=======================
+
+Persistent cache of the icons shown in the process list.
+
+Every refresh used to extract each process's icon again (ExtractIconEx and a
+GDI bitmap), resize it (LANCZOS) and build its rounded-corner mask on the Tk
+thread. Here the finished thumbnail is a PNG on disk, keyed by the
+executable (path, file size, mtime) and the thumbnail (size, DPI scale), so
+an icon is rendered once per executable version and display setting:
+- a worker thread does the extraction, the Pillow pipeline and the PNG
+  encoding/decoding, never the UI
+- the UI thread only turns finished images into photos (drain), and keeps
+  the latest ones in an in-memory LRU; a photo in memory is served without
+  touching the file, and the worker checks its executable again every
+  RECHECK_INTERVAL seconds
+
+Icon extraction sits behind an IconExtractor: Win32IconExtractor on Windows,
+any object with the same extract() (e.g. a stub drawing a square) to run the
+pipeline and the cache on another platform.
+
+Example:
+--------
+from icon_cache import IconThumbnailCache, get_icon_extractor
+
+icons = IconThumbnailCache("icon_cache", get_icon_extractor(), size=24, scale=1.0,
+                           photo_factory=ImageTk.PhotoImage)
+photo = icons.get_photo(exe_path)  # None until drained, then from memory
+for exe_path, photo in icons.drain():  # on the UI thread, every frame
+    ...
+"""
+
+import hashlib
+import os
+import queue
+import sys
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Optional
+
+# Size (pixels) icons are extracted at, before scaling to the thumbnail size
+ICON_SIZE = 32
+# Thumbnail size and corner radius at 96 DPI
+THUMBNAIL_SIZE = 24
+CORNER_RADIUS = 3
+# Photos kept in memory (the rows of the process list hold their own)
+MAX_MEMORY_ICONS = 256
+# Seconds a photo in memory is served before its executable is checked again
+RECHECK_INTERVAL = 30.0
+
+# Worker result: the executable did not change, the photo in memory stays
+_UNCHANGED = object()
+
+
+class IconExtractor:
+    """Extracts the icon of an executable."""
+
+    def extract(self, exe_path: str, size: int = ICON_SIZE):
+        """The icon as a PIL image of size x size pixels, or None."""
+        return None
+
+
+class Win32IconExtractor(IconExtractor):
+    """ExtractIconEx, drawn on a GDI bitmap (pywin32)."""
+
+    def __init__(self):
+        import win32gui
+        import win32ui
+        self._win32gui = win32gui
+        self._win32ui = win32ui
+
+    def extract(self, exe_path: str, size: int = ICON_SIZE):
+        from PIL import Image
+        win32gui = self._win32gui
+        win32ui = self._win32ui
+
+        # Try to extract both large and small icons
+        large, small = win32gui.ExtractIconEx(exe_path, 0)
+        try:
+            # Prefer large icon for better quality, fall back to small if needed
+            icon_handle = large[0] if large else (small[0] if small else None)
+            if not icon_handle:
+                return None
+
+            screen = win32gui.GetDC(0)
+            hdc = win32ui.CreateDCFromHandle(screen)
+            hbmp = win32ui.CreateBitmap()
+            hbmp.CreateCompatibleBitmap(hdc, size, size)
+            memory_dc = hdc.CreateCompatibleDC()
+            try:
+                memory_dc.SelectObject(hbmp)
+                # Draw icon with transparent background support
+                memory_dc.DrawIcon((0, 0), icon_handle)
+                bmpstr = hbmp.GetBitmapBits(True)
+                return Image.frombuffer('RGB', (size, size), bmpstr, 'raw', 'BGRX', 0, 1)
+            finally:
+                memory_dc.DeleteDC()
+                win32gui.DeleteObject(hbmp.GetHandle())
+                win32gui.ReleaseDC(0, screen)
+        finally:
+            # Clean up icon handles
+            for handle in list(large) + list(small):
+                win32gui.DestroyIcon(handle)
+
+
+def get_icon_extractor() -> IconExtractor:
+    """The Windows extractor on Windows (with pywin32), else one that finds no icon."""
+    if sys.platform == 'win32':
+        try:
+            return Win32IconExtractor()
+        except ImportError:
+            pass
+    return IconExtractor()
+
+
+def render_thumbnail(image, size: int, radius: int):
+    """The process list thumbnail of an icon: resized to size and with rounded corners (RGBA)."""
+    from PIL import Image, ImageDraw
+
+    # Resize with high-quality resampling to scaled size for better clarity
+    image = image.convert('RGB').resize((size, size), Image.Resampling.LANCZOS)
+
+    # Add subtle rounded corners for modern look
+    mask = Image.new('L', (size, size), 0)
+    draw = ImageDraw.Draw(mask)
+    draw.rounded_rectangle([(0, 0), (size - 1, size - 1)], radius=radius, fill=255)
+    image.putalpha(mask)
+    return image
+
+
+class IconThumbnailCache:
+    """
+    Thumbnails of executable icons: in memory (photos), on disk (PNG), or
+    rendered by a worker thread.
+
+    get_photo() and drain() belong to the UI thread; the rest can be called
+    from any thread.
+
+    Args:
+        folder: folder of the PNG files (created when the first one is written)
+        extractor: the IconExtractor
+        size, radius: thumbnail size and corner radius, in pixels
+        scale: DPI scale factor (part of the key: a display change renders again)
+        photo_factory: turns a PIL image into what get_photo returns (e.g.
+            ImageTk.PhotoImage); called on the UI thread by drain()
+        max_memory: photos kept in the in-memory LRU
+        recheck_interval: seconds before the worker checks the executable
+            of a photo in memory again (a changed one is rendered again)
+
+    Attributes:
+        stats (dict): 'memory_hits', 'disk_hits', 'extracted' (icons
+            rendered), 'no_icon' (executables without one), 'errors',
+            'evicted' (photos dropped from memory)
+    """
+
+    def __init__(self, folder, extractor: Optional[IconExtractor] = None, size: int = THUMBNAIL_SIZE,
+                 radius: int = CORNER_RADIUS, scale: float = 1.0, photo_factory: Optional[Callable] = None,
+                 max_memory: int = MAX_MEMORY_ICONS, recheck_interval: float = RECHECK_INTERVAL):
+        self.folder = Path(folder)
+        self.extractor = extractor if extractor is not None else get_icon_extractor()
+        self.size = size
+        self.radius = radius
+        self.scale = scale
+        self.photo_factory = photo_factory or (lambda image: image)
+        self.max_memory = max_memory
+        self.recheck_interval = recheck_interval
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'extracted': 0, 'no_icon': 0, 'errors': 0, 'evicted': 0}
+
+        # exe path -> (key, photo or None, time.monotonic() of the last check), least recently used first
+        self._photos = OrderedDict()
+        self._lock = threading.Lock()
+        self._pending = set()  # exe paths queued or being loaded
+        self._ready = []  # (exe path, key, PIL image, None or _UNCHANGED), not drained yet
+        self._requests = queue.Queue()  # the current worker's
+        self._thread = None
+
+    @staticmethod
+    def _path_key(exe_path: str) -> str:
+        return os.path.normcase(os.path.abspath(exe_path))
+
+    def key(self, exe_path: str) -> Optional[str]:
+        """
+        File name of the thumbnail of exe_path: a hash of the path, then a
+        hash of (file size, mtime, thumbnail size, scale). None if the
+        executable cannot be read.
+        """
+        try:
+            stat = os.stat(exe_path)
+        except OSError:
+            return None
+        path_key = self._path_key(exe_path)
+        path_hash = hashlib.sha1(path_key.encode('utf-8')).hexdigest()[:16]
+        version = f"{stat.st_size}:{stat.st_mtime_ns}:{self.size}:{self.radius}:{self.scale:.3f}"
+        version_hash = hashlib.sha1(version.encode('utf-8')).hexdigest()[:16]
+        return f"{path_hash}_{version_hash}.png"
+
+    def load(self, exe_path: str, key: Optional[str] = None):
+        """
+        The thumbnail of exe_path as a PIL image (None: no icon), from the
+        disk cache or rendered and stored. Blocking: called by the worker.
+        """
+        from PIL import Image
+
+        key = key or self.key(exe_path)
+        if key is None:
+            return None
+        path = self.folder / key
+        try:
+            if path.stat().st_size == 0:
+                # Known to have no icon
+                self.stats['disk_hits'] += 1
+                return None
+            with Image.open(path) as image:
+                image.load()
+            self.stats['disk_hits'] += 1
+            return image
+        except FileNotFoundError:
+            pass
+        except Exception:
+            # A damaged file is rendered again
+            self.stats['errors'] += 1
+
+        try:
+            icon = self.extractor.extract(exe_path, ICON_SIZE)
+        except Exception:
+            icon = None
+            self.stats['errors'] += 1
+        image = render_thumbnail(icon, self.size, self.radius) if icon is not None else None
+        self.stats['extracted' if image is not None else 'no_icon'] += 1
+        self._store(path, image)
+        return image
+
+    def _store(self, path: Path, image):
+        try:
+            self.folder.mkdir(parents=True, exist_ok=True)
+            temp_path = path.with_suffix('.tmp')
+            if image is not None:
+                image.save(temp_path, format='PNG')
+            else:
+                temp_path.write_bytes(b"")
+            os.replace(temp_path, path)
+            # Thumbnails of the previous versions of the executable
+            path_hash = path.name.split('_', 1)[0]
+            for old in self.folder.glob(f"{path_hash}_*.png"):
+                if old != path:
+                    old.unlink()
+        except OSError:
+            pass
+
+    def get_photo(self, exe_path: Optional[str]):
+        """
+        The photo of exe_path if it is in memory; otherwise None, and the
+        worker loads it (drain() delivers it). The executable is not looked
+        at here: once recheck_interval has passed, the worker checks it and
+        drain() delivers a new photo if it changed.
+        """
+        if not exe_path:
+            return None
+        path_key = self._path_key(exe_path)
+        cached = self._photos.get(path_key)
+        if cached is None:
+            self.request(exe_path)
+            return None
+        key, photo, checked = cached
+        if time.monotonic() - checked >= self.recheck_interval:
+            self.request(exe_path, key)
+        self._photos.move_to_end(path_key)
+        self.stats['memory_hits'] += 1
+        return photo
+
+    def request(self, exe_path: str, known_key: Optional[str] = None):
+        """
+        Queue exe_path for the worker (once while it is pending). With
+        known_key (the key of the photo in memory), the thumbnail is only
+        loaded if the executable's key changed.
+        """
+        path_key = self._path_key(exe_path)
+        with self._lock:
+            if path_key in self._pending:
+                return
+            self._pending.add(path_key)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, args=(self._requests,),
+                                                name="IconThumbnails", daemon=True)
+                self._thread.start()
+            self._requests.put((exe_path, known_key))
+
+    def _run(self, requests: queue.Queue):
+        while True:
+            request = requests.get()
+            if request is None:
+                return
+            exe_path, known_key = request
+            key = self.key(exe_path)
+            if known_key is not None and key == known_key:
+                result = _UNCHANGED
+            else:
+                try:
+                    result = self.load(exe_path, key)
+                except Exception:
+                    result = None
+                    self.stats['errors'] += 1
+            with self._lock:
+                self._ready.append((exe_path, key, result))
+
+    def drain(self):
+        """
+        Photos the worker finished since the last drain, as a list of
+        (exe path, photo or None). UI thread: photos are created here.
+        """
+        with self._lock:
+            ready = self._ready
+            self._ready = []
+            for exe_path, _, _ in ready:
+                self._pending.discard(self._path_key(exe_path))
+        delivered = []
+        now = time.monotonic()
+        for exe_path, key, image in ready:
+            path_key = self._path_key(exe_path)
+            if image is _UNCHANGED:
+                cached = self._photos.get(path_key)
+                if cached is not None:
+                    self._photos[path_key] = (cached[0], cached[1], now)
+                continue
+            photo = self.photo_factory(image) if image is not None else None
+            self._photos[path_key] = (key, photo, now)
+            self._photos.move_to_end(path_key)
+            delivered.append((exe_path, photo))
+        while len(self._photos) > self.max_memory:
+            self._photos.popitem(last=False)
+            self.stats['evicted'] += 1
+        return delivered
+
+    def close(self):
+        """
+        Stop the worker once it has finished the requests already queued. A
+        later request starts a new worker.
+        """
+        with self._lock:
+            thread, requests = self._thread, self._requests
+            self._thread = None
+            self._requests = queue.Queue()
+        if thread is not None and thread.is_alive():
+            requests.put(None)
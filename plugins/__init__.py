@@ -25,8 +25,41 @@ class MyPlugin(TextractorPlugin):
         return text.upper()
 """
 
+import os
+import sys
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import Optional
+from collections import deque
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Callable, Optional
+
+
+def add_translator_path() -> Path:
+    """
+    Make the bundled Translator folder importable (deep_translator,
+    translation_cache) and return it. The folder is next to the executable
+    when running compiled, and next to this package when running from source.
+    """
+    is_frozen = getattr(sys, 'frozen', False)
+    is_nuitka = getattr(sys, '__compiled__', False) or (
+        sys.executable.lower().endswith('.exe') and
+        'python' not in os.path.basename(sys.executable).lower()
+    )
+    
+    if is_frozen or is_nuitka:
+        translator_dir = Path(sys.executable).parent / 'Translator'
+    else:
+        translator_dir = Path(__file__).resolve().parent.parent / 'Translator'
+    
+    # The Translator folder, and deep_translator's own folder
+    for path in (translator_dir, translator_dir / 'deep_translator'):
+        path_str = str(path)
+        if path_str not in sys.path:
+            sys.path.insert(0, path_str)
+    
+    return translator_dir
 
 
 class TextractorPlugin(ABC):
@@ -52,6 +85,9 @@ class TextractorPlugin(ABC):
     version: str = "1.0"
     author: str = "Unknown"
     
+    # Set by the host: called as deferred_output(plugin, original, text)
+    deferred_output: Optional[Callable] = None
+    
     def __init__(self):
         """Initialize the plugin. Override to add custom initialization."""
         self.enabled = True
@@ -87,6 +123,40 @@ class TextractorPlugin(ABC):
         """Called when the plugin is disabled. Override for custom behavior."""
         pass
     
+    def on_game_changed(self, game_id: Optional[str]):
+        """
+        Called when the host attaches to a game, with its game profile id
+        (None if unknown). Override to keep per-game state, e.g. caches.
+        """
+        pass
+    
+    def emit_deferred(self, original: str, text: str):
+        """
+        Deliver text produced after process_text has returned, e.g. a
+        translation finished in the background. The host appends text to the
+        output and passes it to the other plugins' on_deferred_text.
+        Safe to call from any thread; does nothing when there is no host.
+        
+        Args:
+            original: The text process_text was given
+            text: The text to display
+        """
+        callback = self.deferred_output
+        if callback is not None:
+            callback(self, original, text)
+    
+    def on_deferred_text(self, source, original: str, text: str):
+        """
+        Called (possibly from a worker thread) when another plugin delivers
+        deferred text. Override to react, e.g. to show a late translation.
+        
+        Args:
+            source: The plugin that produced the text
+            original: The text the source plugin was given
+            text: The deferred text
+        """
+        pass
+    
     def get_settings(self) -> dict:
         """
         Get plugin settings for UI display.
@@ -114,3 +184,220 @@ class TextractorPlugin(ABC):
     
     def __repr__(self):
         return f"<{self.__class__.__name__}: {self.name} v{self.version}>"
+
+
+# OrderedWorkerPool policies
+TRANSLATE_ALL = 'all'  # Every item is worked on and delivered (e.g. for a translation log)
+LATEST_ONLY = 'latest'  # A new item supersedes the ones waiting or in flight (e.g. for an overlay)
+
+# Delivery latencies kept for OrderedWorkerPool.latency_stats
+LATENCY_SAMPLES = 1000
+
+
+class OrderedWorkerPool:
+    """
+    Runs work(item) on background threads and hands the results to
+    deliver(item, result) in submission order.
+    
+    Lets a plugin return from process_text immediately and deliver slow
+    results (e.g. translations) later with emit_deferred:
+    - at most max_in_flight items are worked on at once
+    - at most max_pending items wait for a worker; when full, the oldest
+      waiting item is dropped
+    - an item whose work raises or returns None delivers nothing, and does
+      not hold up the items after it
+    - with the LATEST_ONLY policy, submitting an item skips every item that
+      is still waiting or in flight: only the newest result is delivered
+    
+    work may return a concurrent.futures.Future (e.g. from
+    deep_translator.async_http.submit) instead of a result. The pool waits
+    for it, and cancels it when its item is skipped or cleared, so a stale
+    request is abandoned at once instead of holding a worker.
+    
+    Example:
+        pool = OrderedWorkerPool(translate, lambda text, result: self.emit_deferred(text, result))
+        pool.submit(text)
+    
+    Attributes:
+        stats (dict): 'submitted', 'completed', 'failed', 'dropped' (queue full
+            or cleared), 'skipped' (superseded by a newer item) and 'cancelled'
+            (futures cancelled) items
+    """
+    
+    def __init__(self, work: Callable, deliver: Callable, max_in_flight: int = 4,
+                 max_pending: int = 64, name: str = "PluginWorker", policy: str = TRANSLATE_ALL):
+        self.work = work
+        self.deliver = deliver
+        self.max_in_flight = max(1, max_in_flight)
+        self.max_pending = max(1, max_pending)
+        self.name = name
+        self.policy = policy
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._deliver_lock = threading.Lock()
+        self._pending = deque()  # (seq, item) waiting for a worker
+        self._running = {}  # seq -> future returned by work, or None, for items in flight
+        self._stale = set()  # seqs in flight whose result is discarded
+        self._results = {}  # seq -> (item, result), or None when there is nothing to deliver
+        self._submitted_at = {}  # seq -> time.monotonic() of submit
+        self._latencies = deque(maxlen=LATENCY_SAMPLES)  # submit -> deliver, in seconds
+        self._next_seq = 0
+        self._next_delivery = 0
+        self._workers = []
+        self._idle = 0
+        self._closed = False
+        self.stats = {'submitted': 0, 'completed': 0, 'failed': 0, 'dropped': 0,
+                      'skipped': 0, 'cancelled': 0}
+    
+    @property
+    def in_flight(self) -> int:
+        """Number of items being worked on."""
+        with self._lock:
+            return len(self._workers) - self._idle
+    
+    @property
+    def pending(self) -> int:
+        """Number of items waiting for a worker."""
+        with self._lock:
+            return len(self._pending)
+    
+    def submit(self, item) -> bool:
+        """Queue an item. Returns False if the pool is closed."""
+        with self._lock:
+            if self._closed:
+                return False
+            if self.policy == LATEST_ONLY:
+                self.stats['skipped'] += self._discard_locked()
+            elif len(self._pending) >= self.max_pending:
+                dropped_seq, _ = self._pending.popleft()
+                self._results[dropped_seq] = None
+                self.stats['dropped'] += 1
+            self._submitted_at[self._next_seq] = time.monotonic()
+            self._pending.append((self._next_seq, item))
+            self._next_seq += 1
+            self.stats['submitted'] += 1
+            
+            if len(self._pending) > self._idle and len(self._workers) < self.max_in_flight:
+                worker = threading.Thread(target=self._run, name=f"{self.name}-{len(self._workers)}",
+                                          daemon=True)
+                self._workers.append(worker)
+                worker.start()
+            else:
+                self._wakeup.notify()
+        
+        self._flush()
+        return True
+    
+    def clear(self):
+        """Drop waiting items and discard the results of items in flight."""
+        with self._lock:
+            self.stats['dropped'] += self._discard_locked()
+        self._flush()
+    
+    def close(self):
+        """Stop the workers once their current item is done; waiting and in-flight items are dropped."""
+        with self._lock:
+            self._closed = True
+            self.stats['dropped'] += self._discard_locked()
+            self._wakeup.notify_all()
+        self._flush()
+    
+    def _discard_locked(self) -> int:
+        """Give up on every waiting and in-flight item; returns how many there were."""
+        count = len(self._pending)
+        # Finished results still waiting for an earlier item are not delivered either
+        for seq in self._results:
+            self._results[seq] = None
+        for seq, _ in self._pending:
+            self._results[seq] = None
+        self._pending.clear()
+        for seq, future in self._running.items():
+            if seq in self._stale:
+                continue
+            self._stale.add(seq)
+            # Nothing to wait for: later items are delivered without this one
+            self._results[seq] = None
+            if future is not None and future.cancel():
+                self.stats['cancelled'] += 1
+            count += 1
+        return count
+    
+    def _run(self):
+        while True:
+            with self._lock:
+                while not self._pending and not self._closed:
+                    self._idle += 1
+                    self._wakeup.wait()
+                    self._idle -= 1
+                if not self._pending:
+                    self._workers.remove(threading.current_thread())
+                    return
+                seq, item = self._pending.popleft()
+                self._running[seq] = None
+            
+            failed = False
+            try:
+                result = self.work(item)
+                if isinstance(result, Future):
+                    with self._lock:
+                        if seq in self._stale:
+                            if result.cancel():
+                                self.stats['cancelled'] += 1
+                        else:
+                            self._running[seq] = result
+                    result = result.result()
+            except Exception:
+                result = None
+                failed = True
+            
+            with self._lock:
+                del self._running[seq]
+                if seq in self._stale:
+                    self._stale.discard(seq)
+                    continue
+                self.stats['failed' if failed else 'completed'] += 1
+                self._results[seq] = (item, result) if result is not None else None
+            
+            self._flush()
+    
+    def _flush(self):
+        """Deliver finished results that are next in submission order."""
+        with self._deliver_lock:
+            ready = []
+            with self._lock:
+                results = self._results
+                now = time.monotonic()
+                while self._next_delivery in results:
+                    entry = results.pop(self._next_delivery)
+                    submitted_at = self._submitted_at.pop(self._next_delivery, None)
+                    if entry is not None and submitted_at is not None:
+                        self._latencies.append(now - submitted_at)
+                    ready.append(entry)
+                    self._next_delivery += 1
+            
+            for entry in ready:
+                if entry is None:
+                    continue
+                try:
+                    self.deliver(*entry)
+                except Exception:
+                    pass
+    
+    def latency_stats(self) -> dict:
+        """Submit-to-delivery latency (ms) of the last LATENCY_SAMPLES delivered items."""
+        with self._lock:
+            latencies = sorted(self._latencies)
+        if not latencies:
+            return {'count': 0}
+        
+        def percentile(pct):
+            return latencies[min(len(latencies) - 1, int(pct / 100.0 * len(latencies)))] * 1000.0
+        
+        return {
+            'count': len(latencies),
+            'mean_ms': sum(latencies) / len(latencies) * 1000.0,
+            'p50_ms': percentile(50),
+            'p90_ms': percentile(90),
+            'p99_ms': percentile(99),
+            'max_ms': latencies[-1] * 1000.0,
+        }
@@ -1,63 +1,40 @@
 import threading
 import tkinter as tk
-from plugins import TextractorPlugin
-import sys
-import os
-from pathlib import Path
+from plugins import LATEST_ONLY, TRANSLATE_ALL, OrderedWorkerPool, TextractorPlugin, add_translator_path
+
+# deep_translator (requests, the engine) is imported when the plugin is first
+# enabled or configured, not when the plugin folder is scanned
+TRANSLATOR_AVAILABLE = None  # Unknown until import_translator() has run
+GoogleTranslator = async_http = rate_limit = None
+
+
+def import_translator() -> bool:
+    """Import GoogleTranslator from the Translator folder; False if it is missing"""
+    global TRANSLATOR_AVAILABLE, GoogleTranslator, async_http, rate_limit
+    if TRANSLATOR_AVAILABLE is None:
+        try:
+            add_translator_path()
+            from deep_translator import GoogleTranslator, async_http, rate_limit
+            TRANSLATOR_AVAILABLE = True
+        except Exception:
+            TRANSLATOR_AVAILABLE = False
+    return TRANSLATOR_AVAILABLE
 
-# Try to import GoogleTranslator from the Translator folder
-TRANSLATOR_AVAILABLE = False
 try:
-    # Handle both script and compiled executable modes
-    is_frozen = getattr(sys, 'frozen', False)
-    is_nuitka = getattr(sys, '__compiled__', False) or (
-        sys.executable.lower().endswith('.exe') and 
-        'python' not in os.path.basename(sys.executable).lower()
-    )
-    
-    if is_frozen or is_nuitka:
-        # Running as compiled executable
-        # Look for Translator folder next to the executable
-        user_data_dir = Path(sys.executable).parent
-        translator_dir = user_data_dir / 'Translator'
-        
-        # Add to sys.path if not already there
-        translator_dir_str = str(translator_dir)
-        if translator_dir_str not in sys.path:
-            sys.path.insert(0, translator_dir_str)
-        
-        # Also add deep_translator directory directly
-        deep_translator_dir = translator_dir / 'deep_translator'
-        deep_translator_dir_str = str(deep_translator_dir)
-        if deep_translator_dir_str not in sys.path:
-            sys.path.insert(0, deep_translator_dir_str)
-    else:
-        # Running as script
-        base_path = Path(__file__).resolve().parent.parent
-        translator_dir = base_path / 'Translator'
-        
-        # Add to sys.path if not already there
-        translator_dir_str = str(translator_dir)
-        if translator_dir_str not in sys.path:
-            sys.path.insert(0, translator_dir_str)
-        
-        # Also add deep_translator directory directly
-        deep_translator_dir = translator_dir / 'deep_translator'
-        deep_translator_dir_str = str(deep_translator_dir)
-        if deep_translator_dir_str not in sys.path:
-            sys.path.insert(0, deep_translator_dir_str)
-        
-    from deep_translator import GoogleTranslator
-    TRANSLATOR_AVAILABLE = True
-except ImportError:
-    TRANSLATOR_AVAILABLE = False
+    add_translator_path()
+    from translation_cache import get_shared_cache
+except Exception:
+    get_shared_cache = None
+
+try:
+    from single_flight import get_shared_flights
 except Exception:
-    TRANSLATOR_AVAILABLE = False
+    get_shared_flights = None
 
 class GoogleTranslatePlugin(TextractorPlugin):
     name = "Google Translate"
     description = "Translates text using Google Translate."
-    version = "1.2"
+    version = "1.5"
     author = "Cline"
 
     # Available languages for translation
@@ -88,21 +65,123 @@ class GoogleTranslatePlugin(TextractorPlugin):
         'fi': 'Finnish',
     }
 
+    # Background translation policies
+    SCHEDULES = {
+        TRANSLATE_ALL: 'Translate every line (log)',
+        LATEST_ONLY: 'Latest line only (overlay)',
+    }
+
     def __init__(self):
         super().__init__()
         self.translator = None
         self.target_lang = 'en'  # Default to English
         self.source_lang = 'auto'  # Default to auto-detect
+        self.async_mode = True  # Translate in the background instead of blocking hook reading
+        self.max_in_flight = 4  # Translation requests running at once
+        self.schedule = TRANSLATE_ALL  # LATEST_ONLY: skip lines the player has already clicked past
+        self.timeout = 10  # Seconds to wait for Google before giving up on a line
+        self.max_requests_per_second = 0  # Request budget shared by all Google lookups (0 = no limit)
+        self.pool = None
+        self.use_cache = True  # Reuse translations of lines seen before (kept on disk)
+        self.cache = None
+        self.game_id = None  # Cache namespace: the attached game's profile id
+        # The same line from several hooks at once is sent to Google once (None: every copy is sent)
+        self.flights = get_shared_flights() if get_shared_flights is not None else None
 
     def on_enable(self):
-        if not TRANSLATOR_AVAILABLE:
+        if not import_translator():
             return
         
         if not self.translator:
             try:
-                self.translator = GoogleTranslator(source=self.source_lang, target=self.target_lang)
+                self.translator = GoogleTranslator(source=self.source_lang, target=self.target_lang,
+                                                   timeout=self.timeout)
             except Exception:
                 return
+        
+        self._apply_rate_limit()
+        self._open_cache()
+
+    def on_disable(self):
+        self._stop_pool()
+
+    def on_game_changed(self, game_id):
+        self.game_id = game_id
+
+    def _apply_rate_limit(self):
+        # Bursts are queued at this pace; 429 answers are retried after Retry-After
+        if TRANSLATOR_AVAILABLE:
+            rate_limit.configure('GoogleTranslator', requests_per_second=self.max_requests_per_second)
+
+    def _open_cache(self):
+        if self.use_cache and self.cache is None and get_shared_cache is not None:
+            self.cache = get_shared_cache()
+
+    def _cached(self, text: str):
+        if self.cache is None:
+            return None
+        return self.cache.get('google', self.source_lang, self.target_lang, text,
+                              namespace=self.game_id or "")
+
+    def _store(self, text: str, translated: str):
+        if self.cache is not None and translated:
+            self.cache.put('google', self.source_lang, self.target_lang, text, translated,
+                           namespace=self.game_id or "")
+
+    def reset(self):
+        super().reset()
+        # Drop translations still queued or in flight for text that was cleared
+        if self.pool:
+            self.pool.clear()
+
+    def _start_pool(self):
+        if self.pool is None:
+            self.pool = OrderedWorkerPool(
+                self._translate,
+                self._deliver,
+                max_in_flight=self.max_in_flight,
+                name="GoogleTranslate",
+                policy=self.schedule,
+            )
+        return self.pool
+
+    def _stop_pool(self):
+        if self.pool:
+            self.pool.close()
+            self.pool = None
+
+    def _translate(self, text: str):
+        # Runs on a worker thread. The request is sent on the shared event loop, so the
+        # pool can cancel it when the line is skipped or cleared.
+        return async_http.submit(self._atranslate(self.translator, text))
+
+    def _flight_key(self, text: str):
+        return self.flights.key('google', self.source_lang, self.target_lang, text)
+
+    async def _atranslate(self, translator, text: str) -> str:
+        if self.flights is None:
+            return await self._aupstream(translator, text)
+        return await self.flights.ado(self._flight_key(text), lambda: self._aupstream(translator, text))
+
+    async def _aupstream(self, translator, text: str) -> str:
+        translated = await translator.atranslate(text)
+        self._store(text, translated)
+        return translated
+
+    def _translate_now(self, text: str) -> str:
+        translator = self.translator
+        if self.flights is None:
+            return self._upstream(translator, text)
+        return self.flights.do(self._flight_key(text), lambda: self._upstream(translator, text))
+
+    def _upstream(self, translator, text: str) -> str:
+        translated = translator.translate(text)
+        self._store(text, translated)
+        return translated
+
+    def _deliver(self, text: str, translated: str):
+        # Called in submission order; the original was already displayed
+        self.emit_deferred(text, f"{translated}\n\n")
 
     def process_text(self, text: str) -> str:
         if not text or not text.strip():
@@ -144,9 +223,18 @@ class GoogleTranslatePlugin(TextractorPlugin):
                 return text
 
         if self.enabled and self.translator:
+            cached = self._cached(text)
+            if cached:
+                return f"{text.rstrip()}\n{cached}\n\n"
+
+            if self.async_mode:
+                # Show the original now; the translation follows through emit_deferred
+                self._start_pool().submit(text)
+                return text
+
             try:
                 # Synchronous translation
-                translated = self.translator.translate(text)
+                translated = self._translate_now(text)
                 if translated:
                     # Ensure single newline between original and translation
                     # And add double newline at the end for spacing between blocks
@@ -158,7 +246,7 @@ class GoogleTranslatePlugin(TextractorPlugin):
 
     def get_settings(self) -> dict:
         """Return configurable settings for the plugin"""
-        if not TRANSLATOR_AVAILABLE:
+        if not import_translator():
             return {}
         
         # Return settings with current values
@@ -180,6 +268,42 @@ class GoogleTranslatePlugin(TextractorPlugin):
                 'choice',
                 'Target Language',
                 target_languages
+            ),
+            'async_mode': (
+                self.async_mode,
+                'bool',
+                'Translate in Background',
+                None
+            ),
+            'schedule': (
+                self.schedule,
+                'choice',
+                'Background Translation',
+                self.SCHEDULES
+            ),
+            'max_in_flight': (
+                self.max_in_flight,
+                'int_slider',
+                'Max Requests in Flight',
+                {'min': 1, 'max': 16}
+            ),
+            'max_requests_per_second': (
+                self.max_requests_per_second,
+                'int_slider',
+                'Max Requests per Second (0 = no limit)',
+                {'min': 0, 'max': 20}
+            ),
+            'timeout': (
+                self.timeout,
+                'int_slider',
+                'Request Timeout (s)',
+                {'min': 1, 'max': 60}
+            ),
+            'use_cache': (
+                self.use_cache,
+                'bool',
+                'Cache Translations',
+                None
             )
         }
 
@@ -197,13 +321,73 @@ class GoogleTranslatePlugin(TextractorPlugin):
                 # Recreate translator with new settings
                 self._recreate_translator()
                 return True
+        elif name == 'async_mode':
+            self.async_mode = bool(value)
+            if not self.async_mode:
+                self._stop_pool()
+            return True
+        elif name == 'schedule':
+            if value not in self.SCHEDULES:
+                return False
+            self.schedule = value
+            if self.pool:
+                self.pool.policy = value
+            return True
+        elif name == 'max_in_flight':
+            try:
+                self.max_in_flight = max(1, int(value))
+            except (TypeError, ValueError):
+                return False
+            # Queued lines are dropped; the next line starts a pool of the new size
+            self._stop_pool()
+            return True
+        elif name == 'max_requests_per_second':
+            try:
+                self.max_requests_per_second = max(0, int(value))
+            except (TypeError, ValueError):
+                return False
+            self._apply_rate_limit()
+            return True
+        elif name == 'timeout':
+            try:
+                self.timeout = max(1, int(value))
+            except (TypeError, ValueError):
+                return False
+            self._recreate_translator()
+            return True
+        elif name == 'use_cache':
+            self.use_cache = bool(value)
+            if self.use_cache:
+                if self.enabled:
+                    self._open_cache()
+            else:
+                self.cache = None
+            return True
         return False
 
+    def get_stats(self) -> dict:
+        """Translation cache, request coalescing, background pool and rate limit counters"""
+        stats = {}
+        if self.cache is not None:
+            stats['cache'] = self.cache.get_stats()
+        if self.flights is not None:
+            # coalescing_ratio: share of requests answered by a copy already in flight
+            stats['coalescing'] = self.flights.get_stats('google')
+        if self.pool is not None:
+            stats['pool'] = dict(self.pool.stats)
+            # Line submitted -> translation handed to the output and the overlay
+            stats['latency'] = self.pool.latency_stats()
+        if self.translator is not None:
+            # queue_depth / throttle_wait_s: lines waiting for the request budget or a 429 pause
+            stats['rate_limit'] = self.translator.rate_limiter.get_stats()
+        return stats
+
     def _recreate_translator(self):
         """Recreate the translator instance with current settings"""
         if TRANSLATOR_AVAILABLE and self.enabled:
             try:
-                self.translator = GoogleTranslator(source=self.source_lang, target=self.target_lang)
+                self.translator = GoogleTranslator(source=self.source_lang, target=self.target_lang,
+                                                   timeout=self.timeout)
             except Exception:
                 self.translator = None
 
@@ -17,6 +17,8 @@ class OverlayWindowPlugin(TextractorPlugin):
         self.overlay = None
         self.text_widget = None
         self.drag_data = {"x": 0, "y": 0}
+        # The line on display: deferred translations of older lines are not shown
+        self.current_line = None
         
         # Default configuration
         self.config = {
@@ -212,6 +214,7 @@ class OverlayWindowPlugin(TextractorPlugin):
             pass
 
         display_text = text
+        self.current_line = text.strip()
         
         # Update overlay
         if self.overlay:
@@ -222,6 +225,19 @@ class OverlayWindowPlugin(TextractorPlugin):
         
         return text
 
+    def on_deferred_text(self, source, original, text):
+        # A translation finished in the background: show it with its original
+        if not self.enabled or not self.overlay:
+            return
+        
+        combined = f"{original.rstrip()}\n{text.strip()}"
+        self.overlay.after(0, lambda o=original.strip(), t=combined: self.show_deferred(o, t))
+
+    def show_deferred(self, original, text):
+        # A backlog of translations must not replace the line the player is reading
+        if original == self.current_line:
+            self.update_text(text, True)
+
     def update_text(self, text, is_translator_enabled):
         if self.text_widget:
             self.text_widget.config(state='normal')
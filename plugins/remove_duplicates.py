@@ -2,13 +2,252 @@
 Remove Duplicates Plugin
 ========================
 
-Filters out duplicate text that has already been seen.
+Filters out duplicate text that has already been seen recently.
 Also removes inline duplicates where the same text appears twice in a row.
 """
 
+import sys
+import time
+from collections import OrderedDict
 from plugins import TextractorPlugin
 from typing import Optional
 
+# Longest n-gram used for indexing (shorter if min_length is smaller)
+MAX_GRAM_LENGTH = 8
+
+# Shortest repeated pattern (non-whitespace characters) removed inline
+MIN_REPEAT_LENGTH = 3
+
+# Characters compared per slice when extending a match
+EXTEND_CHUNK = 32
+
+
+def first_square_period(s: str, min_period: int, max_period: int) -> int:
+    """
+    Smallest m in [min_period, max_period] with s[:m] == s[m:2*m], or 0.
+    
+    Computes the Z-function of s left to right and stops at the first
+    period whose Z value covers a full copy, so the whole scan is linear in
+    len(s). Positions outside the current Z-box that do not start with s[0]
+    have a Z value of 0 and are skipped with str.find.
+    """
+    n = len(s)
+    max_period = min(max_period, n // 2)
+    if n == 0 or max_period < max(1, min_period):
+        return 0
+    
+    first = s[0]
+    z = [0] * (max_period + 1)
+    left = right = 0
+    i = 1
+    while i <= max_period:
+        if i >= right:
+            i = s.find(first, i, max_period + 1)
+            if i < 0:
+                return 0
+            length = 0
+        else:
+            length = min(right - i, z[i - left])
+        
+        if i + length >= right:
+            # Extend past the Z-box by direct comparison, in slices while they match
+            while i + length + EXTEND_CHUNK <= n and \
+                    s[length:length + EXTEND_CHUNK] == s[i + length:i + length + EXTEND_CHUNK]:
+                length += EXTEND_CHUNK
+            while i + length < n and s[length] == s[i + length]:
+                length += 1
+            left, right = i, i + length
+        
+        z[i] = length
+        if length >= i and i >= min_period:
+            return i
+        i += 1
+    
+    return 0
+
+
+class RecentTextIndex:
+    """
+    Bounded history of normalized texts with an n-gram index.
+    
+    Answers "is this text equal to, a substring of, or a superstring of a
+    recent text" without scanning the history:
+    - substring: look up every n-gram of the text and verify only the
+      entries of the rarest one
+    - superstring: every entry is also filed under one anchor n-gram (its
+      rarest one when added), so only entries anchored at one of the text's
+      n-grams are verified, at the matching offset
+    
+    The index is keyed by the hash of each n-gram, and a posting is the text
+    itself while only one entry has the n-gram, a list of texts after that
+    (most n-grams belong to a single line). Every candidate is verified, so
+    a hash collision only costs a comparison.
+    
+    The history is kept in LRU order and bounded by size and optionally age.
+    """
+    
+    def __init__(self, gram_length: int, max_entries: int, max_age: float = 0):
+        self.gram_length = max(1, gram_length)
+        self.max_entries = max(1, max_entries)
+        self.max_age = max_age
+        self._entries = OrderedDict()  # text -> last seen time, oldest first
+        self._grams = {}  # n-gram hash -> text, or list of texts, containing it
+        self._anchors = {}  # anchor n-gram hash -> list of (text, offset of the anchor)
+        self._anchor_of = {}  # text -> (anchor n-gram hash, offset)
+        self.evictions = 0
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def _text_grams(self, text: str) -> set:
+        g = self.gram_length
+        return {hash(text[i:i + g]) for i in range(len(text) - g + 1)}
+    
+    def find(self, text: str) -> Optional[str]:
+        """Return a recent text that equals, contains or is contained in text."""
+        entries = self._entries
+        if text in entries:
+            return text
+        
+        g = self.gram_length
+        if len(text) < g:
+            return None
+        
+        # Text is a substring of an entry: the entry contains all of its n-grams
+        grams = self._grams
+        candidates, candidate_count = None, 0
+        for gram in self._text_grams(text):
+            posting = grams.get(gram)
+            if posting is None:
+                candidates = None
+                break
+            count = 1 if type(posting) is str else len(posting)
+            if candidates is None or count < candidate_count:
+                candidates, candidate_count = posting, count
+        if candidates is not None:
+            for entry in ((candidates,) if type(candidates) is str else candidates):
+                if text in entry:
+                    return entry
+        
+        # An entry is a substring of text: its anchor is one of text's n-grams
+        anchors = self._anchors
+        for i in range(len(text) - g + 1):
+            anchored = anchors.get(hash(text[i:i + g]))
+            if anchored:
+                for entry, offset in anchored:
+                    start = i - offset
+                    if start >= 0 and text.startswith(entry, start):
+                        return entry
+        
+        return None
+    
+    def touch(self, text: str, now: float):
+        """Mark an entry as recently seen."""
+        self._entries[text] = now
+        self._entries.move_to_end(text)
+    
+    def add(self, text: str, now: float):
+        """Add a text to the history, evicting the least recently seen ones."""
+        if text in self._entries:
+            self.touch(text, now)
+            return
+        if len(text) < self.gram_length:
+            return
+        
+        self._entries[text] = now
+        
+        # Anchor the text at its currently rarest n-gram to keep anchor buckets small
+        grams = self._grams
+        g = self.gram_length
+        anchor, offset, anchor_count = None, 0, None
+        for i in range(len(text) - g + 1):
+            gram = hash(text[i:i + g])
+            posting = grams.get(gram)
+            count = 0 if posting is None else 1 if type(posting) is str else len(posting)
+            if anchor_count is None or count < anchor_count:
+                anchor, offset, anchor_count = gram, i, count
+        self._anchors.setdefault(anchor, []).append((text, offset))
+        self._anchor_of[text] = (anchor, offset)
+        
+        for gram in self._text_grams(text):
+            posting = grams.get(gram)
+            if posting is None:
+                grams[gram] = text
+            elif type(posting) is str:
+                grams[gram] = [posting, text]
+            else:
+                posting.append(text)
+        
+        self.trim()
+    
+    def resize(self, max_entries: int):
+        """Change the number of entries kept, evicting the least recently seen ones now."""
+        self.max_entries = max(1, max_entries)
+        self.trim()
+    
+    def trim(self):
+        """Evict the least recently seen entries beyond max_entries."""
+        while len(self._entries) > self.max_entries:
+            self._evict_oldest()
+    
+    def expire(self, now: float):
+        """Drop entries not seen within max_age seconds."""
+        if self.max_age <= 0:
+            return
+        cutoff = now - self.max_age
+        entries = self._entries
+        while entries and next(iter(entries.values())) < cutoff:
+            self._evict_oldest()
+    
+    def _evict_oldest(self):
+        text, _ = self._entries.popitem(last=False)
+        grams = self._grams
+        for gram in self._text_grams(text):
+            posting = grams.get(gram)
+            if posting is None:
+                continue
+            if type(posting) is str:
+                if posting == text:
+                    del grams[gram]
+                continue
+            try:
+                posting.remove(text)
+            except ValueError:
+                continue
+            if len(posting) == 1:
+                grams[gram] = posting[0]
+        anchor, offset = self._anchor_of.pop(text)
+        anchored = self._anchors.get(anchor)
+        if anchored is not None:
+            try:
+                anchored.remove((text, offset))
+            except ValueError:
+                pass
+            if not anchored:
+                del self._anchors[anchor]
+        self.evictions += 1
+    
+    def index_size(self) -> dict:
+        """Number of entries, distinct n-grams, n-gram postings and the index's approximate size in bytes."""
+        grams = self._grams
+        size = sys.getsizeof(grams) + sys.getsizeof(self._anchors) + sys.getsizeof(self._anchor_of)
+        postings = 0
+        for gram, posting in grams.items():
+            size += sys.getsizeof(gram)
+            if type(posting) is str:
+                postings += 1
+            else:
+                postings += len(posting)
+                size += sys.getsizeof(posting)
+        for anchored in self._anchors.values():
+            size += sys.getsizeof(anchored) + sum(sys.getsizeof(item) for item in anchored)
+        return {
+            'entries': len(self._entries),
+            'grams': len(grams),
+            'postings': postings,
+            'index_bytes': size,
+        }
+
 
 class RemoveDuplicatesPlugin(TextractorPlugin):
     """
@@ -16,18 +255,30 @@ class RemoveDuplicatesPlugin(TextractorPlugin):
     
     This plugin:
     - Removes inline duplicates (same text repeated within a line)
-    - Tracks all seen text and filters out any text that has been seen before
+    - Tracks recently seen text (bounded by count and optionally age) and
+      filters out text that is equal to, part of, or contains a recent text
     """
     
     name = "Remove Duplicates"
     description = "Filters out text that has already been displayed"
-    version = "1.0"
+    version = "1.1"
     author = "Sugoi Hook"
     
     def __init__(self):
         super().__init__()
-        self._state['seen_texts'] = set()
         self._state['min_length'] = 10  # Minimum length for duplicate checking
+        self._state['history_size'] = 5000  # Recent texts remembered (LRU)
+        self._state['history_age'] = 0  # Forget texts not seen for this many seconds (0 = never)
+        self._state['checks'] = 0
+        self._state['hits'] = 0
+        self._state['seen_texts'] = self._new_index()
+    
+    def _new_index(self) -> RecentTextIndex:
+        return RecentTextIndex(
+            gram_length=min(self._state['min_length'], MAX_GRAM_LENGTH),
+            max_entries=self._state['history_size'],
+            max_age=self._state['history_age'],
+        )
     
     def remove_inline_duplicates(self, text: str) -> str:
         """
@@ -53,22 +304,25 @@ class RemoveDuplicatesPlugin(TextractorPlugin):
             if first_normalized == second_normalized:
                 return first_half.strip()
         
-        # Check for repeated patterns with some tolerance
-        # Look for patterns where text repeats with possible whitespace differences
-        for pattern_len in range(3, min(len(text_clean) // 2 + 1, 200)):
-            pattern = text_clean[:pattern_len]
-            pattern_normalized = ''.join(pattern.split())
-            
-            if len(pattern_normalized) < 3:
-                continue
-            
-            # Check if the rest of the text starts with the same pattern
-            rest = text_clean[pattern_len:].lstrip()
-            rest_normalized = ''.join(rest.split())
-            
-            if rest_normalized.startswith(pattern_normalized):
-                # Found a duplicate pattern, return just the first occurrence
-                return pattern.strip()
+        # Check for a repeated leading pattern, ignoring whitespace differences.
+        # Work on the text with all whitespace removed: the pattern repeats when
+        # stripped[:m] == stripped[m:2m]. Any further copies (or a partial copy)
+        # after the second one are dropped along with it.
+        stripped = ''.join(text_clean.split())
+        
+        # The first copy has to end in the first half of the text
+        max_period = len(''.join(text_clean[:half_len].split()))
+        period = first_square_period(stripped, MIN_REPEAT_LENGTH, max_period)
+        if not period:
+            return text_clean
+        
+        # Map the period back to the original text: cut after its last character
+        count = 0
+        for index, char in enumerate(text_clean):
+            if not char.isspace():
+                count += 1
+                if count == period:
+                    return text_clean[:index + 1]
         
         return text_clean
     
@@ -98,24 +352,41 @@ class RemoveDuplicatesPlugin(TextractorPlugin):
         if len(text_normalized) < self._state['min_length']:
             return text_clean + '\n' if text.endswith('\n') else text_clean
         
-        # Check if this text is already seen
-        if text_normalized in self._state['seen_texts']:
-            return None
+        seen_texts = self._state['seen_texts']
+        now = time.monotonic()
+        seen_texts.expire(now)
+        self._state['checks'] += 1
         
-        # Check if this text is a substring of any seen text (handles overlapping chunks)
-        for seen in self._state['seen_texts']:
-            if text_normalized in seen or seen in text_normalized:
-                return None
+        # Check if this text was seen, or overlaps a seen text (handles overlapping chunks)
+        match = seen_texts.find(text_normalized)
+        if match is not None:
+            self._state['hits'] += 1
+            seen_texts.touch(match, now)
+            return None
         
         # Add normalized text to seen texts
-        self._state['seen_texts'].add(text_normalized)
+        seen_texts.add(text_normalized, now)
         
         # Preserve the newline if original had it
         return text_clean + '\n' if text.endswith('\n') else text_clean
     
     def reset(self):
         """Reset the seen texts tracking."""
-        self._state['seen_texts'] = set()
+        self._state['seen_texts'] = self._new_index()
+        self._state['checks'] = 0
+        self._state['hits'] = 0
+    
+    def get_stats(self) -> dict:
+        """Duplicate hit rate and index size."""
+        checks = self._state['checks']
+        stats = {
+            'checks': checks,
+            'hits': self._state['hits'],
+            'hit_rate': self._state['hits'] / checks if checks else 0.0,
+            'evictions': self._state['seen_texts'].evictions,
+        }
+        stats.update(self._state['seen_texts'].index_size())
+        return stats
     
     def get_settings(self) -> dict:
         """Get plugin settings."""
@@ -124,6 +395,16 @@ class RemoveDuplicatesPlugin(TextractorPlugin):
                 self._state['min_length'],
                 'int',
                 'Minimum text length for duplicate checking (shorter texts are ignored)'
+            ),
+            'history_size': (
+                self._state['history_size'],
+                'int',
+                'Number of recent texts remembered for duplicate checking'
+            ),
+            'history_age': (
+                self._state['history_age'],
+                'int',
+                'Forget texts not seen for this many seconds (0 = never)'
             )
         }
     
@@ -132,9 +413,30 @@ class RemoveDuplicatesPlugin(TextractorPlugin):
         if name == 'min_length':
             try:
                 self._state['min_length'] = int(value)
-                return True
             except (ValueError, TypeError):
                 return False
+            self.reset()  # The index n-gram length depends on min_length
+            return True
+        elif name == 'history_size':
+            try:
+                history_size = int(value)
+            except (ValueError, TypeError):
+                return False
+            if history_size < 1:
+                return False
+            self._state['history_size'] = history_size
+            self._state['seen_texts'].resize(history_size)
+            return True
+        elif name == 'history_age':
+            try:
+                history_age = int(value)
+            except (ValueError, TypeError):
+                return False
+            if history_age < 0:
+                return False
+            self._state['history_age'] = history_age
+            self._state['seen_texts'].max_age = history_age
+            return True
         return False
 
 
@@ -8,9 +8,36 @@ more than 30 types of translation endpoints (DeepL, Google, etc.).
 For more information: https://dreamsavior.net
 """
 
-import requests
-from plugins import TextractorPlugin
-from typing import Optional
+import asyncio
+from plugins import TextractorPlugin, add_translator_path
+from typing import List, Optional
+
+try:
+    add_translator_path()
+    from translation_cache import get_shared_cache
+except Exception:
+    get_shared_cache = None
+
+try:
+    from single_flight import get_shared_flights
+except Exception:
+    get_shared_flights = None
+
+# Imported by import_clients() when the plugin is enabled, not when the plugin
+# folder is scanned
+requests = None
+async_http = None  # deep_translator's asyncio client, None if unavailable
+
+
+def import_clients():
+    """Import requests and deep_translator's asyncio client."""
+    global requests, async_http
+    import requests
+    if async_http is None:
+        try:
+            from deep_translator import async_http
+        except Exception:
+            pass
 
 # ============================================================================
 # CONFIGURATION - Modify these constants as needed
@@ -19,6 +46,10 @@ TARGET_LANGUAGE = ""  # Target language code (e.g., "EN", "DE", "FR", "ES", "JA"
 SOURCE_LANGUAGE = ""  # Source language (use "auto" for auto-detection). If blank will follow Translator++ settings.
 PROXY_URL = "http://127.0.0.1:8877/v2/translate"  # Translator++ proxy endpoint
 REQUEST_TIMEOUT = 10  # Timeout in seconds for translation requests
+USE_CACHE = True  # Reuse translations of lines seen before (shared on-disk translation cache)
+COALESCE = True  # Send a line once when several hooks emit it at the same time
+BATCH_MAX_ITEMS = 50  # Texts sent per request by translate_batch
+BATCH_MAX_CHARS = 30000  # Characters sent per request by translate_batch
 # ============================================================================
 
 
@@ -43,11 +74,21 @@ class TranslatorPlusPlusPlugin(TextractorPlugin):
         self.proxy_url = PROXY_URL
         self.timeout = REQUEST_TIMEOUT
         self.session = None
+        self.cache = None
+        self.game_id = None  # Cache namespace: the attached game's profile id
+        self.flights = get_shared_flights() if COALESCE and get_shared_flights is not None else None
     
     def on_enable(self):
         """Initialize the session when the plugin is enabled."""
+        import_clients()
         if self.session is None:
             self.session = requests.Session()
+        if USE_CACHE and self.cache is None and get_shared_cache is not None:
+            self.cache = get_shared_cache()
+    
+    def on_game_changed(self, game_id):
+        """Keep cached translations per game."""
+        self.game_id = game_id
     
     def on_disable(self):
         """Clean up the session when the plugin is disabled."""
@@ -75,37 +116,23 @@ class TranslatorPlusPlusPlugin(TextractorPlugin):
         if self.session is None:
             self.on_enable()
         
+        cache = self.cache
+        namespace = self.game_id or ""
+        if cache is not None:
+            translated = cache.get('translator++', self.source_lang, self.target_lang, text,
+                                   namespace=namespace)
+            if translated:
+                return f"{text.rstrip()}\n{translated}\n\n"
+        
         try:
-            # Prepare the request payload
-            payload = {
-                "text": [text.strip()],
-                "target_lang": self.target_lang
-            }
-            
-            # Add source language if specified
-            if self.source_lang and self.source_lang.lower() != "auto":
-                payload["source_lang"] = self.source_lang
-            
-            # Make the translation request
-            response = self.session.post(
-                self.proxy_url,
-                json=payload,
-                timeout=self.timeout,
-                headers={"Content-Type": "application/json"}
-            )
-            
-            # Check if request was successful
-            if response.status_code == 200:
-                result = response.json()
-                
-                # Extract translated text from response
-                # The API returns translations in a "translations" array
-                if "translations" in result and len(result["translations"]) > 0:
-                    translated = result["translations"][0].get("text", "")
-                    if translated:
-                        # Return original text with translation, separated by newline
-                        # Add double newline at the end for spacing between blocks
-                        return f"{text.rstrip()}\n{translated}\n\n"
+            translated = self._translate_line(text)
+            if translated:
+                if cache is not None:
+                    cache.put('translator++', self.source_lang, self.target_lang, text,
+                              translated, namespace=namespace)
+                # Return original text with translation, separated by newline
+                # Add double newline at the end for spacing between blocks
+                return f"{text.rstrip()}\n{translated}\n\n"
             
             # If translation failed, return original text
             return text
@@ -120,6 +147,148 @@ class TranslatorPlusPlusPlugin(TextractorPlugin):
             # Any other error - return original text
             return text
     
+    def _translate_line(self, text: str) -> str:
+        """
+        Translate one line. Concurrent calls for the same line (e.g. from
+        several hooks) share one request.
+        
+        Returns:
+            The translation, or "" if the proxy did not return one
+        """
+        def request():
+            translations = self._request([text.strip()])
+            return translations[0] if translations else ""
+        
+        if self.flights is None:
+            return request()
+        key = self.flights.key('translator++', self.source_lang, self.target_lang, text)
+        return self.flights.do(key, request)
+    
+    def get_stats(self) -> dict:
+        """Request coalescing counters."""
+        if self.flights is None:
+            return {}
+        return {'coalescing': self.flights.get_stats('translator++')}
+    
+    def _request(self, texts: List[str]) -> Optional[List[str]]:
+        """
+        Send texts to the proxy in one request.
+        
+        Returns:
+            The translations in order ("" where one is missing), or None if the
+            request failed
+        """
+        response = self.session.post(
+            self.proxy_url,
+            json=self._payload(texts),
+            timeout=self.timeout,
+            headers={"Content-Type": "application/json"}
+        )
+        return self._parse_response(texts, response)
+    
+    async def _arequest(self, texts: List[str]) -> Optional[List[str]]:
+        """Same as _request, sent with the asyncio client of deep_translator."""
+        response = await async_http.get_session().post(
+            self.proxy_url,
+            json=self._payload(texts),
+            timeout=self.timeout,
+            headers={"Content-Type": "application/json"}
+        )
+        return self._parse_response(texts, response)
+    
+    def _payload(self, texts: List[str]) -> dict:
+        # Prepare the request payload
+        payload = {
+            "text": texts,
+            "target_lang": self.target_lang
+        }
+        
+        # Add source language if specified
+        if self.source_lang and self.source_lang.lower() != "auto":
+            payload["source_lang"] = self.source_lang
+        return payload
+    
+    def _parse_response(self, texts: List[str], response) -> Optional[List[str]]:
+        # Check if request was successful
+        if response.status_code != 200:
+            return None
+        
+        # The API returns translations in a "translations" array, in request order
+        translations = response.json().get("translations") or []
+        result = [item.get("text", "") for item in translations[:len(texts)]]
+        return result + [""] * (len(texts) - len(result))
+    
+    def _chunks(self, texts: List[str]) -> List[List[int]]:
+        """Indexes of consecutive non-empty texts, grouped within the request limits."""
+        chunks = []
+        chunk = []
+        chars = 0
+        for index, text in enumerate(texts):
+            if not text or not text.strip():
+                continue
+            size = len(text.strip())
+            if chunk and (len(chunk) >= BATCH_MAX_ITEMS or chars + size > BATCH_MAX_CHARS):
+                chunks.append(chunk)
+                chunk = []
+                chars = 0
+            chunk.append(index)
+            chars += size
+        if chunk:
+            chunks.append(chunk)
+        return chunks
+    
+    def translate_batch(self, texts: List[str]) -> List[str]:
+        """
+        Translate many texts with as few requests as possible.
+        
+        The proxy accepts a "text" array, so texts are sent in chunks of up to
+        BATCH_MAX_ITEMS texts / BATCH_MAX_CHARS characters, one request each.
+        
+        Args:
+            texts: The texts to translate
+            
+        Returns:
+            The translations in order ("" where a text could not be translated)
+        """
+        if self.session is None:
+            self.on_enable()
+        
+        results = [""] * len(texts)
+        for chunk in self._chunks(texts):
+            try:
+                translations = self._request([texts[i].strip() for i in chunk])
+            except Exception:
+                translations = None
+            if translations:
+                for i, translated in zip(chunk, translations):
+                    results[i] = translated
+        return results
+    
+    async def atranslate_batch(self, texts: List[str]) -> List[str]:
+        """
+        asyncio version of translate_batch: the chunks are sent concurrently,
+        and cancelling it cancels the requests in flight.
+        """
+        if self.session is None:
+            self.on_enable()
+        if async_http is None:
+            # deep_translator is not available: run the blocking version on a thread
+            return await asyncio.get_running_loop().run_in_executor(None, self.translate_batch, texts)
+        
+        async def request(chunk):
+            try:
+                return await self._arequest([texts[i].strip() for i in chunk])
+            except Exception:
+                return None
+        
+        chunks = self._chunks(texts)
+        results = [""] * len(texts)
+        for chunk, translations in zip(chunks, await asyncio.gather(*map(request, chunks))):
+            if translations:
+                for i, translated in zip(chunk, translations):
+                    results[i] = translated
+        return results
+    
     def reset(self):
         """Reset the plugin state."""
         # Close and recreate session
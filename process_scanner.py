@@ -0,0 +1,343 @@
+"""
+Process Scanner
+===============
+
+Background, incremental scan of the running processes for the process list.
+
+The previous refresh walked every top-level window once per process
+(O(processes x windows)), probed the architecture and icon of every process
+and rebuilt the whole list, all on the Tk thread. A scan here:
+- enumerates the visible windows once, into a set of pids
+- lists the processes with psutil and compares them with the previous scan,
+  keyed by (pid, create_time) so a reused pid counts as a new process
+- probes (name, path, exclusion, architecture) only the processes that
+  appeared; the others are looked up again only in the window pid set, so a
+  game whose window opens after its process started still shows up
+- queues the changes (rows to add, rows to remove) for the UI, which applies
+  them once per frame (drain)
+
+Window and architecture probing sit behind a WindowBackend: the Windows one
+uses pywin32 and IsWow64Process, StaticWindowBackend runs the scanner and
+its diffing on any platform (benchmarks, tests).
+
+Example:
+--------
+from process_scanner import ProcessScanner, get_window_backend
+
+scanner = ProcessScanner(get_window_backend(), exclude=should_exclude_process)
+scanner.start()
+...
+added, removed = scanner.drain()  # on the UI thread, every frame
+"""
+
+import sys
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional, Set
+
+import psutil
+
+# Processes with a lower pid are system processes
+MIN_SYSTEM_PID = 100
+# Seconds between two background scans
+SCAN_INTERVAL = 2.0
+# Architecture reported when it cannot be determined (as the hook engine's default build)
+DEFAULT_ARCH = "x86"
+
+
+class ProcessEntry:
+    """
+    A listed process, with the keys the search box matches against
+    precomputed (lowercase name, pid as text).
+    """
+
+    __slots__ = ('pid', 'create_time', 'name', 'exe', 'arch', 'name_key', 'pid_key')
+
+    def __init__(self, pid: int, create_time, name: str, exe: Optional[str] = None, arch: str = DEFAULT_ARCH):
+        self.pid = pid
+        self.create_time = create_time
+        self.name = name
+        self.exe = exe
+        self.arch = arch
+        self.name_key = name.lower()
+        self.pid_key = str(pid)
+
+    @property
+    def key(self) -> tuple:
+        return (self.pid, self.create_time)
+
+    def matches(self, search_term: str) -> bool:
+        """search_term: lowercase text typed in the search box ("" matches all)."""
+        return search_term in self.name_key or search_term in self.pid_key
+
+    def __repr__(self):
+        return f"ProcessEntry({self.pid}, {self.name!r}, {self.arch})"
+
+
+class WindowBackend:
+    """Window and architecture probing for the scanner."""
+
+    def visible_window_pids(self) -> Optional[Set[int]]:
+        """
+        Pids owning a visible top-level window with a title, from one
+        enumeration of the windows. None if the windows cannot be
+        enumerated: every process is then considered to have one.
+        """
+        return None
+
+    def architecture(self, pid: int) -> str:
+        """"x86" or "x64"."""
+        return DEFAULT_ARCH
+
+
+class Win32WindowBackend(WindowBackend):
+    """The Windows APIs (pywin32 for the windows, IsWow64Process for the architecture)."""
+
+    def __init__(self):
+        import win32gui
+        import win32process
+        self._win32gui = win32gui
+        self._win32process = win32process
+
+    def visible_window_pids(self) -> Optional[Set[int]]:
+        win32gui = self._win32gui
+        get_pid = self._win32process.GetWindowThreadProcessId
+
+        def enum_windows_callback(hwnd, pids):
+            # Only count windows with actual titles
+            if win32gui.IsWindowVisible(hwnd) and win32gui.GetWindowText(hwnd):
+                pids.add(get_pid(hwnd)[1])
+            return True
+
+        pids = set()
+        try:
+            win32gui.EnumWindows(enum_windows_callback, pids)
+        except Exception:
+            # If we can't check, assume every process might be valid
+            return None
+        return pids
+
+    def architecture(self, pid: int) -> str:
+        try:
+            import ctypes
+            kernel32 = ctypes.windll.kernel32
+            handle = kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+            if handle:
+                try:
+                    is_wow64 = ctypes.c_bool()
+                    if kernel32.IsWow64Process(handle, ctypes.byref(is_wow64)):
+                        return "x86" if is_wow64.value else "x64"
+                finally:
+                    kernel32.CloseHandle(handle)
+        except Exception:
+            pass
+        return DEFAULT_ARCH
+
+
+class StaticWindowBackend(WindowBackend):
+    """
+    Windows and architectures given up front, for other platforms,
+    benchmarks and tests.
+
+    Args:
+        window_pids: pids that have a visible window (None: every process);
+            can be changed between scans
+        arch: architecture of every process, or a dict of pid -> architecture
+    """
+
+    def __init__(self, window_pids: Optional[Iterable[int]] = None, arch=DEFAULT_ARCH):
+        self.window_pids = set(window_pids) if window_pids is not None else None
+        self.arch = arch
+        self.stats = {'enumerations': 0, 'arch_probes': 0}
+
+    def visible_window_pids(self) -> Optional[Set[int]]:
+        self.stats['enumerations'] += 1
+        return set(self.window_pids) if self.window_pids is not None else None
+
+    def architecture(self, pid: int) -> str:
+        self.stats['arch_probes'] += 1
+        if isinstance(self.arch, dict):
+            return self.arch.get(pid, DEFAULT_ARCH)
+        return self.arch
+
+
+def get_window_backend() -> WindowBackend:
+    """The Windows backend on Windows (with pywin32), else a StaticWindowBackend."""
+    if sys.platform == 'win32':
+        try:
+            return Win32WindowBackend()
+        except ImportError:
+            pass
+    return StaticWindowBackend()
+
+
+class ProcessScanner:
+    """
+    Incremental scanner of the processes to list.
+
+    scan() can be called from any thread (scans never overlap); start() runs
+    it every interval seconds on a background thread, and refresh() asks
+    for a scan now. The changes of every scan are queued until drain().
+
+    Args:
+        backend: window and architecture probing
+        exclude: exclude(name, exe_path) -> True for processes never to list
+            (called once per process)
+        min_pid: processes with a lower pid are not listed
+        interval: seconds between background scans
+
+    Attributes:
+        stats (dict): 'scans', 'probed' (processes seen for the first time),
+            'added' and 'removed' (rows), 'last_scan_ms'
+    """
+
+    def __init__(self, backend: Optional[WindowBackend] = None,
+                 exclude: Optional[Callable[[str, Optional[str]], bool]] = None,
+                 min_pid: int = MIN_SYSTEM_PID, interval: float = SCAN_INTERVAL):
+        self.backend = backend if backend is not None else get_window_backend()
+        self.exclude = exclude
+        self.min_pid = min_pid
+        self.interval = interval
+        self.stats = {'scans': 0, 'probed': 0, 'added': 0, 'removed': 0, 'last_scan_ms': 0.0}
+
+        self._scan_lock = threading.Lock()
+        self._known = {}  # key -> ProcessEntry, or None for a process never to list
+        self._listed = set()  # keys of the entries currently listed
+
+        self._lock = threading.Lock()
+        self._added = {}  # key -> ProcessEntry, not drained yet
+        self._removed = set()  # keys, not drained yet
+
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def _probe(self, proc, key) -> Optional[ProcessEntry]:
+        """The entry of a process seen for the first time, or None if it is not to be listed."""
+        self.stats['probed'] += 1
+        if proc.pid < self.min_pid:
+            return None
+        try:
+            name = proc.name()
+        except psutil.Error:
+            return None
+        try:
+            exe = proc.exe()
+        except psutil.Error:
+            exe = None
+        if self.exclude is not None and self.exclude(name, exe):
+            return None
+        return ProcessEntry(proc.pid, key[1], name, exe, arch=None)
+
+    def scan(self):
+        """
+        Compare the running processes with the previous scan and queue the
+        changes.
+
+        Returns:
+            (added, removed) - the entries listed by this scan and the keys
+            of the entries it removed
+        """
+        with self._scan_lock:
+            started = time.perf_counter()
+            window_pids = self.backend.visible_window_pids()
+
+            current = {}
+            for proc in psutil.process_iter():
+                try:
+                    create_time = proc.create_time()
+                except (psutil.NoSuchProcess, psutil.ZombieProcess):
+                    continue
+                except psutil.AccessDenied:
+                    create_time = None
+                current[(proc.pid, create_time)] = proc
+
+            known = self._known
+            listed = self._listed
+            added = []
+            removed = []
+            for key in known.keys() - current.keys():
+                del known[key]
+                if key in listed:
+                    listed.discard(key)
+                    removed.append(key)
+
+            for key, proc in current.items():
+                if key in known:
+                    entry = known[key]
+                else:
+                    entry = known[key] = self._probe(proc, key)
+                if entry is None:
+                    continue
+                visible = window_pids is None or key[0] in window_pids
+                if visible and key not in listed:
+                    if entry.arch is None:
+                        entry.arch = self.backend.architecture(entry.pid)
+                    listed.add(key)
+                    added.append(entry)
+                elif not visible and key in listed:
+                    listed.discard(key)
+                    removed.append(key)
+
+            with self._lock:
+                for entry in added:
+                    self._added[entry.key] = entry
+                for key in removed:
+                    # Added and removed again before the UI saw it
+                    if self._added.pop(key, None) is None:
+                        self._removed.add(key)
+
+            self.stats['scans'] += 1
+            self.stats['added'] += len(added)
+            self.stats['removed'] += len(removed)
+            self.stats['last_scan_ms'] = (time.perf_counter() - started) * 1000.0
+        return added, removed
+
+    def drain(self):
+        """
+        Take the changes queued since the last drain.
+
+        Returns:
+            (added, removed) - a list of ProcessEntry to add (in scan order)
+            and a list of keys to remove
+        """
+        with self._lock:
+            added = list(self._added.values())
+            removed = list(self._removed)
+            self._added = {}
+            self._removed = set()
+        return added, removed
+
+    def entries(self) -> Dict[tuple, ProcessEntry]:
+        """The entries currently listed, by key."""
+        with self._scan_lock:
+            return {key: self._known[key] for key in self._listed}
+
+    def start(self):
+        """Scan now and then every interval seconds, on a background thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        self._wake.set()
+        self._thread = threading.Thread(target=self._run, name="ProcessScanner", daemon=True)
+        self._thread.start()
+
+    def refresh(self):
+        """Ask the background thread for a scan now."""
+        self._wake.set()
+
+    def stop(self):
+        self._stopped.set()
+        self._wake.set()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            if self._stopped.is_set():
+                break
+            try:
+                self.scan()
+            except Exception:
+                # Keep the last list; the next scan tries again
+                pass
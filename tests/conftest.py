@@ -0,0 +1,51 @@
+import http.server
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+# The GUI modules live at the root, the Translator's next to Translator.py.
+# The root comes first: plugins is the GUI's package, not Translator/plugins.py
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+if str(ROOT / "Translator") not in sys.path:
+    sys.path.append(str(ROOT / "Translator"))
+
+
+class StubHandler(http.server.BaseHTTPRequestHandler):
+    """Base of the local stub servers' handlers: keep-alive, and no request log."""
+
+    protocol_version = "HTTP/1.1"
+
+    def send_body(self, body: bytes, content_type: str = "text/html; charset=utf-8", status: int = 200):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    """
+    serve(handler) starts a server for a StubHandler subclass on a free local
+    port and returns its base URL; every server is shut down after the test.
+    """
+    servers = []
+
+    def serve(handler):
+        httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        httpd.daemon_threads = True
+        threading.Thread(target=httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+        servers.append(httpd)
+        return f"http://127.0.0.1:{httpd.server_address[1]}"
+
+    yield serve
+    for httpd in servers:
+        httpd.shutdown()
+        httpd.server_close()
@@ -0,0 +1,181 @@
+import asyncio
+import gzip
+import socket
+import threading
+import time
+import zlib
+
+import pytest
+
+requests = pytest.importorskip("requests")
+
+from conftest import StubHandler
+from deep_translator.async_http import AsyncSession
+
+BODY = "猫が好き。".encode("utf-8") * 50
+
+
+class HttpFeaturesHandler(StubHandler):
+    """
+    One path per feature; every request is recorded as (path, client port),
+    so the tests can tell which connection it came on.
+    """
+
+    requests = []
+    dropped = False
+    lock = threading.Lock()
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            cls.requests.append((self.path, self.client_address[1]))
+        if self.path == "/chunked":
+            self.send_response(200)
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for start in range(0, len(BODY), 100):
+                chunk = BODY[start:start + 100]
+                self.wfile.write(b"%x;ext=1\r\n%s\r\n" % (len(chunk), chunk))
+            self.wfile.write(b"0\r\nX-Trailer: 1\r\n\r\n")
+        elif self.path in ("/gzip", "/deflate", "/raw-deflate"):
+            encoded = {
+                "/gzip": gzip.compress(BODY),
+                "/deflate": zlib.compress(BODY),
+                "/raw-deflate": zlib.compress(BODY)[2:-4],
+            }[self.path]
+            self.send_response(200)
+            self.send_header("Content-Encoding", "deflate" if "deflate" in self.path else "gzip")
+            self.send_header("Content-Length", str(len(encoded)))
+            self.end_headers()
+            self.wfile.write(encoded)
+        elif self.path == "/until-close":
+            self.send_response(200)
+            self.end_headers()
+            self.wfile.write(BODY)
+            self.close_connection = True
+        elif self.path == "/drop-once" and not cls.dropped:
+            # Closed without an answer, as a server does with a stale keep-alive connection
+            cls.dropped = True
+            self.close_connection = True
+        elif self.path == "/slow":
+            time.sleep(1.0)
+            self.send_body(b"late", "text/plain")
+        else:
+            self.send_body(self.path.encode("utf-8"), "text/plain")
+
+
+@pytest.fixture
+def base_url(stub_server):
+    HttpFeaturesHandler.requests = []
+    HttpFeaturesHandler.dropped = False
+    return stub_server(HttpFeaturesHandler)
+
+
+def run(coroutine_function):
+    """Run coroutine_function(session) on a new event loop with a session that does not retry."""
+
+    async def main():
+        session = AsyncSession(retries=0, backoff_factor=0, pool_maxsize=4)
+        try:
+            return await coroutine_function(session)
+        finally:
+            session.close()
+
+    return asyncio.run(main())
+
+
+def connections():
+    return len({port for _, port in HttpFeaturesHandler.requests})
+
+
+def test_content_length_body(base_url):
+    response = run(lambda session: session.get(base_url + "/echo", params={"q": "猫"}))
+    assert response.status_code == 200
+    assert response.text == "/echo?q=%E7%8C%AB"
+
+
+def test_chunked_body_with_extensions_and_trailers(base_url):
+    async def two_requests(session):
+        return await session.get(base_url + "/chunked"), await session.get(base_url + "/after")
+
+    chunked, after = run(two_requests)
+    assert chunked.content == BODY
+    # The trailers were read to the end: the connection is still in step
+    assert after.text == "/after"
+    assert connections() == 1
+
+
+@pytest.mark.parametrize("path", ["/gzip", "/deflate", "/raw-deflate"])
+def test_compressed_bodies_are_decoded(base_url, path):
+    assert run(lambda session: session.get(base_url + path)).content == BODY
+
+
+def test_body_until_close_is_not_reused(base_url):
+    async def two_requests(session):
+        return await session.get(base_url + "/until-close"), await session.get(base_url + "/after")
+
+    until_close, after = run(two_requests)
+    assert until_close.content == BODY
+    assert after.text == "/after"
+    assert connections() == 2
+
+
+def test_keep_alive_connection_is_reused(base_url):
+    async def three_requests(session):
+        return [(await session.get(f"{base_url}/{index}")).text for index in range(3)]
+
+    assert run(three_requests) == ["/0", "/1", "/2"]
+    assert connections() == 1
+
+
+def test_request_is_sent_again_when_the_server_closed_the_connection(base_url):
+    async def two_requests(session):
+        await session.get(base_url + "/first")
+        # Sent on the pooled connection, which the server closes without answering
+        return await session.get(base_url + "/drop-once")
+
+    assert run(two_requests).text == "/drop-once"
+    assert [path for path, _ in HttpFeaturesHandler.requests] == ["/first", "/drop-once", "/drop-once"]
+    assert connections() == 2
+
+
+def test_fresh_connection_closed_without_answer_is_an_error(base_url):
+    HttpFeaturesHandler.dropped = False
+    with pytest.raises(requests.exceptions.ConnectionError):
+        run(lambda session: session.get(base_url + "/drop-once"))
+
+
+def test_read_timeout(base_url):
+    started = time.monotonic()
+    with pytest.raises(requests.exceptions.ReadTimeout):
+        run(lambda session: session.get(base_url + "/slow", timeout=(1.0, 0.1)))
+    assert time.monotonic() - started < 0.8
+
+
+def test_connect_error():
+    # A port nothing listens on any more
+    with socket.socket() as listener:
+        listener.bind(("127.0.0.1", 0))
+        port = listener.getsockname()[1]
+    with pytest.raises(requests.exceptions.ConnectionError):
+        run(lambda session: session.get(f"http://127.0.0.1:{port}/", timeout=1.0))
+
+
+def test_cancelled_request_does_not_poison_the_pool(base_url):
+    async def cancel_then_request(session):
+        await session.get(base_url + "/first")
+        slow = asyncio.ensure_future(session.get(base_url + "/slow"))
+        await asyncio.sleep(0.1)
+        slow.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await slow
+        pooled = sum(len(idle) for idle in session._idle.values())
+        after = await session.get(base_url + "/after", timeout=2.0)
+        return pooled, after
+
+    pooled, after = run(cancel_then_request)
+    # The cancelled request's connection was closed, not put back
+    assert pooled == 0
+    # and the next request is not answered with the cancelled one's late answer
+    assert after.text == "/after"
+    assert connections() == 2
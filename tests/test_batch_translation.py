@@ -0,0 +1,56 @@
+import json
+import urllib.parse
+
+import pytest
+
+pytest.importorskip("requests")
+
+from conftest import StubHandler
+from deep_translator import DeeplTranslator, async_http
+
+
+class DeeplStubHandler(StubHandler):
+    """DeepL's /translate: every "text" of the form body, translated; the texts of each request are recorded."""
+
+    requests = []
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0))).decode("utf-8")
+        texts = urllib.parse.parse_qs(body).get("text", [])
+        type(self).requests.append(texts)
+        data = json.dumps({"translations": [{"text": f"EN[{text}]"} for text in texts]}).encode("utf-8")
+        self.send_body(data, "application/json")
+
+
+@pytest.fixture
+def translator(stub_server):
+    DeeplStubHandler.requests = []
+    translator = DeeplTranslator(source="ja", target="en", api_key="stub")
+    translator._base_url = stub_server(DeeplStubHandler) + "/deepl/"
+    return translator
+
+
+def test_batch_is_sent_in_chunks_and_returned_in_order(translator):
+    texts = [f"行{index}" for index in range(120)]
+    assert translator.translate_batch(texts) == [f"EN[{text}]" for text in texts]
+    assert sorted(len(chunk) for chunk in DeeplStubHandler.requests) == [20, 50, 50]
+
+
+def test_empty_texts_are_not_sent(translator):
+    assert translator.translate_batch(["猫", "", "  ", "犬"]) == ["EN[猫]", "", "  ", "EN[犬]"]
+    assert DeeplStubHandler.requests == [["猫", "犬"]]
+
+
+def test_chunks_respect_the_character_limit(translator, monkeypatch):
+    monkeypatch.setattr(translator, "batch_max_chars", 10)
+    texts = ["あ" * 6, "い" * 6, "う" * 3, "え" * 20]
+    assert translator.translate_batch(texts) == [f"EN[{text}]" for text in texts]
+    # A text longer than the limit is sent on its own
+    assert sorted(DeeplStubHandler.requests) == [["あ" * 6], ["い" * 6, "う" * 3], ["え" * 20]]
+
+
+def test_async_batch(translator):
+    texts = [f"行{index}" for index in range(60)]
+    translations = async_http.submit(translator.atranslate_batch(texts)).result()
+    assert translations == [f"EN[{text}]" for text in texts]
+    assert len(DeeplStubHandler.requests) == 2
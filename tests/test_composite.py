@@ -0,0 +1,117 @@
+import asyncio
+import time
+
+import pytest
+
+pytest.importorskip("requests")
+
+from deep_translator.base import BaseTranslator
+from deep_translator.composite import (
+    CLOSED, HALF_OPEN, HEDGE, OPEN, RACE, CircuitBreaker, CompositeTranslator,
+)
+
+
+class StubTranslator(BaseTranslator):
+    """Answers "<engine>:<text>" after delay seconds, or raises while failing is set."""
+
+    def __init__(self, delay=0.0, failing=False):
+        self.delay = delay
+        self.failing = failing
+        self.calls = 0
+        super().__init__(source="ja", target="en")
+
+    def translate(self, text, **kwargs):
+        raise NotImplementedError
+
+    async def atranslate(self, text, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.failing:
+            raise ConnectionError("engine down")
+        return f"{self._type()}:{text}"
+
+
+class PrimaryTranslator(StubTranslator):
+    pass
+
+
+class BackupTranslator(StubTranslator):
+    pass
+
+
+def test_failover_to_the_next_engine():
+    primary, backup = PrimaryTranslator(failing=True), BackupTranslator()
+    composite = CompositeTranslator([primary, backup])
+    assert composite.translate("猫") == "BackupTranslator:猫"
+    stats = composite.get_stats()
+    assert stats["failed_over"] == 1
+    assert stats["engines"]["primary"]["errors"] == 1
+    assert stats["engines"]["backup"]["wins"] == 1
+
+
+def test_every_engine_failing_raises():
+    composite = CompositeTranslator([PrimaryTranslator(failing=True), BackupTranslator(failing=True)])
+    with pytest.raises(ConnectionError):
+        composite.translate("猫")
+    assert composite.get_stats()["failed"] == 1
+
+
+def test_open_breaker_skips_the_engine_until_reset_timeout():
+    primary, backup = PrimaryTranslator(failing=True), BackupTranslator()
+    composite = CompositeTranslator([primary, backup], failure_threshold=2, reset_timeout=0.2)
+    composite.translate("一")
+    composite.translate("二")
+    assert composite.get_stats()["engines"]["primary"]["breaker"] == OPEN
+
+    composite.translate("三")
+    assert primary.calls == 2
+    assert composite.get_stats()["engines"]["primary"]["skipped"] == 1
+
+    # Half open: one request goes through, and its success closes the breaker
+    time.sleep(0.25)
+    primary.failing = False
+    assert composite.translate("四") == "PrimaryTranslator:四"
+    assert composite.get_stats()["engines"]["primary"]["breaker"] == CLOSED
+
+
+def test_race_cancels_the_slower_engine():
+    primary, backup = PrimaryTranslator(delay=1.0), BackupTranslator(delay=0.01)
+    composite = CompositeTranslator([primary, backup], mode=RACE)
+    started = time.monotonic()
+    assert composite.translate("猫") == "BackupTranslator:猫"
+    assert time.monotonic() - started < 0.5
+    time.sleep(0.05)
+    assert composite.get_stats()["engines"]["primary"]["cancelled"] == 1
+
+
+def test_hedge_asks_the_next_engine_after_hedge_after():
+    primary, backup = PrimaryTranslator(delay=1.0), BackupTranslator(delay=0.01)
+    composite = CompositeTranslator([primary, backup], mode=HEDGE, hedge_after=0.05)
+    assert composite.translate("猫") == "BackupTranslator:猫"
+    assert composite.get_stats()["hedged"] == 1
+
+    fast = CompositeTranslator([PrimaryTranslator(), BackupTranslator()], mode=HEDGE, hedge_after=0.5)
+    assert fast.translate("猫") == "PrimaryTranslator:猫"
+    assert fast.get_stats()["hedged"] == 0
+
+
+def test_circuit_breaker_transitions():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.1)
+    breaker.record_failure()
+    assert breaker.state == CLOSED and breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == OPEN and not breaker.allow()
+
+    time.sleep(0.15)
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+    # Only one probe at a time
+    assert not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert breaker.opened == 2
+
+    time.sleep(0.15)
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CLOSED and breaker.failures == 0
@@ -0,0 +1,40 @@
+import urllib.parse
+
+import pytest
+
+pytest.importorskip("requests")
+pytest.importorskip("bs4")
+
+from conftest import StubHandler
+from deep_translator import GoogleTranslator
+
+
+class EchoWithHlHandler(StubHandler):
+    """A Google result page: the text itself while an hl parameter is sent, else its translation."""
+
+    queries = []
+
+    def do_GET(self):
+        query = urllib.parse.parse_qs(urllib.parse.urlparse(self.path).query)
+        type(self).queries.append(query)
+        text = query["q"][0]
+        result = text if "hl" in query else f"translated {text}"
+        self.send_body(f'<html><div class="result-container">{result}</div></html>'.encode("utf-8"))
+
+
+@pytest.fixture
+def base_url(stub_server):
+    EchoWithHlHandler.queries = []
+    return stub_server(EchoWithHlHandler) + "/google"
+
+
+def test_untranslated_page_is_requested_again_without_hl(base_url):
+    translator = GoogleTranslator(source="ja", target="en", hl="ja")
+    translator._base_url = base_url
+    assert translator.translate("abc") == "translated abc"
+    assert ["hl" in query for query in EchoWithHlHandler.queries] == [True, False]
+    # Only that request went without hl: the instance is unchanged for the others
+    assert translator._url_params == {"hl": "ja"}
+    assert translator.translate("def") == "translated def"
+    assert ["hl" in query for query in EchoWithHlHandler.queries] == [True, False, True, False]
+
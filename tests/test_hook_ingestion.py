@@ -0,0 +1,199 @@
+import io
+from pathlib import Path
+
+import pytest
+
+from hook_capture import CaptureTee, CaptureWriter, read_capture, replay_capture
+from hook_ingestion import (
+    HookIngestionEngine, HookRegistry, LunaLineParser, PluginDispatcher, TextractorLineParser, get_parser,
+)
+from plugins import TextractorPlugin
+from plugins.remove_duplicates import RemoveDuplicatesPlugin
+
+SESSION = Path(__file__).parent / "fixtures" / "session.shcap"
+
+
+class AppendPlugin(TextractorPlugin):
+    def __init__(self, suffix):
+        super().__init__()
+        self.suffix = suffix
+
+    def process_text(self, text):
+        return text + self.suffix
+
+
+class DropPlugin(TextractorPlugin):
+    def process_text(self, text):
+        return None if "drop" in text else text
+
+
+class FailingPlugin(TextractorPlugin):
+    def process_text(self, text):
+        raise ValueError("broken")
+
+
+def make_dispatcher(**plugins):
+    dispatcher = PluginDispatcher()
+    for filename, plugin in plugins.items():
+        dispatcher.add(filename, plugin)
+        dispatcher.plugin_order.append(filename)
+        dispatcher.active_plugins.append(filename)
+    dispatcher.invalidate()
+    return dispatcher
+
+
+def test_textractor_line_parser():
+    parser = TextractorLineParser()
+    assert parser.parse("[1:1A2C:4B5678:0:0:GetGlyphOutlineW:HS-8@0] こんにちは") == (
+        "1", "GetGlyphOutlineW", "こんにちは")
+    # The text can contain brackets and colons
+    assert parser.parse("[12:1:2:3:4:TextOutA:HA@0] [a:b] c")[2] == "[a:b] c"
+    assert parser.parse("[#1|0:1a2b:0:0:TextOutA:game.exe] luna") is None
+    assert parser.parse("Textractor attached") is None
+    assert parser.format_unselected("3", "千早") == "[Hook 3] 千早\n"
+
+
+def test_luna_line_parser():
+    parser = LunaLineParser()
+    assert parser.parse("[#1|0:1a2b:0:0:GetGlyphOutlineW:game.exe] こんにちは") == (
+        "1", "GetGlyphOutlineW", "こんにちは")
+    assert parser.parse("[#4|console] text") == ("4", "Unknown", "text")
+    assert parser.parse("[1:1A2C:4B5678:0:0:GetGlyphOutlineW:HS-8@0] textractor") is None
+    assert parser.format_unselected("3", "千早") == "[Hook #3] 千早\n"
+
+
+def test_get_parser():
+    assert get_parser("luna").engine == "luna"
+    assert get_parser("textractor").engine == "textractor"
+    with pytest.raises(ValueError):
+        get_parser("other")
+
+
+def test_hook_registry_keeps_the_first_texts():
+    registry = HookRegistry(max_texts=2)
+    assert registry.record("1", "TextOutA", "a")
+    assert not registry.record("1", "Other", "b")
+    registry.record("1", "TextOutA", "c")
+    assert registry.hooks["1"] == {'id': "1", 'function': "TextOutA", 'texts': ["a", "b"]}
+    assert "1" in registry and len(registry) == 1
+    registry.clear()
+    assert len(registry) == 0
+
+
+def test_dispatcher_runs_the_active_plugins_in_order():
+    dispatcher = make_dispatcher(a=AppendPlugin("a"), b=AppendPlugin("b"), drop=DropPlugin())
+    assert dispatcher.process("x") == "xab"
+    dispatcher.plugin_order = ["b", "a", "drop"]
+    assert dispatcher.process("x") == "xba"
+    dispatcher.active_plugins = ["a", "drop"]
+    assert dispatcher.process("x") == "xa"
+    dispatcher.plugins["a"].enabled = False
+    dispatcher.invalidate()
+    assert dispatcher.process("x") == "x"
+    assert dispatcher.process("drop me") is None
+    stats = dispatcher.get_stats()
+    assert stats["drop"]["filtered"] == 1
+    assert stats["b"]["calls"] == 2
+
+
+def test_dispatcher_passes_the_line_on_when_a_plugin_fails():
+    dispatcher = make_dispatcher(broken=FailingPlugin(), a=AppendPlugin("a"))
+    assert dispatcher.process("x") == "xa"
+    stats = dispatcher.get_stats()["broken"]
+    assert stats["errors"] == 1
+    assert stats["last_error"] == "ValueError: broken"
+
+
+def test_removed_plugin_leaves_the_chain():
+    plugin = AppendPlugin("a")
+    dispatcher = make_dispatcher(a=plugin, b=AppendPlugin("b"))
+    assert dispatcher.process("x") == "xab"
+    dispatcher.remove("a")
+    assert dispatcher.process("x") == "xb"
+
+
+def test_engine_displays_the_selected_hook_only():
+    outputs = []
+    engine = HookIngestionEngine(engine="textractor", on_output=outputs.append)
+    lines = [
+        "[1:1:2:0:0:GetGlyphOutlineW:HS@0] one",
+        "[2:1:3:0:0:TextOutA:HS@0] name",
+        "[Console] attached",
+    ]
+    engine.feed_lines(lines)
+    assert outputs == ["[Hook 1] one\n", "[Hook 2] name\n", "[Console] attached\n"]
+
+    outputs.clear()
+    engine.selected_hook_id = "1"
+    engine.feed_lines(lines)
+    assert outputs == ["one\n", "[Console] attached\n"]
+
+    outputs.clear()
+    engine.selected_hook_id = None
+    engine.suppress_unselected = True
+    engine.feed_lines(lines)
+    assert outputs == ["[Console] attached\n"]
+
+
+def test_engine_reads_a_file(tmp_path):
+    path = tmp_path / "session.txt"
+    path.write_text("[#1|0:1:0:0:TextOutA:game.exe] 猫\n\nnoise\n[#1|0:1:0:0:TextOutA:game.exe] 犬\n",
+                    encoding="utf-8")
+    previews = []
+    engine = HookIngestionEngine(engine="luna", on_hook_text=lambda hook_id, text: previews.append(text))
+    with open(path, encoding="utf-8") as f:
+        # The blank line is read, but only the others count as lines
+        assert engine.run(f) == 4
+    assert previews == ["猫", "犬"]
+    assert (engine.stats['lines'], engine.stats['hook_lines'], engine.stats['outputs']) == (3, 2, 2)
+
+
+def test_recorded_capture_through_the_engine():
+    outputs = []
+    new_hooks = []
+    dispatcher = make_dispatcher(**{"remove_duplicates.py": RemoveDuplicatesPlugin()})
+    engine = HookIngestionEngine(dispatcher=dispatcher, on_output=outputs.append,
+                                 on_new_hook=lambda hook_id, function: new_hooks.append((hook_id, function)))
+    engine.selected_hook_id = "1"
+
+    result = replay_capture(SESSION, engine)
+
+    assert result['lines'] == 12
+    assert engine.engine == "textractor"
+    assert outputs == [
+        "[Console] Attached to game.exe (pid 6700)\n",
+        "今日はとても良い天気ですね。\n",
+        "昨日の夜、不思議な夢を見たんだ。\n",
+        # Inline repetition removed
+        "放課後、屋上で待っているから。\n",
+        "[Console] Textractor attached\n",
+        "そんなこと、誰にも言えないよ。\n",
+    ]
+    assert new_hooks == [("1", "GetGlyphOutlineW"), ("2", "TextOutA"), ("7", "DrawTextW"), ("3", "TextOutA")]
+    assert engine.stats == {
+        'lines': 12, 'hook_lines': 9, 'console_lines': 2, 'outputs': 6, 'filtered': 2, 'deferred': 0,
+    }
+
+
+def test_realtime_replay_keeps_the_recorded_pace():
+    engine = HookIngestionEngine()
+    recorded = max(timestamp for engine_name, timestamp, _ in read_capture(SESSION) if engine_name == "luna")
+    result = replay_capture(SESSION, engine, realtime=True, speed=4.0)
+    assert result['elapsed'] >= recorded / 4.0
+    assert replay_capture(SESSION, engine, max_lines=3)['lines'] == 3
+
+
+def test_recorded_stream_replays_the_same(tmp_path):
+    capture = tmp_path / "captures" / "session.shcap"
+    stream = io.StringIO(SESSION.read_text(encoding="utf-8").split("#SHCAP 1 engine=textractor\n")[0])
+    raw_lines = [record.split("\t", 1)[1] for record in stream.getvalue().splitlines()[1:]]
+
+    live = []
+    with CaptureWriter(capture, engine="luna") as writer:
+        assert HookIngestionEngine(on_output=live.append).run(CaptureTee(io.StringIO(
+            "".join(line + "\n" for line in raw_lines)), writer)) == len(raw_lines)
+
+    replayed = []
+    replay_capture(capture, HookIngestionEngine(on_output=replayed.append))
+    assert [line for _, _, line in read_capture(capture)] == raw_lines
+    assert replayed == live
@@ -0,0 +1,175 @@
+import os
+import time
+
+import pytest
+
+pytest.importorskip("PIL")
+
+from icon_cache import IconExtractor, IconThumbnailCache
+
+
+class StubIconExtractor(IconExtractor):
+    """A plain square per executable; none for the paths in no_icon."""
+
+    def __init__(self, no_icon=()):
+        self.no_icon = set(no_icon)
+        self.calls = []
+
+    def extract(self, exe_path, size=32):
+        from PIL import Image
+        self.calls.append(exe_path)
+        if exe_path in self.no_icon:
+            return None
+        return Image.new('RGB', (size, size), (200, 40, 40))
+
+
+def make_exe(folder, name, data=b"MZ"):
+    path = folder / name
+    path.write_bytes(data)
+    return str(path)
+
+
+def wait_for_photos(cache, exe_paths, timeout=5.0):
+    """Drain until every path is delivered; returns {exe path: photo}."""
+    delivered = {}
+    deadline = time.monotonic() + timeout
+    while not set(exe_paths) <= delivered.keys():
+        assert time.monotonic() < deadline, "timed out"
+        delivered.update(cache.drain())
+        time.sleep(0.005)
+    return delivered
+
+
+@pytest.fixture
+def cache_folder(tmp_path):
+    return tmp_path / "icon_cache"
+
+
+def test_miss_then_memory_hit(tmp_path, cache_folder):
+    exe = make_exe(tmp_path, "game.exe")
+    extractor = StubIconExtractor()
+    cache = IconThumbnailCache(cache_folder, extractor, size=24)
+    assert cache.get_photo(exe) is None
+    photo = wait_for_photos(cache, [exe])[exe]
+    assert photo.size == (24, 24)
+    assert photo.mode == 'RGBA'
+    assert cache.get_photo(exe) is photo
+    assert cache.stats['extracted'] == 1
+    assert cache.stats['memory_hits'] == 1
+    assert extractor.calls == [exe]
+    cache.close()
+
+
+def test_disk_hit_in_a_new_cache(tmp_path, cache_folder):
+    exe = make_exe(tmp_path, "game.exe")
+    first = IconThumbnailCache(cache_folder, StubIconExtractor())
+    first.get_photo(exe)
+    wait_for_photos(first, [exe])
+    first.close()
+    assert len(list(cache_folder.glob("*.png"))) == 1
+
+    extractor = StubIconExtractor()
+    second = IconThumbnailCache(cache_folder, extractor)
+    assert second.get_photo(exe) is None
+    assert wait_for_photos(second, [exe])[exe] is not None
+    assert second.stats['disk_hits'] == 1
+    assert extractor.calls == []
+    second.close()
+
+
+def test_memory_hit_does_not_look_at_the_executable(tmp_path, cache_folder, monkeypatch):
+    exe = make_exe(tmp_path, "game.exe")
+    cache = IconThumbnailCache(cache_folder, StubIconExtractor())
+    cache.get_photo(exe)
+    photo = wait_for_photos(cache, [exe])[exe]
+
+    def no_stat(*args, **kwargs):
+        raise AssertionError("the executable was looked at on the UI thread")
+
+    monkeypatch.setattr(cache, "key", no_stat)
+    assert cache.get_photo(exe) is photo
+    cache.close()
+
+
+def test_changed_executable_is_rendered_again(tmp_path, cache_folder):
+    exe = make_exe(tmp_path, "game.exe")
+    extractor = StubIconExtractor()
+    cache = IconThumbnailCache(cache_folder, extractor, recheck_interval=0)
+    cache.get_photo(exe)
+    old_photo = wait_for_photos(cache, [exe])[exe]
+
+    # Checked again while nothing changed: the photo in memory stays, nothing is delivered
+    assert cache.get_photo(exe) is old_photo
+    deadline = time.monotonic() + 5
+    while cache._pending:
+        assert time.monotonic() < deadline, "timed out"
+        assert cache.drain() == []
+        time.sleep(0.005)
+    assert cache.stats['disk_hits'] == 0
+    assert extractor.calls == [exe]
+
+    # A new version of the executable: the worker notices and renders it again
+    make_exe(tmp_path, "game.exe", b"MZ version 2")
+    stat = os.stat(exe)
+    os.utime(exe, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert cache.get_photo(exe) is old_photo
+    new_photo = wait_for_photos(cache, [exe])[exe]
+    assert new_photo is not old_photo
+    assert cache.get_photo(exe) is new_photo
+    assert extractor.calls == [exe, exe]
+    # The thumbnail of the previous version was removed
+    assert [path.name for path in cache_folder.glob("*.png")] == [cache.key(exe)]
+    cache.close()
+
+
+def test_request_after_close_is_served(tmp_path, cache_folder):
+    exes = [make_exe(tmp_path, f"game_{index}.exe") for index in range(3)]
+    cache = IconThumbnailCache(cache_folder, StubIconExtractor())
+    cache.get_photo(exes[0])
+    cache.close()
+    # Asked for before the stopped worker is gone
+    cache.get_photo(exes[1])
+    cache.get_photo(exes[2])
+    assert all(wait_for_photos(cache, exes).values())
+    assert not cache._pending
+    cache.close()
+
+
+def test_other_display_scale_is_another_thumbnail(tmp_path, cache_folder):
+    exe = make_exe(tmp_path, "game.exe")
+    assert (IconThumbnailCache(cache_folder, StubIconExtractor(), scale=1.0).key(exe)
+            != IconThumbnailCache(cache_folder, StubIconExtractor(), size=36, scale=1.5).key(exe))
+
+
+def test_executable_without_icon_is_remembered(tmp_path, cache_folder):
+    exe = make_exe(tmp_path, "tool.exe")
+    cache = IconThumbnailCache(cache_folder, StubIconExtractor(no_icon=[exe]))
+    cache.get_photo(exe)
+    assert wait_for_photos(cache, [exe])[exe] is None
+    assert cache.stats['no_icon'] == 1
+    cache.close()
+
+    extractor = StubIconExtractor(no_icon=[exe])
+    again = IconThumbnailCache(cache_folder, extractor)
+    again.get_photo(exe)
+    assert wait_for_photos(again, [exe])[exe] is None
+    assert extractor.calls == []
+    again.close()
+
+
+def test_memory_is_bounded(tmp_path, cache_folder):
+    exes = [make_exe(tmp_path, f"game_{index}.exe") for index in range(5)]
+    cache = IconThumbnailCache(cache_folder, StubIconExtractor(), max_memory=3)
+    for exe in exes:
+        cache.get_photo(exe)
+    wait_for_photos(cache, exes)
+    assert cache.stats['evicted'] == 2
+    assert cache.get_photo(exes[0]) is None
+    assert cache.get_photo(exes[-1]) is not None
+    cache.close()
+
+
+def test_missing_executable(tmp_path, cache_folder):
+    cache = IconThumbnailCache(cache_folder, StubIconExtractor())
+    assert cache.key(str(tmp_path / "gone.exe")) is None
+    assert cache.get_photo(None) is None
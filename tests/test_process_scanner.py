@@ -0,0 +1,125 @@
+import pytest
+
+psutil = pytest.importorskip("psutil")
+
+import process_scanner
+from process_scanner import ProcessScanner, StaticWindowBackend
+
+
+class FakeProcess:
+    def __init__(self, pid, create_time, name, exe=None):
+        self.pid = pid
+        self._create_time = create_time
+        self._name = name
+        self._exe = exe if exe is not None else f"C:\\Games\\{name}"
+
+    def create_time(self):
+        if self._create_time is None:
+            raise psutil.AccessDenied(self.pid)
+        return self._create_time
+
+    def name(self):
+        return self._name
+
+    def exe(self):
+        return self._exe
+
+
+@pytest.fixture
+def processes(monkeypatch):
+    """The process table the scanner sees: a list of FakeProcess to edit between scans."""
+    table = []
+    monkeypatch.setattr(process_scanner.psutil, "process_iter", lambda: list(table))
+    return table
+
+
+def names(entries):
+    return sorted(entry.name for entry in entries)
+
+
+def test_first_scan_lists_visible_processes(processes):
+    processes.extend([
+        FakeProcess(4, 1.0, "System"),
+        FakeProcess(500, 1.0, "game.exe"),
+        FakeProcess(501, 1.0, "hidden.exe"),
+        FakeProcess(502, 1.0, "explorer.exe"),
+    ])
+    backend = StaticWindowBackend(window_pids={4, 500, 502}, arch={500: "x64"})
+    scanner = ProcessScanner(backend, exclude=lambda name, exe: name == "explorer.exe")
+    added, removed = scanner.scan()
+    assert names(added) == ["game.exe"]
+    assert removed == []
+    assert added[0].arch == "x64"
+    # Only listed processes have their architecture probed
+    assert backend.stats['arch_probes'] == 1
+
+
+def test_unchanged_processes_are_not_probed_again(processes):
+    processes.extend([FakeProcess(500, 1.0, "game.exe"), FakeProcess(501, 1.0, "tool.exe")])
+    scanner = ProcessScanner(StaticWindowBackend())
+    scanner.scan()
+    probed = scanner.stats['probed']
+    assert scanner.scan() == ([], [])
+    assert scanner.stats['probed'] == probed
+
+
+def test_exited_and_reused_pids(processes):
+    processes.extend([FakeProcess(500, 1.0, "game.exe"), FakeProcess(501, 1.0, "tool.exe")])
+    scanner = ProcessScanner(StaticWindowBackend())
+    scanner.scan()
+
+    # 501 exited; 500 exited and its pid went to another process
+    processes[:] = [FakeProcess(500, 2.0, "other.exe")]
+    added, removed = scanner.scan()
+    assert names(added) == ["other.exe"]
+    assert sorted(removed) == [(500, 1.0), (501, 1.0)]
+    assert list(scanner.entries()) == [(500, 2.0)]
+
+
+def test_window_opening_after_the_process_started(processes):
+    processes.append(FakeProcess(500, 1.0, "game.exe"))
+    backend = StaticWindowBackend(window_pids=set())
+    scanner = ProcessScanner(backend)
+    assert scanner.scan() == ([], [])
+
+    backend.window_pids = {500}
+    added, _ = scanner.scan()
+    assert names(added) == ["game.exe"]
+    assert scanner.stats['probed'] == 1
+
+    backend.window_pids = set()
+    assert scanner.scan() == ([], [(500, 1.0)])
+
+
+def test_access_denied_create_time(processes):
+    processes.append(FakeProcess(500, None, "service.exe"))
+    scanner = ProcessScanner(StaticWindowBackend())
+    added, _ = scanner.scan()
+    assert [entry.key for entry in added] == [(500, None)]
+
+
+def test_drain_merges_scans(processes):
+    processes.extend([FakeProcess(500, 1.0, "game.exe"), FakeProcess(501, 1.0, "tool.exe")])
+    scanner = ProcessScanner(StaticWindowBackend())
+    scanner.scan()
+    added, removed = scanner.drain()
+    assert names(added) == ["game.exe", "tool.exe"]
+    assert scanner.drain() == ([], [])
+
+    # Started and exited between two drains: the UI never hears of it
+    processes.append(FakeProcess(502, 1.0, "launcher.exe"))
+    scanner.scan()
+    del processes[2]
+    del processes[1]
+    scanner.scan()
+    added, removed = scanner.drain()
+    assert added == []
+    assert removed == [(501, 1.0)]
+
+
+def test_search_term_matching():
+    entry = process_scanner.ProcessEntry(1234, 1.0, "Game.exe")
+    assert entry.matches("game")
+    assert entry.matches("123")
+    assert entry.matches("")
+    assert not entry.matches("tool")
@@ -0,0 +1,129 @@
+import asyncio
+import time
+
+import pytest
+
+pytest.importorskip("requests")
+pytest.importorskip("bs4")
+
+from conftest import StubHandler
+from deep_translator import GoogleTranslator, rate_limit
+from deep_translator.exceptions import TooManyRequests
+
+
+class ThrottlingHandler(StubHandler):
+    """Answers 429 with `retry_after` to the first `rejections` requests, then a Google result page."""
+
+    rejections = 0
+    retry_after = "0"
+    requests = []
+
+    def do_GET(self):
+        cls = type(self)
+        cls.requests.append(time.monotonic())
+        if cls.rejections > 0:
+            cls.rejections -= 1
+            self.send_response(429)
+            self.send_header("Retry-After", cls.retry_after)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_body(b'<html><div class="result-container">translated</div></html>')
+
+
+@pytest.fixture
+def server(stub_server):
+    ThrottlingHandler.requests = []
+    return stub_server(ThrottlingHandler)
+
+
+def make_translator(base_url, name, **settings):
+    # A subclass per test, so each one has its own limiter and counters
+    translator = type(name, (GoogleTranslator,), {})(source="ja", target="en")
+    translator._base_url = base_url + "/google"
+    rate_limit.configure(name, **settings)
+    return translator
+
+
+def test_retry_after_is_waited_for_then_retried(server):
+    ThrottlingHandler.rejections = 1
+    ThrottlingHandler.retry_after = "1"
+    translator = make_translator(server, "RetryAfterTranslator", backoff_factor=0.01)
+    assert translator.translate("こんにちは") == "translated"
+    first, second = ThrottlingHandler.requests
+    assert second - first >= 1.0
+    stats = translator.rate_limiter.get_stats()
+    assert stats["rate_limited"] == 1
+    assert stats["retries"] == 1
+    assert stats["gave_up"] == 0
+
+
+def test_backoff_without_retry_after(server):
+    ThrottlingHandler.rejections = 2
+    ThrottlingHandler.retry_after = ""
+    translator = make_translator(server, "BackoffTranslator", backoff_factor=0.01)
+    assert translator.translate("こんにちは") == "translated"
+    assert len(ThrottlingHandler.requests) == 3
+    assert translator.rate_limiter.get_stats()["retries"] == 2
+
+
+def test_gives_up_after_max_retries(server):
+    ThrottlingHandler.rejections = 10
+    ThrottlingHandler.retry_after = "0"
+    translator = make_translator(server, "GiveUpTranslator", max_retries=2, backoff_factor=0.01)
+    with pytest.raises(TooManyRequests):
+        translator.translate("こんにちは")
+    assert len(ThrottlingHandler.requests) == 3
+    stats = translator.rate_limiter.get_stats()
+    assert stats["retries"] == 2
+    assert stats["gave_up"] == 1
+
+
+def test_retry_after_beyond_max_delay_is_not_waited_for(server):
+    ThrottlingHandler.rejections = 1
+    ThrottlingHandler.retry_after = "120"
+    translator = make_translator(server, "MaxDelayTranslator", max_delay=5.0)
+    started = time.monotonic()
+    with pytest.raises(TooManyRequests):
+        translator.translate("こんにちは")
+    assert time.monotonic() - started < 5.0
+    assert translator.rate_limiter.get_stats()["gave_up"] == 1
+
+
+def test_request_budget_paces_a_burst():
+    limiter = rate_limit.RateLimiter(requests_per_second=20, burst=1)
+    started = time.monotonic()
+    for _ in range(5):
+        limiter.acquire()
+    # The first request is sent at once, the others 50 ms apart
+    assert time.monotonic() - started >= 0.19
+    assert limiter.get_stats()["throttled"] == 4
+
+
+def test_parse_retry_after():
+    assert rate_limit.parse_retry_after("3") == 3.0
+    assert rate_limit.parse_retry_after(None) is None
+    assert rate_limit.parse_retry_after("soon") is None
+    assert rate_limit.parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+
+def test_cancelled_waiters_give_their_turn_back():
+    limiter = rate_limit.RateLimiter(requests_per_second=1, burst=1)
+    limiter.acquire()
+
+    async def main():
+        waiters = [asyncio.ensure_future(limiter.aacquire()) for _ in range(3)]
+        await asyncio.sleep(0.05)
+        for waiter in waiters:
+            waiter.cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+        started = time.monotonic()
+        await limiter.aacquire()
+        return time.monotonic() - started
+
+    # Only the token taken by the first acquire is waited for, not the 3 s
+    # the cancelled waiters had reserved
+    assert asyncio.run(main()) < 1.2
+    stats = limiter.get_stats()
+    assert stats["queue_depth"] == 0
+    assert stats["requests"] == 2
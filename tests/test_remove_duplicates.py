@@ -0,0 +1,210 @@
+import random
+
+from plugins.remove_duplicates import RecentTextIndex, RemoveDuplicatesPlugin
+
+remove_inline_duplicates = RemoveDuplicatesPlugin().remove_inline_duplicates
+
+
+def legacy_remove_inline_duplicates(text, max_pattern=200):
+    """The pattern loop the Z-function scan replaced; max_pattern=None lifts its length cap."""
+    if not text or len(text) < 4:
+        return text
+
+    text_clean = text.strip()
+
+    half_len = len(text_clean) // 2
+    if half_len >= 3:
+        first_half = text_clean[:half_len]
+        second_half = text_clean[half_len:half_len*2]
+
+        first_normalized = ' '.join(first_half.split())
+        second_normalized = ' '.join(second_half.split())
+
+        if first_normalized == second_normalized:
+            return first_half.strip()
+
+    end = len(text_clean) // 2 + 1
+    if max_pattern is not None:
+        end = min(end, max_pattern)
+    for pattern_len in range(3, end):
+        pattern = text_clean[:pattern_len]
+        pattern_normalized = ''.join(pattern.split())
+
+        if len(pattern_normalized) < 3:
+            continue
+
+        rest = text_clean[pattern_len:].lstrip()
+        rest_normalized = ''.join(rest.split())
+
+        if rest_normalized.startswith(pattern_normalized):
+            return pattern.strip()
+
+    return text_clean
+
+LINES = [
+    "今日はとても良い天気ですね",
+    "昨日の夜不思議な夢を見たんだ",
+    "放課後屋上で待っているから",
+    "そんなこと誰にも言えないよ",
+]
+
+
+def test_equal_text_is_found():
+    index = RecentTextIndex(gram_length=8, max_entries=10)
+    index.add(LINES[0], 0)
+    assert index.find(LINES[0]) == LINES[0]
+    assert index.find(LINES[1]) is None
+
+
+def test_substring_of_an_entry_is_found():
+    index = RecentTextIndex(gram_length=8, max_entries=10)
+    for line in LINES:
+        index.add(line, 0)
+    assert index.find("昨日の夜不思議な夢を") == LINES[1]
+    assert index.find("昨日の夜不思議な猫を") is None
+
+
+def test_superstring_of_an_entry_is_found_through_its_anchor():
+    index = RecentTextIndex(gram_length=8, max_entries=10)
+    for line in LINES:
+        index.add(line, 0)
+    # The entry starts at an offset in the text, and the text shares n-grams with other entries
+    assert index.find("「あのさ" + LINES[2] + "」今日はとても") == LINES[2]
+    assert index.find("放課後屋上で待っている") == LINES[2]
+    assert index.find("放課後屋上で待っていない今日はとても") is None
+
+
+def test_random_overlaps_are_found():
+    rng = random.Random(3)
+    index = RecentTextIndex(gram_length=8, max_entries=1000)
+    alphabet = "あいうえおかきくけこ"
+    texts = ["".join(rng.choice(alphabet) for _ in range(rng.randint(8, 30))) for _ in range(200)]
+    for text in texts:
+        index.add(text, 0)
+    for text in texts:
+        start = rng.randint(0, len(text) - 8)
+        part = text[start:start + rng.randint(8, len(text) - start)]
+        found = index.find(part)
+        assert found is not None and (part in found or found in part)
+        longer = "ん" + text + "ん"
+        found = index.find(longer)
+        assert found is not None and found in longer
+
+
+def test_least_recently_seen_entry_is_evicted():
+    index = RecentTextIndex(gram_length=8, max_entries=3)
+    for now, line in enumerate(LINES[:3]):
+        index.add(line, now)
+    index.touch(LINES[0], 3)
+    index.add(LINES[3], 4)
+    assert len(index) == 3
+    assert index.evictions == 1
+    assert index.find(LINES[1]) is None
+    assert index.find("昨日の夜不思議な夢を") is None
+    assert index.find(LINES[0]) == LINES[0]
+
+
+def test_evicting_every_entry_empties_the_index():
+    index = RecentTextIndex(gram_length=4, max_entries=50)
+    for now, line in enumerate(LINES * 2 + ["今日はとても良い", "とても良い天気ですね"]):
+        index.add(line, now)
+    index.resize(1)
+    assert len(index) == 1
+    index.max_age = 1
+    index.expire(100)
+    size = index.index_size()
+    assert (size['entries'], size['grams'], size['postings']) == (0, 0, 0)
+    assert index.find("今日はとても") is None
+
+
+def test_entries_older_than_the_age_limit_expire():
+    index = RecentTextIndex(gram_length=8, max_entries=10, max_age=60)
+    index.add(LINES[0], 0)
+    index.add(LINES[1], 30)
+    index.expire(70)
+    assert index.find(LINES[0]) is None
+    assert index.find(LINES[1]) == LINES[1]
+
+
+def test_plugin_filters_repeats_and_overlaps():
+    plugin = RemoveDuplicatesPlugin()
+    assert plugin.process_text("今日はとても良い天気ですね\n") == "今日はとても良い天気ですね\n"
+    assert plugin.process_text("今日は とても良い天気ですね") is None
+    assert plugin.process_text("とても良い天気ですね") is None
+    assert plugin.process_text("短い") == "短い"
+    stats = plugin.get_stats()
+    assert (stats['checks'], stats['hits'], stats['entries']) == (3, 2, 1)
+    assert stats['index_bytes'] > 0
+
+
+def test_lowering_history_size_trims_at_once():
+    plugin = RemoveDuplicatesPlugin()
+    for line in LINES:
+        plugin.process_text(line)
+    assert plugin.set_setting('history_size', 2)
+    stats = plugin.get_stats()
+    assert (stats['entries'], stats['evictions']) == (2, 2)
+    assert plugin.process_text(LINES[0]) == LINES[0]
+    assert plugin.process_text(LINES[3]) is None
+    assert not plugin.set_setting('history_size', 0)
+
+
+INLINE_EXAMPLES = [
+    "Hello world Hello world",
+    "Hello worldHello world",
+    "  Hello  world Hello world  ",
+    "今日はとても良い天気ですね今日はとても良い天気ですね",
+    "今日は とても良い天気ですね 今日はとても 良い天気ですね",
+    "abcabcabc",
+    "abcabcab",
+    "ab ab ab ab",
+    "ああああああ",
+    "ねえ、ねえ、聞いてる？",
+    "「春香」「春香」",
+    "no repetition in this line",
+    "aXbXc",
+    "abc",
+    "abcd",
+    "   ",
+    "",
+    "あ い あ い あ い",
+]
+
+
+def repeated_text(rng, pattern_length, copies, alphabet="あいうかき abc"):
+    pattern = "".join(rng.choice(alphabet) for _ in range(pattern_length))
+    text = "".join(
+        # Copies differ in their whitespace only
+        "".join(char + (" " if rng.random() < 0.05 else "") for char in pattern) for _ in range(copies)
+    )
+    return text + pattern[:rng.randint(0, pattern_length - 1)]
+
+
+def test_inline_examples_match_the_pattern_loop():
+    for text in INLINE_EXAMPLES:
+        assert remove_inline_duplicates(text) == legacy_remove_inline_duplicates(text), text
+
+
+def test_random_lines_match_the_pattern_loop():
+    rng = random.Random(11)
+    for _ in range(3000):
+        if rng.random() < 0.5:
+            text = "".join(rng.choice("あいう ab") for _ in range(rng.randint(0, 60)))
+        else:
+            text = repeated_text(rng, rng.randint(1, 40), rng.randint(1, 5), alphabet="あいう ab")
+        expected = legacy_remove_inline_duplicates(text, max_pattern=None)
+        assert remove_inline_duplicates(text) == expected, text
+        # Below 400 characters the old length cap never applied
+        if len(text.strip()) < 400:
+            assert legacy_remove_inline_duplicates(text) == expected, text
+
+
+def test_long_repetitions_and_many_copies():
+    rng = random.Random(12)
+    for pattern_length in (150, 250, 600):
+        for copies in (2, 3, 5):
+            text = repeated_text(rng, pattern_length, copies)
+            result = remove_inline_duplicates(text)
+            assert result == legacy_remove_inline_duplicates(text, max_pattern=None)
+            # At most one copy is left, whatever the old loop's cap
+            assert len("".join(result.split())) <= pattern_length
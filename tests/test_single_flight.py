@@ -0,0 +1,199 @@
+import asyncio
+import threading
+import time
+import urllib.request
+
+import pytest
+
+from conftest import StubHandler
+from single_flight import SingleFlight
+
+
+class SlowEchoHandler(StubHandler):
+    """Answers the path after 0.2 s; counts the requests it received."""
+
+    hits = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            cls.hits += 1
+        time.sleep(0.2)
+        self.send_body(self.path.encode("utf-8"), "text/plain")
+
+
+@pytest.fixture
+def upstream(stub_server):
+    SlowEchoHandler.hits = 0
+    base_url = stub_server(SlowEchoHandler)
+
+    def fetch(path):
+        with urllib.request.urlopen(base_url + path, timeout=5) as response:
+            return response.read().decode("utf-8")
+
+    return fetch
+
+
+def run_threads(count, target):
+    """Run target(index) on count threads released at once; return the results or exceptions by index."""
+    barrier = threading.Barrier(count)
+    results = [None] * count
+
+    def run(index):
+        barrier.wait()
+        try:
+            results[index] = target(index)
+        except Exception as e:
+            results[index] = e
+
+    threads = [threading.Thread(target=run, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_concurrent_do_callers_share_one_upstream_request(upstream):
+    flights = SingleFlight()
+    copies = ["猫が好き", " 猫が好き", "猫が好き  "]
+
+    def translate(index):
+        key = flights.key("google", "ja", "en", copies[index % 3])
+        return flights.do(key, lambda: upstream("/cat"))
+
+    assert run_threads(8, translate) == ["/cat"] * 8
+    assert SlowEchoHandler.hits == 1
+    assert flights.stats == {'requests': 8, 'upstream': 1, 'coalesced': 7, 'errors': 0}
+    assert flights.in_flight == 0
+
+
+def test_concurrent_ado_callers_share_one_upstream_request(upstream):
+    flights = SingleFlight()
+    key = flights.key("google", "ja", "en", "猫が好き")
+
+    async def call():
+        return await asyncio.get_running_loop().run_in_executor(None, upstream, "/cat")
+
+    async def main():
+        return await asyncio.gather(*(flights.ado(key, call) for _ in range(8)))
+
+    assert asyncio.run(main()) == ["/cat"] * 8
+    assert SlowEchoHandler.hits == 1
+    assert flights.stats['coalesced'] == 7
+    assert flights.in_flight == 0
+
+
+def test_an_upstream_error_reaches_every_waiter():
+    flights = SingleFlight()
+    key = flights.key("google", "ja", "en", "猫")
+
+    def fail():
+        time.sleep(0.2)
+        raise ValueError("upstream failed")
+
+    results = run_threads(5, lambda index: flights.do(key, fail))
+    assert all(isinstance(result, ValueError) for result in results)
+    stats = flights.get_stats()
+    assert (stats['upstream'], stats['errors'], stats['in_flight']) == (1, 1, 0)
+
+
+def test_an_upstream_error_reaches_every_async_waiter():
+    flights = SingleFlight()
+    key = flights.key("google", "ja", "en", "猫")
+
+    async def fail():
+        await asyncio.sleep(0.1)
+        raise ValueError("upstream failed")
+
+    async def main():
+        return await asyncio.gather(*(flights.ado(key, fail) for _ in range(4)), return_exceptions=True)
+
+    assert all(isinstance(result, ValueError) for result in asyncio.run(main()))
+    assert flights.get_stats()['errors'] == 1
+
+
+def test_cancelling_one_waiter_keeps_the_shared_call():
+    flights = SingleFlight()
+    key = flights.key("google", "ja", "en", "猫")
+    calls = []
+
+    async def call():
+        calls.append("started")
+        await asyncio.sleep(0.2)
+        calls.append("finished")
+        return "a cat"
+
+    async def main():
+        waiters = [asyncio.ensure_future(flights.ado(key, call)) for _ in range(3)]
+        await asyncio.sleep(0.05)
+        waiters[0].cancel()
+        return await asyncio.gather(*waiters, return_exceptions=True)
+
+    cancelled, *answers = asyncio.run(main())
+    assert isinstance(cancelled, asyncio.CancelledError)
+    assert answers == ["a cat", "a cat"]
+    assert calls == ["started", "finished"]
+    assert flights.in_flight == 0
+
+
+def test_cancelling_every_waiter_cancels_the_upstream_call():
+    flights = SingleFlight()
+    key = flights.key("google", "ja", "en", "猫")
+    calls = []
+
+    async def call():
+        calls.append("started")
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            calls.append("cancelled")
+            raise
+        return "a cat"
+
+    async def main():
+        waiters = [asyncio.ensure_future(flights.ado(key, call)) for _ in range(3)]
+        await asyncio.sleep(0.05)
+        for waiter in waiters:
+            waiter.cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+        for _ in range(10):
+            if flights.in_flight == 0:
+                break
+            await asyncio.sleep(0.01)
+
+    started = time.monotonic()
+    asyncio.run(main())
+    assert time.monotonic() - started < 1.0
+    assert calls == ["started", "cancelled"]
+    assert flights.in_flight == 0
+    # A cancelled call is not an upstream error
+    assert flights.get_stats()['errors'] == 0
+
+
+def test_stats_are_kept_per_engine():
+    flights = SingleFlight()
+    release = threading.Event()
+
+    def call():
+        release.wait(5)
+        return "done"
+
+    def translate(index):
+        engine = "google" if index < 4 else "deepl"
+        return flights.do(flights.key(engine, "ja", "en", "猫"), call)
+
+    threading.Timer(0.2, release.set).start()
+    assert run_threads(6, translate) == ["done"] * 6
+
+    google = flights.get_stats("google")
+    assert (google['requests'], google['upstream'], google['coalesced']) == (4, 1, 3)
+    assert google['coalescing_ratio'] == 0.75
+    deepl = flights.get_stats("deepl")
+    assert (deepl['requests'], deepl['upstream'], deepl['coalesced']) == (2, 1, 1)
+    assert deepl['coalescing_ratio'] == 0.5
+    assert flights.get_stats("bing") == {
+        'requests': 0, 'upstream': 0, 'coalesced': 0, 'errors': 0, 'in_flight': 0, 'coalescing_ratio': 0.0,
+    }
+    assert flights.get_stats()['coalescing_ratio'] == 4 / 6
@@ -0,0 +1,98 @@
+import json
+import random
+import re
+
+import pytest
+
+from text_rules import RuleError, RuleSet, TextRules
+
+# Patterns of the random rule sets: literal prefixes, no prefix, groups,
+# anchors, inline flags and zero-width matches
+PATTERNS = [
+    "ab", "a+b", "ba*", "(a)b", "(?:ab)+", "a|b", "[ab]c", "c$", "^a", "^", "$", "x?", "a*", "b*?",
+    "|a", "\\b", "(?<=a)b", "(?i)AB", "A", "(?=b)", "^a*", ".$",
+]
+REPLACEMENTS = ["", "-", "ba", "x", "\\g<0>\\g<0>"]
+ALPHABET = "abcAB\n"
+
+
+def random_rules(rng, count):
+    rules = []
+    for _ in range(count):
+        if rng.random() < 0.3:
+            find = "".join(rng.choice(ALPHABET) for _ in range(rng.randint(1, 3)))
+            rules.append({"find": find, "replace": rng.choice(REPLACEMENTS[:4])})
+        else:
+            rules.append({"pattern": rng.choice(PATTERNS), "replace": rng.choice(REPLACEMENTS),
+                          "ignore_case": rng.random() < 0.2})
+    return rules
+
+
+def sequential_sub(rules, text):
+    """The rules applied one after the other with str.replace and re.sub."""
+    for rule in rules:
+        if "find" in rule:
+            text = text.replace(rule["find"], rule["replace"])
+        else:
+            text = re.sub(rule["pattern"], rule["replace"], text, flags=re.IGNORECASE if rule["ignore_case"] else 0)
+    return text
+
+
+@pytest.mark.parametrize("pattern, text, expected", [
+    ("$", "abc", "abc!"),
+    ("x?", "abc", "!a!b!c!"),
+    ("a*", "baaac", "!b!!c!"),
+    ("|a", "a", "!!!"),
+    ("^", "", "!"),
+    ("$", "", "!"),
+])
+def test_empty_matches(pattern, text, expected):
+    assert RuleSet([{"pattern": pattern, "replace": "!"}]).apply(text) == expected
+    assert re.sub(pattern, "!", text) == expected
+
+
+def test_random_rules_match_sequential_sub():
+    rng = random.Random(1234)
+    for _ in range(500):
+        rules = random_rules(rng, rng.randint(1, 6))
+        # One pass per rule: each sees the result of the previous ones, as with sequential re.sub
+        staged = [dict(rule, **{"pass": stage}) for stage, rule in enumerate(rules)]
+        engine = RuleSet(staged)
+        one_pass = RuleSet(rules)
+        for _ in range(10):
+            text = "".join(rng.choice(ALPHABET) for _ in range(rng.randint(0, 12)))
+            assert engine.apply(text) == sequential_sub(rules, text), (rules, text)
+            # Same rules in a single scan: no rescan, but it has to end
+            assert isinstance(one_pass.apply(text), str)
+
+
+def test_one_pass_prefers_longest_literal_then_file_order():
+    rules = RuleSet([
+        {"pattern": "a.", "replace": "<pattern>"},
+        {"find": "a", "replace": "<a>"},
+        {"find": "ab", "replace": "<ab>"},
+    ])
+    assert rules.apply("ab ac") == "<ab> <a>c"
+
+
+def test_inline_flags():
+    rules = RuleSet([{"pattern": "(?i)abc", "replace": "x"}, {"find": "d", "replace": "y"}])
+    assert rules.apply("ABC d abc") == "x y x"
+
+
+def test_invalid_pattern_is_a_rule_error():
+    with pytest.raises(RuleError):
+        RuleSet([{"pattern": "(", "replace": ""}])
+
+
+def test_invalid_file_keeps_previous_rules(tmp_path, capsys):
+    path = tmp_path / "text_rules.json"
+    path.write_text(json.dumps({"input": [{"find": "a", "replace": "b"}]}), encoding="utf-8")
+    rules = TextRules(path)
+    assert rules.process_input("aa") == "bb"
+
+    path.write_text(json.dumps({"input": [{"pattern": "a(?i)", "replace": "c"}]}), encoding="utf-8")
+    rules._checked = 0.0
+    rules._signature = None
+    assert rules.process_input("aa") == "bb"
+    assert rules.last_error is not None
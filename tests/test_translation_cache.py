@@ -0,0 +1,93 @@
+import sqlite3
+
+import translation_cache
+from translation_cache import TranslationCache
+
+
+def test_database_is_opened_on_first_use(tmp_path):
+    path = tmp_path / "cache" / "translation_cache.db"
+    cache = TranslationCache(path)
+    assert not path.exists()
+    assert cache.get("google", "ja", "en", "猫") is None
+    assert path.exists()
+    cache.close()
+
+
+def test_close_without_use_creates_nothing(tmp_path):
+    path = tmp_path / "translation_cache.db"
+    TranslationCache(path).close()
+    assert not path.exists()
+
+
+def test_translations_survive_a_restart(tmp_path):
+    path = tmp_path / "translation_cache.db"
+    cache = TranslationCache(path)
+    cache.put("google", "ja", "en", "  猫  が ", "a cat", namespace="game")
+    cache.close()
+
+    cache = TranslationCache(path)
+    assert cache.get("google", "ja", "en", "猫 が", namespace="game") == "a cat"
+    assert cache.get("google", "ja", "en", "猫 が", namespace="other") is None
+    assert len(cache) == 1
+    cache.close()
+
+
+def test_failed_commit_keeps_the_writes(tmp_path):
+    path = tmp_path / "translation_cache.db"
+    cache = TranslationCache(path)
+    cache.get("google", "ja", "en", "open")
+
+    # Another process holds the write lock
+    other = sqlite3.connect(str(path), timeout=0)
+    other.execute("BEGIN IMMEDIATE")
+    cache._conn.execute("PRAGMA busy_timeout=0")
+    cache.put("google", "ja", "en", "猫", "cat")
+    cache.flush()
+    stats = cache.get_stats()
+    assert stats['flush_errors'] == 1
+    assert stats['pending_writes'] == 1
+    other.rollback()
+    other.close()
+
+    cache.flush()
+    assert cache.get_stats()['pending_writes'] == 0
+    cache.close()
+    cache = TranslationCache(path)
+    assert cache.get("google", "ja", "en", "猫") == "cat"
+    cache.close()
+
+
+def test_pending_writes_are_bounded(tmp_path, monkeypatch):
+    monkeypatch.setattr(translation_cache, "MAX_PENDING", 3)
+    path = tmp_path / "translation_cache.db"
+    cache = TranslationCache(path)
+    cache.get("google", "ja", "en", "open")
+    other = sqlite3.connect(str(path), timeout=0)
+    other.execute("BEGIN IMMEDIATE")
+    cache._conn.execute("PRAGMA busy_timeout=0")
+    for index in range(5):
+        cache.put("google", "ja", "en", f"line {index}", f"translation {index}")
+    cache.flush()
+    assert cache.get_stats()['dropped_writes'] == 2
+    other.rollback()
+    other.close()
+    cache.flush()
+    cache._memory.clear()
+    assert cache.get("google", "ja", "en", "line 0") is None
+    assert cache.get("google", "ja", "en", "line 4") == "translation 4"
+    cache.close()
+
+
+def test_unusable_database_works_from_memory(tmp_path):
+    folder = tmp_path / "not_a_folder"
+    folder.write_text("")
+    cache = TranslationCache(folder / "translation_cache.db")
+    cache.put("google", "ja", "en", "猫", "cat")
+    cache.flush()
+    assert cache.get("google", "ja", "en", "猫") == "cat"
+    assert cache.open_error is not None
+    cache.close()
+
+
+def test_default_path_is_outside_the_source_tree():
+    assert translation_cache.DEFAULT_CACHE_PATH.parent == translation_cache.user_data_dir()
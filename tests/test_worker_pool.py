@@ -0,0 +1,133 @@
+import random
+import threading
+import time
+from concurrent.futures import Future
+
+from plugins import LATEST_ONLY, OrderedWorkerPool
+
+
+def wait_until(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+def test_results_are_delivered_in_submission_order():
+    rng = random.Random(7)
+    delays = {item: rng.uniform(0.0, 0.02) for item in range(40)}
+    delivered = []
+
+    def work(item):
+        time.sleep(delays[item])
+        return item * 2
+
+    pool = OrderedWorkerPool(work, lambda item, result: delivered.append((item, result)), max_in_flight=8)
+    for item in range(40):
+        pool.submit(item)
+    wait_until(lambda: len(delivered) == 40)
+    assert delivered == [(item, item * 2) for item in range(40)]
+    assert pool.stats['completed'] == 40
+    pool.close()
+
+
+def test_failed_items_do_not_hold_up_the_others():
+    delivered = []
+
+    def work(item):
+        if item == 1:
+            raise RuntimeError("engine down")
+        return None if item == 2 else item
+
+    pool = OrderedWorkerPool(work, lambda item, result: delivered.append(item), max_in_flight=2)
+    for item in range(5):
+        pool.submit(item)
+    wait_until(lambda: delivered[-1:] == [4])
+    assert delivered == [0, 3, 4]
+    assert pool.stats['failed'] == 1
+    pool.close()
+
+
+def test_oldest_waiting_item_is_dropped_when_full():
+    release = threading.Event()
+    delivered = []
+
+    def work(item):
+        release.wait()
+        return item
+
+    pool = OrderedWorkerPool(work, lambda item, result: delivered.append(item), max_in_flight=1, max_pending=2)
+    pool.submit(0)
+    wait_until(lambda: pool.in_flight == 1 and pool.pending == 0)
+    for item in range(1, 5):
+        pool.submit(item)
+    assert pool.stats['dropped'] == 2
+    release.set()
+    wait_until(lambda: delivered[-1:] == [4])
+    assert delivered == [0, 3, 4]
+    pool.close()
+
+
+def test_latest_only_delivers_the_newest_item():
+    release = threading.Event()
+    delivered = []
+
+    def work(item):
+        release.wait()
+        return item
+
+    pool = OrderedWorkerPool(work, lambda item, result: delivered.append(item), max_in_flight=1,
+                             policy=LATEST_ONLY)
+    pool.submit("first")
+    wait_until(lambda: pool.in_flight == 1 and pool.pending == 0)
+    pool.submit("second")
+    pool.submit("third")
+    release.set()
+    wait_until(lambda: delivered == ["third"])
+    # "first" was in flight, "second" waiting
+    assert pool.stats['skipped'] == 2
+    time.sleep(0.05)
+    assert delivered == ["third"]
+    pool.close()
+
+
+def test_superseded_futures_are_cancelled():
+    futures = []
+    delivered = []
+
+    def work(item):
+        if item == "stale":
+            future = Future()  # never completes unless cancelled
+            futures.append(future)
+            return future
+        return item
+
+    pool = OrderedWorkerPool(work, lambda item, result: delivered.append(item), policy=LATEST_ONLY)
+    pool.submit("stale")
+    wait_until(lambda: futures)
+    pool.submit("fresh")
+    wait_until(lambda: delivered == ["fresh"])
+    wait_until(lambda: futures[0].cancelled())
+    assert pool.stats['cancelled'] == 1
+    pool.close()
+
+
+def test_clear_discards_waiting_and_in_flight_items():
+    release = threading.Event()
+    delivered = []
+
+    def work(item):
+        release.wait()
+        return item
+
+    pool = OrderedWorkerPool(work, lambda item, result: delivered.append(item), max_in_flight=1)
+    pool.submit(0)
+    wait_until(lambda: pool.in_flight == 1 and pool.pending == 0)
+    pool.submit(1)
+    pool.submit(2)
+    pool.clear()
+    release.set()
+    pool.submit(3)
+    wait_until(lambda: delivered == [3])
+    assert pool.stats['dropped'] == 3
+    pool.close()